@@ -0,0 +1,65 @@
+# benchmarks/compare.py
+"""
+두 벤치마크 결과(JSON) 비교.
+
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json --threshold 0.10
+
+median 기준으로 threshold(기본 10%) 이상 느려진 항목이 있으면 종료코드 1.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: dict, head: dict, threshold: float = 0.10):
+    """
+    (행 목록, 회귀 항목 이름 목록) 반환. 행: (이름, 기준 median, 비교 median, 변화율 또는 None)
+    """
+    rows, regressions = [], []
+    base_results, head_results = base["results"], head["results"]
+    for name in sorted(set(base_results) | set(head_results)):
+        old = base_results.get(name, {}).get("median")
+        new = head_results.get(name, {}).get("median")
+        change = (new - old) / old if old and new is not None else None
+        rows.append((name, old, new, change))
+        if change is not None and change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value * 1000:.3f}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 median 증가율 (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    rows, regressions = compare(base, head, args.threshold)
+
+    print(f"base {base['meta'].get('commit')} ({base['meta'].get('timestamp')})  →  "
+          f"head {head['meta'].get('commit')} ({head['meta'].get('timestamp')})")
+    print(f"{'benchmark':<28} {'base ms':>12} {'head ms':>12} {'change':>9}")
+    for name, old, new, change in rows:
+        mark = "  ← 회귀" if name in regressions else ""
+        pct = "-" if change is None else f"{change * 100:+.1f}%"
+        print(f"{name:<28} {_ms(old):>12} {_ms(new):>12} {pct:>9}{mark}")
+
+    if regressions:
+        print(f"\n{len(regressions)}개 항목이 {args.threshold * 100:.0f}% 이상 느려졌습니다.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
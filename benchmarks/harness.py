@@ -0,0 +1,118 @@
+# benchmarks/harness.py
+"""
+벤치마크 공통 환경.
+
+src.db 는 import 시점에 엔진을 만들기 때문에, 이 모듈을 가장 먼저 import 해서
+임시 SQLite 파일 DB / SQL 로그 끔 / 가짜 자격증명을 환경변수로 지정한다.
+"""
+
+import copy
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR     = os.path.join(ROOT_DIR, "src")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+WORK_DIR    = tempfile.mkdtemp(prefix="kis-bench-")
+
+# src/main.py 와 같은 import 경로 (rebalancer, orders.* / src.*)
+for path in (SRC_DIR, ROOT_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+BENCH_ENV = {
+    "DATABASE_URL": f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}",
+    "DB_ECHO": "0",
+    "KIS_API_KEY": "bench-appkey",
+    "KIS_APP_SECRET": "bench-appsecret",
+    "KIS_OAUTH_TOKEN": "",
+}
+for key, value in BENCH_ENV.items():
+    os.environ.setdefault(key, value)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 측정 도구
+# ─────────────────────────────────────────────────────────────────────────
+def summarize(samples: List[float], **extra) -> dict:
+    """
+    반복 측정값(초) → 결과 항목. 비교 기준값은 median.
+    """
+    ordered = sorted(samples)
+    result = {
+        "median": statistics.median(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "repeat": len(ordered),
+    }
+    result.update(extra)
+    return result
+
+
+def measure(fn: Callable[[], None], repeat: int = 5, setup: Optional[Callable[[], None]] = None, **extra) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, **extra)
+
+
+def metadata() -> dict:
+    def git(*args):
+        try:
+            return subprocess.check_output(["git", *args], cwd=ROOT_DIR, text=True,
+                                           stderr=subprocess.DEVNULL).strip()
+        except Exception:
+            return ""
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 시뮬레이터에 연결된 Rebalancer
+# ─────────────────────────────────────────────────────────────────────────
+def bench_config(server_url: str, universe: Dict[str, tuple], cano: str, rate_per_sec: float = 0.0) -> dict:
+    """
+    config.yaml 을 기반으로 시뮬레이터 주소 / 동일 비중 / 장 시간 무시 / 거래소 지정을 덮어쓴 설정.
+    거래소는 수동 지정해 첫 주기의 거래소 탐색 비용을 제외한다 (정상 상태 측정).
+    """
+    from src.orders.base_manager import load_config
+
+    cfg = copy.deepcopy(load_config())
+    cfg.setdefault("trading", {})["use_mock"] = False
+    cfg["path"]["real"] = server_url
+    cfg["account"] = dict(cfg.get("account", {}), CANO=cano, ACNT_PRDT_CD="01", OVRS_EXCG_CD="NASD")
+    cfg["rate_limit"] = {"real_per_sec": rate_per_sec, "mock_per_sec": rate_per_sec}
+    cfg["market_hours"] = {"enabled": False}
+    cfg["exchange_routing"] = dict(
+        cfg.get("exchange_routing", {}),
+        symbols={code: exchange for code, (_, exchange) in universe.items()},
+        cache_path=None,
+    )
+    weight = 1.0 / len(universe)
+    cfg["strategy"] = dict(cfg.get("strategy", {}), weights={code: weight for code in universe})
+    return cfg
+
+
+def init_database():
+    from src.db.db import init_db
+
+    init_db()
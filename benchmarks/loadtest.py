@@ -0,0 +1,264 @@
+# benchmarks/loadtest.py
+"""
+멀티 계좌 부하 테스트.
+
+N개 계좌 × M개 종목의 리밸런싱(MultiAccountRebalancer)과 체결내역 동기화(ExecutionManager)를
+cycles 회 반복하고, Transport 요청 리스너로 TR 별 지연/처리량/요청 한도 거절을 집계한다.
+시뮬레이터는 별도 프로세스로 띄워 CPU/메모리 측정에 섞이지 않게 한다.
+
+    python -m benchmarks.loadtest --accounts 20 --symbols 50 --cycles 3 --appkeys 2
+    python -m benchmarks.loadtest --accounts 5 --symbols 10 --server http://127.0.0.1:8000   # 이미 떠 있는 서버
+"""
+
+from benchmarks import harness  # noqa: F401  (환경변수 설정이 src import 보다 먼저 와야 함)
+
+import argparse
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.harness import ROOT_DIR, bench_config, init_database, metadata
+from src.simulator import make_universe
+from src.transport import RequestEvent, add_listener, remove_listener
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 요청 집계
+# ─────────────────────────────────────────────────────────────────────────
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class RequestRecorder:
+    """
+    Transport 리스너: TR 별 지연 시간, 요청 한도 거절, 오류, 한도 대기 시간을 모은다.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.rate_limited: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        tr_id = event.tr_id or "unknown"
+        with self._lock:
+            self.latencies.setdefault(tr_id, []).append(event.elapsed)
+            self.waited += event.waited
+            if event.rate_limited:
+                self.rate_limited[tr_id] = self.rate_limited.get(tr_id, 0) + 1
+            elif event.error or event.rt_cd not in (None, "0"):
+                self.errors[tr_id] = self.errors.get(tr_id, 0) + 1
+
+    def report(self, wall_time: float) -> dict:
+        per_tr = {}
+        for tr_id, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            per_tr[tr_id] = {
+                "requests": len(ordered),
+                "rps": len(ordered) / wall_time if wall_time else 0.0,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "rate_limited": self.rate_limited.get(tr_id, 0),
+                "errors": self.errors.get(tr_id, 0),
+            }
+        total = sum(len(s) for s in self.latencies.values())
+        return {
+            "requests": total,
+            "rps": total / wall_time if wall_time else 0.0,
+            "rate_limited": sum(self.rate_limited.values()),
+            "errors": sum(self.errors.values()),
+            "limiter_wait_sec": self.waited,
+            "per_tr": per_tr,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 시뮬레이터 프로세스
+# ─────────────────────────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_simulator(args) -> (subprocess.Popen, str):
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "src.simulator", "--port", str(port), "--symbols", str(args.symbols),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.latency_ms / 4),
+        "--error-rate", str(args.error_rate), "--rate-limit", str(args.server_rate_limit),
+        "--cash", str(args.symbols * 10000.0),
+    ]
+    proc = subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("시뮬레이터가 시작되지 않았습니다")
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) 부하 시나리오
+# ─────────────────────────────────────────────────────────────────────────
+def build_config(server_url: str, args) -> dict:
+    """
+    accounts 목록을 가진 설정. 계좌는 appkeys 개의 appkey 에 라운드로빈으로 배정된다.
+    """
+    universe = make_universe(args.symbols)
+    cfg = bench_config(server_url, universe, "00000000", rate_per_sec=args.rate_limit)
+    accounts = []
+    for i in range(args.accounts):
+        key = i % args.appkeys
+        os.environ[f"LOADTEST_APPKEY_{key}"] = f"loadtest-appkey-{key}"
+        os.environ[f"LOADTEST_APPSECRET_{key}"] = f"loadtest-appsecret-{key}"
+        accounts.append({
+            "name": f"acct{i:03d}",
+            "CANO": f"{50000000 + i}",
+            "ACNT_PRDT_CD": "01",
+            "appkey_env": f"LOADTEST_APPKEY_{key}",
+            "appsecret_env": f"LOADTEST_APPSECRET_{key}",
+        })
+    cfg["accounts"] = accounts
+    return cfg
+
+
+def sync_executions(server_url: str, cfg: dict, workers: int) -> int:
+    """
+    모든 계좌의 체결내역(v1_해외주식-007)을 조회해 DB 에 반영. 반환값: 처리한 체결 건수.
+    """
+    from src.orders.execution_manager import EXEC_PATH, ExecutionManager
+
+    def run(entry):
+        manager = ExecutionManager(os.getenv(entry["appkey_env"]), os.getenv(entry["appsecret_env"]), "loadtest")
+        manager.exec_url = f"{server_url}{EXEC_PATH}"
+        try:
+            response = manager.inquire_executions(
+                entry["CANO"], entry["ACNT_PRDT_CD"], "", "", "", "00", "01", "NASD", "DS",
+            )
+            if response is None:
+                return 0
+            manager.process_executions(response)
+            return len(response.output)
+        finally:
+            manager.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(run, cfg["accounts"]))
+
+
+def run_load(args, server_url: str) -> dict:
+    from rebalancer import Rebalancer
+    from src.multi_account import MultiAccountRebalancer
+    from src.transport import close_transports
+
+    cfg = build_config(server_url, args)
+    workers = args.workers or args.accounts
+    recorder = RequestRecorder()
+    add_listener(recorder)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    cycles = []
+    try:
+        for cycle in range(args.cycles):
+            t0 = time.perf_counter()
+            report = MultiAccountRebalancer(Rebalancer, cfg, max_workers=workers).run()
+            t1 = time.perf_counter()
+            fills = sync_executions(server_url, cfg, workers)
+            t2 = time.perf_counter()
+            cycles.append({
+                "cycle": cycle,
+                "rebalance_sec": t1 - t0,
+                "sync_sec": t2 - t1,
+                "accounts_ok": report.succeeded,
+                "accounts_failed": report.failed,
+                "orders_sent": report.orders_sent,
+                "orders_failed": report.orders_failed,
+                "fills": fills,
+            })
+            print(f"[loadtest] cycle {cycle}: 리밸런싱 {t1 - t0:.2f}s (주문 {report.orders_sent}건), "
+                  f"동기화 {t2 - t1:.2f}s (체결 {fills}건)", file=sys.stderr)
+    finally:
+        remove_listener(recorder)
+        close_transports()
+
+    wall = time.perf_counter() - start
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (usage.ru_utime - usage_before.ru_utime) + (usage.ru_stime - usage_before.ru_stime)
+    result = recorder.report(wall)
+    result.update({
+        "wall_sec": wall,
+        "cpu_sec": cpu,
+        "cpu_util": cpu / wall if wall else 0.0,    # 1.0 = 코어 1개 포화
+        "max_rss_mb": usage.ru_maxrss / 1024,         # Linux: KB 단위
+        "cycles": cycles,
+    })
+    return result
+
+
+def print_report(result: dict):
+    print(f"\n총 {result['requests']}건, {result['rps']:.1f} req/s, 요청 한도 거절 {result['rate_limited']}건, "
+          f"오류 {result['errors']}건, 한도 대기 합계 {result['limiter_wait_sec']:.2f}s")
+    print(f"CPU {result['cpu_sec']:.2f}s ({result['cpu_util'] * 100:.0f}% of 1 core), "
+          f"최대 RSS {result['max_rss_mb']:.1f} MB, 총 {result['wall_sec']:.2f}s")
+    print(f"{'TR':<16} {'req':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'429':>6} {'err':>6}")
+    for tr_id, s in result["per_tr"].items():
+        print(f"{tr_id:<16} {s['requests']:>7} {s['rps']:>8.1f} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+              f"{s['p99_ms']:>9.2f} {s['rate_limited']:>6} {s['errors']:>6}")
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="멀티 계좌 부하 테스트")
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--appkeys", type=int, default=1, help="계좌들이 나눠 쓸 appkey 수")
+    parser.add_argument("--workers", type=int, default=0, help="동시 실행 계좌 수 (기본: 계좌 수)")
+    parser.add_argument("--rate-limit", type=float, default=18.0, help="클라이언트 측 appkey 당 초당 요청 한도")
+    parser.add_argument("--server-rate-limit", type=float, default=20.0, help="시뮬레이터 appkey 당 초당 한도")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="시뮬레이터 평균 응답 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--server", help="이미 실행 중인 시뮬레이터 주소 (없으면 새로 띄움)")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.CRITICAL)
+    init_database()
+
+    proc = None
+    server_url = args.server
+    if server_url is None:
+        proc, server_url = start_simulator(args)
+    try:
+        result = run_load(args, server_url)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": dict(metadata(), **vars(args)), "result": result}, f, ensure_ascii=False, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
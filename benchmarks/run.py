@@ -0,0 +1,386 @@
+# benchmarks/run.py
+"""
+엔드투엔드 벤치마크 (로컬 KIS 시뮬레이터 + 임시 SQLite).
+
+    python -m benchmarks.run                      # 전체 실행 → benchmarks/results/<시각>-<커밋>.json
+    python -m benchmarks.run --only rebalance tr  # 일부 스위트만
+    python -m benchmarks.run --quick              # 작은 규모로 빠르게 (개발 중 확인용)
+    python -m benchmarks.compare old.json new.json
+
+스위트
+    startup    : 새 인터프리터에서 import + Rebalancer 생성까지 걸리는 시간
+    rebalance  : 종목 10/100/1000개 동일 비중 포트폴리오의 Rebalancer.rebalance() 1회
+    ingestion  : 체결 1k/100k 건의 ExecutionManager.process_executions()
+    tr         : TR 별 클라이언트 호출 1건당 시간과 순수 HTTP 왕복 대비 오버헤드
+    bars       : 봉 저장소에서 10년 일봉 패널(1000종목) 로드 (새 프로세스 첫 로드 / 매핑 재사용)
+"""
+
+from benchmarks import harness  # noqa: F401  (환경변수 설정이 src import 보다 먼저 와야 함)
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.harness import (
+    BENCH_ENV, RESULTS_DIR, ROOT_DIR, SRC_DIR, bench_config, init_database, measure, metadata, summarize,
+)
+from src.simulator import KISSimulator, SimulatorConfig, SimulatorServer, make_universe
+
+
+SUITES = ("startup", "rebalance", "ingestion", "tr", "bars", "backtest", "sweep")
+REBALANCE_SIZES = (10, 100, 1000)
+INGESTION_SIZES = (1000, 100000)
+PANEL_SYMBOLS = 1000
+PANEL_DAYS = 2520            # 10년 (연 252 거래일)
+BACKTEST_SETS = 1000
+BACKTEST_SYMBOLS = 10
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 스위트
+# ─────────────────────────────────────────────────────────────────────────
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+from rebalancer import Rebalancer
+imported = time.perf_counter()
+Rebalancer()
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def bench_startup(args) -> dict:
+    env = dict(os.environ, **BENCH_ENV, PYTHONPATH=os.pathsep.join([SRC_DIR, ROOT_DIR]))
+    imports, totals = [], []
+    for _ in range(args.repeat):
+        out = subprocess.check_output([sys.executable, "-c", STARTUP_SNIPPET], env=env, cwd=ROOT_DIR, text=True)
+        t_import, t_total = map(float, out.split()[-2:])
+        imports.append(t_import)
+        totals.append(t_total)
+    return {
+        "startup.import": summarize(imports),
+        "startup.construct": summarize(totals),
+    }
+
+
+def bench_rebalance(args) -> dict:
+    from rebalancer import Rebalancer
+
+    results = {}
+    sizes = (10, 100) if args.quick else REBALANCE_SIZES
+    for n in sizes:
+        universe = make_universe(n)
+        sim = KISSimulator(SimulatorConfig(volatility=0.0, default_cash=n * 10000.0), universe)
+        with SimulatorServer(sim) as server:
+            counter = iter(range(10 ** 7))
+            state = {}
+
+            def setup():
+                # 매 반복마다 빈 계좌로 시작해야 주문 수가 같다
+                cano = f"{n:04d}{next(counter):04d}"
+                state["reb"] = Rebalancer(bench_config(server.url, universe, cano))
+
+            def run():
+                state["reb"].rebalance()
+
+            before = sum(sim.request_counts.values())
+            result = measure(run, repeat=args.repeat, setup=setup, symbols=n)
+            result["requests_per_run"] = (sum(sim.request_counts.values()) - before) / args.repeat
+            result["orders_per_run"] = state["reb"].orders_sent
+            state["reb"].close()
+        results[f"rebalance.{n}"] = result
+    return results
+
+
+def _fill_rows(n: int):
+    from src.order_execution_models import ResponseBodyOutput
+
+    now = datetime.now()
+    rows = []
+    for i in range(n):
+        odno = f"BENCH{i:08d}"
+        rows.append(ResponseBodyOutput(
+            ord_dt=now.strftime("%Y%m%d"), ord_gno_brno="01790", odno=odno, orgn_odno=odno,
+            sll_buy_dvsn_cd="02", sll_buy_dvsn_cd_name="매수", rvse_cncl_dvsn="00", rvse_cncl_dvsn_name="",
+            pdno=f"S{i:07d}", prdt_name="", ft_ord_qty="1", ft_ord_unpr3="10.0000", ft_ccld_qty="1",
+            ft_ccld_unpr3="10.0000", ft_ccld_amt3="10.00", nccs_qty="0", prcs_stat_name="완료",
+            rjct_rson="", ord_tmd=now.strftime("%H%M%S"), tr_mket_name="NASD", tr_natn="840",
+            tr_natn_name="미국", ovrs_excg_cd="NASD", tr_crcy_cd="USD", dmst_ord_dt=now.strftime("%Y%m%d"),
+            thco_ord_tmd=now.strftime("%H%M%S"), loan_type_cd="10", loan_dt="", mdia_dvsn_name="OpenAPI",
+            usa_amk_exts_rqst_yn="N", splt_buy_attr_name="",
+        ))
+    return rows
+
+
+def bench_ingestion(args) -> dict:
+    """
+    매수 체결 n건 → 주문(OrderList) 조회 + 보유(HoldList) 생성.
+    주문 행은 측정 전에 미리 넣고, 반복마다 보유 테이블을 비운다.
+    """
+    from src.db.db import SessionLocal
+    from src.db.models import HoldList, OrderList
+    from src.order_execution_models import ExecutionInquiryResponse
+    from src.orders.execution_manager import ExecutionManager
+
+    results = {}
+    sizes = (1000,) if args.quick else INGESTION_SIZES
+    for n in sizes:
+        session = SessionLocal()
+        session.query(HoldList).delete()
+        session.query(OrderList).delete()
+        session.bulk_save_objects([
+            OrderList(order_id=f"BENCH{i:08d}", code=f"S{i:07d}", name="", order_type="리밸런싱 매수",
+                      qty=1, remain_qty=1, cum_price=10, status="주문전송완료")
+            for i in range(n)
+        ])
+        session.commit()
+
+        response = ExecutionInquiryResponse(
+            rt_cd="0", msg_cd="MCA00000", msg1="", ctx_area_fk200="", ctx_area_nk200="", output=_fill_rows(n),
+        )
+        manager = ExecutionManager(BENCH_ENV["KIS_API_KEY"], BENCH_ENV["KIS_APP_SECRET"], "bench-token")
+
+        def setup():
+            session.query(HoldList).delete()
+            session.commit()
+
+        repeat = 1 if n >= 100000 else args.repeat
+        result = measure(lambda: manager.process_executions(response), repeat=repeat, setup=setup, fills=n)
+        result["fills_per_sec"] = n / result["median"]
+        results[f"ingestion.{n}"] = result
+        manager.close()
+        session.close()
+    return results
+
+
+def bench_tr(args) -> dict:
+    """
+    TR 별 클라이언트 경로(헤더 모델 검증 → Transport → 응답 파싱) 1건당 시간.
+    overhead = 클라이언트 호출 - 같은 요청의 순수 HTTP 왕복(Transport 미사용 requests.Session).
+    """
+    import requests
+
+    from rebalancer import Rebalancer
+    from src.api_client import APIClient
+    from src.orders.execution_manager import EXEC_PATH, ExecutionManager
+
+    universe = {"AAPL": (100.0, "NASD")}
+    sim = KISSimulator(SimulatorConfig(volatility=0.0, default_cash=1e12), universe)
+    calls = 50 if args.quick else 300
+    results = {}
+    with SimulatorServer(sim) as server:
+        reb = Rebalancer(bench_config(server.url, universe, "77777777"))
+        reb.token = reb._get_token()
+        executions = ExecutionManager(reb.api_key, reb.app_secret, reb.token)
+        executions.exec_url = f"{server.url}{EXEC_PATH}"
+        token_client = APIClient(reb.api_key, reb.app_secret, token_url=f"{server.url}/oauth2/tokenP")
+
+        cases = {
+            "tokenP": lambda: token_client.get_oauth_token(),
+            "HHDFS00000300": lambda: reb._get_price("AAPL"),
+            "TTTS3012R": lambda: reb.get_balance(),
+            "TTTC2101R": lambda: reb.get_foreign_margin(),
+            "TTTT1002U": lambda: reb.create_order(
+                is_buy=True, CANO=reb.CANO, ACNT_PRDT_CD=reb.ACNT_PRDT_CD, OVRS_EXCG_CD="NASD", PDNO="AAPL",
+                ORD_QTY=1, OVRS_ORD_UNPR=100, order_type="벤치마크", name="AAPL", qty=1, price=100,
+            ),
+            "TTTS3035R": lambda: executions.inquire_executions(
+                reb.CANO, reb.ACNT_PRDT_CD, "AAPL", "", "", "02", "01", "NASD", "DS",
+            ),
+        }
+        raw_requests = {
+            "tokenP": ("POST", "/oauth2/tokenP", None, {}),
+            "HHDFS00000300": ("GET", "/uapi/overseas-price/v1/quotations/price", {"EXCD": "NAS", "SYMB": "AAPL"}, None),
+            "TTTS3012R": ("GET", "/uapi/overseas-stock/v1/trading/inquire-balance",
+                          {"CANO": reb.CANO, "OVRS_EXCG_CD": "NASD"}, None),
+            "TTTC2101R": ("GET", "/uapi/overseas-stock/v1/trading/foreign-margin", {"CANO": reb.CANO}, None),
+            "TTTT1002U": ("POST", "/uapi/overseas-stock/v1/trading/order", None,
+                          {"CANO": reb.CANO, "OVRS_EXCG_CD": "NASD", "PDNO": "AAPL",
+                           "ORD_QTY": "1", "OVRS_ORD_UNPR": "100"}),
+            "TTTS3035R": ("GET", "/uapi/overseas-stock/v1/trading/inquire-ccnl",
+                          {"CANO": reb.CANO, "PDNO": "AAPL", "SLL_BUY_DVSN": "02", "CCLD_NCCS_DVSN": "01"}, None),
+        }
+
+        raw = requests.Session()
+        for tr_id, call in cases.items():
+            method, path, params, body = raw_requests[tr_id]
+            headers = {"appkey": reb.api_key, "tr_id": tr_id}
+            raw_call = lambda: raw.request(method, f"{server.url}{path}", headers=headers,
+                                           params=params, json=body).json()
+
+            for fn in (call, raw_call):   # 연결/캐시 예열
+                fn()
+            client = _per_call(call, calls)
+            baseline = _per_call(raw_call, calls)
+            client["http_median"] = baseline["median"]
+            client["overhead_median"] = client["median"] - baseline["median"]
+            results[f"tr.{tr_id}"] = client
+
+        raw.close()
+        executions.close()
+        reb.close()
+    return results
+
+
+def bench_bars(args) -> dict:
+    """
+    종목 N개 × 일봉 PANEL_DAYS 개를 임시 저장소에 쓰고 종가 패널 로드 시간을 잰다.
+    cold: 새 BarStore (색인 읽기 + mmap), warm: 같은 BarStore 에서 다시 로드.
+    screen: 같은 저장소 전체 종목에 조건식 스크리닝.
+    """
+    import numpy as np
+
+    from src.marketdata.bar_store import BAR_DTYPE, BarStore
+    from src.screening import compile_conditions
+
+    n = 100 if args.quick else PANEL_SYMBOLS
+    symbols = [f"SYM{i:04d}" for i in range(n)]
+    rng = np.random.default_rng(0)
+    bars = np.zeros(PANEL_DAYS, dtype=BAR_DTYPE)
+    bars["ts"] = 1262563200 + np.arange(PANEL_DAYS) * 86400
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        writer = BarStore(root)
+        start = time.perf_counter()
+        for symbol in symbols:
+            bars["close"] = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, PANEL_DAYS)))
+            writer.append("1d", symbol, bars)
+        results["bars.append"] = summarize([time.perf_counter() - start], symbols=n, rows=PANEL_DAYS)
+
+        state = {}
+
+        def setup():
+            state["store"] = BarStore(root)
+
+        def load():
+            state["panel"] = state["store"].panel("1d", symbols)
+
+        results["bars.panel_cold"] = measure(load, repeat=args.repeat, setup=setup, symbols=n, rows=PANEL_DAYS)
+        results["bars.panel_warm"] = measure(load, repeat=args.repeat, symbols=n, rows=PANEL_DAYS)
+        results["bars.slice_1y"] = measure(
+            lambda: [state["store"].load("1d", s, start="20190101", end="20200101") for s in symbols],
+            repeat=args.repeat, symbols=n,
+        )
+        assert state["panel"]["close"].shape == (PANEL_DAYS, n)
+
+        screen = compile_conditions({
+            "filters": ["close > sma(200)", "return(60) > 0", "high(20) > 0"],
+            "sort": "-return(60)", "limit": 20,
+        })
+        results["bars.screen"] = measure(lambda: screen.run(state["store"]), repeat=args.repeat, symbols=n)
+    return results
+
+
+def bench_backtest(args) -> dict:
+    """
+    일봉 PANEL_DAYS 개 × BACKTEST_SYMBOLS 종목에서 파라미터 조합 K 개를 한 번에 백테스트한다.
+    조합: 무작위 목표비중 × 정기 리밸런싱 간격 × 종목별 드리프트 임계값.
+    """
+    import numpy as np
+
+    from src.backtest.engine import run_backtest
+
+    k = 100 if args.quick else BACKTEST_SETS
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (PANEL_DAYS, BACKTEST_SYMBOLS)), axis=0))
+    weights = rng.dirichlet(np.ones(BACKTEST_SYMBOLS), size=k)
+    every = rng.choice([0, 5, 21, 63], size=k)
+    sym_thr = rng.choice([0.02, 0.05, 0.1, np.inf], size=k)
+
+    def run():
+        run_backtest(prices, weights, every, sym_thr, keep_equity=False)
+
+    return {"backtest.sets": measure(run, repeat=args.repeat, sets=k, days=PANEL_DAYS, symbols=BACKTEST_SYMBOLS)}
+
+
+def bench_sweep(args) -> dict:
+    """
+    backtest 와 같은 규모의 조합을 SweepRunner 로 workers=1 과 workers=CPU 수에서 돌려 처리량을 비교한다.
+    가격은 prices.npy mmap 으로 공유, 결과는 JSONL 로 기록 (매 반복 새 디렉터리).
+    """
+    import numpy as np
+
+    from src.backtest.sweep import SweepRunner, expand_grid
+
+    n_sets = 100 if args.quick else BACKTEST_SETS
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (PANEL_DAYS, BACKTEST_SYMBOLS)), axis=0))
+    symbols = [f"SYM{i:02d}" for i in range(BACKTEST_SYMBOLS)]
+    weights = rng.dirichlet(np.ones(BACKTEST_SYMBOLS), size=n_sets // 16)
+    grid = {
+        "symbols": symbols,
+        "weights": {f"w{i}": dict(zip(symbols, w)) for i, w in enumerate(weights)},
+        "rebalance_every": [0, 5, 21, 63],
+        "symbol_threshold": [0.02, 0.05, 0.1, float("inf")],
+    }
+    _, jobs = expand_grid(grid)
+
+    results = {}
+    for workers in sorted({1, os.cpu_count() or 1}):
+        with tempfile.TemporaryDirectory() as root:
+            state = {"i": 0}
+
+            def run():
+                state["i"] += 1
+                SweepRunner(os.path.join(root, str(state["i"])), workers=workers).run(prices, jobs, symbols)
+
+            results[f"sweep.workers_{workers}"] = measure(run, repeat=args.repeat, sets=len(jobs), workers=workers)
+    return results
+
+
+def _per_call(fn, calls: int) -> dict:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 실행
+# ─────────────────────────────────────────────────────────────────────────
+def main(argv=None) -> str:
+    parser = argparse.ArgumentParser(description="KIS 리밸런서 엔드투엔드 벤치마크")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="작은 규모로 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.CRITICAL)
+    init_database()
+
+    meta = metadata()
+    report = {"meta": dict(meta, quick=args.quick, repeat=args.repeat), "results": {}}
+    runners = {"startup": bench_startup, "rebalance": bench_rebalance,
+               "ingestion": bench_ingestion, "tr": bench_tr, "bars": bench_bars,
+               "backtest": bench_backtest, "sweep": bench_sweep}
+    for suite in args.only:
+        start = time.perf_counter()
+        report["results"].update(runners[suite](args))
+        print(f"[benchmarks] {suite} 완료 ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+    for name, result in sorted(report["results"].items()):
+        print(f"{name:<28} median {result['median'] * 1000:10.3f} ms   (min {result['min'] * 1000:.3f}, "
+              f"max {result['max'] * 1000:.3f}, n={result['repeat']})")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{meta['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[benchmarks] 결과 저장: {output}", file=sys.stderr)
+    return output
+
+
+if __name__ == "__main__":
+    main()
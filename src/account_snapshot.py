@@ -0,0 +1,98 @@
+# src/account_snapshot.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from src.orders.account_models import BalanceInquiryResponse
+from src.orders.margin_models import MarginResponse
+from src import tracing
+
+
+_MISSING = object()
+
+
+class AccountSnapshot:
+    """
+    한 리밸런싱 주기 동안 사용하는 계좌 조회 결과.
+
+    잔고(v1_해외주식-006), 통화별 증거금(v1_해외주식-035), 현재가(v1_해외주식-009)를
+    처음 요청될 때 한 번만 조회하고, 주기가 끝날 때까지 모든 소비자에게 같은 값을 돌려준다.
+    잔고는 거래소별로 동시에 조회해 병합하고, 현재가도 여러 종목을 동시에 조회한다.
+    manager 는 get_merged_balance / get_foreign_margin / get_available_cash / _get_price
+    를 가진 객체 (Rebalancer).
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._balance = _MISSING
+        self._margin = _MISSING
+        self._prices: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> Optional[BalanceInquiryResponse]:
+        with self._lock:
+            if self._balance is _MISSING:
+                self._balance = self._manager.get_merged_balance()
+            return self._balance
+
+    @property
+    def margin(self) -> Optional[MarginResponse]:
+        with self._lock:
+            if self._margin is _MISSING:
+                self._margin = self._manager.get_foreign_margin()
+            return self._margin
+
+    def positions(self) -> Dict[str, int]:
+        """
+        {종목코드: 잔고수량} (수량 0 이하 제외)
+        """
+        balance = self.balance
+        if balance is None:
+            return {}
+        result = {}
+        for item in balance.output1:
+            qty = int(item.ovrs_cblc_qty)
+            if qty > 0:
+                result[item.ovrs_pdno] = qty
+        return result
+
+    def cash(self, currency: str = "USD") -> float:
+        """
+        통화별 외화일반주문가능금액 (증거금 응답 재사용).
+        증거금 조회가 실패했으면 이번 주기에는 다시 조회하지 않고 0.0
+        (margin=None 을 넘기면 get_available_cash 가 다시 조회한다).
+        """
+        margin = self.margin
+        if margin is None:
+            return 0.0
+        return self._manager.get_available_cash(currency, margin=margin)
+
+    def price(self, code: str) -> Optional[float]:
+        with self._lock:
+            if code in self._prices:
+                return self._prices[code]
+        price = self._manager._get_price(code)
+        with self._lock:
+            return self._prices.setdefault(code, price)
+
+    def seed_prices(self, prices: Dict[str, float]) -> None:
+        """
+        다른 경로(거래소 탐색 등)에서 이미 받은 현재가를 이번 주기 값으로 기록 (재조회 방지)
+        """
+        with self._lock:
+            for code, price in prices.items():
+                self._prices.setdefault(code, price)
+
+    def prices(self, codes: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        아직 조회하지 않은 종목만 동시에 조회 (동시 요청 수: manager.price_workers)
+        """
+        codes = list(dict.fromkeys(codes))
+        missing = [c for c in codes if c not in self._prices]
+        workers = min(len(missing), getattr(self._manager, "price_workers", 8))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(tracing.propagate(self.price), missing))
+        return {code: self.price(code) for code in codes}
@@ -0,0 +1,314 @@
+# src/allocation_library.py
+"""
+목표배분 파일 컴파일 / 캐시.
+
+target_allocation.yaml 한 개 또는 배분 파일(*.yaml, *.yml)이 든 디렉터리를 읽어
+    - 종목 키 해석: "NASD:AAPL" (거래소 지정), 종목코드, 회사명 → 종목 마스터로 종목코드 확정
+    - 비중 검증/정규화: 음수·비유한값 거부, 같은 종목으로 해석된 키는 합산,
+      normalize(기본 true) 면 전략별 합계를 1 로 맞추고 false 면 합계 ≤ 1 만 확인
+    - allocation 을 생략한 전략은 남은 배분(1 - 지정 합계)을 똑같이 나눠 가진다
+을 거쳐 CSR 행렬(전략 × 종목)로 컴파일한다.
+
+컴파일 결과는 파일 내용 해시 + 종목 마스터 버전을 키로 .npz 로 저장해 두고, 같은 입력이면
+YAML 파싱/해석 없이 바로 읽는다 (항목 수천 개 이상의 여러 북에서도 시작/재적재가 빠름).
+
+    python -m src.allocation_library config/allocations/    # 컴파일 후 요약 출력
+"""
+
+import argparse
+import glob
+import hashlib
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from src.exchange_index import PRICE_EXCHANGE_CODES
+from src.strategies import ROOT_DIR, TOLERANCE, Strategy
+from src.symbol_master import SymbolMaster, normalize_code
+
+
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "allocation_cache")
+COMPILER_VERSION = 2
+CACHE_KEEP = 8               # 남겨 둘 캐시 파일 수 (최근 사용 순)
+
+# 가능한 경우 C 구현 로더 사용 (큰 파일에서 수 배 빠름)
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompiledAllocation:
+    """
+    전략 S 개 × 종목 N 개 배분 (CSR). 행 s 의 비중은 data[indptr[s]:indptr[s+1]], 열은 indices.
+    """
+    names: List[str]
+    allocation: np.ndarray
+    codes: List[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    exchanges: Dict[str, str] = field(default_factory=dict)
+    unresolved: List[str] = field(default_factory=list)
+    key: str = ""
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def strategies(self) -> List[Strategy]:
+        out = []
+        for s, name in enumerate(self.names):
+            lo, hi = self.indptr[s], self.indptr[s + 1]
+            weights = {self.codes[j]: float(w) for j, w in zip(self.indices[lo:hi], self.data[lo:hi])}
+            out.append(Strategy(name, float(self.allocation[s]), weights))
+        return out
+
+    def weights(self) -> Dict[str, float]:
+        """
+        계좌 목표비중 (Σ 배분 × 비중, 종목별). 0 인 종목은 전량 매도 목표로 남긴다.
+        """
+        scaled = self.data * np.repeat(self.allocation, np.diff(self.indptr))
+        combined = np.bincount(self.indices, weights=scaled, minlength=len(self.codes))
+        return {code: float(w) for code, w in zip(self.codes, combined)}
+
+    # ─── 캐시 파일 ────────────────────────────────────────────────────────
+    def save(self, path: str):
+        ex_codes = sorted(self.exchanges)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            names=np.array(self.names, dtype=str),
+            allocation=self.allocation,
+            codes=np.array(self.codes, dtype=str),
+            indptr=self.indptr,
+            indices=self.indices,
+            data=self.data,
+            ex_codes=np.array(ex_codes, dtype=str),
+            ex_values=np.array([self.exchanges[c] for c in ex_codes], dtype=str),
+            unresolved=np.array(self.unresolved, dtype=str),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, key: str = "") -> "CompiledAllocation":
+        with np.load(path, allow_pickle=False) as z:
+            return cls(
+                names=z["names"].tolist(),
+                allocation=z["allocation"],
+                codes=z["codes"].tolist(),
+                indptr=z["indptr"],
+                indices=z["indices"],
+                data=z["data"],
+                exchanges=dict(zip(z["ex_codes"].tolist(), z["ex_values"].tolist())),
+                unresolved=z["unresolved"].tolist(),
+                key=key,
+            )
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 입력 파일 / 캐시 키
+# ─────────────────────────────────────────────────────────────────────────
+def allocation_files(path: str) -> List[str]:
+    """
+    파일이면 그 파일, 디렉터리면 안의 *.yaml / *.yml (이름순). 상대 경로는 프로젝트 루트 기준.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(ROOT_DIR, path)
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.yaml")) + glob.glob(os.path.join(path, "*.yml")))
+    return [path] if os.path.exists(path) else []
+
+
+def _read(files: Sequence[str]) -> Tuple[List[bytes], str]:
+    contents = []
+    digest = hashlib.sha1(f"v{COMPILER_VERSION}".encode())
+    for path in files:
+        with open(path, "rb") as f:
+            content = f.read()
+        contents.append(content)
+        digest.update(os.path.basename(path).encode() + b"\0" + hashlib.sha1(content).digest())
+    return contents, digest.hexdigest()
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 종목 해석 / 검증
+# ─────────────────────────────────────────────────────────────────────────
+class _Resolver:
+    def __init__(self, master: Optional[SymbolMaster]):
+        self.master = master
+        self.exchanges: Dict[str, str] = {}
+        self.unresolved: Dict[str, None] = {}
+        self._memo: Dict[str, str] = {}
+
+    def __call__(self, key, source: str) -> str:
+        key = str(key).strip()
+        code = self._memo.get(key)
+        if code is not None:
+            return code
+
+        exchange, _, symbol = key.rpartition(":")
+        if exchange:
+            exchange = exchange.strip().upper()
+            if exchange not in PRICE_EXCHANGE_CODES:
+                raise ValueError(f"{source}: 알 수 없는 거래소코드 {exchange!r} ({key})")
+        code = normalize_code(symbol)
+        if self.master is not None and code not in self.master:
+            record = self.master.by_name(symbol)
+            if record is not None:
+                code = record.code
+            else:
+                self.unresolved[code] = None
+        if exchange:
+            previous = self.exchanges.setdefault(code, exchange)
+            if previous != exchange:
+                raise ValueError(f"{source}: {code} 거래소가 {previous} / {exchange} 로 다르게 지정됨")
+        self._memo[key] = code
+        return code
+
+
+def _strategy_weights(name: str, raw: dict, resolve: _Resolver, normalize: bool, source: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for key, value in (raw or {}).items():
+        try:
+            w = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{source}: {name}.{key} 비중이 숫자가 아닙니다: {value!r}")
+        if not math.isfinite(w) or w < 0:
+            raise ValueError(f"{source}: {name}.{key} 비중은 0 이상의 유한값이어야 합니다: {value!r}")
+        code = resolve(key, source)
+        weights[code] = weights.get(code, 0.0) + w
+
+    total = sum(weights.values())
+    if normalize and total > 0:
+        weights = {c: w / total for c, w in weights.items()}
+    elif total > 1 + TOLERANCE:
+        raise ValueError(f"{source}: {name} 비중 합계가 1 을 넘습니다: {total:.4f} (normalize: false)")
+    return weights
+
+
+def _compile(files: Sequence[str], contents: Sequence[bytes], master: Optional[SymbolMaster],
+             normalize_default: bool) -> CompiledAllocation:
+    resolve = _Resolver(master)
+    entries: List[Tuple[str, Optional[float], Dict[str, float]]] = []
+    seen: Dict[str, str] = {}
+    for path, content in zip(files, contents):
+        source = os.path.basename(path)
+        raw = yaml.load(content, Loader=YamlLoader) or {}
+        if not isinstance(raw, dict):
+            raise ValueError(f"{source}: 최상위는 매핑이어야 합니다")
+        normalize = bool(raw.get("normalize", normalize_default))
+        for name, entry in (raw.get("strategies") or {}).items():
+            name = str(name)
+            if name in seen:
+                raise ValueError(f"전략 이름 중복: {name} ({seen[name]}, {source})")
+            seen[name] = source
+            entry = entry or {}
+            allocation = entry.get("allocation")
+            if allocation is not None:
+                allocation = float(allocation)
+                if not math.isfinite(allocation) or allocation < 0:
+                    raise ValueError(f"{source}: {name}.allocation 은 0 이상이어야 합니다: {allocation}")
+            weights = _strategy_weights(name, entry.get("weights"), resolve, normalize, source)
+            entries.append((name, allocation, weights))
+
+    fixed = sum(a for _, a, _ in entries if a is not None)
+    if fixed > 1 + TOLERANCE:
+        raise ValueError(f"전략 allocation 합계가 1 을 넘습니다: {fixed:.4f}")
+    free = [n for n, a, _ in entries if a is None]
+    share = max(1.0 - fixed, 0.0) / len(free) if free else 0.0
+
+    codes = list(dict.fromkeys(c for _, _, w in entries for c in w))
+    column = {c: j for j, c in enumerate(codes)}
+    indptr = np.zeros(len(entries) + 1, dtype=np.int64)
+    indices, data = [], []
+    for s, (_, _, weights) in enumerate(entries):
+        indices.extend(column[c] for c in weights)
+        data.extend(weights.values())
+        indptr[s + 1] = len(indices)
+
+    if resolve.unresolved:
+        logger.warning("[AllocationLibrary] 종목 마스터에 없는 종목 %d개 (그대로 사용): %s",
+                       len(resolve.unresolved), ", ".join(list(resolve.unresolved)[:10]))
+    return CompiledAllocation(
+        names=[n for n, _, _ in entries],
+        allocation=np.array([share if a is None else a for _, a, _ in entries], dtype=float),
+        codes=codes,
+        indptr=indptr,
+        indices=np.array(indices, dtype=np.int64),
+        data=np.array(data, dtype=float),
+        exchanges=resolve.exchanges,
+        unresolved=list(resolve.unresolved),
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) 진입점
+# ─────────────────────────────────────────────────────────────────────────
+def compile_allocation(
+    path: str,
+    master: Optional[SymbolMaster] = None,
+    cache_dir: Optional[str] = CACHE_DIR,
+    normalize: bool = True,
+) -> CompiledAllocation:
+    """
+    배분 파일/디렉터리를 컴파일한다. 같은 내용(+ 같은 종목 마스터 버전)이면 캐시를 읽는다.
+    master 가 None 이면 종목 해석 없이 키를 종목코드로 쓴다. cache_dir 이 None 이면 캐시 없음.
+    """
+    files = allocation_files(path)
+    if not files:
+        return _compile([], [], master, normalize)
+    contents, digest = _read(files)
+    key = hashlib.sha1(f"{digest}|{master.version if master is not None else None}|{normalize}".encode()).hexdigest()
+
+    cache_path = os.path.join(cache_dir, f"{key}.npz") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            compiled = CompiledAllocation.load(cache_path, key)
+            os.utime(cache_path)
+            return compiled
+        except Exception:
+            logger.warning("[AllocationLibrary] 캐시를 읽지 못해 다시 컴파일합니다: %s", cache_path)
+
+    compiled = _compile(files, contents, master, normalize)
+    compiled.key = key
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            compiled.save(cache_path)
+            _prune(cache_dir)
+        except OSError:
+            logger.warning("[AllocationLibrary] 캐시 저장 실패: %s", cache_path, exc_info=True)
+    logger.info("[AllocationLibrary] 컴파일: 파일 %d개, 전략 %d개, 종목 %d개, 항목 %d개",
+                len(files), len(compiled), len(compiled.codes), len(compiled.data))
+    return compiled
+
+
+def _prune(cache_dir: str, keep: int = CACHE_KEEP):
+    paths = sorted(glob.glob(os.path.join(cache_dir, "*.npz")), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    from src.logging_setup import setup_logging
+    from src.orders.base_manager import load_config
+    from src.symbol_master import get_symbol_master
+
+    parser = argparse.ArgumentParser(description="목표배분 파일 컴파일 (검증/정규화/종목 해석)")
+    parser.add_argument("path", help="배분 YAML 파일 또는 디렉터리")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    setup_logging(cfg.get("logging"))
+    compiled = compile_allocation(args.path, get_symbol_master(cfg.get("symbol_master")))
+    for strategy in compiled.strategies():
+        print(f"{strategy.name:<24} allocation {strategy.allocation:.4f}  종목 {len(strategy.weights)}")
+    print(f"계좌 목표 종목 {len(compiled.weights())}개, 미해석 {len(compiled.unresolved)}개, 캐시 키 {compiled.key[:12]}")
@@ -0,0 +1,166 @@
+# src/allocation_optimizer.py
+
+import heapq
+import math
+from typing import Sequence
+
+import numpy as np
+
+from src.rebalance_engine import RebalancePlan
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 정수 수량 최적화 (추적오차 최소화)
+#
+#   목적함수: Σ (보유수량_i × 현재가_i − 목표가치_i)²
+#   제약조건: 예수금 ≥ 0, 무거래 밴드, 최소 주문금액
+#
+#   1) 밴드 안의 종목은 현재 수량 고정, 나머지는 목표 수량의 내림값에서 시작
+#   2) 최소 주문금액 미만 주문 제거 → 현금 부족분 복구
+#   3) 남은 현금으로 오차 감소량이 가장 큰 종목부터 1주씩 추가 (greedy + heap)
+#   4) 다시 최소 주문금액/현금 제약 정리
+# ─────────────────────────────────────────────────────────────────────────
+def _remove_cost(price: float, value: float, target: float) -> float:
+    """1주 제거 시 제곱오차 증가량"""
+    return price * (price - 2.0 * (value - target))
+
+
+def _drop_small_trades(new_qty, qty, prices, min_order_notional):
+    if min_order_notional <= 0:
+        return new_qty
+    delta = new_qty - qty
+    small = (delta != 0) & (np.abs(delta) * prices < min_order_notional)
+    return np.where(small, qty, new_qty)
+
+
+def _repair_cash(new_qty, qty, prices, targets, cash_left, min_order_notional):
+    """
+    예수금이 음수이면 매수 종목에서 오차 증가가 가장 작은 순으로 1주씩 줄인다.
+    줄인 결과가 최소 주문금액 미만이면 해당 매수를 통째로 취소한다.
+    """
+    heap = [
+        (_remove_cost(prices[i], new_qty[i] * prices[i], targets[i]), i)
+        for i in np.flatnonzero(new_qty > qty)
+    ]
+    heapq.heapify(heap)
+    while cash_left < 0 and heap:
+        _, i = heapq.heappop(heap)
+        if new_qty[i] <= qty[i]:
+            continue
+        new_qty[i] -= 1
+        cash_left += prices[i]
+        buy_notional = (new_qty[i] - qty[i]) * prices[i]
+        if 0 < buy_notional < min_order_notional:
+            cash_left += buy_notional
+            new_qty[i] = qty[i]
+        if new_qty[i] > qty[i]:
+            heapq.heappush(heap, (_remove_cost(prices[i], new_qty[i] * prices[i], targets[i]), i))
+    return new_qty, cash_left
+
+
+def _fill_cash(new_qty, qty, prices, targets, active, cash_left, min_order_notional):
+    """
+    남은 예수금으로 오차 감소량이 가장 큰 종목에 주식을 추가한다.
+    현재 거래가 없는 종목은 최소 주문금액을 만족하는 수량 단위로 한 번에 추가한다.
+    """
+    def step_of(i):
+        if new_qty[i] == qty[i] and min_order_notional > 0:
+            return max(1, math.ceil(min_order_notional / prices[i]))
+        return 1
+
+    def gain_of(i, step):
+        value = new_qty[i] * prices[i]
+        return (targets[i] - value) ** 2 - (targets[i] - value - step * prices[i]) ** 2
+
+    heap = []
+    for i in np.flatnonzero(active):
+        step = step_of(i)
+        gain = gain_of(i, step)
+        if gain > 0:
+            heap.append((-gain, i, step))
+    heapq.heapify(heap)
+
+    while heap:
+        neg_gain, i, step = heapq.heappop(heap)
+        cost = step * prices[i]
+        if cost > cash_left:
+            # 현금은 줄어들기만 하므로 이후에도 살 수 없음
+            continue
+        current_step = step_of(i)
+        current_gain = gain_of(i, current_step)
+        if current_step != step or current_gain != -neg_gain:
+            if current_gain > 0:
+                heapq.heappush(heap, (-current_gain, i, current_step))
+            continue
+
+        new_qty[i] += step
+        cash_left -= cost
+        next_step = step_of(i)
+        next_gain = gain_of(i, next_step)
+        if next_gain > 0:
+            heapq.heappush(heap, (-next_gain, i, next_step))
+    return new_qty, cash_left
+
+
+def optimize_plan(
+    codes: Sequence[str],
+    prices: Sequence[float],
+    qty: Sequence[float],
+    weights: Sequence[float],
+    cash: float,
+    no_trade_band: float = 0.0,
+    min_order_notional: float = 0.0,
+    other_value: float = 0.0,
+) -> RebalancePlan:
+    """
+    목표 비중과의 추적오차를 최소화하는 정수 수량을 구해 RebalancePlan으로 반환한다.
+
+    no_trade_band      : |현재비중 − 목표비중| 이 이 값 이하인 종목은 거래하지 않음
+    min_order_notional : 이 금액 미만의 주문은 내지 않음
+    other_value        : codes 에 없는 보유 종목의 평가금액 (총 평가금액 기준에만 포함)
+    """
+    prices  = np.asarray(prices, dtype=float)
+    qty     = np.asarray(qty, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    cash    = float(cash)
+
+    valid = prices > 0
+    safe_prices = np.where(valid, prices, 1.0)
+
+    market_value = qty * prices
+    total_value = float(market_value.sum() + cash + other_value)
+    investable = total_value - float(other_value)     # 목표 종목 + 예수금
+    targets = total_value * weights
+    diffs = targets - market_value
+
+    current_weights = market_value / total_value if total_value > 0 else np.zeros_like(weights)
+    active = valid & (np.abs(current_weights - weights) > no_trade_band)
+
+    # 1) 시작점: 목표 수량의 내림값
+    new_qty = np.where(active, np.floor(targets / safe_prices), qty)
+
+    # 2) 최소 주문금액 / 현금 제약
+    new_qty = _drop_small_trades(new_qty, qty, prices, min_order_notional)
+    cash_left = investable - float((new_qty * prices).sum())
+    new_qty, cash_left = _repair_cash(new_qty, qty, prices, targets, cash_left, min_order_notional)
+
+    # 3) 남는 현금 배분
+    new_qty, cash_left = _fill_cash(new_qty, qty, prices, targets, active, cash_left, min_order_notional)
+
+    # 4) 마무리 정리
+    new_qty = _drop_small_trades(new_qty, qty, prices, min_order_notional)
+    cash_left = investable - float((new_qty * prices).sum())
+    new_qty, cash_left = _repair_cash(new_qty, qty, prices, targets, cash_left, min_order_notional)
+
+    return RebalancePlan(
+        codes=tuple(codes),
+        prices=prices,
+        current_qty=qty,
+        target_values=targets,
+        diffs=diffs,
+        sell_qty=np.maximum(qty - new_qty, 0).astype(np.int64),
+        buy_qty=np.maximum(new_qty - qty, 0).astype(np.int64),
+        cash_before=cash,
+        cash_after=float(cash_left),
+        total_value=total_value,
+    )
@@ -1,9 +1,13 @@
 import requests
 import logging
 import os
+import threading
+import time
 import yaml
 from dotenv import load_dotenv
 
+from src import profiling
+
 load_dotenv()  
 
 
@@ -12,6 +16,7 @@ class APIClient:
         self.api_key = api_key
         self.app_secret = app_secret
         self.token_url = token_url
+        self.expires_in = None  # 마지막 발급 토큰의 유효시간(초)
         self.logger = logging.getLogger(__name__)
     
     def get_oauth_token(self):
@@ -31,6 +36,7 @@ class APIClient:
             data = response.json()
             token = data.get("access_token")
             if token:
+                self.expires_in = data.get("expires_in")
                 self.logger.info("OAuth 토큰 발급 성공")
                 return token
             else:
@@ -40,6 +46,79 @@ class APIClient:
             self.logger.exception("토큰 발급 중 예외 발생")
             return None
 
+class TokenManager:
+    """
+    접근 토큰을 캐시하고 만료가 가까워졌을 때만 재발급한다.
+    (KIS 토큰 유효기간 24시간, 발급은 1분당 1회로 제한)
+    """
+
+    TOKEN_TTL = 86400       # 기본 유효시간(초)
+    REFRESH_MARGIN = 600    # 만료 10분 전부터 재발급
+
+    def __init__(self, client: APIClient, token: str = None):
+        """
+        client : 토큰 발급용 APIClient
+        token  : 이미 발급받은 토큰(.env 의 KIS_OAUTH_TOKEN 등).
+                 발급 시각을 알 수 없으므로 생성 시점부터 TOKEN_TTL 동안 유효하다고 간주하되,
+                 서버가 만료(EGW00123)로 거부하면 호출자가 invalidate(token) 후 재발급한다.
+        """
+        self.client = client
+        self._token = token
+        self._expires_at = time.monotonic() + self.TOKEN_TTL if token else 0.0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get_token(self):
+        """
+        유효한 토큰 반환. 없거나 만료 임박이면 새로 발급한다.
+        """
+        with self._lock:
+            if self._token and time.monotonic() < self._expires_at - self.REFRESH_MARGIN:
+                return self._token
+
+            with profiling.profile("token"):
+                token = self.client.get_oauth_token()
+            if not token:
+                # 발급 실패 시 아직 만료되지 않은 기존 토큰이 있으면 계속 사용
+                if self._token and time.monotonic() < self._expires_at:
+                    return self._token
+                return None
+
+            ttl = self.client.expires_in or self.TOKEN_TTL
+            self._token = token
+            self._expires_at = time.monotonic() + float(ttl)
+            return token
+
+    def invalidate(self, token: str = None):
+        """
+        다음 get_token() 호출에서 재발급하도록 캐시를 비운다.
+        token 을 주면 캐시된 토큰이 그 토큰일 때만 비운다
+        (다른 스레드가 이미 재발급했으면 새 토큰을 그대로 쓴다).
+        """
+        with self._lock:
+            if token is not None and token != self._token:
+                return
+            self._token = None
+            self._expires_at = 0.0
+
+
+_token_managers = {}
+_token_managers_lock = threading.Lock()
+
+
+def get_token_manager(api_key, app_secret, token_url, token=None) -> TokenManager:
+    """
+    appkey 별 공유 TokenManager 반환. 같은 appkey 를 쓰는 계좌들은 토큰 하나를 함께 쓴다.
+    """
+    with _token_managers_lock:
+        manager = _token_managers.get(api_key)
+        if manager is None:
+            client = APIClient(api_key, app_secret, token_url=token_url)
+            manager = TokenManager(client, token=token)
+            _token_managers[api_key] = manager
+        return manager
+
+
 def update_env_token(env_path: str, new_token: str) -> None:
     """
     .env 파일에서 KIS_OAUTH_TOKEN 항목을 찾아 new_token으로 갱신합니다.
@@ -92,7 +171,7 @@ if __name__ == "__main__":
         api_key    = os.getenv("KIS_API_KEY")
         app_secret = os.getenv("KIS_APP_SECRET")
     except Exception as e:
-        logger.exception(f"설정 로드 실패: {e}")
+        logger.exception("설정 로드 실패: %s", e)
         exit(1)
 
     # APIClient 인스턴스 생성
@@ -101,9 +180,9 @@ if __name__ == "__main__":
     logger.info("OAuth 토큰 발급 테스트 시작")
     token = client.get_oauth_token()
     if token:
-        logger.info(f"발급된 토큰: {token}")
+        logger.info("발급된 토큰: %s", token)
         update_env_token(ENV_PATH, token)
-        logger.info(f".env 파일에 KIS_OAUTH_TOKEN 갱신 완료: {ENV_PATH}")
+        logger.info(".env 파일에 KIS_OAUTH_TOKEN 갱신 완료: %s", ENV_PATH)
 
     else:
         logger.error("토큰 발급 실패")
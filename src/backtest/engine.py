@@ -0,0 +1,285 @@
+# src/backtest/engine.py
+"""
+벡터화 백테스트 엔진 (목표비중 리밸런싱).
+
+Rebalancer 와 같은 규칙을 과거 봉에 재생한다.
+    - 수량 산정: rebalance_engine.size_orders (정수 주, 목표가치 대비 차이, 매도 → 매수)
+    - 매도 대금(수수료·세금 차감)을 더한 예수금 안에서만 매수 (수수료 포함 가격으로 재배정)
+    - 현재가가 없는(NaN) 종목은 거래 제외, 평가는 마지막 가격 사용
+    - 리밸런싱 시점: 첫 봉 + rebalance_every 봉마다 + 드리프트 임계값 초과 시 (데몬 규칙)
+
+시간 축은 순차 루프, 파라미터 조합(K) 축은 (K, N) 배열 연산으로 한 번에 계산한다.
+processes > 1 이면 조합을 나눠 프로세스별로 실행한다.
+
+    python -m src.backtest.engine --start 20180101     # 계좌 목표비중(전략 합산) / daemon 임계값
+"""
+
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.rebalance_engine import fit_buys_to_cash, size_orders
+
+
+@dataclass
+class BacktestConfig:
+    initial_cash: float = 100000.0
+    fee_rate: float = 0.0025          # 매매 수수료율 (매수/매도 거래대금 대비)
+    sell_tax_rate: float = 0.0        # 매도 시 추가 비용률 (거래세·SEC fee 등)
+    periods_per_year: int = 252       # 연환산 기준 봉 수 (일봉 252)
+
+    @classmethod
+    def from_config(cls, backtest_cfg: Optional[dict]) -> "BacktestConfig":
+        backtest_cfg = backtest_cfg or {}
+        return cls(**{k: backtest_cfg[k] for k in cls.__dataclass_fields__ if k in backtest_cfg})
+
+
+@dataclass
+class BacktestResult:
+    """
+    조합 K 개의 결과. 모든 배열의 첫 축은 조합 인덱스.
+    """
+    final_value: np.ndarray
+    total_return: np.ndarray
+    cagr: np.ndarray
+    volatility: np.ndarray           # 연환산 변동성
+    sharpe: np.ndarray               # 무위험수익률 0 기준
+    max_drawdown: np.ndarray         # 양수 (0.25 = -25%)
+    turnover: np.ndarray             # 누적 거래대금
+    fees: np.ndarray                 # 누적 수수료 + 세금
+    rebalances: np.ndarray           # 리밸런싱 횟수
+    orders: np.ndarray               # 주문 수 (종목별 매도/매수 각 1건)
+    final_qty: np.ndarray            # (K, N) 최종 보유 수량
+    final_cash: np.ndarray
+    equity: Optional[np.ndarray] = None   # (T, K) 평가금액 곡선 (keep_equity=True)
+    ts: Optional[np.ndarray] = None
+    symbols: List[str] = field(default_factory=list)
+
+    SUMMARY_FIELDS = ("final_value", "total_return", "cagr", "volatility", "sharpe", "max_drawdown",
+                      "turnover", "fees", "rebalances", "orders")
+
+    def __len__(self) -> int:
+        return len(self.final_value)
+
+    def summary(self, i: int) -> Dict[str, float]:
+        return {name: getattr(self, name)[i].item() for name in self.SUMMARY_FIELDS}
+
+    def to_rows(self) -> List[Dict[str, float]]:
+        return [self.summary(i) for i in range(len(self))]
+
+    @classmethod
+    def concat(cls, parts: Sequence["BacktestResult"]) -> "BacktestResult":
+        first = parts[0]
+        merged = {}
+        for name in cls.__dataclass_fields__:
+            values = [getattr(p, name) for p in parts]
+            if name in ("ts", "symbols"):
+                merged[name] = getattr(first, name)
+            elif name == "equity":
+                merged[name] = None if first.equity is None else np.concatenate(values, axis=1)
+            else:
+                merged[name] = np.concatenate(values)
+        return cls(**merged)
+
+
+def _per_set(value, k: int, dtype=float) -> np.ndarray:
+    """
+    스칼라 또는 (K,) 파라미터 → (K,) 배열
+    """
+    arr = np.asarray(value, dtype=dtype)
+    return np.broadcast_to(arr, (k,)).copy() if arr.ndim == 0 else arr.reshape(k)
+
+
+def _forward_fill(prices: np.ndarray) -> np.ndarray:
+    """
+    종목별 마지막 유효 가격으로 NaN 채우기 (첫 가격 이전은 0).
+    """
+    valid = ~np.isnan(prices)
+    idx = np.where(valid, np.arange(len(prices))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = prices[idx, np.arange(prices.shape[1])]
+    return np.where(np.isnan(filled), 0.0, filled)
+
+
+def simulate(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    rebalance_every=0,
+    symbol_threshold=np.inf,
+    aggregate_threshold=np.inf,
+    config: Optional[BacktestConfig] = None,
+    keep_equity: bool = True,
+) -> BacktestResult:
+    """
+    prices  : (T, N) 종가 (없는 봉은 NaN)
+    weights : (K, N) 또는 (N,) 목표 비중
+    rebalance_every / symbol_threshold / aggregate_threshold : 스칼라 또는 (K,)
+        rebalance_every 0 이면 정기 리밸런싱 없음, 임계값 inf 이면 드리프트 조건 없음
+    """
+    cfg = config or BacktestConfig()
+    prices = np.asarray(prices, dtype=float)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    T, N = prices.shape
+    K = weights.shape[0]
+    every = _per_set(rebalance_every, K, dtype=np.int64)
+    sym_thr = _per_set(symbol_threshold, K)
+    agg_thr = _per_set(aggregate_threshold, K)
+    check_drift = bool(np.isfinite(sym_thr).any() or np.isfinite(agg_thr).any())
+
+    marks = _forward_fill(prices)                       # 평가 가격
+    trade = np.where(np.isnan(prices), 0.0, prices)     # 거래 가격 (0 = 거래 제외)
+    fee, sell_cost_rate = cfg.fee_rate, cfg.fee_rate + cfg.sell_tax_rate
+
+    qty = np.zeros((K, N))
+    cash = np.full(K, float(cfg.initial_cash))
+    last = np.full(K, -1, dtype=np.int64)
+    turnover = np.zeros(K)
+    fees = np.zeros(K)
+    rebalances = np.zeros(K, dtype=np.int64)
+    orders = np.zeros(K, dtype=np.int64)
+
+    equity = np.empty((T, K)) if keep_equity else None
+    prev = np.full(K, float(cfg.initial_cash))
+    peak = prev.copy()
+    max_dd = np.zeros(K)
+    ret_sum = np.zeros(K)
+    ret_sq = np.zeros(K)
+
+    for t in range(T):
+        p_mark, p_trade = marks[t], trade[t]
+        if not p_trade.any():
+            due = np.zeros(K, dtype=bool)
+        else:
+            due = (last < 0) | ((every > 0) & (t - last >= every))
+            if check_drift:
+                value = cash + qty @ p_mark
+                held = qty * p_mark / np.where(value > 0, value, 1.0)[:, None]
+                diff = np.abs(held - weights)
+                due |= (diff.max(axis=1) > sym_thr) | (0.5 * diff.sum(axis=1) > agg_thr)
+
+        idx = np.flatnonzero(due)
+        if idx.size:
+            q, c = qty[idx], cash[idx]
+            # 이번 봉에 가격이 없는 보유 종목도 직전 가격으로 총 평가금액에 포함 (Rebalancer 와 같은 기준)
+            other = (q * np.where(p_trade > 0, 0.0, p_mark)).sum(axis=1)
+            _, _, sell, buy, _, _ = size_orders(p_trade, q, weights[idx], c, other)
+            proceeds = sell @ p_trade
+            c = c + proceeds * (1.0 - sell_cost_rate)
+            # 매도 비용을 뺀 예수금 안에서 수수료 포함 가격으로 매수 수량을 다시 맞춘다
+            buy = fit_buys_to_cash(buy, p_trade * (1.0 + fee), c)
+            spent = buy @ p_trade
+            cash[idx] = c - spent * (1.0 + fee)
+            qty[idx] = q - sell + buy
+            turnover[idx] += proceeds + spent
+            fees[idx] += proceeds * sell_cost_rate + spent * fee
+            orders[idx] += np.count_nonzero(sell, axis=1) + np.count_nonzero(buy, axis=1)
+            rebalances[idx] += 1
+            last[idx] = t
+
+        value = cash + qty @ p_mark
+        if keep_equity:
+            equity[t] = value
+        r = value / np.where(prev > 0, prev, 1.0) - 1.0
+        ret_sum += r
+        ret_sq += r * r
+        np.maximum(peak, value, out=peak)
+        np.maximum(max_dd, 1.0 - value / np.where(peak > 0, peak, 1.0), out=max_dd)
+        prev = value
+
+    ppy = cfg.periods_per_year
+    mean = ret_sum / max(T, 1)
+    var = np.maximum(ret_sq / max(T, 1) - mean * mean, 0.0)
+    vol = np.sqrt(var * ppy)
+    years = max(T, 1) / ppy
+    growth = np.maximum(prev / cfg.initial_cash, 0.0)
+    return BacktestResult(
+        final_value=prev,
+        total_return=growth - 1.0,
+        cagr=growth ** (1.0 / years) - 1.0,
+        volatility=vol,
+        sharpe=np.where(vol > 0, mean * ppy / np.where(vol > 0, vol, 1.0), 0.0),
+        max_drawdown=max_dd,
+        turnover=turnover,
+        fees=fees,
+        rebalances=rebalances,
+        orders=orders,
+        final_qty=qty,
+        final_cash=cash,
+        equity=equity,
+    )
+
+
+def _simulate_chunk(args) -> BacktestResult:
+    prices, weights, every, sym_thr, agg_thr, config, keep_equity = args
+    return simulate(prices, weights, every, sym_thr, agg_thr, config, keep_equity)
+
+
+def run_backtest(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    rebalance_every=0,
+    symbol_threshold=np.inf,
+    aggregate_threshold=np.inf,
+    config: Optional[BacktestConfig] = None,
+    keep_equity: bool = True,
+    processes: int = 1,
+    ts: Optional[np.ndarray] = None,
+    symbols: Optional[Sequence[str]] = None,
+) -> BacktestResult:
+    """
+    simulate() 에 조합 분할 병렬 실행을 더한 진입점. processes > 1 이면 조합 축을 나눠 실행한다.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    K = weights.shape[0]
+    every = _per_set(rebalance_every, K, dtype=np.int64)
+    sym_thr = _per_set(symbol_threshold, K)
+    agg_thr = _per_set(aggregate_threshold, K)
+
+    processes = max(1, min(int(processes), K))
+    if processes == 1:
+        result = simulate(prices, weights, every, sym_thr, agg_thr, config, keep_equity)
+    else:
+        bounds = np.linspace(0, K, processes + 1).astype(int)
+        chunks = [
+            (prices, weights[a:b], every[a:b], sym_thr[a:b], agg_thr[a:b], config, keep_equity)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            result = BacktestResult.concat(list(pool.map(_simulate_chunk, chunks)))
+
+    result.ts = ts
+    result.symbols = list(symbols or [])
+    return result
+
+
+if __name__ == "__main__":
+    from src.marketdata import bar_store
+    from src.orders.base_manager import load_config
+    from src.strategies import target_weights
+
+    parser = argparse.ArgumentParser(description="목표비중 리밸런싱 백테스트 (저장된 일봉 사용)")
+    parser.add_argument("--start", help="시작일 YYYYMMDD")
+    parser.add_argument("--end", help="종료일 YYYYMMDD (미포함)")
+    parser.add_argument("--freq", default="1d")
+    parser.add_argument("--every", type=int, default=0, help="정기 리밸런싱 간격 (봉 수, 0: 없음)")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    weights_cfg = target_weights(cfg)
+    daemon_cfg = cfg.get("daemon", {}) or {}
+    symbols = list(weights_cfg)
+    panel = bar_store.from_config(cfg.get("marketdata")).panel(args.freq, symbols, args.start, args.end)
+    result = run_backtest(
+        panel["close"], [weights_cfg[s] for s in symbols],
+        rebalance_every=args.every,
+        symbol_threshold=daemon_cfg.get("symbol_drift_threshold", math.inf),
+        aggregate_threshold=daemon_cfg.get("aggregate_drift_threshold", math.inf),
+        config=BacktestConfig.from_config(cfg.get("backtest")),
+        ts=panel.ts, symbols=symbols,
+    )
+    for name, value in result.summary(0).items():
+        print(f"{name:<14} {value:,.4f}")
@@ -0,0 +1,276 @@
+# src/backtest/sweep.py
+"""
+파라미터 스윕 병렬 실행기.
+
+그리드(목표비중 세트 × 정기 리밸런싱 간격 × 드리프트 임계값)를 조합 단위 작업으로 펼치고,
+batch_size 개씩 묶어 프로세스 풀에서 engine.simulate 로 한 번에 계산한다.
+
+    - 가격 패널은 출력 디렉터리의 prices.npy 에 한 번 쓰고 워커는 mmap 으로 열어 공유한다
+      (작업마다 배열을 피클로 복사하지 않음, 페이지 캐시 공유)
+    - 끝난 배치의 결과는 results.jsonl 에 바로 덧붙인다 (한 줄 = 조합 하나)
+    - 다시 실행하면 results.jsonl 에 있는 조합(job id)은 건너뛴다 → 중단된 스윕 재개
+    - 작업 사이에 공유 상태가 없으므로 처리량은 코어 수에 거의 비례한다
+
+그리드 YAML:
+
+    symbols: [TQQQ, SGOV]            # 생략 시 weights 에 나온 종목 합집합
+    weights:
+      balanced:   {TQQQ: 0.5, SGOV: 0.5}
+      aggressive: {TQQQ: 0.7, SGOV: 0.3}
+    rebalance_every: [0, 5, 21]      # 봉 수 (0: 정기 리밸런싱 없음)
+    symbol_threshold: [0.05, .inf]
+    aggregate_threshold: [0.1, .inf]
+
+    python -m src.backtest.sweep grid.yaml --name tqqq_2018 --start 20180101
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.backtest.engine import BacktestConfig, simulate
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SWEEP_DIR = os.path.join(ROOT_DIR, "data", "sweeps")
+
+PRICES_FILE = "prices.npy"
+MANIFEST_FILE = "sweep.json"
+RESULTS_FILE = "results.jsonl"
+PARAM_KEYS = ("rebalance_every", "symbol_threshold", "aggregate_threshold")
+DEFAULTS = {"rebalance_every": [0], "symbol_threshold": [math.inf], "aggregate_threshold": [math.inf]}
+
+logger = logging.getLogger(__name__)
+
+
+def _json_value(value):
+    """
+    inf 는 JSON 표준이 아니므로 null 로 기록
+    """
+    return None if isinstance(value, float) and math.isinf(value) else value
+
+
+def job_id(weights_name: str, weights: Sequence[float], params: Dict) -> str:
+    key = json.dumps([weights_name, [round(float(w), 12) for w in weights],
+                      [params[k] for k in PARAM_KEYS]])
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def expand_grid(grid: Dict) -> Tuple[List[str], List[Dict]]:
+    """
+    그리드 → (종목 목록, 작업 목록). 작업: {job, weights, w, rebalance_every, symbol_threshold, aggregate_threshold}
+    """
+    weight_sets: Dict[str, Dict[str, float]] = grid["weights"]
+    symbols = list(grid.get("symbols") or dict.fromkeys(s for w in weight_sets.values() for s in w))
+    axes = [[int(v) if k == "rebalance_every" else float(v) for v in (grid.get(k) or DEFAULTS[k])]
+            for k in PARAM_KEYS]
+
+    jobs = []
+    for name, mapping in weight_sets.items():
+        unknown = set(mapping) - set(symbols)
+        if unknown:
+            raise ValueError(f"weights.{name} 에 symbols 에 없는 종목: {sorted(unknown)}")
+        w = [float(mapping.get(s, 0.0)) for s in symbols]
+        for values in itertools.product(*axes):
+            params = dict(zip(PARAM_KEYS, values))
+            jobs.append(dict(job=job_id(name, w, params), weights=name, w=w, **params))
+    return symbols, jobs
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 워커
+# ─────────────────────────────────────────────────────────────────────────
+_worker_prices: Optional[np.ndarray] = None
+_worker_config: Optional[BacktestConfig] = None
+
+
+def _init_worker(prices_path: str, config: BacktestConfig):
+    global _worker_prices, _worker_config
+    _worker_prices = np.load(prices_path, mmap_mode="r")
+    _worker_config = config
+
+
+def _run_batch(jobs: List[Dict]) -> List[Dict]:
+    result = simulate(
+        _worker_prices,
+        np.array([j["w"] for j in jobs]),
+        [j["rebalance_every"] for j in jobs],
+        [j["symbol_threshold"] for j in jobs],
+        [j["aggregate_threshold"] for j in jobs],
+        config=_worker_config,
+        keep_equity=False,
+    )
+    rows = []
+    for i, j in enumerate(jobs):
+        row = {"job": j["job"], "weights": j["weights"]}
+        row.update({k: _json_value(j[k]) for k in PARAM_KEYS})
+        row.update(result.summary(i))
+        rows.append(row)
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 실행기
+# ─────────────────────────────────────────────────────────────────────────
+class SweepRunner:
+    def __init__(self, out_dir: str, workers: int = 0, batch_size: int = 256,
+                 config: Optional[BacktestConfig] = None):
+        """
+        out_dir    : prices.npy / sweep.json / results.jsonl 을 두는 디렉터리 (스윕 하나당 하나)
+        workers    : 프로세스 수 (0 이하면 CPU 수, 1 이면 현재 프로세스에서 실행)
+        batch_size : 워커 한 번에 넘기는 최대 조합 수 (클수록 벡터화 이득, 작을수록 부하 분산)
+        """
+        self.out_dir = out_dir
+        self.workers = int(workers) if workers and workers > 0 else (os.cpu_count() or 1)
+        self.batch_size = max(1, int(batch_size))
+        self.config = config or BacktestConfig()
+        self.prices_path = os.path.join(out_dir, PRICES_FILE)
+        self.results_path = os.path.join(out_dir, RESULTS_FILE)
+
+    # ─── 입력 / 결과 파일 ──────────────────────────────────────────────────
+    def _prepare(self, prices: np.ndarray, symbols: Sequence[str]):
+        """
+        가격 패널을 prices.npy 로 고정한다. 재개 시에는 같은 패널인지 확인만 한다.
+        """
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        digest = hashlib.sha1(prices.tobytes()).hexdigest()
+        manifest_path = os.path.join(self.out_dir, MANIFEST_FILE)
+        manifest = {"symbols": list(symbols), "shape": list(prices.shape), "prices_sha1": digest,
+                    "config": vars(self.config)}
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        if os.path.exists(manifest_path) and os.path.exists(self.prices_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                previous = json.load(f)
+            if previous != manifest:
+                raise ValueError(f"{self.out_dir} 의 기존 스윕과 가격/설정이 다릅니다 (다른 디렉터리를 쓰세요)")
+            return
+
+        tmp = self.prices_path + ".tmp.npy"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float64, shape=prices.shape)
+        out[:] = prices
+        out.flush()
+        del out
+        os.replace(tmp, self.prices_path)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def completed(self) -> set:
+        """
+        results.jsonl 에 기록된 job id. 마지막 줄이 잘린 경우(중단) 그 줄은 지운다.
+        """
+        if not os.path.exists(self.results_path):
+            return set()
+        with open(self.results_path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        return {json.loads(line)["job"] for line in data[:end].splitlines() if line.strip()}
+
+    def results(self) -> List[Dict]:
+        if not os.path.exists(self.results_path):
+            return []
+        with open(self.results_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    # ─── 실행 ──────────────────────────────────────────────────────────────
+    def _batches(self, jobs: List[Dict]) -> Iterable[List[Dict]]:
+        # 시간 루프 비용은 배치마다 들므로 크게 묶되, 워커마다 최소 한 배치는 돌아가게 한다
+        size = max(1, min(self.batch_size, math.ceil(len(jobs) / self.workers)))
+        for i in range(0, len(jobs), size):
+            yield jobs[i:i + size]
+
+    def run(self, prices: np.ndarray, jobs: List[Dict], symbols: Sequence[str] = ()) -> int:
+        """
+        아직 결과가 없는 조합만 실행하고 새로 기록한 조합 수를 반환한다.
+        """
+        self._prepare(prices, symbols)
+        done = self.completed()
+        pending = [j for j in dict((j["job"], j) for j in jobs).values() if j["job"] not in done]
+        logger.info("[SweepRunner] 전체 %d / 완료 %d / 실행 %d 조합 (workers=%d)",
+                    len(jobs), len(done), len(pending), self.workers)
+        if not pending:
+            return 0
+
+        written = 0
+        with open(self.results_path, "a", encoding="utf-8") as out:
+            def write(rows: List[Dict]):
+                nonlocal written
+                out.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+                out.flush()
+                written += len(rows)
+
+            if self.workers == 1:
+                _init_worker(self.prices_path, self.config)
+                for batch in self._batches(pending):
+                    write(_run_batch(batch))
+                return written
+
+            # 큐에 워커 수의 몇 배만 올려 두고 끝나는 대로 채운다 (결과도 끝나는 대로 기록)
+            batches = iter(self._batches(pending))
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.prices_path, self.config)) as pool:
+                running = {pool.submit(_run_batch, b) for b in itertools.islice(batches, self.workers * 2)}
+                while running:
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(future.result())
+                    running |= {pool.submit(_run_batch, b) for b in itertools.islice(batches, len(finished))}
+                    logger.debug("[SweepRunner] %d / %d 조합 완료", written, len(pending))
+        return written
+
+
+def from_config(backtest_cfg: Optional[dict], out_dir: str) -> SweepRunner:
+    backtest_cfg = backtest_cfg or {}
+    sweep_cfg = backtest_cfg.get("sweep", {}) or {}
+    return SweepRunner(
+        out_dir,
+        workers=int(sweep_cfg.get("workers", 0)),
+        batch_size=int(sweep_cfg.get("batch_size", 256)),
+        config=BacktestConfig.from_config(backtest_cfg),
+    )
+
+
+if __name__ == "__main__":
+    import yaml
+
+    from src.logging_setup import setup_logging
+    from src.marketdata import bar_store
+    from src.orders.base_manager import load_config
+
+    parser = argparse.ArgumentParser(description="목표비중 리밸런싱 파라미터 스윕 (중단 후 같은 --name 으로 재개)")
+    parser.add_argument("grid", help="그리드 YAML 경로")
+    parser.add_argument("--name", required=True, help="스윕 이름 (backtest.sweep.output_dir 아래 디렉터리)")
+    parser.add_argument("--start", help="시작일 YYYYMMDD")
+    parser.add_argument("--end", help="종료일 YYYYMMDD (미포함)")
+    parser.add_argument("--freq", default="1d")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    setup_logging(cfg.get("logging"))
+    with open(args.grid, encoding="utf-8") as f:
+        symbols, jobs = expand_grid(yaml.safe_load(f))
+
+    backtest_cfg = cfg.get("backtest", {}) or {}
+    # 상대 경로는 실행 위치가 아니라 프로젝트 루트 기준
+    sweep_dir = (backtest_cfg.get("sweep", {}) or {}).get("output_dir") or SWEEP_DIR
+    if not os.path.isabs(sweep_dir):
+        sweep_dir = os.path.join(ROOT_DIR, sweep_dir)
+    out_dir = os.path.join(sweep_dir, args.name)
+    runner = from_config(backtest_cfg, out_dir)
+    if os.path.exists(runner.prices_path):
+        prices = np.load(runner.prices_path, mmap_mode="r")
+    else:
+        panel = bar_store.from_config(cfg.get("marketdata")).panel(args.freq, symbols, args.start, args.end)
+        prices = panel["close"]
+    written = runner.run(prices, jobs, symbols)
+    print(f"{written} 조합 기록 → {runner.results_path}")
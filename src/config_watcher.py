@@ -0,0 +1,185 @@
+# src/config_watcher.py
+"""
+config.yaml / 목표배분 파일 변경 감시 (재시작 없는 설정 반영).
+
+    watcher = ConfigWatcher(cfg=rebalancer.cfg)
+    watcher.subscribe(rebalancer.reconfigure, "strategy", "account", "exchange_routing")
+    ...
+    watcher.poll()      # 주기 사이에 호출: 바뀐 섹션 목록 반환
+
+poll() 은 interval_sec 마다 감시 파일의 (mtime, 크기) 만 stat 으로 비교하고, 바뀐 경우에만
+다시 읽는다. 새 설정은 validate_config 를 통과해야 교체되며(실패 시 기존 설정 유지),
+교체는 참조 하나를 바꾸는 것이라 호출 스레드의 주기 사이에 원자적으로 일어난다.
+구독자는 자신이 등록한 섹션이 바뀐 경우에만 한 번 호출된다. 배분 파일(strategy.allocation_file)이
+바뀌면 strategy 섹션이 바뀐 것으로 본다.
+
+토큰/연결/캐시는 그대로 두고 설정만 바꾸므로 재구성에 콜드 스타트 비용이 없다.
+trading/path/rate_limit 처럼 연결 자체에 묶인 섹션은 반영하지 않고 재시작이 필요하다고 경고한다.
+"""
+
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.allocation_library import allocation_files
+from src.orders.base_manager import CONFIG_PATH, load_config
+from src.strategies import ALLOCATION_PATH, ROOT_DIR, TOLERANCE, resolve_strategies, target_weights
+
+
+# 재시작해야 반영되는 섹션 (appkey 단위 연결/토큰, 로깅/메트릭 초기화에 묶임)
+RESTART_SECTIONS = frozenset({"trading", "path", "rate_limit", "logging", "metrics", "tracing"})
+
+Subscriber = Callable[[dict, Set[str]], None]
+
+
+def validate_config(cfg, master=None) -> Dict[str, float]:
+    """
+    교체 전 설정 검증. 목표비중(전략 합산 또는 strategy.weights)을 계산해 반환하고,
+    형식 오류/음수/합계 초과는 ValueError.
+    """
+    if not isinstance(cfg, dict):
+        raise ValueError("설정 최상위는 매핑이어야 합니다")
+    for section in ("account", "strategy", "daemon"):
+        if not isinstance(cfg.get(section) or {}, dict):
+            raise ValueError(f"{section} 섹션은 매핑이어야 합니다")
+
+    weights = target_weights(cfg, resolve_strategies(cfg, master))
+    for code, w in weights.items():
+        if not isinstance(w, (int, float)) or not math.isfinite(w) or w < 0:
+            raise ValueError(f"strategy.weights.{code} 는 0 이상의 숫자여야 합니다: {w!r}")
+    total = sum(weights.values())
+    if total > 1 + TOLERANCE:
+        raise ValueError(f"목표비중 합계가 1 을 넘습니다: {total:.4f}")
+
+    for key, value in (cfg.get("daemon") or {}).items():
+        if key.endswith(("_sec", "_threshold")) and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"daemon.{key} 는 숫자여야 합니다: {value!r}")
+    return weights
+
+
+class ConfigWatcher:
+    """
+    감시 파일 mtime 폴링 → 검증 → 교체 → 바뀐 섹션 구독자 통지.
+    """
+
+    def __init__(
+        self,
+        config_path: str = CONFIG_PATH,
+        cfg: Optional[dict] = None,
+        interval_sec: float = 5.0,
+        master=None,
+    ):
+        self.config_path = config_path
+        self.interval = float(interval_sec)
+        self.master = master
+        self._cfg = cfg if cfg is not None else load_config(config_path)
+        self._subscribers: List[Tuple[Subscriber, frozenset]] = []
+        self._stamp = self._take_stamp(self._cfg)      # 마지막으로 확인한 파일 상태
+        self._applied = self._stamp                     # 마지막으로 반영한 파일 상태
+        self._next_check = time.monotonic() + self.interval
+        self.reloads = 0
+        self.failures = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def cfg(self) -> dict:
+        return self._cfg
+
+    def subscribe(self, callback: Subscriber, *sections: str):
+        """
+        callback(새 설정, 바뀐 섹션 집합). sections 를 생략하면 모든 변경에 호출.
+        """
+        self._subscribers.append((callback, frozenset(sections)))
+
+    # ─── 감시 대상 ────────────────────────────────────────────────────────
+    def _allocation_path(self, cfg: dict) -> Optional[str]:
+        strategy_cfg = cfg.get("strategy", {}) or {}
+        if strategy_cfg.get("strategies"):
+            return None
+        return strategy_cfg.get("allocation_file", ALLOCATION_PATH)
+
+    def _take_stamp(self, cfg: dict) -> Tuple[tuple, tuple]:
+        """
+        (config.yaml 상태, 배분 파일 상태). 디렉터리면 디렉터리 자체(파일 추가/삭제)와 안의 파일들.
+        """
+        allocation = ()
+        path = self._allocation_path(cfg)
+        if path:
+            path = path if os.path.isabs(path) else os.path.join(ROOT_DIR, path)
+            paths = allocation_files(path)
+            if os.path.isdir(path):
+                paths = [path] + paths
+            allocation = tuple(_stat(p) for p in paths)
+        return _stat(self.config_path), allocation
+
+    # ─── 폴링 ─────────────────────────────────────────────────────────────
+    def poll(self, force: bool = False) -> Set[str]:
+        """
+        감시 파일이 바뀌었으면 다시 읽어 교체하고 바뀐 섹션 집합을 반환 (없으면 빈 집합).
+        interval_sec 이 지나지 않았으면 stat 도 하지 않는다.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return set()
+        self._next_check = now + self.interval
+
+        stamp = self._take_stamp(self._cfg)
+        if stamp == self._stamp:
+            return set()
+        return self.reload(stamp)
+
+    def reload(self, stamp: Optional[tuple] = None) -> Set[str]:
+        try:
+            cfg = load_config(self.config_path)
+            validate_config(cfg, self.master)
+        except Exception as e:
+            # 같은 파일 상태로 반복 실패하지 않도록 상태는 기록해 둔다 (다음 수정 때 재시도)
+            self._stamp = stamp if stamp is not None else self._take_stamp(self._cfg)
+            self.failures += 1
+            self.logger.error("[ConfigWatcher] 새 설정 검증 실패, 기존 설정 유지: %s", e)
+            return set()
+
+        old, new_stamp = self._cfg, self._take_stamp(cfg)
+        changed = {k for k in set(old) | set(cfg) if old.get(k) != cfg.get(k)}
+        if new_stamp[1] != self._applied[1]:
+            changed.add("strategy")
+        self._cfg, self._stamp, self._applied = cfg, new_stamp, new_stamp
+        if not changed:
+            return set()
+
+        self.reloads += 1
+        self.logger.info("[ConfigWatcher] 설정 변경 반영: %s", ", ".join(sorted(changed)))
+        restart = changed & RESTART_SECTIONS
+        if restart:
+            self.logger.warning("[ConfigWatcher] 재시작해야 반영되는 섹션: %s", ", ".join(sorted(restart)))
+        self._notify(cfg, changed)
+        return changed
+
+    def _notify(self, cfg: dict, changed: Set[str]):
+        for callback, sections in self._subscribers:
+            if sections and not (sections & changed):
+                continue
+            try:
+                callback(cfg, changed if not sections else set(sections & changed))
+            except Exception:
+                self.logger.exception("[ConfigWatcher] 설정 변경 처리 중 예외 발생: %r", callback)
+
+    @classmethod
+    def from_config(cls, cfg: dict, master=None, config_path: str = CONFIG_PATH) -> Optional["ConfigWatcher"]:
+        """
+        daemon.reload_interval_sec (기본 5, 0 이면 감시 안 함) 으로 생성.
+        """
+        interval = float((cfg.get("daemon", {}) or {}).get("reload_interval_sec", 5))
+        if interval <= 0:
+            return None
+        return cls(config_path, cfg=cfg, interval_sec=interval, master=master)
+
+
+def _stat(path: str) -> tuple:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, st.st_mtime_ns, st.st_size
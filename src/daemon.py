@@ -0,0 +1,275 @@
+# src/daemon.py
+
+import logging
+import signal
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.portfolio_state import PortfolioState
+from src.account_snapshot import AccountSnapshot
+from src.marketdata import bar_store
+from src.config_watcher import ConfigWatcher
+from src.indicators import IndicatorBank
+from src.marketdata.candles import CandleAggregator
+
+
+# 한 번에 대기하는 최대 시간 (장외 대기가 길거나 다음 개장을 못 찾아도 주기적으로 깨어 다시 계산)
+MAX_WAIT_SEC = 6 * 3600
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) DriftMonitor : PortfolioState 기반 드리프트 계산
+# ─────────────────────────────────────────────────────────────────────────
+class DriftMonitor:
+    """
+    PortfolioState 의 현재 비중과 목표 비중을 비교한다.
+    가격 갱신은 PortfolioState 가 O(1)로 처리하므로 drift() 는 배열 연산 한 번이다.
+    """
+
+    def __init__(self, weights: Dict[str, float], portfolio: Optional[PortfolioState] = None):
+        self.portfolio = portfolio if portfolio is not None else PortfolioState()
+        self._target_weights = dict(weights)
+        self._aligned_len = -1
+        self.targets = np.zeros(0)
+        self.is_target = np.zeros(0, dtype=bool)
+
+    @property
+    def seeded(self) -> bool:
+        return self.portfolio.last_sync is not None
+
+    @property
+    def codes(self):
+        return self.portfolio.codes
+
+    @property
+    def total_value(self) -> float:
+        return self.portfolio.total_value
+
+    def seed(self, holdings: Dict[str, dict], cash: float):
+        """
+        {종목코드: {"qty", "current_price"}} 형식의 보유 현황으로 상태를 초기화.
+        """
+        positions = {
+            code: (item.get("qty", 0), item.get("current_price", 0.0))
+            for code, item in holdings.items()
+        }
+        self.portfolio.seed(positions, cash, universe=self._target_weights.keys())
+
+    def set_weights(self, weights: Dict[str, float]):
+        """
+        목표 비중 교체 (설정 재적재). 새 목표 종목은 다음 재동기화 때 포트폴리오에 들어온다.
+        """
+        self._target_weights = dict(weights)
+        self._aligned_len = -1
+
+    def update_price(self, code: str, price: float):
+        """
+        보유/목표 종목의 가격 갱신 (O(1)). 처음 보는 종목은 무시.
+        """
+        if code in self.portfolio.index:
+            self.portfolio.apply_quote(code, price)
+
+    def _align(self):
+        # 종목이 추가된 경우에만 목표 비중 배열을 다시 만든다
+        codes = self.portfolio.codes
+        if len(codes) != self._aligned_len:
+            self.targets = np.array([self._target_weights.get(c, 0.0) for c in codes], dtype=float)
+            self.is_target = np.array([c in self._target_weights for c in codes], dtype=bool)
+            self._aligned_len = len(codes)
+
+    def drift(self):
+        """
+        반환: (목표 종목별 |현재비중 − 목표비중| 배열, 전체 드리프트 = ½ Σ|차이|)
+        """
+        self._align()
+        diff = np.abs(self.portfolio.weights() - self.targets)
+        return diff[self.is_target], 0.5 * float(diff.sum())
+
+    def breached(self, symbol_threshold: float, aggregate_threshold: float) -> bool:
+        per_symbol, aggregate = self.drift()
+        if per_symbol.size and float(per_symbol.max()) > symbol_threshold:
+            return True
+        return aggregate > aggregate_threshold
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) RebalanceDaemon : 드리프트 기반 연속 리밸런싱
+# ─────────────────────────────────────────────────────────────────────────
+class RebalanceDaemon:
+    """
+    Rebalancer 인스턴스(토큰, 연결, 현재가 캐시)를 유지한 채 주기적으로
+    현재가만 갱신하고, 드리프트가 임계값을 넘을 때만 리밸런싱한다.
+
+    config.yaml 의 daemon 섹션:
+        poll_interval_sec          : 현재가 갱신 주기
+        symbol_drift_threshold     : 종목별 비중 차이 임계값
+        aggregate_drift_threshold  : 전체 드리프트 임계값
+        cooldown_sec               : 리밸런싱 후 최소 대기 시간
+        resync_interval_sec        : 잔고/예수금 전체 재조회 주기
+        reload_interval_sec        : config.yaml / 배분 파일 변경 확인 주기 (watcher 를 넘긴 경우)
+    """
+
+    def __init__(self, rebalancer, daemon_cfg: Optional[dict] = None, watcher: Optional[ConfigWatcher] = None):
+        cfg = daemon_cfg if daemon_cfg is not None else rebalancer.cfg.get("daemon", {})
+        self.rebalancer = rebalancer
+        self.portfolio = rebalancer.portfolio
+        self._configure(cfg)
+
+        self.monitor = DriftMonitor(rebalancer.weights, self.portfolio)
+        self.last_rebalance = float("-inf")
+
+        # 현재가 폴링 결과로 실시간 캔들 기록 (config.yaml marketdata.candles)
+        md_cfg = rebalancer.cfg.get("marketdata", {}) or {}
+        candles_cfg = md_cfg.get("candles", {}) or {}
+        self.candles: Optional[CandleAggregator] = None
+        if candles_cfg.get("enabled"):
+            store = bar_store.from_config(md_cfg)
+            freq = candles_cfg.get("freq", "poll_1m")
+            bank = None
+            if candles_cfg.get("indicators"):
+                # 저장된 캔들로 지표 상태를 채운 뒤 새 봉마다 이어서 갱신
+                bank = IndicatorBank(candles_cfg["indicators"])
+                bank.warm_up(store, freq, list(rebalancer.weights))
+            self.candles = CandleAggregator(
+                store,
+                freq=freq,
+                interval_sec=candles_cfg.get("interval_sec", 60),
+                indicators=bank,
+            )
+
+        # config.yaml / 배분 파일 변경을 주기 사이에 반영 (Rebalancer 가 먼저 갱신된 뒤 데몬 상태를 맞춘다)
+        self.watcher = watcher
+        if watcher is not None:
+            watcher.subscribe(rebalancer.reconfigure, "strategy", "account", "exchange_routing", "market_hours")
+            watcher.subscribe(self._on_config_change, "strategy", "account", "market_hours", "daemon")
+
+        self._stop = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def _configure(self, cfg: dict):
+        self.poll_interval       = float(cfg.get("poll_interval_sec", 60))
+        self.symbol_threshold    = float(cfg.get("symbol_drift_threshold", 0.05))
+        self.aggregate_threshold = float(cfg.get("aggregate_drift_threshold", 0.10))
+        self.cooldown            = float(cfg.get("cooldown_sec", 3600))
+
+        # 리밸런싱 직전 잔고 조회 시 방금 갱신한 현재가를 재사용
+        self.rebalancer.price_cache_ttl = self.poll_interval
+
+        # 잔고/예수금 전체 재조회는 resync_interval 마다만 수행
+        self.portfolio.resync_interval = float(cfg.get("resync_interval_sec", 1800))
+
+    def _on_config_change(self, cfg: dict, sections):
+        if "daemon" in sections:
+            self._configure(cfg.get("daemon", {}) or {})
+        if "strategy" in sections:
+            self.monitor.set_weights(self.rebalancer.weights)
+
+    @property
+    def scheduler(self):
+        # Rebalancer 가 설정 변경/재동기화 때 대상 거래소에 맞춰 다시 만든다
+        return self.rebalancer.market_scheduler
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def _resync(self) -> bool:
+        """
+        잔고 + 현재가 + 예수금 전체 조회로 PortfolioState 재초기화.
+        """
+        self.rebalancer.token = self.rebalancer._get_token()
+        if not self.rebalancer._sync_portfolio():
+            self.logger.error("[RebalanceDaemon] 잔고 재동기화 실패")
+            return False
+        return True
+
+    def _refresh_prices(self):
+        self.rebalancer.token = self.rebalancer._get_token()
+        # 종목별 거래소로 라우팅된 현재가를 동시에 조회
+        prices = AccountSnapshot(self.rebalancer).prices(self.portfolio.codes)
+        for code, price in prices.items():
+            self.portfolio.apply_quote(code, price)
+        if self.candles is not None:
+            now = time.time()
+            for code, price in prices.items():
+                self.candles.on_tick(code, price, ts=now)
+            self.candles.flush(now)
+
+    def run_once(self) -> bool:
+        """
+        한 주기 실행. 리밸런싱을 수행했으면 True.
+        장외 시간에는 가격 갱신을 포함한 어떤 요청도 보내지 않는다.
+        """
+        if not self.scheduler.is_open():
+            return False
+
+        now = time.monotonic()
+        if self.portfolio.needs_resync(now):
+            if not self._resync():
+                return False
+        else:
+            self._refresh_prices()
+
+        per_symbol, aggregate = self.monitor.drift()
+        max_drift = float(per_symbol.max()) if per_symbol.size else 0.0
+        self.logger.info("[RebalanceDaemon] 드리프트: 종목 최대 %.4f, 전체 %.4f", max_drift, aggregate)
+
+        if not self.monitor.breached(self.symbol_threshold, self.aggregate_threshold):
+            return False
+        if now - self.last_rebalance < self.cooldown:
+            self.logger.info("[RebalanceDaemon] 임계값 초과했지만 쿨다운 중, 리밸런싱 보류")
+            return False
+
+        self.logger.info("[RebalanceDaemon] 드리프트 임계값 초과 → 리밸런싱 실행")
+        self.rebalancer.rebalance()
+        self.last_rebalance = time.monotonic()
+        # 주문 이후 실제 잔고로 다시 맞춘다
+        self.portfolio.mark_stale()
+        return True
+
+    def _next_wait(self) -> float:
+        """
+        장중이면 poll_interval, 장외면 다음 개장 시각까지 대기.
+        """
+        until_open = self.scheduler.seconds_until_open()
+        if until_open > 0:
+            self.logger.info("[RebalanceDaemon] 장외 시간, 개장까지 %.0f분 대기", until_open / 60)
+            # 개장 직후 첫 주기에서 잔고를 다시 맞춘다
+            self.portfolio.mark_stale()
+            return until_open
+        return self.poll_interval
+
+    def _wait(self, seconds: float):
+        """
+        다음 주기까지 대기 (최대 MAX_WAIT_SEC). 설정 감시 중이면 감시 주기마다 깨어 변경을 반영하고,
+        변경이 있으면 대기를 끝내 새 설정으로 바로 한 주기를 돈다.
+        """
+        seconds = min(seconds, MAX_WAIT_SEC)
+        if self.watcher is None:
+            self._stop.wait(seconds)
+            return
+        deadline = time.monotonic() + seconds
+        while not self._stop.wait(min(self.watcher.interval, max(deadline - time.monotonic(), 0.0))):
+            if self.watcher.poll() or time.monotonic() >= deadline:
+                return
+
+    def run(self):
+        """
+        SIGINT/SIGTERM 을 받을 때까지 반복 실행.
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        self.logger.info("[RebalanceDaemon] 데몬 시작")
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self.logger.exception("[RebalanceDaemon] 주기 실행 중 예외 발생")
+            self._wait(self._next_wait())
+        if self.candles is not None:
+            self.candles.flush(time.time())
+        self.logger.info("[RebalanceDaemon] 데몬 종료")
@@ -4,6 +4,7 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base, HoldList, OrderList, TradeHistory
+from src.symbol_master import get_symbol_master
 from dotenv import load_dotenv
 
 # .env 파일을 불러옵니다.
@@ -20,7 +21,10 @@ POSTGRES_PORT     = os.getenv("POSTGRES_PORT", "5432")
 default_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 DATABASE_URL = os.getenv("DATABASE_URL", default_url)
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL 로그 출력 여부 (DB_ECHO=0 이면 끔, 벤치마크/대량 처리 시 사용)
+DB_ECHO = os.getenv("DB_ECHO", "1").lower() not in ("0", "false", "no", "off")
+
+engine = create_engine(DATABASE_URL, echo=DB_ECHO)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -34,6 +38,19 @@ def init_db():
 # -----------------------------
 #  보유 생성/삭제, 매도 거래 기록 유틸리티
 # -----------------------------
+def find_order(session, odno, order_date=None):
+    """
+    KIS 주문번호(odno)로 OrderList 를 찾습니다. 주문번호는 매일 다시 매겨지므로
+    order_date(YYYYMMDD)가 있으면 그 날짜의 주문을, 없거나 맞는 주문이 없으면 가장 최근 주문을 반환합니다.
+    """
+    query = session.query(OrderList).filter(OrderList.odno == odno)
+    if order_date:
+        order = query.filter(OrderList.order_date == order_date).first()
+        if order:
+            return order
+    return query.order_by(OrderList.order_time.desc()).first()
+
+
 def create_hold_from_order(order):
     """
     OrderList 객체를 받아서 HoldList 레코드를 생성합니다.
@@ -65,7 +82,7 @@ def create_hold_from_order(order):
 def create_trade_from_hold_and_delete(hold, sell_price):
     """
     HoldList 객체를 받아서 TradeHistory 레코드를 생성하고,
-    동일 세션에서 해당 보유를 삭제합니다.
+    동일 세션에서 해당 보유를 삭제합니다. 회사명은 종목 마스터(메모리)에서 채웁니다.
     """
     session = SessionLocal()
     try:
@@ -73,7 +90,7 @@ def create_trade_from_hold_and_delete(hold, sell_price):
         profit = (sell_price - hold.avg_price) * hold.qty if hold.qty else 0
         new_trade = TradeHistory(
             code=hold.code,
-            회사명=None,
+            회사명=get_symbol_master().name(hold.code),
             avg_price=hold.avg_price,
             qty=hold.qty,
             sell_price=sell_price,
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -20,7 +20,11 @@ class HoldList(Base):
 
 class OrderList(Base):
     __tablename__ = 'order_list'
+    # order_id 는 내부 대리키(uuid). KIS 주문번호(odno)는 매일 다시 매겨지므로 (order_date, odno) 로 찾는다
+    __table_args__ = (Index('ix_order_list_date_odno', 'order_date', 'odno'),)
     order_id = Column(String, primary_key=True)
+    odno = Column(String, index=True)
+    order_date = Column(String)  # YYYYMMDD
     code = Column(String, nullable=False)
     name = Column(String)
     order_type = Column(String, nullable=False)
@@ -0,0 +1,230 @@
+# src/exchange_index.py
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from src import tracing
+
+
+# 주문/잔고용 거래소코드 → 시세(v1_해외주식-009) 거래소코드
+PRICE_EXCHANGE_CODES = {
+    "NASD": "NAS",
+    "NYSE": "NYS",
+    "AMEX": "AMS",
+    "TKSE": "TSE",
+    "SEHK": "HKS",
+    "SHAA": "SHS",
+    "SZAA": "SZS",
+    "HASE": "HNX",
+    "VNSE": "HSX",
+}
+
+# 같은 통화권에서 종목 거래소를 모를 때 시도할 후보
+SIBLING_EXCHANGES = {
+    "NASD": ("NASD", "NYSE", "AMEX"),
+    "NYSE": ("NYSE", "NASD", "AMEX"),
+    "AMEX": ("AMEX", "NASD", "NYSE"),
+    "SHAA": ("SHAA", "SZAA"),
+    "SZAA": ("SZAA", "SHAA"),
+    "HASE": ("HASE", "VNSE"),
+    "VNSE": ("VNSE", "HASE"),
+}
+
+ROOT_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(ROOT_DIR, "data", "exchange_index.json")
+
+
+def price_exchange_code(exchange: str) -> str:
+    return PRICE_EXCHANGE_CODES.get(exchange, exchange)
+
+
+class ExchangeIndex:
+    """
+    종목코드 → 거래소코드(NASD/NYSE/AMEX ...) 캐시 (잔고 응답/조회 결과).
+
+    캐시는 JSON 파일로 저장되어 재시작 후에도 유지되고, 같은 파일을 쓰는 모든 계좌가 공유한다.
+    수동 지정(exchange_routing.symbols, 배분 파일의 "거래소:종목")은 계좌별 ExchangeRoutes 뷰에만 둔다.
+    """
+
+    def __init__(self, cache_path: Optional[str] = CACHE_PATH):
+        self.cache_path = cache_path
+        self._index: Dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self._load()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except Exception:
+            self.logger.warning("[ExchangeIndex] 캐시 파일을 읽지 못해 무시합니다: %s", self.cache_path)
+            self._index = {}
+
+    def save(self):
+        """
+        변경 사항이 있을 때만 캐시 파일에 기록한다.
+        """
+        with self._lock:
+            if not self._dirty or not self.cache_path:
+                return
+            snapshot = dict(self._index)
+            self._dirty = False
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 여러 계좌 스레드가 동시에 저장해도 임시 파일이 겹치지 않도록 프로세스/스레드별 이름
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+
+    def get(self, symbol: str) -> Optional[str]:
+        return self._index.get(symbol)
+
+    def set(self, symbol: str, exchange: str):
+        if not symbol or not exchange:
+            return
+        with self._lock:
+            if self._index.get(symbol) != exchange:
+                self._index[symbol] = exchange
+                self._dirty = True
+
+    def update_from_balance(self, balance) -> None:
+        """
+        잔고 응답(output1.ovrs_excg_cd)으로 보유 종목의 거래소를 기록.
+        """
+        if balance is None:
+            return
+        for item in balance.output1:
+            self.set(item.ovrs_pdno, item.ovrs_excg_cd)
+
+    def resolve(
+        self,
+        symbol: str,
+        default: str,
+        probe: Callable[[str, str], Optional[float]],
+    ) -> Optional[str]:
+        """
+        캐시에 없는 종목은 default 와 같은 통화권 거래소들에 동시에 시세를 조회해
+        응답이 유효한 첫 거래소를 기록한다. probe(symbol, exchange) → 가격 또는 None.
+        """
+        known = self.get(symbol)
+        if known:
+            return known
+        return self.probe(symbol, default, probe)
+
+    def probe(
+        self,
+        symbol: str,
+        default: str,
+        probe: Callable[[str, str], Optional[float]],
+    ) -> Optional[str]:
+        """
+        default 와 같은 통화권 거래소들에 동시에 시세를 조회해 응답이 유효한 첫 거래소를 기록.
+        """
+        found = self.probe_many([symbol], default, probe)
+        return found[symbol][0] if symbol in found else None
+
+    def probe_many(
+        self,
+        symbols: Iterable[str],
+        default: str,
+        probe: Callable[[str, str], Optional[float]],
+        max_workers: int = 8,
+    ) -> Dict[str, Tuple[str, float]]:
+        """
+        여러 종목 × 같은 통화권 거래소 조합을 한 풀에서 동시에 조회해 종목별로 응답이 유효한
+        첫 거래소(후보 순서 기준)를 기록하고 {종목: (거래소, 가격)} 을 반환 (못 찾은 종목 제외).
+        """
+        candidates = SIBLING_EXCHANGES.get(default, (default,))
+        pairs = [(symbol, ex) for symbol in dict.fromkeys(symbols) for ex in candidates]
+        if not pairs:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(len(pairs), max_workers))) as pool:
+            results = list(pool.map(tracing.propagate(lambda pair: probe(*pair)), pairs))
+        found: Dict[str, Tuple[str, float]] = {}
+        for (symbol, exchange), price in zip(pairs, results):
+            if price is not None and symbol not in found:
+                found[symbol] = (exchange, price)
+                self.set(symbol, exchange)
+        return found
+
+    def group(self, symbols: Iterable[str], default: str) -> Dict[str, list]:
+        """
+        {거래소코드: [종목, ...]} 로 묶어 반환 (모르는 종목은 default).
+        """
+        groups: Dict[str, list] = {}
+        for symbol in symbols:
+            groups.setdefault(self.get(symbol) or default, []).append(symbol)
+        return groups
+
+
+class ExchangeRoutes:
+    """
+    공유 ExchangeIndex 캐시 위에 계좌별 수동 지정(exchange_routing.symbols, 배분 파일의 "거래소:종목")을
+    얹은 뷰. 지정은 이 뷰에서만 보이므로 멀티 계좌에서 다른 계좌의 지정과 섞이지 않고,
+    잔고/조회로 알게 된 거래소는 공유 캐시에 기록된다.
+    """
+
+    def __init__(self, index: ExchangeIndex, overrides: Optional[Dict[str, str]] = None):
+        self.index = index
+        self.overrides = dict(overrides or {})
+
+    def get(self, symbol: str) -> Optional[str]:
+        return self.overrides.get(symbol) or self.index.get(symbol)
+
+    def set(self, symbol: str, exchange: str):
+        self.index.set(symbol, exchange)
+
+    def save(self):
+        self.index.save()
+
+    def update_from_balance(self, balance) -> None:
+        self.index.update_from_balance(balance)
+
+    def resolve(
+        self,
+        symbol: str,
+        default: str,
+        probe: Callable[[str, str], Optional[float]],
+    ) -> Optional[str]:
+        return self.get(symbol) or self.index.probe(symbol, default, probe)
+
+    def probe_many(
+        self,
+        symbols: Iterable[str],
+        default: str,
+        probe: Callable[[str, str], Optional[float]],
+        max_workers: int = 8,
+    ) -> Dict[str, Tuple[str, float]]:
+        return self.index.probe_many(symbols, default, probe, max_workers)
+
+    group = ExchangeIndex.group
+
+
+_indexes: Dict[str, ExchangeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_exchange_index(routing_cfg: Optional[dict] = None) -> ExchangeIndex:
+    """
+    캐시 파일 경로별 공유 ExchangeIndex 반환 (멀티 계좌에서도 한 번만 로드).
+    routing_cfg 의 수동 지정(symbols)은 여기서 쓰지 않는다 — 호출자가 ExchangeRoutes 로 얹는다.
+    """
+    cache_path = (routing_cfg or {}).get("cache_path") or CACHE_PATH
+    if not os.path.isabs(cache_path):
+        cache_path = os.path.join(ROOT_DIR, cache_path)
+    with _indexes_lock:
+        index = _indexes.get(cache_path)
+        if index is None:
+            index = ExchangeIndex(cache_path)
+            _indexes[cache_path] = index
+        return index
@@ -0,0 +1,601 @@
+# src/indicators.py
+"""
+기술적 지표 (SMA, EMA, RSI, ATR, 변동성) — 배치/스트리밍 겸용.
+
+지표마다 종목 축(N)으로 펼친 작은 상태 배열을 두고, 새 봉 하나가 들어오면 O(1) 로 갱신한다.
+    - 스트리밍: update(idx, *값) — 실시간 봉/틱이 닫힐 때마다 해당 종목 열만 갱신
+    - 배치:     run(*(T, N) 배열) — 봉 축 전체를 한 번에 계산하는 벡터 커널
+                (SMA/변동성: 누적합 창, EMA/RSI/ATR: 선형 재귀식의 블록 닫힌 식)
+
+배치 커널은 계산이 끝난 뒤 스트리밍과 같은 상태를 채워 두므로 이어서 update 할 수 있다.
+연산 순서가 달라 두 모드의 결과는 부동소수 오차만큼 다를 수 있다 (테스트: 상대 1e-10).
+이미 상태가 있는 열(스트리밍 도중 이어서 배치 계산)은 봉 단위 update 로 계산한다.
+스트리밍 이동합은 더하고 빼는 방식이라 오차가 쌓일 수 있어, 링 버퍼가 한 바퀴 돌 때마다
+버퍼에서 다시 합산한다 (분할 상환 O(1)).
+
+EMA/RSI/ATR 는 첫 n 개의 단순 평균으로 시작하고(Wilder), 이후 재귀식으로 갱신한다.
+변동성은 최근 n 개 단순 수익률의 표본 표준편차 (연환산 없음).
+NaN 봉(배치 입력)은 그 종목에 봉이 없는 것으로 보고 건너뛴다.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+SPEC_RE = re.compile(r"^\s*([a-z_]+)\s*\(\s*(\d+)\s*\)\s*$")
+
+
+def _window_sums(x: np.ndarray, n: int, chunk: int = 256) -> np.ndarray:
+    """
+    (T, N) 의 길이 n 이동합 (T - n + 1 행). 누적합의 상쇄 오차가 봉 수만큼 커지지 않도록
+    chunk 행마다 그 구간 첫 값을 빼고 새로 누적한다.
+    """
+    rows = len(x) - n + 1
+    out = np.empty((rows,) + x.shape[1:])
+    for start in range(0, rows, chunk):
+        stop = min(start + chunk, rows)
+        seg = x[start:stop + n - 1]
+        ref = seg[0]
+        csum = np.cumsum(seg - ref, axis=0)
+        window = csum[n - 1:].copy()
+        window[1:] -= csum[:-n]
+        out[start:stop] = window + n * ref
+    return out
+
+
+def _linear_filter(x: np.ndarray, decay: float, gain: float, y0: np.ndarray) -> np.ndarray:
+    """
+    y[t] = decay * y[t-1] + gain * x[t] (y[-1] = y0) 를 (T, N) 열마다 계산.
+    y[t] = d^t (y0 + gain * Σ x[j] d^-j) 닫힌 식을 d^-t 가 e^50 을 넘지 않는 블록 단위로 적용한다.
+    """
+    if decay == 0:
+        return gain * x
+    y = np.empty_like(x)
+    block = max(1, int(50.0 / -np.log(decay)))
+    prev = np.asarray(y0, dtype=float)
+    for start in range(0, len(x), block):
+        seg = x[start:start + block]
+        powers = decay ** np.arange(1, len(seg) + 1, dtype=float)[:, None]
+        y[start:start + len(seg)] = powers * (prev + gain * np.cumsum(seg / powers, axis=0))
+        prev = y[start + len(seg) - 1]
+    return y
+
+
+class StreamingIndicator:
+    """
+    지표 공통 틀. 하위 클래스는 _init_state / _step / _value 를 구현한다.
+    """
+
+    name = ""
+    inputs: Tuple[str, ...] = ("close",)
+
+    def __init__(self, n: int, size: int = 0):
+        if int(n) < 1:
+            raise ValueError(f"{self.name} 기간은 1 이상이어야 합니다: {n}")
+        self.n = int(n)
+        self.size = 0
+        self._state: Dict[str, tuple] = {}
+        self._init_state()
+        self.resize(size)
+
+    # ─── 상태 배열 ────────────────────────────────────────────────────────
+    def _add(self, name: str, fill, dtype=float, rows: Optional[int] = None):
+        self._state[name] = (fill, dtype, rows)
+        shape = (0,) if rows is None else (rows, 0)
+        setattr(self, name, np.full(shape, fill, dtype=dtype))
+
+    def resize(self, size: int):
+        """
+        종목 열 수를 size 로 늘린다 (기존 상태 유지).
+        """
+        if size <= self.size:
+            return
+        for name, (fill, dtype, rows) in self._state.items():
+            old = getattr(self, name)
+            shape = (size,) if rows is None else (rows, size)
+            new = np.full(shape, fill, dtype=dtype)
+            new[..., :self.size] = old
+            setattr(self, name, new)
+        self.size = size
+
+    @staticmethod
+    def _resum(buf: np.ndarray) -> np.ndarray:
+        # 행 순서대로 더한다 (배열 모양에 따라 합산 방식이 바뀌지 않도록)
+        total = buf[0].copy()
+        for row in buf[1:]:
+            total += row
+        return total
+
+    # ─── 갱신 ─────────────────────────────────────────────────────────────
+    def _init_state(self):
+        raise NotImplementedError
+
+    def _step(self, idx: np.ndarray, *values: np.ndarray):
+        raise NotImplementedError
+
+    def _value(self, idx: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _fresh(self, cols: np.ndarray) -> np.ndarray:
+        """
+        아직 봉을 하나도 받지 않은 열 (배치 커널 대상). 커널이 없는 지표는 모두 False.
+        """
+        return np.zeros(len(cols), dtype=bool)
+
+    def _batch(self, cols: np.ndarray, *values: np.ndarray) -> np.ndarray:
+        """
+        빈 상태의 cols 열에 (T, len(cols)) 봉 전체를 한 번에 반영하고 봉별 값을 반환.
+        """
+        raise NotImplementedError
+
+    def update(self, idx, *values) -> np.ndarray:
+        """
+        idx 열(중복 없는 종목 인덱스)에 새 봉 하나씩 반영하고 그 열의 현재 값을 반환.
+        values 는 inputs 순서의 (len(idx),) 배열 또는 스칼라.
+        """
+        idx = np.atleast_1d(np.asarray(idx, dtype=np.intp))
+        values = [np.broadcast_to(np.asarray(v, dtype=float), idx.shape) for v in values]
+        self._step(idx, *values)
+        return self._value(idx)
+
+    def value(self, idx=None) -> np.ndarray:
+        """
+        현재 값 (워밍업 중인 열은 NaN)
+        """
+        idx = np.arange(self.size) if idx is None else np.atleast_1d(np.asarray(idx, dtype=np.intp))
+        return self._value(idx)
+
+    def run(self, *series, cols: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        배치 계산: (T, N) 또는 (T,) 입력을 봉 순서대로 update 해 같은 모양의 결과를 반환.
+        cols 를 주면 입력 열 j 를 상태 열 cols[j] 로 이어서 계산한다 (워밍업 후 스트리밍 계속).
+        """
+        arrays = [np.asarray(s, dtype=float) for s in series]
+        one_d = arrays[0].ndim == 1
+        if one_d:
+            arrays = [a[:, None] for a in arrays]
+        T, N = arrays[0].shape
+        cols = np.arange(N) if cols is None else np.asarray(cols, dtype=np.intp)
+        if len(cols):
+            self.resize(int(cols.max()) + 1)
+
+        out = np.full((T, N), np.nan)
+        valid = ~np.isnan(arrays[0])
+        for a in arrays[1:]:
+            valid &= ~np.isnan(a)
+
+        # 빈 열: 벡터 커널. NaN 이 없는 열은 함께, NaN 이 있는 열은 유효 봉만 모아 열마다 계산
+        fresh = self._fresh(cols)
+        complete = fresh & valid.all(axis=0)
+        groups = [(np.arange(T), np.flatnonzero(complete))] if complete.any() else []
+        groups += [(np.flatnonzero(valid[:, j]), np.array([j])) for j in np.flatnonzero(fresh & ~complete)]
+        for rows, js in groups:
+            if rows.size:
+                block = np.ix_(rows, js)
+                out[block] = self._batch(cols[js], *(a[block] for a in arrays))
+
+        # 이미 상태가 있는 열: 봉 순서대로 update
+        rest = np.flatnonzero(~fresh)
+        if rest.size:
+            cols_r, valid_r = cols[rest], valid[:, rest]
+            for t in range(T):
+                v = valid_r[t]
+                if v.all():
+                    out[t, rest] = self.update(cols_r, *(a[t, rest] for a in arrays))
+                elif v.any():
+                    out[t, rest[v]] = self.update(cols_r[v], *(a[t, rest[v]] for a in arrays))
+        return out[:, 0] if one_d else out
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 지표
+# ─────────────────────────────────────────────────────────────────────────
+class SMA(StreamingIndicator):
+    name = "sma"
+
+    def _init_state(self):
+        self._add("buf", 0.0, rows=self.n)
+        self._add("total", 0.0)
+        self._add("count", 0, dtype=np.int64)
+        self._add("pos", 0, dtype=np.int64)
+
+    def _step(self, idx, x):
+        pos = self.pos[idx]
+        self.total[idx] = self.total[idx] + (x - self.buf[pos, idx])
+        self.buf[pos, idx] = x
+        pos = (pos + 1) % self.n
+        self.pos[idx] = pos
+        self.count[idx] += 1
+        wrapped = idx[pos == 0]
+        if wrapped.size:
+            self.total[wrapped] = self._resum(self.buf[:, wrapped])
+
+    def _value(self, idx):
+        return np.where(self.count[idx] >= self.n, self.total[idx] / self.n, np.nan)
+
+    def _fresh(self, cols):
+        return self.count[cols] == 0
+
+    def _batch(self, cols, x):
+        m, n = len(x), self.n
+        out = np.full(x.shape, np.nan)
+        if m >= n:
+            out[n - 1:] = _window_sums(x, n) / n
+        # 스트리밍 상태: 마지막 n 개를 링 버퍼 위치(봉 번호 % n)에
+        k = min(m, n)
+        self.buf[(np.arange(m - k, m) % n)[:, None], cols] = x[m - k:]
+        self.pos[cols] = m % n
+        self.count[cols] = m
+        self.total[cols] = self._resum(self.buf[:, cols])
+        return out
+
+
+class EMA(StreamingIndicator):
+    name = "ema"
+
+    def _init_state(self):
+        self.alpha = 2.0 / (self.n + 1)
+        self._add("ema", np.nan)
+        self._add("seed", 0.0)
+        self._add("count", 0, dtype=np.int64)
+
+    def _step(self, idx, x):
+        warming = self.count[idx] < self.n
+        if warming.any():
+            iw = idx[warming]
+            self.seed[iw] += x[warming]
+            self.count[iw] += 1
+            done = iw[self.count[iw] == self.n]
+            self.ema[done] = self.seed[done] / self.n
+        if not warming.all():
+            ia, xa = idx[~warming], x[~warming]
+            self.ema[ia] = self.ema[ia] + self.alpha * (xa - self.ema[ia])
+
+    def _value(self, idx):
+        return self.ema[idx].copy()
+
+    def _fresh(self, cols):
+        return self.count[cols] == 0
+
+    def _batch(self, cols, x):
+        m, n = len(x), self.n
+        k = min(m, n)
+        self.seed[cols] = self._resum(x[:k])
+        self.count[cols] = k
+        out = np.full(x.shape, np.nan)
+        if m >= n:
+            start = self.seed[cols] / n
+            out[n - 1] = start
+            out[n:] = _linear_filter(x[n:], 1.0 - self.alpha, self.alpha, start)
+            self.ema[cols] = out[-1]
+        return out
+
+
+class _Wilder(StreamingIndicator):
+    """
+    첫 n 개 단순 평균 후 avg = (avg * (n - 1) + x) / n 으로 평활 (RSI/ATR 공통)
+    """
+
+    def _seed_or_smooth(self, idx, names: Sequence[str], samples: Sequence[np.ndarray]):
+        m = self.samples[idx]
+        warming = m < self.n
+        if warming.any():
+            iw = idx[warming]
+            for name, x in zip(names, samples):
+                seed = getattr(self, "seed_" + name)
+                seed[iw] += x[warming]
+            self.samples[iw] += 1
+            done = iw[self.samples[iw] == self.n]
+            for name in names:
+                getattr(self, "avg_" + name)[done] = getattr(self, "seed_" + name)[done] / self.n
+        if not warming.all():
+            ia = idx[~warming]
+            for name, x in zip(names, samples):
+                avg = getattr(self, "avg_" + name)
+                avg[ia] = (avg[ia] * (self.n - 1) + x[~warming]) / self.n
+
+    def _fresh(self, cols):
+        return np.isnan(self.prev[cols])
+
+    def _seed_or_smooth_batch(self, cols, names: Sequence[str], samples: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """
+        _seed_or_smooth 의 배치판: (M, len(cols)) 표본 전체 → 표본별 평균 (워밍업 중 NaN)
+        """
+        m, n = len(samples[0]), self.n
+        k = min(m, n)
+        self.samples[cols] = k
+        result = []
+        for name, x in zip(names, samples):
+            seed = self._resum(x[:k]) if k else np.zeros(len(cols))
+            getattr(self, "seed_" + name)[cols] = seed
+            avg = np.full(x.shape, np.nan)
+            if m >= n:
+                avg[n - 1] = seed / n
+                avg[n:] = _linear_filter(x[n:], (n - 1) / n, 1.0 / n, seed / n)
+                getattr(self, "avg_" + name)[cols] = avg[-1]
+            result.append(avg)
+        return result
+
+
+class RSI(_Wilder):
+    name = "rsi"
+
+    def _init_state(self):
+        self._add("prev", np.nan)
+        self._add("samples", 0, dtype=np.int64)   # 가격 변화 개수
+        for name in ("gain", "loss"):
+            self._add("seed_" + name, 0.0)
+            self._add("avg_" + name, np.nan)
+
+    def _step(self, idx, x):
+        prev = self.prev[idx]
+        self.prev[idx] = x
+        has_prev = ~np.isnan(prev)
+        if not has_prev.all():
+            idx, x, prev = idx[has_prev], x[has_prev], prev[has_prev]
+        if idx.size:
+            change = x - prev
+            self._seed_or_smooth(idx, ("gain", "loss"), (np.maximum(change, 0.0), np.maximum(-change, 0.0)))
+
+    @staticmethod
+    def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), rsi)
+
+    def _value(self, idx):
+        rsi = self._rsi(self.avg_gain[idx], self.avg_loss[idx])
+        return np.where(self.samples[idx] >= self.n, rsi, np.nan)
+
+    def _batch(self, cols, x):
+        self.prev[cols] = x[-1]
+        change = np.diff(x, axis=0)
+        gain, loss = self._seed_or_smooth_batch(
+            cols, ("gain", "loss"), (np.maximum(change, 0.0), np.maximum(-change, 0.0))
+        )
+        out = np.full(x.shape, np.nan)
+        out[1:] = np.where(np.isnan(gain), np.nan, self._rsi(gain, loss))
+        return out
+
+
+class ATR(_Wilder):
+    name = "atr"
+    inputs = ("high", "low", "close")
+
+    def _init_state(self):
+        self._add("prev", np.nan)
+        self._add("samples", 0, dtype=np.int64)
+        self._add("seed_tr", 0.0)
+        self._add("avg_tr", np.nan)
+
+    def _step(self, idx, high, low, close):
+        prev = self.prev[idx]
+        self.prev[idx] = close
+        # 첫 봉은 전일 종가가 없어 고가 - 저가
+        tr = np.where(
+            np.isnan(prev),
+            high - low,
+            np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev))),
+        )
+        self._seed_or_smooth(idx, ("tr",), (tr,))
+
+    def _value(self, idx):
+        return np.where(self.samples[idx] >= self.n, self.avg_tr[idx], np.nan)
+
+    def _batch(self, cols, high, low, close):
+        self.prev[cols] = close[-1]
+        tr = high - low
+        prev = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+        return self._seed_or_smooth_batch(cols, ("tr",), (tr,))[0]
+
+
+class Volatility(StreamingIndicator):
+    name = "volatility"
+
+    def __init__(self, n: int, size: int = 0):
+        if int(n) < 2:
+            raise ValueError(f"volatility 기간은 2 이상이어야 합니다: {n}")
+        super().__init__(n, size)
+
+    def _init_state(self):
+        self._add("prev", np.nan)
+        self._add("buf", 0.0, rows=self.n)
+        self._add("pos", 0, dtype=np.int64)
+        self._add("samples", 0, dtype=np.int64)   # 수익률 개수
+        self._add("mean", 0.0)
+        self._add("m2", 0.0)
+
+    def _step(self, idx, x):
+        prev = self.prev[idx]
+        self.prev[idx] = x
+        has_prev = ~np.isnan(prev)
+        if not has_prev.all():
+            idx, x, prev = idx[has_prev], x[has_prev], prev[has_prev]
+        if not idx.size:
+            return
+        r = x / prev - 1.0
+        pos = self.pos[idx]
+        m = self.samples[idx]
+        mean, m2 = self.mean[idx], self.m2[idx]
+
+        # 창이 차기 전: Welford 누적 / 찬 뒤: 가장 오래된 값을 빼는 이동 Welford
+        growing = m < self.n
+        old = self.buf[pos, idx]
+        count = np.where(growing, m + 1, self.n)
+        delta_in = r - np.where(growing, mean, old)
+        new_mean = np.where(growing, mean + delta_in / count, mean + (r - old) / self.n)
+        m2 = np.where(growing, m2 + delta_in * (r - new_mean), m2 + (r - old) * (r - new_mean + old - mean))
+
+        self.mean[idx], self.m2[idx] = new_mean, m2
+        self.samples[idx] = count
+        self.buf[pos, idx] = r
+        pos = (pos + 1) % self.n
+        self.pos[idx] = pos
+        wrapped = idx[pos == 0]
+        if wrapped.size:
+            window = self.buf[:, wrapped]
+            mean = self._resum(window) / self.n
+            self.mean[wrapped] = mean
+            self.m2[wrapped] = self._resum((window - mean) ** 2)
+
+    def _value(self, idx):
+        var = np.maximum(self.m2[idx], 0.0) / (self.n - 1)
+        return np.where(self.samples[idx] >= self.n, np.sqrt(var), np.nan)
+
+    def _fresh(self, cols):
+        return np.isnan(self.prev[cols])
+
+    def _batch(self, cols, x):
+        n = self.n
+        self.prev[cols] = x[-1]
+        r = x[1:] / x[:-1] - 1.0
+        m = len(r)
+        out = np.full(x.shape, np.nan)
+        if m >= n:
+            # 창 합/제곱합 (전체 평균을 빼서 상쇄 오차를 줄인다, 분산은 이동에 불변)
+            d = r - r.mean(axis=0)
+            w1, w2 = _window_sums(d, n), _window_sums(d * d, n)
+            m2 = w2 - w1 * w1 / n
+            # 누적합 오차(≈ eps × 구간 길이 × 최대 제곱)에 비해 창 분산이 작으면 자릿수를 잃으므로
+            # 그 창만 두 번 훑어 다시 계산
+            rows, js = np.nonzero(m2 <= 1e-3 * (d * d).max(axis=0))
+            for start in range(0, len(rows), 65536):
+                t, j = rows[start:start + 65536, None], js[start:start + 65536, None]
+                window = r[t + np.arange(n), j]
+                m2[t[:, 0], j[:, 0]] = ((window - window.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+            out[n:] = np.sqrt(np.maximum(m2, 0.0) / (n - 1))
+        if not m:
+            return out
+        # 스트리밍 상태: 마지막 n 개 수익률을 링 버퍼 위치(수익률 번호 % n)에, 창 평균/편차제곱합
+        k = min(m, n)
+        window = r[m - k:]
+        self.buf[(np.arange(m - k, m) % n)[:, None], cols] = window
+        self.pos[cols] = m % n
+        self.samples[cols] = k
+        mean = self._resum(window) / k
+        self.mean[cols] = mean
+        self.m2[cols] = self._resum((window - mean) ** 2)
+        return out
+
+
+INDICATORS = {cls.name: cls for cls in (SMA, EMA, RSI, ATR, Volatility)}
+
+
+def create(spec: str, size: int = 0) -> StreamingIndicator:
+    """
+    "rsi(14)" 형식 → 지표 객체
+    """
+    match = SPEC_RE.match(spec)
+    if not match or match.group(1) not in INDICATORS:
+        raise ValueError(f"알 수 없는 지표: {spec!r} (지원: {', '.join(INDICATORS)})")
+    return INDICATORS[match.group(1)](int(match.group(2)), size)
+
+
+def warmup_bars(spec: str) -> int:
+    """
+    최근 구간만으로 계산할 때 읽을 봉 수. 재귀 지표(EMA/RSI/ATR)는 시작값 영향이
+    충분히 줄도록 5n 봉 (EMA 기준 잔여 가중치 e^-10 수준).
+    """
+    indicator = create(spec)
+    if isinstance(indicator, (EMA, _Wilder)):
+        return 5 * indicator.n + 1
+    if isinstance(indicator, Volatility):
+        return indicator.n + 1
+    return indicator.n
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 배치 함수 ((T,) 또는 (T, N) → 같은 모양)
+# ─────────────────────────────────────────────────────────────────────────
+def sma(close, n: int) -> np.ndarray:
+    return SMA(n).run(close)
+
+
+def ema(close, n: int) -> np.ndarray:
+    return EMA(n).run(close)
+
+
+def rsi(close, n: int = 14) -> np.ndarray:
+    return RSI(n).run(close)
+
+
+def atr(high, low, close, n: int = 14) -> np.ndarray:
+    return ATR(n).run(high, low, close)
+
+
+def volatility(close, n: int = 20) -> np.ndarray:
+    return Volatility(n).run(close)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) 종목별 스트리밍 묶음
+# ─────────────────────────────────────────────────────────────────────────
+class IndicatorBank:
+    """
+    여러 지표를 종목 단위로 묶어 관리한다. 처음 보는 종목은 열을 새로 배정한다 (배열은 2배씩 확장).
+    """
+
+    def __init__(self, specs: Sequence[str]):
+        self.indicators: Dict[str, StreamingIndicator] = {}
+        for spec in specs:
+            indicator = create(spec)
+            self.indicators[f"{indicator.name}({indicator.n})"] = indicator
+        self._columns: Dict[str, int] = {}
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+    def _column(self, symbol: str) -> int:
+        col = self._columns.get(symbol)
+        if col is None:
+            col = self._columns[symbol] = len(self._columns)
+            if col >= self._capacity:
+                self._capacity = max(8, 2 * self._capacity)
+                for indicator in self.indicators.values():
+                    indicator.resize(self._capacity)
+        return col
+
+    def update(self, symbol: str, open: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> Dict[str, float]:
+        """
+        닫힌 봉 하나 반영 후 {지표: 값}
+        """
+        bar = {"open": open, "high": high, "low": low, "close": close, "volume": volume}
+        with self._lock:
+            col = self._column(symbol)
+            return {key: float(ind.update(col, *(bar[f] for f in ind.inputs))[0])
+                    for key, ind in self.indicators.items()}
+
+    def values(self, symbol: str) -> Dict[str, float]:
+        with self._lock:
+            col = self._columns.get(symbol)
+            if col is None:
+                return {key: float("nan") for key in self.indicators}
+            return {key: float(ind.value(col)[0]) for key, ind in self.indicators.items()}
+
+    def warm_up(self, store, freq: str, symbols: Sequence[str], bars: Optional[int] = None) -> int:
+        """
+        저장된 봉으로 상태를 채운다 (배치 모드, 이후 update 는 이어서 계산).
+        bars 를 주면 종목별 최근 bars 개만 사용. 반영한 봉 수 반환.
+        """
+        fields = sorted({f for ind in self.indicators.values() for f in ind.inputs})
+        used = 0
+        with self._lock:
+            for symbol in symbols:
+                loaded = store.load(freq, symbol, columns=fields)
+                series = {f: loaded[f] if bars is None else loaded[f][-bars:] for f in fields}
+                count = len(series[fields[0]]) if fields else 0
+                if not count:
+                    continue
+                col = self._column(symbol)
+                for ind in self.indicators.values():
+                    ind.run(*(series[f] for f in ind.inputs), cols=[col])
+                used += count
+        return used
+
+    def symbols(self) -> List[str]:
+        return list(self._columns)
@@ -0,0 +1,183 @@
+# src/logging_setup.py
+"""
+비동기 로깅 설정.
+
+호출 스레드에서는 레코드를 큐에 넣기만 하고(메시지 포맷/IO 없음), 백그라운드 QueueListener 가
+포맷과 출력을 맡는다. 큐가 가득 차면 기다리지 않고 버린 뒤 개수를 센다.
+
+    logging:
+      level: INFO
+      format: text            # text / json (한 줄에 JSON 객체 하나)
+      file: ""                # 지정 시 콘솔 대신 파일에 기록 (예: data/rebalancer.log)
+      queue_size: 10000
+      sql_echo: false         # SQLAlchemy SQL 로그 (sqlalchemy.engine INFO)
+      levels:                 # 로거(서브시스템)별 레벨
+        src.transport: WARNING
+      sampling:               # 로거별 INFO 이하 레코드 샘플링 비율 (WARNING 이상은 항상 기록)
+        rebalancer: 0.1
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+ROOT_DIR    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# LogRecord 기본 속성 (extra 로 넘긴 필드만 JSON 에 추가하기 위해 제외)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    로거 이름(접두어 일치, 가장 긴 것 우선)별 비율로 WARNING 미만 레코드를 샘플링.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(((name, float(rate)) for name, rate in rates.items()),
+                            key=lambda kv: len(kv[0]), reverse=True)
+        self._cache: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            for prefix, value in self.rates:
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = value
+                    break
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    포맷하지 않은 레코드를 그대로 큐에 넣는다 (포맷은 리스너 스레드에서).
+    큐가 가득 차면 호출 스레드를 막지 않고 버린다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 예외 정보는 트레이스백 객체가 살아 있을 때 문자열로 만들어 둔다
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _State:
+    listener: Optional[logging.handlers.QueueListener] = None
+    handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging(logging_cfg: Optional[dict] = None) -> DroppingQueueHandler:
+    """
+    루트 로거를 큐 기반 비동기 파이프라인으로 교체한다 (다시 호출하면 기존 설정을 정리 후 재구성).
+    """
+    logging_cfg = logging_cfg or {}
+    shutdown_logging()
+
+    fmt = logging_cfg.get("format", "text")
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+
+    path = logging_cfg.get("file") or ""
+    if path:
+        path = path if os.path.isabs(path) else os.path.join(ROOT_DIR, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        output: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        output = logging.StreamHandler()
+    output.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(int(logging_cfg.get("queue_size", 10000))))
+    sampling = logging_cfg.get("sampling") or {}
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(logging_cfg.get("level", "INFO"))
+
+    for name, level in (logging_cfg.get("levels") or {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    # SQLAlchemy echo=True 는 자체 stdout 핸들러로 동기 출력하므로 끄고, 필요하면 큐를 통해 기록
+    try:
+        from src.db.db import engine
+        engine.echo = False
+    except Exception:
+        pass
+    sa_logger = logging.getLogger("sqlalchemy.engine.Engine")
+    for existing in list(sa_logger.handlers):
+        sa_logger.removeHandler(existing)
+    logging.getLogger("sqlalchemy.engine").setLevel(
+        logging.INFO if logging_cfg.get("sql_echo", False) else logging.WARNING
+    )
+
+    listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    _State.listener, _State.handler = listener, handler
+    return handler
+
+
+def shutdown_logging():
+    """
+    큐에 남은 레코드를 모두 출력하고 리스너를 멈춘다.
+    """
+    listener, handler = _State.listener, _State.handler
+    _State.listener = _State.handler = None
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+        if handler.dropped:
+            logging.getLogger(__name__).warning("[Logging] 큐가 가득 차 버린 로그 %s건", handler.dropped)
+
+
+atexit.register(shutdown_logging)
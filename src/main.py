@@ -1,24 +1,61 @@
 # main.py
 
+import argparse
 import logging
 from rebalancer import Rebalancer
+from src.config_watcher import ConfigWatcher
+from src.daemon import RebalanceDaemon
+from src.multi_account import MultiAccountRebalancer
+from src.orders.base_manager import load_config
+from src.transport import close_transports
+from src import metrics, tracing
+from src.logging_setup import setup_logging, shutdown_logging
 
 if __name__ == "__main__":
-    # 로깅 설정 (원하는 포맷/레벨로 조정하세요)
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    parser = argparse.ArgumentParser(description="KIS 해외주식 리밸런서")
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="드리프트 기반 연속 리밸런싱 모드 (config.yaml 의 daemon 섹션 사용)"
     )
+    parser.add_argument(
+        "--all-accounts", action="store_true",
+        help="config.yaml 의 accounts 목록 전체를 동시에 리밸런싱"
+    )
+    args = parser.parse_args()
+
+    # 로깅 설정 (config.yaml 의 logging 섹션: 포맷/레벨/샘플링)
+    cfg = load_config()
+    setup_logging(cfg.get("logging"))
 
     logger = logging.getLogger("main")
     logger.info("리밸런서 시작")
+    metrics.setup(cfg.get("metrics"))
+    tracing.setup(cfg.get("tracing"))
+
+    if args.all_accounts:
+        try:
+            MultiAccountRebalancer(Rebalancer).run()
+        finally:
+            close_transports()
+            metrics.shutdown()
+            logger.info("리밸런서 종료")
+            shutdown_logging()
+        raise SystemExit(0)
 
     reb = Rebalancer()
     try:
-        reb.rebalance()
-        logger.info("리밸런싱 완료")
+        if args.daemon:
+            # 설정/배분 파일 변경은 재시작 없이 주기 사이에 반영 (토큰/연결/캐시 유지)
+            watcher = ConfigWatcher.from_config(reb.cfg, reb.symbol_master)
+            RebalanceDaemon(reb, watcher=watcher).run()
+        else:
+            reb.rebalance()
+            logger.info("리밸런싱 완료")
     except Exception as e:
         logger.exception("리밸런싱 중 예외 발생")
     finally:
         reb.close()
+        close_transports()
+        metrics.shutdown()
         logger.info("리밸런서 종료")
+        shutdown_logging()
@@ -0,0 +1,382 @@
+# src/market_calendar.py
+
+import bisect
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 거래소별 세션 정의 (현지 시각)
+#    NASD/NYSE/AMEX 는 동일한 미국 캘린더를 사용한다.
+#    미국 외 거래소는 주말 + config.yaml market_hours.holidays 만 휴장 처리.
+# ─────────────────────────────────────────────────────────────────────────
+SESSION_PRE     = "pre"
+SESSION_REGULAR = "regular"
+SESSION_AFTER   = "after"
+
+EXCHANGE_SPECS = {
+    "US": {
+        "tz": "America/New_York",
+        "sessions": [
+            (SESSION_PRE, "04:00", "09:30"),
+            (SESSION_REGULAR, "09:30", "16:00"),
+            (SESSION_AFTER, "16:00", "20:00"),
+        ],
+        "early_close": "13:00",
+    },
+    "TKSE": {
+        "tz": "Asia/Tokyo",
+        "sessions": [(SESSION_REGULAR, "09:00", "11:30"), (SESSION_REGULAR, "12:30", "15:30")],
+    },
+    "SEHK": {
+        "tz": "Asia/Hong_Kong",
+        "sessions": [(SESSION_REGULAR, "09:30", "12:00"), (SESSION_REGULAR, "13:00", "16:00")],
+    },
+    "SHAA": {
+        "tz": "Asia/Shanghai",
+        "sessions": [(SESSION_REGULAR, "09:30", "11:30"), (SESSION_REGULAR, "13:00", "15:00")],
+    },
+    "SZAA": {
+        "tz": "Asia/Shanghai",
+        "sessions": [(SESSION_REGULAR, "09:30", "11:30"), (SESSION_REGULAR, "13:00", "15:00")],
+    },
+    "HASE": {
+        "tz": "Asia/Ho_Chi_Minh",
+        "sessions": [(SESSION_REGULAR, "09:00", "11:30"), (SESSION_REGULAR, "13:00", "14:45")],
+    },
+    "VNSE": {
+        "tz": "Asia/Ho_Chi_Minh",
+        "sessions": [(SESSION_REGULAR, "09:00", "11:30"), (SESSION_REGULAR, "13:00", "14:45")],
+    },
+}
+
+# 주문 거래소코드 / 시세 거래소코드 → 캘린더 키
+EXCHANGE_ALIASES = {
+    "NASD": "US", "NYSE": "US", "AMEX": "US",
+    "NAS": "US", "NYS": "US", "AMS": "US",
+    "TSE": "TKSE", "HKS": "SEHK", "SHS": "SHAA", "SZS": "SZAA",
+    "HNX": "HASE", "HSX": "VNSE",
+}
+
+BUCKET_SECONDS = 3600
+
+# next_open 이 테이블 끝을 넘어 다음 개장을 찾을 때 늘려 볼 최대 연수 (세션이 전혀 없으면 inf)
+MAX_LOOKAHEAD_YEARS = 10
+
+
+def calendar_key(exchange: str) -> str:
+    code = (exchange or "").upper()
+    return EXCHANGE_ALIASES.get(code, code)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 미국 휴장일 / 조기폐장 규칙 (NYSE)
+# ─────────────────────────────────────────────────────────────────────────
+def _easter(year: int) -> date:
+    """Anonymous Gregorian algorithm"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    nxt = date(year + (month // 12), month % 12 + 1, 1)
+    last = nxt - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    """토요일 → 금요일, 일요일 → 월요일"""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def us_holidays(year: int) -> Dict[date, str]:
+    holidays = {}
+    new_year = date(year, 1, 1)
+    # 신정이 토요일이면 전년도 12/31(금)은 휴장하지 않음
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    holidays[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_last_weekday(year, 5, 0)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    holidays[_observed(date(year, 12, 25))] = "Christmas Day"
+    return holidays
+
+
+def us_early_closes(year: int) -> List[date]:
+    days = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    holidays = us_holidays(year)
+    return [d for d in days if d.weekday() < 5 and d not in holidays]
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) MarketCalendar : 세션 구간을 1시간 버킷 테이블로 미리 계산
+#    - is_open / session / next_open 은 버킷 하나만 보므로 O(1)
+# ─────────────────────────────────────────────────────────────────────────
+class _Timeline:
+    def __init__(self, intervals: List[Tuple[float, float, str]], base: int, n_buckets: int):
+        self.base = base
+        self.buckets: List[Tuple[Tuple[float, float, str], ...]] = [()] * n_buckets
+        self.next_start = [float("inf")] * (n_buckets + 1)
+
+        grouped: Dict[int, list] = {}
+        for start, end, kind in intervals:
+            first = max(int((start - base) // BUCKET_SECONDS), 0)
+            last = min(int((end - 1 - base) // BUCKET_SECONDS), n_buckets - 1)
+            for b in range(first, last + 1):
+                grouped.setdefault(b, []).append((start, end, kind))
+        for b, items in grouped.items():
+            self.buckets[b] = tuple(items)
+
+        starts = sorted(s for s, _, _ in intervals)
+        for b in range(n_buckets - 1, -1, -1):
+            bucket_start = base + b * BUCKET_SECONDS
+            i = bisect.bisect_left(starts, bucket_start)
+            self.next_start[b] = starts[i] if i < len(starts) else float("inf")
+
+    def bucket(self, ts: float) -> int:
+        return int((ts - self.base) // BUCKET_SECONDS)
+
+
+class MarketCalendar:
+    """
+    한 거래소의 세션 테이블.
+
+    extended=True 이면 프리/애프터마켓까지 포함한 구간으로 판단한다.
+    테이블 범위를 벗어난 시각이 들어오면 범위를 넓혀 다시 계산한다.
+    """
+
+    def __init__(
+        self,
+        exchange: str,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        extra_holidays: Iterable = (),
+    ):
+        self.key = calendar_key(exchange)
+        if self.key not in EXCHANGE_SPECS:
+            raise ValueError(f"지원하지 않는 거래소 코드: {exchange}")
+        spec = EXCHANGE_SPECS[self.key]
+        self.tz = ZoneInfo(spec["tz"])
+        self._spec = spec
+        self._extra_holidays = {
+            d if isinstance(d, date) else date.fromisoformat(str(d)) for d in extra_holidays
+        }
+
+        this_year = datetime.now(self.tz).year
+        self._lock = threading.Lock()
+        self._build(start_year or this_year - 1, end_year or this_year + 2)
+
+    # ── 테이블 생성 ──────────────────────────────────────────────────────
+    def holidays(self, year: int) -> Dict[date, str]:
+        days = us_holidays(year) if self.key == "US" else {}
+        for d in self._extra_holidays:
+            if d.year == year:
+                days.setdefault(d, "config")
+        return days
+
+    def _day_sessions(self, day: date, early_close: bool) -> List[Tuple[str, str, str]]:
+        sessions = list(self._spec["sessions"])
+        if not early_close:
+            return sessions
+        close = self._spec["early_close"]
+        result = []
+        for kind, start, end in sessions:
+            if kind == SESSION_REGULAR:
+                result.append((kind, start, close))
+            elif kind == SESSION_AFTER:
+                # 조기폐장일 애프터마켓은 13:00 ~ 17:00
+                result.append((kind, close, "17:00"))
+            else:
+                result.append((kind, start, end))
+        return result
+
+    def _build(self, start_year: int, end_year: int):
+        regular, extended = [], []
+        day = date(start_year, 1, 1)
+        last = date(end_year, 12, 31)
+        holidays, early = {}, set()
+        for year in range(start_year, end_year + 1):
+            holidays.update(self.holidays(year))
+            if self.key == "US":
+                early.update(us_early_closes(year))
+
+        while day <= last:
+            if day.weekday() < 5 and day not in holidays:
+                for kind, start, end in self._day_sessions(day, day in early):
+                    s = datetime.combine(day, datetime.strptime(start, "%H:%M").time(), self.tz).timestamp()
+                    e = datetime.combine(day, datetime.strptime(end, "%H:%M").time(), self.tz).timestamp()
+                    extended.append((s, e, kind))
+                    if kind == SESSION_REGULAR:
+                        regular.append((s, e, kind))
+            day += timedelta(days=1)
+
+        base = int(datetime(start_year, 1, 1, tzinfo=self.tz).timestamp()) - 86400
+        n_buckets = int((datetime(end_year + 1, 1, 1, tzinfo=self.tz).timestamp() + 86400 - base) // BUCKET_SECONDS) + 1
+
+        self.start_year, self.end_year = start_year, end_year
+        self._timelines = {
+            False: _Timeline(regular, base, n_buckets),
+            True: _Timeline(extended, base, n_buckets),
+        }
+
+    def _timeline(self, ts: float, extended: bool) -> _Timeline:
+        timeline = self._timelines[extended]
+        b = timeline.bucket(ts)
+        if 0 <= b < len(timeline.buckets) - 1:
+            return timeline
+        with self._lock:
+            year = datetime.fromtimestamp(ts, self.tz).year
+            self._build(min(self.start_year, year - 1), max(self.end_year, year + 1))
+            return self._timelines[extended]
+
+    # ── 조회 ─────────────────────────────────────────────────────────────
+    def session(self, ts: Optional[float] = None, extended: bool = True) -> Optional[str]:
+        """
+        해당 시각의 세션 종류 (pre / regular / after). 장외면 None.
+        """
+        ts = time.time() if ts is None else ts
+        timeline = self._timeline(ts, extended)
+        for start, end, kind in timeline.buckets[timeline.bucket(ts)]:
+            if start <= ts < end:
+                return kind
+        return None
+
+    def is_open(self, ts: Optional[float] = None, extended: bool = False) -> bool:
+        return self.session(ts, extended) is not None
+
+    def next_open(self, ts: Optional[float] = None, extended: bool = False) -> float:
+        """
+        ts 이후(포함) 처음으로 장이 열려 있는 시각 (epoch 초).
+        다음 개장이 테이블 끝을 넘으면 테이블을 한 해씩 늘려 다시 찾는다.
+        """
+        ts = time.time() if ts is None else ts
+        for _ in range(MAX_LOOKAHEAD_YEARS + 1):
+            timeline = self._timeline(ts, extended)
+            b = timeline.bucket(ts)
+            best = float("inf")
+            for start, end, _ in timeline.buckets[b]:
+                if start <= ts < end:
+                    return ts
+                if start > ts:
+                    best = min(best, start)
+            best = min(best, timeline.next_start[b + 1])
+            if best != float("inf"):
+                return best
+            with self._lock:
+                self._build(self.start_year, self.end_year + 1)
+        return float("inf")
+
+    def seconds_until_open(self, ts: Optional[float] = None, extended: bool = False) -> float:
+        ts = time.time() if ts is None else ts
+        return max(self.next_open(ts, extended) - ts, 0.0)
+
+
+_calendars: Dict[Tuple[str, Tuple], MarketCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_calendar(exchange: str, extra_holidays: Sequence = ()) -> MarketCalendar:
+    """
+    거래소별 MarketCalendar 캐시 반환.
+    """
+    key = (calendar_key(exchange), tuple(sorted(str(d) for d in extra_holidays)))
+    with _calendars_lock:
+        calendar = _calendars.get(key)
+        if calendar is None:
+            calendar = MarketCalendar(exchange, extra_holidays=extra_holidays)
+            _calendars[key] = calendar
+        return calendar
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 4) MarketScheduler : 여러 거래소를 묶어 "지금 요청을 보내도 되는가" 판단
+# ─────────────────────────────────────────────────────────────────────────
+class MarketScheduler:
+    """
+    config.yaml 의 market_hours 섹션:
+        enabled        : false 면 항상 열린 것으로 간주 (캘린더를 만들지 않음)
+        extended_hours : 프리/애프터마켓 포함 여부
+        holidays       : {거래소코드: ["YYYY-MM-DD", ...]} 추가 휴장일
+
+    지원하지 않거나 비어 있는 거래소 코드는 경고 후 건너뛰고,
+    남은 캘린더가 없으면 enabled=false 와 같이 항상 열린 것으로 간주한다.
+    """
+
+    def __init__(self, exchanges: Iterable[str], market_cfg: Optional[dict] = None):
+        market_cfg = market_cfg or {}
+        self.enabled  = market_cfg.get("enabled", True)
+        self.extended = market_cfg.get("extended_hours", False)
+        extra = market_cfg.get("holidays", {}) or {}
+        self.logger = logging.getLogger(__name__)
+
+        self.calendars: Dict[str, MarketCalendar] = {}
+        if not self.enabled:
+            return
+        for exchange in exchanges:
+            key = calendar_key(exchange)
+            if key in self.calendars:
+                continue
+            try:
+                self.calendars[key] = get_calendar(exchange, extra.get(exchange, extra.get(key, ())))
+            except ValueError as e:
+                self.logger.warning("[MarketScheduler] %s → 장 운영시간 확인 없이 진행", e)
+        if not self.calendars:
+            self.enabled = False
+
+    def is_open(self, ts: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return True
+        ts = time.time() if ts is None else ts
+        return any(c.is_open(ts, self.extended) for c in self.calendars.values())
+
+    def is_open_for(self, exchange: str, ts: Optional[float] = None) -> bool:
+        """
+        해당 거래소 장이 열려 있는지 (종목별 주문 판단). 캘린더가 없는 거래소는 열린 것으로 간주.
+        """
+        calendar = self.calendars.get(calendar_key(exchange)) if self.enabled else None
+        if calendar is None:
+            return True
+        return calendar.is_open(time.time() if ts is None else ts, self.extended)
+
+    def next_open(self, ts: Optional[float] = None) -> float:
+        ts = time.time() if ts is None else ts
+        if not self.enabled:
+            return ts
+        return min(c.next_open(ts, self.extended) for c in self.calendars.values())
+
+    def seconds_until_open(self, ts: Optional[float] = None) -> float:
+        ts = time.time() if ts is None else ts
+        return max(self.next_open(ts) - ts, 0.0)
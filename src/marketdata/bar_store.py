@@ -0,0 +1,403 @@
+# src/marketdata/bar_store.py
+"""
+로컬 봉(OHLCV) 저장소 (메모리 매핑 컬럼 파일).
+
+    <root>/<freq>/_index.npy               # 종목 색인: 종목코드, 확정된 봉 수, 첫/마지막 시각
+    <root>/<freq>/_meta.json               # 주기별 메타데이터 (일봉 수정주가 여부 등)
+    <root>/<freq>/<종목코드>/ts.i8          # 봉 시작 시각 (UTC epoch 초, 오름차순)
+                            open.f8 high.f8 low.f8 close.f8 volume.f8
+
+컬럼마다 little-endian 원시 배열 파일 하나. freq 는 "1d", "1m", "5m" 같은 주기 이름.
+
+쓰기 : 마지막 봉보다 새로운 봉만 파일 끝에 덧붙이고 색인의 봉 수를 갱신해 확정한다.
+       replace_from 을 주면 그 시각 이후의 봉을 제자리에서 다시 쓴다 (미완성 봉 / 수정주가 보정).
+       색인에 반영되기 전의 바이트는 읽기에서 보이지 않으므로 중단된 쓰기가 섞이지 않는다.
+       주기(freq)마다 쓰는 프로세스는 하나로 둔다 (다운로더 / 캔들 집계기).
+읽기 : 컬럼 파일을 mmap 해 복사 없이 NumPy 배열로 돌려주고, 시간 범위는 ts 에 대한
+       이진 탐색(searchsorted)으로 자른다. 열린 매핑은 봉 수가 바뀔 때까지 재사용하되,
+       매핑마다 파일 디스크립터를 하나씩 잡으므로 최근 사용한 max_open_maps 개만 캐시한다.
+       panel() 은 종목별 구간을 결과 행렬로 복사한 뒤 매핑을 놓으므로 종목 수와 무관하게
+       열린 디스크립터가 캐시 크기를 넘지 않는다.
+"""
+
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+ROOT_DIR   = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STORE_DIR  = os.path.join(ROOT_DIR, "data", "bars")
+INDEX_FILE = "_index.npy"
+META_FILE  = "_meta.json"    # 주기별 메타데이터 (예: 일봉 수정주가 여부)
+MAX_OPEN_MAPS = 256          # 캐시할 컬럼 매핑 수 (매핑 1개 = 파일 디스크립터 1개)
+
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+COLUMNS = BAR_DTYPE.names
+
+INDEX_DTYPE = np.dtype([
+    ("symbol", "U32"),
+    ("rows", "<i8"),
+    ("first", "<i8"),
+    ("last", "<i8"),
+])
+
+TimeLike = Union[int, float, str, date, datetime, None]
+
+
+def to_epoch(value: TimeLike) -> Optional[int]:
+    """
+    epoch 초 / "YYYYMMDD[HHMMSS]" (UTC) / date / datetime(naive 는 UTC) → epoch 초.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        fmt = "%Y%m%d%H%M%S" if len(value) > 8 else "%Y%m%d"
+        value = datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+    raise TypeError(f"시각으로 변환할 수 없는 값: {value!r}")
+
+
+def _column_file(column: str) -> str:
+    return f"{column}.{BAR_DTYPE[column].kind}{BAR_DTYPE[column].itemsize}"
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 읽기 결과
+# ─────────────────────────────────────────────────────────────────────────
+class Bars:
+    """
+    한 종목의 봉. 컬럼은 읽기 전용 배열(메모리 매핑 뷰)이다.
+        bars.close, bars["ts"], len(bars)
+    """
+    __slots__ = ("symbol", "columns")
+
+    def __init__(self, symbol: str, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.columns = columns
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def __getattr__(self, column: str) -> np.ndarray:
+        try:
+            return self.columns[column]
+        except KeyError:
+            raise AttributeError(column) from None
+
+    def __len__(self) -> int:
+        return len(self.columns["ts"])
+
+    def to_records(self) -> np.ndarray:
+        """
+        BAR_DTYPE 구조화 배열로 복사 (없는 컬럼은 0).
+        """
+        out = np.zeros(len(self), dtype=BAR_DTYPE)
+        for column, values in self.columns.items():
+            out[column] = values
+        return out
+
+
+@dataclass
+class Panel:
+    """
+    여러 종목을 시각 합집합에 맞춘 (T, N) 행렬. 봉이 없는 칸은 NaN.
+        panel.ts (T,), panel.symbols (N), panel["close"] (T, N)
+    """
+    ts: np.ndarray
+    symbols: List[str]
+    fields: Dict[str, np.ndarray]
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 저장소
+# ─────────────────────────────────────────────────────────────────────────
+class BarStore:
+    def __init__(self, root: str = STORE_DIR, max_open_maps: int = MAX_OPEN_MAPS):
+        self.root = root
+        self.max_open_maps = max(int(max_open_maps), 1)
+        # 주기별 색인 {freq: (색인 파일 mtime_ns, {종목: [rows, first, last]})}
+        self._catalogs: Dict[str, Tuple[int, Dict[str, list]]] = {}
+        # 열린 매핑 {(freq, 종목, 컬럼): (rows, 배열)} (최근 사용 순, max_open_maps 개까지)
+        self._maps: "OrderedDict[tuple, Tuple[int, np.ndarray]]" = OrderedDict()
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, *key) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _dir(self, freq: str, symbol: str) -> str:
+        return os.path.join(self.root, freq, symbol)
+
+    def _path(self, freq: str, symbol: str, column: str) -> str:
+        return os.path.join(self._dir(freq, symbol), _column_file(column))
+
+    def _index_path(self, freq: str) -> str:
+        return os.path.join(self.root, freq, INDEX_FILE)
+
+    # ── 색인 ──────────────────────────────────────────────────────────────
+    def _read_index(self, freq: str) -> Tuple[int, Dict[str, list]]:
+        path = self._index_path(freq)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            table = np.load(path)
+        except FileNotFoundError:
+            return 0, self._scan(freq)
+        values = zip(table["rows"].tolist(), table["first"].tolist(), table["last"].tolist())
+        return mtime, {symbol: list(entry) for symbol, entry in zip(table["symbol"].tolist(), values)}
+
+    def _scan(self, freq: str) -> Dict[str, list]:
+        """
+        색인 파일이 없으면(이전 형식 저장소) ts 파일 크기로 색인을 만든다.
+        """
+        base = os.path.join(self.root, freq)
+        catalog: Dict[str, list] = {}
+        if not os.path.isdir(base):
+            return catalog
+        for symbol in os.listdir(base):
+            path = self._path(freq, symbol, "ts")
+            if not os.path.isfile(path):
+                continue
+            rows = os.path.getsize(path) // BAR_DTYPE["ts"].itemsize
+            if rows:
+                ts = np.fromfile(path, dtype=BAR_DTYPE["ts"], count=rows)
+                catalog[symbol] = [rows, int(ts[0]), int(ts[-1])]
+        return catalog
+
+    def _catalog(self, freq: str) -> Dict[str, list]:
+        """
+        주기별 색인. 다른 프로세스가 색인 파일을 갱신했으면 다시 읽는다.
+        """
+        cached = self._catalogs.get(freq)
+        try:
+            mtime = os.stat(self._index_path(freq)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = 0
+        if cached is None or cached[0] != mtime:
+            cached = self._read_index(freq)
+            self._catalogs[freq] = cached
+        return cached[1]
+
+    def _commit(self, freq: str, symbol: str, entry: list):
+        """
+        종목 한 개의 색인 항목을 갱신해 파일에 원자적으로 기록 (디스크의 최신 색인에 병합).
+        """
+        with self._lock(freq, INDEX_FILE):
+            catalog = dict(self._catalog(freq))
+            catalog[symbol] = entry
+            symbols = sorted(catalog)
+            values = np.array([catalog[s] for s in symbols], dtype=np.int64).reshape(-1, 3)
+            table = np.empty(len(symbols), dtype=INDEX_DTYPE)
+            table["symbol"] = symbols
+            table["rows"], table["first"], table["last"] = values.T
+            path = self._index_path(freq)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp, path)
+            self._catalogs[freq] = (os.stat(path).st_mtime_ns, catalog)
+
+    def meta(self, freq: str) -> dict:
+        try:
+            with open(os.path.join(self.root, freq, META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def set_meta(self, freq: str, **values):
+        with self._lock(freq, META_FILE):
+            meta = dict(self.meta(freq), **values)
+            path = os.path.join(self.root, freq, META_FILE)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp, path)
+
+    def symbols(self, freq: str) -> List[str]:
+        return sorted(self._catalog(freq))
+
+    def rows(self, freq: str, symbol: str) -> int:
+        entry = self._catalog(freq).get(symbol)
+        return entry[0] if entry else 0
+
+    def span(self, freq: str, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        (첫 봉 시각, 마지막 봉 시각). 봉이 없으면 None.
+        """
+        entry = self._catalog(freq).get(symbol)
+        return (entry[1], entry[2]) if entry else None
+
+    def last_timestamp(self, freq: str, symbol: str) -> Optional[int]:
+        entry = self._catalog(freq).get(symbol)
+        return entry[2] if entry else None
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────────
+    def append(self, freq: str, symbol: str, bars: np.ndarray, replace_from: Optional[int] = None) -> int:
+        """
+        BAR_DTYPE 배열을 시각순으로 정렬해 마지막 봉 이후 것만 덧붙인다. 늘어난 봉 수 반환.
+        replace_from 을 주면 그 시각 이후의 저장된 봉을 bars 로 다시 쓴다 (미완성 봉 / 수정주가 보정).
+        """
+        if len(bars) == 0:
+            return 0
+        bars = np.asarray(bars, dtype=BAR_DTYPE)
+        if not np.all(np.diff(bars["ts"]) > 0):
+            _, first = np.unique(bars["ts"], return_index=True)   # 정렬 + 중복 시각 제거
+            bars = bars[first]
+
+        with self._lock(freq, symbol):
+            entry = self._catalog(freq).get(symbol)
+            rows = keep = entry[0] if entry else 0
+            if entry is not None and replace_from is not None:
+                keep = int(np.searchsorted(self._column(freq, symbol, "ts", rows), replace_from, side="left"))
+                bars = bars[bars["ts"] >= replace_from]
+            elif entry is not None:
+                bars = bars[bars["ts"] > entry[2]]
+            if len(bars) == 0:
+                return 0
+            os.makedirs(self._dir(freq, symbol), exist_ok=True)
+            for column in COLUMNS:
+                path = self._path(freq, symbol, column)
+                itemsize = BAR_DTYPE[column].itemsize
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    # 확정된 봉은 keep 부터 덮어쓰고, 확정되지 않은(색인에 없는) 꼬리는 버린다.
+                    # 다른 곳에서 매핑 중일 수 있는 확정 구간(rows)보다 짧게 자르지는 않는다.
+                    f.truncate(max(keep, rows) * itemsize)
+                    f.seek(keep * itemsize)
+                    f.write(np.ascontiguousarray(bars[column]).tobytes())
+            first_ts = entry[1] if entry and keep else int(bars["ts"][0])
+            self._commit(freq, symbol, [keep + len(bars), first_ts, int(bars["ts"][-1])])
+        return keep + len(bars) - rows
+
+    # ── 읽기 ──────────────────────────────────────────────────────────────
+    def _column(self, freq: str, symbol: str, column: str, rows: int) -> np.ndarray:
+        key = (freq, symbol, column)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == rows:
+            self._maps.move_to_end(key)
+            return cached[1]
+        dtype = BAR_DTYPE[column]
+        if rows == 0:
+            array = np.empty(0, dtype=dtype)
+        else:
+            with open(self._path(freq, symbol, column), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), rows * dtype.itemsize, access=mmap.ACCESS_READ)
+            array = np.frombuffer(mapped, dtype=dtype, count=rows)
+        self._maps[key] = (rows, array)
+        self._maps.move_to_end(key)
+        # 밀려난 매핑은 바깥에서 참조하는 배열이 없어지는 즉시 닫힌다 (디스크립터 반환)
+        while len(self._maps) > self.max_open_maps:
+            self._maps.popitem(last=False)
+        return array
+
+    def _range(self, freq: str, symbol: str, start: TimeLike, end: TimeLike) -> Tuple[int, int, int, np.ndarray]:
+        """
+        (봉 수, lo, hi, ts[lo:hi] 뷰)
+        """
+        rows = self.rows(freq, symbol)
+        ts = self._column(freq, symbol, "ts", rows)
+        lo = 0 if start is None else int(np.searchsorted(ts, to_epoch(start), side="left"))
+        hi = rows if end is None else int(np.searchsorted(ts, to_epoch(end), side="left"))
+        hi = max(hi, lo)
+        return rows, lo, hi, ts[lo:hi]
+
+    def load(
+        self,
+        freq: str,
+        symbol: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> Bars:
+        """
+        [start, end) 구간의 봉 (복사 없는 메모리 매핑 뷰). 봉이 없으면 빈 Bars.
+        """
+        rows, lo, hi, ts = self._range(freq, symbol, start, end)
+        out = {"ts": ts}
+        for column in columns:
+            if column != "ts":
+                out[column] = self._column(freq, symbol, column, rows)[lo:hi]
+        return Bars(symbol, out)
+
+    def panel(
+        self,
+        freq: str,
+        symbols: Iterable[str],
+        start: TimeLike = None,
+        end: TimeLike = None,
+        fields: Sequence[str] = ("close",),
+    ) -> Panel:
+        """
+        여러 종목의 [start, end) 구간을 시각 합집합 기준 (T, N) 행렬로 정렬 (열 우선 배열).
+        종목들의 시각 배열이 같으면(같은 거래일 달력) 합집합 계산 없이 그대로 복사한다.
+        """
+        symbols = list(symbols)
+        # 1) 종목별 구간과 시각 (복사본: 매핑을 붙잡지 않는다)
+        ranges = []
+        for s in symbols:
+            rows, lo, hi, ts = self._range(freq, s, start, end)
+            ranges.append((rows, lo, hi, np.array(ts)))
+
+        calendars: List[np.ndarray] = []
+        for _, _, _, ts in ranges:
+            if len(ts) and not any(
+                len(c) == len(ts) and c[0] == ts[0] and c[-1] == ts[-1] and np.array_equal(c, ts)
+                for c in calendars
+            ):
+                calendars.append(ts)
+        if not calendars:
+            union = np.empty(0, dtype=BAR_DTYPE["ts"])
+        elif len(calendars) == 1:
+            union = calendars[0]
+        else:
+            union = np.unique(np.concatenate(calendars))
+
+        # 2) 모든 칸을 NaN 으로 채우지 않고, 시각이 빠진 종목 열만 NaN 으로 초기화한다
+        out = {f: np.empty((len(union), len(symbols)), order="F") for f in fields}
+        for j, (s, (rows, lo, hi, ts)) in enumerate(zip(symbols, ranges)):
+            aligned = len(ts) == len(union)
+            idx = None if aligned or not len(ts) else np.searchsorted(union, ts)
+            for f in fields:
+                values = self._column(freq, s, f, rows)[lo:hi] if f != "ts" else ts
+                if aligned:
+                    out[f][:, j] = values
+                else:
+                    out[f][:, j] = np.nan
+                    if idx is not None:
+                        out[f][idx, j] = values
+        return Panel(union, symbols, out)
+
+
+def from_config(md_cfg: Optional[dict] = None) -> BarStore:
+    """
+    config.yaml marketdata 섹션의 store_dir (상대 경로는 프로젝트 루트 기준), max_open_maps.
+    """
+    md_cfg = md_cfg or {}
+    root = md_cfg.get("store_dir") or STORE_DIR
+    if not os.path.isabs(root):
+        root = os.path.join(ROOT_DIR, root)
+    return BarStore(root, md_cfg.get("max_open_maps", MAX_OPEN_MAPS))
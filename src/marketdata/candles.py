@@ -0,0 +1,95 @@
+# src/marketdata/candles.py
+"""
+실시간 캔들 집계.
+
+현재가/체결가 틱을 interval 초 단위 봉(UTC epoch 기준 정렬)으로 묶고, 다음 구간의 틱이
+들어오거나 flush(now) 시점이 구간 끝을 지나면 봉을 닫아 BarStore 에 덧붙인다.
+데몬의 현재가 폴링 결과를 넣으면 poll 주기 해상도의 봉이 쌓인다.
+IndicatorBank 를 주면 봉이 닫힐 때마다 지표를 O(1) 로 갱신한다.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.indicators import IndicatorBank
+from src.marketdata.bar_store import BAR_DTYPE, BarStore
+
+
+class CandleAggregator:
+    def __init__(self, store: BarStore, freq: str = "1m", interval_sec: int = 60,
+                 indicators: Optional[IndicatorBank] = None):
+        """
+        freq         : 저장소 주기 이름 (다운로드한 봉과 섞지 않으려면 별도 이름 사용)
+        interval_sec : 봉 길이(초)
+        indicators   : 닫힌 봉으로 갱신할 지표 묶음 (선택)
+        """
+        self.store = store
+        self.freq = freq
+        self.interval = int(interval_sec)
+        self.indicators = indicators
+        # 종목별 진행 중인 봉 [구간시작, 시가, 고가, 저가, 종가, 거래량]
+        self._open: Dict[str, list] = {}
+        # 닫혔지만 아직 저장하지 않은 봉
+        self._closed: Dict[str, List[tuple]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def on_tick(self, symbol: str, price: Optional[float], volume: float = 0.0, ts: Optional[float] = None):
+        """
+        틱 하나 반영. 이미 닫힌 구간의 늦은 틱은 버린다.
+        """
+        if price is None or price <= 0:
+            return
+        ts = time.time() if ts is None else ts
+        bucket = int(ts // self.interval) * self.interval
+        with self._lock:
+            bar = self._open.get(symbol)
+            if bar is not None and bucket < bar[0]:
+                return
+            if bar is None or bucket > bar[0]:
+                if bar is not None:
+                    self._close(symbol, bar)
+                self._open[symbol] = [bucket, price, price, price, price, volume]
+                return
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += volume
+
+    def _close(self, symbol: str, bar: list):
+        self._closed.setdefault(symbol, []).append(tuple(bar))
+        if self.indicators is not None:
+            self.indicators.update(symbol, *bar[1:])
+
+    def current(self, symbol: str) -> Optional[tuple]:
+        """
+        진행 중인 봉 (구간시작, 시가, 고가, 저가, 종가, 거래량).
+        """
+        with self._lock:
+            bar = self._open.get(symbol)
+            return tuple(bar) if bar is not None else None
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        닫힌 봉을 저장소에 덧붙인다. now 를 주면 구간이 끝난 진행 중 봉도 닫는다.
+        저장한 봉 수 반환.
+        """
+        with self._lock:
+            if now is not None:
+                for symbol, bar in list(self._open.items()):
+                    if bar[0] + self.interval <= now:
+                        self._close(symbol, bar)
+                        del self._open[symbol]
+            closed, self._closed = self._closed, {}
+
+        written = 0
+        for symbol, bars in closed.items():
+            try:
+                written += self.store.append(self.freq, symbol, np.array(bars, dtype=BAR_DTYPE))
+            except Exception:
+                self.logger.exception("[CandleAggregator] %s 봉 저장 실패", symbol)
+        return written
@@ -0,0 +1,134 @@
+import logging
+from typing import Optional
+
+from pydantic import ValidationError
+
+from src.api_client import get_token_manager
+from src.exchange_index import ExchangeRoutes, get_exchange_index, price_exchange_code
+from src.marketdata.chart_models import DailyPriceResponse, MinuteChartResponse
+from src.orders.order_models import RequestHeader
+from src.orders.base_manager import BaseManager
+
+
+class ChartManager(BaseManager):
+    """
+    해외주식 기간별시세 (v1_해외주식-010) / 분봉조회 (v1_해외주식-030) 기능.
+    한 번의 호출은 한 페이지(일봉 100건, 분봉 최대 120건)만 조회하고, 이어받기는 호출자가 한다.
+    """
+
+    def __init__(self, cfg: dict = None):
+        super().__init__(cfg)  # BaseManager 초기화
+
+        # TR ID 및 API URL 설정
+        self.DAILY_TR_ID  = "HHDFS76240000"
+        self.MINUTE_TR_ID = "HHDFS76950200"
+        base = self.DOMAIN_MOCK if self.use_mock else self.DOMAIN_REAL
+        self.daily_api_url  = f"{base}/uapi/overseas-price/v1/quotations/dailyprice"
+        self.minute_api_url = f"{base}/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice"
+
+        # 종목별 거래소 (수동 지정 > 공유 캐시, 없으면 계좌 기본 거래소)
+        routing_cfg = self.cfg.get("exchange_routing", {}) or {}
+        self.OVRS_EXCG_CD   = self.cfg.get("account", {}).get("OVRS_EXCG_CD", "NASD")
+        self.exchange_index = ExchangeRoutes(get_exchange_index(routing_cfg), routing_cfg.get("symbols"))
+
+        self.token_manager = get_token_manager(
+            self.api_key, self.app_secret, token_url=f"{base}/oauth2/tokenP", token=self.token
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def refresh_token(self) -> bool:
+        """
+        조회 전에 공유 TokenManager 에서 유효한 토큰을 받아 self.token 에 설정.
+        """
+        self.token = self.token_manager.get_token()
+        return bool(self.token)
+
+    def _build_header(self, tr_id: str) -> Optional[dict]:
+        """
+        RequestHeader 모델을 통해 헤더 검증 및 dict 형태 반환
+        """
+        try:
+            header_model = RequestHeader(
+                **{
+                    "content-type": "application/json; charset=UTF-8",
+                    "authorization": f"Bearer {self.token}",
+                    "appkey": self.api_key,
+                    "appsecret": self.app_secret,
+                    "tr_id": tr_id,
+                }
+            )
+        except ValidationError as ve:
+            self.logger.error("[ChartManager] RequestHeader 검증 실패: %s", ve.json())
+            return None
+
+        return header_model.dict(by_alias=True, exclude_none=True)
+
+    def _get(self, url: str, tr_id: str, params: dict, model, symbol: str):
+        headers = self._build_header(tr_id)
+        if headers is None:
+            return None
+
+        try:
+            data = self.transport.get(url, headers=headers, params=params, client=self.client_id,
+                                      reauth=self._reauth)
+        except Exception:
+            self.logger.exception("[ChartManager] %s %s 조회 중 HTTP 요청 에러 발생", symbol, tr_id)
+            return None
+
+        try:
+            parsed = model.parse_obj(data)
+        except ValidationError as ve:
+            self.logger.error("[ChartManager] %s %s 응답 파싱 실패: %s", symbol, tr_id, ve.json())
+            return None
+
+        if parsed.rt_cd != "0":
+            self.logger.error("[ChartManager] %s %s 조회 실패 (rt_cd=%s, msg1=%s)", symbol, tr_id, parsed.rt_cd, parsed.msg1)
+            return None
+
+        return parsed
+
+    def get_daily_page(
+        self,
+        symbol: str,
+        end: str = "",
+        exchange: str = None,
+        adjusted: bool = True,
+    ) -> Optional[DailyPriceResponse]:
+        """
+        end(YYYYMMDD, 비우면 오늘) 이전 일봉을 최신순으로 최대 100건 조회.
+        """
+        exchange = exchange or self.exchange_index.get(symbol) or self.OVRS_EXCG_CD
+        params = {
+            "AUTH": "",
+            "EXCD": price_exchange_code(exchange),
+            "SYMB": symbol,
+            "GUBN": "0",                       # 0: 일, 1: 주, 2: 월
+            "BYMD": end,
+            "MODP": "1" if adjusted else "0",  # 수정주가 반영 여부
+        }
+        return self._get(self.daily_api_url, self.DAILY_TR_ID, params, DailyPriceResponse, symbol)
+
+    def get_minute_page(
+        self,
+        symbol: str,
+        nmin: int = 1,
+        key: str = "",
+        exchange: str = None,
+    ) -> Optional[MinuteChartResponse]:
+        """
+        nmin 분봉을 최신순으로 최대 120건 조회.
+        key(현지 YYYYMMDDHHMMSS) 를 주면 그 이전 봉부터 이어서 조회한다.
+        """
+        exchange = exchange or self.exchange_index.get(symbol) or self.OVRS_EXCG_CD
+        params = {
+            "AUTH": "",
+            "EXCD": price_exchange_code(exchange),
+            "SYMB": symbol,
+            "NMIN": str(nmin),
+            "PINC": "1",                       # 전일 포함
+            "NEXT": "1" if key else "",
+            "NREC": "120",
+            "FILL": "",
+            "KEYB": key,
+        }
+        return self._get(self.minute_api_url, self.MINUTE_TR_ID, params, MinuteChartResponse, symbol)
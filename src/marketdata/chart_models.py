@@ -0,0 +1,84 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 해외주식 기간별시세 (v1_해외주식-010, HHDFS76240000)
+# ─────────────────────────────────────────────────────────────────────────
+class DailyPriceOutput1(BaseModel):
+    rsym: str                         = Field(..., alias="rsym", description="실시간조회종목코드")
+    zdiv: str                         = Field(..., alias="zdiv", description="소수점자리수")
+    nrec: str                         = Field(..., alias="nrec", description="레코드갯수")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
+
+
+class DailyPriceOutput2(BaseModel):
+    xymd: str                         = Field(..., alias="xymd", description="일자 (YYYYMMDD)")
+    clos: str                         = Field(..., alias="clos", description="종가")
+    open: str                         = Field(..., alias="open", description="시가")
+    high: str                         = Field(..., alias="high", description="고가")
+    low: str                          = Field(..., alias="low", description="저가")
+    tvol: str                         = Field(..., alias="tvol", description="거래량")
+    tamt: str                         = Field("", alias="tamt", description="거래대금")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
+
+
+class DailyPriceResponse(BaseModel):
+    rt_cd: str                        = Field(..., alias="rt_cd", description="성공 실패 여부 (0: 성공)")
+    msg_cd: str                       = Field(..., alias="msg_cd", description="응답코드")
+    msg1: str                         = Field(..., alias="msg1", description="응답메시지")
+    output1: DailyPriceOutput1        = Field(..., alias="output1", description="응답상세1")
+    output2: List[DailyPriceOutput2]  = Field(default_factory=list, alias="output2", description="일봉 (최신순, 최대 100건)")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 해외주식 분봉조회 (v1_해외주식-030, HHDFS76950200)
+# ─────────────────────────────────────────────────────────────────────────
+class MinuteChartOutput1(BaseModel):
+    rsym: str                         = Field(..., alias="rsym", description="실시간종목코드")
+    zdiv: str                         = Field(..., alias="zdiv", description="소수점자리수")
+    next: str                         = Field("", alias="next", description="다음가능여부 (1: 이전 봉 있음)")
+    more: str                         = Field("", alias="more", description="추가데이타여부")
+    nrec: str                         = Field("", alias="nrec", description="레코드갯수")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
+
+
+class MinuteChartOutput2(BaseModel):
+    xymd: str                         = Field(..., alias="xymd", description="현지영업일자")
+    xhms: str                         = Field(..., alias="xhms", description="현지기준시간")
+    kymd: str                         = Field(..., alias="kymd", description="한국기준일자")
+    khms: str                         = Field(..., alias="khms", description="한국기준시간")
+    open: str                         = Field(..., alias="open", description="시가")
+    high: str                         = Field(..., alias="high", description="고가")
+    low: str                          = Field(..., alias="low", description="저가")
+    last: str                         = Field(..., alias="last", description="종가")
+    evol: str                         = Field(..., alias="evol", description="체결량")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
+
+
+class MinuteChartResponse(BaseModel):
+    rt_cd: str                        = Field(..., alias="rt_cd", description="성공 실패 여부 (0: 성공)")
+    msg_cd: str                       = Field(..., alias="msg_cd", description="응답코드")
+    msg1: str                         = Field(..., alias="msg1", description="응답메시지")
+    output1: MinuteChartOutput1       = Field(..., alias="output1", description="응답상세1")
+    output2: List[MinuteChartOutput2] = Field(default_factory=list, alias="output2", description="분봉 (최신순, 최대 120건)")
+
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias      = True
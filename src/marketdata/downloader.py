@@ -0,0 +1,296 @@
+# src/marketdata/downloader.py
+"""
+일봉/분봉 이력 증분 다운로더.
+
+종목마다 저장소의 마지막 봉부터 최신 페이지를 거꾸로 이어받아(일봉 BYMD, 분봉 NEXT/KEYB)
+한 번에 기록한다. 마지막 저장 봉은 미완성일 수 있어 다시 받아 덮어쓰고, 진행 중인 분봉은
+저장하지 않는다. 중간에 조회가 실패하면 그 종목은 아무것도 쓰지 않으므로(이력에 구멍 없음)
+다음 실행이 같은 지점부터 다시 받는다. 여러 종목은 동시에 받되 요청 한도는 appkey 단위
+Transport 의 RateLimiter 가 지킨다.
+
+    python -m src.marketdata.downloader --freq 1d            # 목표비중(전략 합산) 종목 일봉
+    python -m src.marketdata.downloader --freq 5m AAPL MSFT  # 5분봉
+"""
+
+import argparse
+import calendar
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src import tracing
+from src.marketdata import bar_store
+from src.marketdata.bar_store import BAR_DTYPE, BarStore
+from src.marketdata.chart_manager import ChartManager
+
+
+DAILY_FREQ = "1d"
+DAILY_PAGE = 100             # 기간별시세 1회 최대 건수
+KST_OFFSET = 9 * 3600        # 분봉은 한국시각(kymd/khms)으로 UTC 변환 (서머타임 없음)
+
+
+def minute_freq(nmin: int) -> str:
+    return f"{int(nmin)}m"
+
+
+def _ymd_to_epoch(ymd: str) -> int:
+    return calendar.timegm(time.strptime(ymd, "%Y%m%d"))
+
+
+def _epoch_to_ymd(ts: int) -> str:
+    return time.strftime("%Y%m%d", time.gmtime(ts))
+
+
+def daily_bars(rows) -> np.ndarray:
+    """
+    기간별시세 output2 → BAR_DTYPE (ts: 해당 일자 00:00 UTC)
+    """
+    out = np.empty(len(rows), dtype=BAR_DTYPE)
+    for i, r in enumerate(rows):
+        out[i] = (_ymd_to_epoch(r.xymd), float(r.open), float(r.high), float(r.low), float(r.clos), float(r.tvol))
+    return out
+
+
+def minute_bars(rows) -> np.ndarray:
+    """
+    분봉 output2 → BAR_DTYPE (ts: 봉 시작 UTC epoch 초)
+    """
+    out = np.empty(len(rows), dtype=BAR_DTYPE)
+    for i, r in enumerate(rows):
+        ts = calendar.timegm(time.strptime(r.kymd + r.khms, "%Y%m%d%H%M%S")) - KST_OFFSET
+        out[i] = (ts, float(r.open), float(r.high), float(r.low), float(r.last), float(r.evol))
+    return out
+
+
+class BarDownloader:
+    def __init__(
+        self,
+        chart: ChartManager,
+        store: Optional[BarStore] = None,
+        workers: int = 8,
+        daily_start: str = "",
+        adjusted: bool = True,
+    ):
+        """
+        chart       : 차트 TR 조회용 ChartManager
+        daily_start : 저장된 봉이 없는 종목을 처음 받을 때의 시작일 (YYYYMMDD, 비우면 조회 가능한 전체)
+        """
+        self.chart = chart
+        self.store = store or BarStore()
+        self.workers = max(int(workers), 1)
+        self.daily_start = daily_start
+        self.adjusted = adjusted
+        self.rebase = False          # 저장된 일봉과 수정주가 설정이 다르면 전체 이력을 다시 받는다
+        self._failed: set = set()
+        self.logger = logging.getLogger(__name__)
+
+    # ── 거래소 ────────────────────────────────────────────────────────────
+    def _exchange(self, symbol: str) -> Optional[str]:
+        """
+        거래소를 모르는 종목은 같은 통화권 거래소에 일봉 1페이지를 조회해 찾는다.
+        """
+        index = self.chart.exchange_index
+
+        def probe(code, exchange):
+            page = self.chart.get_daily_page(code, exchange=exchange, adjusted=self.adjusted)
+            return 1.0 if page is not None and page.output2 else None
+
+        return index.resolve(symbol, self.chart.OVRS_EXCG_CD, probe)
+
+    # ── 종목 1개 ──────────────────────────────────────────────────────────
+    def _stored_tail(self, freq: str, symbol: str, n: int) -> np.ndarray:
+        bars = self.store.load(freq, symbol, columns=("close",))
+        out = np.zeros(min(len(bars), n), dtype=BAR_DTYPE)
+        if len(out):
+            out["ts"], out["close"] = bars.ts[-len(out):], bars.close[-len(out):]
+        return out
+
+    def _fetch_daily(self, symbol: str, exchange: str, floor: Optional[int]) -> Optional[List[np.ndarray]]:
+        """
+        최신 페이지부터 floor 시각(포함)까지 일봉 페이지를 거꾸로 받는다. 실패하면 None.
+        """
+        chunks: List[np.ndarray] = []
+        end = ""
+        while True:
+            page = self.chart.get_daily_page(symbol, end=end, exchange=exchange, adjusted=self.adjusted)
+            if page is None:
+                self.logger.warning("[BarDownloader] %s 일봉 조회 실패, 이번 실행에서는 저장하지 않음", symbol)
+                return None
+            bars = daily_bars(page.output2)
+            if len(bars) == 0:
+                break
+            chunks.append(bars)
+            oldest = int(bars["ts"].min())
+            if floor is not None and oldest <= floor or len(bars) < DAILY_PAGE:
+                break
+            end = _epoch_to_ymd(oldest - 86400)
+        return chunks
+
+    def download_daily(self, symbol: str) -> int:
+        """
+        저장된 마지막 일봉 2개부터(없으면 daily_start) 다시 받아 저장. 늘어난 봉 수 반환.
+        마지막 봉은 장중에 받은 미완성 봉일 수 있어 다시 쓰고, 그 전 봉(확정)의 종가가 달라졌으면
+        (adjusted 에서 분할/배당으로 수정주가 기준이 바뀐 경우) 전체 이력을 다시 받아 교체한다.
+        adjusted 설정 자체가 저장소 기록(_meta.json)과 다르면(rebase) 처음부터 모두 교체한다.
+        """
+        exchange = self._exchange(symbol)
+        if exchange is None:
+            self.logger.warning("[BarDownloader] %s 거래소를 찾지 못해 일봉 다운로드 생략", symbol)
+            return 0
+
+        start = _ymd_to_epoch(self.daily_start) if self.daily_start else None
+        if self.rebase:
+            # 저장된 봉은 다른 수정주가 기준 → 처음부터 받아 모두 교체
+            tail, floor, replace_from = self._stored_tail(DAILY_FREQ, symbol, 0), start, 0
+        else:
+            tail = self._stored_tail(DAILY_FREQ, symbol, 2)
+            floor = replace_from = int(tail["ts"][0]) if len(tail) else start
+        chunks = self._fetch_daily(symbol, exchange, floor)
+        if chunks is None:
+            self._failed.add(symbol)
+            return 0
+
+        if len(tail) == 2 and chunks:
+            fetched = np.concatenate(chunks)
+            check = fetched[fetched["ts"] == tail["ts"][0]]
+            if len(check) and not np.isclose(check["close"][0], tail["close"][0], rtol=1e-4):
+                self.logger.info("[BarDownloader] %s 수정주가 기준 변경 감지 → 일봉 전체 재다운로드", symbol)
+                chunks = self._fetch_daily(symbol, exchange, start)
+                if chunks is None:
+                    self._failed.add(symbol)
+                    return 0
+                replace_from = 0          # 이전 기준의 봉은 모두 교체
+        return self._store(DAILY_FREQ, symbol, chunks, replace_from)
+
+    def download_minute(self, symbol: str, nmin: int = 1) -> int:
+        """
+        마지막 저장 분봉부터 nmin 분봉을 받아 저장 (처음이면 API 가 제공하는 범위 전체).
+        아직 끝나지 않은 현재 분봉은 저장하지 않는다.
+        """
+        exchange = self._exchange(symbol)
+        if exchange is None:
+            self.logger.warning("[BarDownloader] %s 거래소를 찾지 못해 분봉 다운로드 생략", symbol)
+            return 0
+
+        freq = minute_freq(nmin)
+        floor = self.store.last_timestamp(freq, symbol)
+        chunks: List[np.ndarray] = []
+        key, prev_oldest = "", None
+        while True:
+            page = self.chart.get_minute_page(symbol, nmin=nmin, key=key, exchange=exchange)
+            if page is None:
+                self.logger.warning("[BarDownloader] %s 분봉 조회 실패, 이번 실행에서는 저장하지 않음", symbol)
+                return 0
+            bars = minute_bars(page.output2)
+            if len(bars) == 0:
+                break
+            chunks.append(bars)
+            oldest = int(bars["ts"].min())
+            if floor is not None and oldest <= floor or page.output1.next != "1":
+                break
+            if prev_oldest is not None and oldest >= prev_oldest:
+                self.logger.warning("[BarDownloader] %s 분봉 이어받기 키가 진행하지 않아 중단", symbol)
+                break
+            prev_oldest = oldest
+            tail = min(page.output2, key=lambda r: r.xymd + r.xhms)
+            key = tail.xymd + tail.xhms
+
+        closed_before = time.time() - nmin * 60
+        chunks = [c[c["ts"] <= closed_before] for c in chunks]
+        return self._store(freq, symbol, chunks, floor)
+
+    def _store(self, freq: str, symbol: str, chunks: List[np.ndarray], replace_from: Optional[int]) -> int:
+        """
+        replace_from 이후 봉을 받은 봉으로 다시 쓴다 (없으면 전부 추가).
+        """
+        if not chunks:
+            return 0
+        bars = np.concatenate(chunks)
+        if replace_from is not None:
+            bars = bars[bars["ts"] >= replace_from]
+        return self.store.append(freq, symbol, bars, replace_from=replace_from)
+
+    # ── 전체 ──────────────────────────────────────────────────────────────
+    def run(self, symbols: Iterable[str], freq: str = DAILY_FREQ) -> Dict[str, int]:
+        """
+        여러 종목을 동시에 받는다. {종목코드: 추가한 봉 수} 반환.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        if not self.chart.refresh_token():
+            self.logger.error("[BarDownloader] 토큰 발급 실패로 다운로드 중단")
+            return {}
+
+        if freq == DAILY_FREQ:
+            task = self.download_daily
+            stored = self.store.meta(DAILY_FREQ).get("adjusted")
+            self.rebase = stored is not None and bool(stored) != bool(self.adjusted)
+            if self.rebase:
+                self.logger.info("[BarDownloader] 수정주가 설정 변경(%s → %s) → 일봉 전체 재다운로드", stored, self.adjusted)
+        elif freq.endswith("m") and freq[:-1].isdigit():
+            nmin = int(freq[:-1])
+            task = lambda symbol: self.download_minute(symbol, nmin)  # noqa: E731
+        else:
+            raise ValueError(f"지원하지 않는 주기: {freq}")
+
+        def safe(symbol):
+            try:
+                return task(symbol)
+            except Exception:
+                self.logger.exception("[BarDownloader] %s %s 다운로드 중 예외 발생", symbol, freq)
+                return 0
+
+        start = time.perf_counter()
+        with tracing.trace("download_bars", freq=freq, symbols=len(symbols)):
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(symbols))) as pool:
+                counts = dict(zip(symbols, pool.map(tracing.propagate(safe), symbols)))
+        self.chart.exchange_index.save()
+        if freq == DAILY_FREQ and not self._failed:
+            # 모두 새 기준으로 받았을 때만 기록 (실패한 종목이 있으면 다음 실행에서 다시 교체)
+            self.store.set_meta(DAILY_FREQ, adjusted=bool(self.adjusted))
+            self.rebase = False
+        self._failed.clear()
+
+        self.logger.info(
+            "[BarDownloader] %s %d종목 완료: 신규 봉 %d개 (%.1fs)",
+            freq, len(symbols), sum(counts.values()), time.perf_counter() - start,
+        )
+        return counts
+
+
+def from_config(cfg: dict) -> BarDownloader:
+    """
+    config.yaml marketdata 섹션으로 BarDownloader 생성.
+    """
+    md_cfg = cfg.get("marketdata", {}) or {}
+    return BarDownloader(
+        ChartManager(cfg),
+        bar_store.from_config(md_cfg),
+        workers=md_cfg.get("workers", 8),
+        daily_start=str(md_cfg.get("daily_start") or ""),
+        adjusted=md_cfg.get("adjusted", True),
+    )
+
+
+if __name__ == "__main__":
+    from src.logging_setup import setup_logging
+    from src.orders.base_manager import load_config
+    from src.strategies import target_weights
+    from src.transport import close_transports
+
+    parser = argparse.ArgumentParser(description="KIS 해외주식 일봉/분봉 이력 다운로드")
+    parser.add_argument("symbols", nargs="*", help="종목코드 (비우면 marketdata.symbols 또는 목표비중 종목)")
+    parser.add_argument("--freq", default=DAILY_FREQ, help="1d (일봉) 또는 Nm (N분봉, 예: 1m, 5m)")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    setup_logging(cfg.get("logging"))
+    symbols = args.symbols or (cfg.get("marketdata", {}) or {}).get("symbols") or list(target_weights(cfg))
+    try:
+        from_config(cfg).run(symbols, args.freq)
+    finally:
+        close_transports()
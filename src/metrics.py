@@ -0,0 +1,334 @@
+# src/metrics.py
+"""
+Prometheus 텍스트 형식 메트릭.
+
+    metrics:
+      enabled: true
+      port: 9108                 # http://127.0.0.1:9108/metrics
+      dump_path: data/kis.prom   # node_exporter textfile collector 용 파일 (선택)
+
+- 공유 요청 경로(Transport 리스너): TR 별 지연 히스토그램, rt_cd/msg_cd 별 건수,
+  재시도, 응답 바이트, 요청 한도 대기 시간
+- DB 커밋 지연 (SessionLocal 이벤트)
+- 리밸런싱 주기 단계별 소요 시간 (phase 컨텍스트 매니저)
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src import tracing
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 메트릭 타입
+# ─────────────────────────────────────────────────────────────────────────
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 값이 필요합니다 (받은 값 {labels})")
+        return tuple("" if v is None else str(v) for v in labels)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _render_sample(self, key, state) -> List[str]:
+        counts, total, n = state
+        lines, cumulative = [], 0
+        for bound, c in zip(self.buckets + (float("inf"),), counts):
+            cumulative += c
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 기본 메트릭
+# ─────────────────────────────────────────────────────────────────────────
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "kis_request_duration_seconds", "KIS API HTTP 왕복 시간 (시도 단위)", ("tr_id",))
+REQUESTS = REGISTRY.counter(
+    "kis_requests_total", "KIS API 응답 건수", ("tr_id", "rt_cd", "msg_cd"))
+REQUEST_ERRORS = REGISTRY.counter(
+    "kis_request_errors_total", "응답을 받지 못한 요청 (연결/타임아웃/파싱 예외)", ("tr_id", "error"))
+REQUEST_RETRIES = REGISTRY.counter(
+    "kis_request_retries_total", "초당 거래건수 초과(EGW00201)로 인한 재시도", ("tr_id",))
+RESPONSE_BYTES = REGISTRY.counter(
+    "kis_response_bytes_total", "응답 본문 바이트 합계", ("tr_id",))
+LIMITER_WAIT = REGISTRY.histogram(
+    "kis_rate_limiter_wait_seconds", "요청 한도 슬롯 대기 시간", ("tr_id",),
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+DB_COMMIT_DURATION = REGISTRY.histogram(
+    "kis_db_commit_duration_seconds", "DB 세션 커밋(flush 포함) 시간")
+PHASE_DURATION = REGISTRY.histogram(
+    "kis_rebalance_phase_duration_seconds", "리밸런싱 주기 단계별 소요 시간", ("phase",))
+
+
+def observe_request(event):
+    """
+    Transport 요청 리스너 (src.transport.RequestEvent).
+    """
+    tr_id = event.tr_id or "unknown"
+    REQUEST_DURATION.observe(event.elapsed, tr_id)
+    LIMITER_WAIT.observe(event.waited, tr_id)
+    if event.attempt > 0:
+        REQUEST_RETRIES.inc(tr_id)
+    if event.error:
+        REQUEST_ERRORS.inc(tr_id, event.error)
+        return
+    REQUESTS.inc(tr_id, event.rt_cd, event.msg_cd)
+    RESPONSE_BYTES.inc(tr_id, amount=event.bytes_received)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    with metrics.phase("sync"): ...  → kis_rebalance_phase_duration_seconds{phase="sync"}
+    추적이 켜져 있으면 같은 이름의 span 도 연다.
+    """
+    start = time.perf_counter()
+    try:
+        with tracing.span(name):
+            yield
+    finally:
+        PHASE_DURATION.observe(time.perf_counter() - start, name)
+
+
+def instrument_sessions(session_factory):
+    """
+    sessionmaker 에 커밋 시간 측정 이벤트를 등록한다.
+    """
+    from sqlalchemy import event
+
+    def before_commit(session):
+        session.info["_commit_start"] = time.perf_counter()
+
+    def after_commit(session):
+        start = session.info.pop("_commit_start", None)
+        if start is not None:
+            DB_COMMIT_DURATION.observe(time.perf_counter() - start)
+
+    event.listen(session_factory, "before_commit", before_commit)
+    event.listen(session_factory, "after_commit", after_commit)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) 노출: HTTP 엔드포인트 / 파일 덤프
+# ─────────────────────────────────────────────────────────────────────────
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        payload = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def dump(path: str):
+    """
+    현재 메트릭을 파일로 원자적으로 저장 (textfile collector 가 쓰다 만 파일을 읽지 않도록).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp_path, path)
+
+
+class _State:
+    enabled = False
+    server: Optional[ThreadingHTTPServer] = None
+    dump_path: Optional[str] = None
+    stop = threading.Event()
+
+
+def setup(metrics_cfg: Optional[dict] = None) -> bool:
+    """
+    config.yaml metrics 섹션에 따라 계측을 켠다 (여러 번 호출해도 한 번만 적용). 켜졌으면 True.
+    """
+    metrics_cfg = metrics_cfg or {}
+    if _State.enabled or not metrics_cfg.get("enabled", False):
+        return _State.enabled
+
+    from src.db.db import SessionLocal
+    from src.transport import add_listener
+
+    add_listener(observe_request)
+    instrument_sessions(SessionLocal)
+    _State.enabled = True
+    logger = logging.getLogger(__name__)
+
+    port = int(metrics_cfg.get("port") or 0)
+    if port:
+        host = metrics_cfg.get("host", "127.0.0.1")
+        _State.server = start_http_server(port, host)
+        logger.info("[Metrics] Prometheus 엔드포인트: http://%s:%s/metrics", host, port)
+
+    dump_path = metrics_cfg.get("dump_path") or None
+    if dump_path and not os.path.isabs(dump_path):
+        dump_path = os.path.join(ROOT_DIR, dump_path)
+    _State.dump_path = dump_path
+    if _State.dump_path:
+        interval = float(metrics_cfg.get("dump_interval_sec", 15))
+
+        def loop():
+            while not _State.stop.wait(interval):
+                try:
+                    dump(_State.dump_path)
+                except Exception:
+                    logger.exception("[Metrics] 메트릭 파일 저장 실패")
+
+        threading.Thread(target=loop, name="metrics-dump", daemon=True).start()
+    return True
+
+
+def shutdown():
+    """
+    마지막 메트릭을 파일로 남기고 HTTP 엔드포인트를 닫는다.
+    """
+    _State.stop.set()
+    if _State.dump_path:
+        dump(_State.dump_path)
+    if _State.server is not None:
+        _State.server.shutdown()
+        _State.server.server_close()
+        _State.server = None
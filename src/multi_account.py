@@ -0,0 +1,167 @@
+# src/multi_account.py
+
+import copy
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from src.orders.base_manager import load_config
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 실행 결과
+# ─────────────────────────────────────────────────────────────────────────
+@dataclass
+class AccountRunResult:
+    name: str
+    CANO: str
+    ok: bool
+    duration: float
+    orders_planned: int = 0
+    orders_sent: int = 0
+    orders_failed: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class MultiAccountReport:
+    results: List[AccountRunResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def orders_sent(self) -> int:
+        return sum(r.orders_sent for r in self.results)
+
+    @property
+    def orders_failed(self) -> int:
+        return sum(r.orders_failed for r in self.results)
+
+    def summary(self) -> str:
+        slowest = max((r.duration for r in self.results), default=0.0)
+        return (
+            f"계좌 {len(self.results)}개 (성공 {self.succeeded}, 실패 {self.failed}), "
+            f"주문 전송 {self.orders_sent}건 / 실패 {self.orders_failed}건, "
+            f"총 소요 {self.wall_time:.2f}s (가장 느린 계좌 {slowest:.2f}s)"
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) MultiAccountRebalancer
+# ─────────────────────────────────────────────────────────────────────────
+class MultiAccountRebalancer:
+    """
+    config.yaml 의 accounts 목록을 한 프로세스 안에서 동시에 리밸런싱한다.
+
+        accounts:
+          - name: main
+            CANO: "12345678"
+            ACNT_PRDT_CD: "01"
+            weights: {TQQQ: 0.5, SGOV: 0.5}
+          - name: sub
+            CANO: "87654321"
+            ACNT_PRDT_CD: "01"
+            appkey_env: KIS_API_KEY_SUB       # 다른 appkey 를 쓰는 계좌
+            appsecret_env: KIS_APP_SECRET_SUB
+
+    각 항목은 account 섹션을 덮어쓰고, strategies 또는 weights 가 없으면 공통 목표비중
+    (target_allocation.yaml 전략 합산 또는 strategy.weights)을 사용한다.
+    같은 appkey 의 계좌들은 토큰/HTTP 연결/초당 요청 한도를 공유하며,
+    요청 한도는 계좌 간 라운드로빈으로 나눠 쓴다.
+    """
+
+    ACCOUNT_KEYS = ("CANO", "ACNT_PRDT_CD", "OVRS_EXCG_CD", "TR_CRCY_CD",
+                    "appkey_env", "appsecret_env", "token_env")
+
+    def __init__(self, rebalancer_factory: Callable, cfg: dict = None, max_workers: int = None):
+        """
+        rebalancer_factory : cfg 딕셔너리를 받아 Rebalancer 를 만드는 callable (보통 Rebalancer 클래스)
+        """
+        self.factory = rebalancer_factory
+        self.cfg = cfg if cfg is not None else load_config()
+        self.accounts = self.cfg.get("accounts") or []
+        self.max_workers = max_workers or max(len(self.accounts), 1)
+        self.logger = logging.getLogger(__name__)
+
+    def account_config(self, entry: dict) -> dict:
+        """
+        공통 설정에 계좌 항목을 덮어쓴 계좌별 설정 딕셔너리.
+        """
+        cfg = copy.deepcopy(self.cfg)
+        cfg.pop("accounts", None)
+        account = dict(cfg.get("account", {}))
+        account.update({k: entry[k] for k in self.ACCOUNT_KEYS if k in entry})
+        cfg["account"] = account
+
+        strategy = dict(cfg.get("strategy", {}))
+        if "strategies" in entry:
+            strategy["strategies"] = entry["strategies"]
+        elif "weights" in entry:
+            # 계좌별 비중이 공통 전략 파일보다 우선
+            strategy["weights"] = entry["weights"]
+            strategy.pop("strategies", None)
+            strategy["allocation_file"] = None
+        cfg["strategy"] = strategy
+        return cfg
+
+    def _run_account(self, entry: dict) -> AccountRunResult:
+        name = entry.get("name") or entry.get("CANO")
+        start = time.monotonic()
+        reb = None
+        try:
+            reb = self.factory(self.account_config(entry))
+            reb.rebalance()
+            plan = reb.last_plan
+            return AccountRunResult(
+                name=name,
+                CANO=entry.get("CANO"),
+                ok=True,
+                duration=time.monotonic() - start,
+                orders_planned=plan.order_count if plan is not None else 0,
+                orders_sent=reb.orders_sent,
+                orders_failed=reb.orders_failed,
+            )
+        except Exception as e:
+            self.logger.exception("[MultiAccountRebalancer] %s 리밸런싱 중 예외 발생", name)
+            return AccountRunResult(
+                name=name,
+                CANO=entry.get("CANO"),
+                ok=False,
+                duration=time.monotonic() - start,
+                error=str(e),
+            )
+        finally:
+            if reb is not None:
+                reb.close()
+
+    def run(self) -> MultiAccountReport:
+        """
+        모든 계좌를 동시에 리밸런싱하고 결과 보고서를 반환.
+        """
+        report = MultiAccountReport()
+        if not self.accounts:
+            self.logger.warning("[MultiAccountRebalancer] config.yaml 에 accounts 항목이 없습니다")
+            return report
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="account") as pool:
+            report.results = list(pool.map(self._run_account, self.accounts))
+        report.wall_time = time.monotonic() - start
+
+        for r in report.results:
+            status = "성공" if r.ok else f"실패 ({r.error})"
+            self.logger.info(
+                "[MultiAccountRebalancer] %s: %s, 계획 %s건, 전송 %s건, 실패 %s건, %.2fs",
+                r.name, status, r.orders_planned, r.orders_sent, r.orders_failed, r.duration
+            )
+        self.logger.info("[MultiAccountRebalancer] %s", report.summary())
+        return report
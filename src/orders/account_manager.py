@@ -1,6 +1,6 @@
 import logging
-import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
 
 from pydantic import ValidationError
 
@@ -8,6 +8,8 @@ from src.db.db import SessionLocal
 from src.orders.account_models import BalanceInquiryResponse
 from src.orders.order_models import RequestHeader
 from src.orders.base_manager import BaseManager
+from src.exchange_index import ExchangeRoutes, get_exchange_index
+from src import tracing
 
 
 class AccountManager(BaseManager):
@@ -15,8 +17,8 @@ class AccountManager(BaseManager):
     해외주식 잔고 조회 (v1_해외주식-006) 기능.
     """
 
-    def __init__(self):
-        super().__init__()  # BaseManager 초기화
+    def __init__(self, cfg: dict = None):
+        super().__init__(cfg)  # BaseManager 초기화
 
         # config.yaml의 account 섹션에서 계좌 정보 불러오기
         account_cfg = self.cfg.get("account", {})
@@ -25,6 +27,11 @@ class AccountManager(BaseManager):
         self.OVRS_EXCG_CD = account_cfg.get("OVRS_EXCG_CD")
         self.TR_CRCY_CD   = account_cfg.get("TR_CRCY_CD")
 
+        # 종목별 거래소 라우팅 (config.yaml exchange_routing 섹션): 공유 캐시 + 이 계좌의 수동 지정
+        routing_cfg = self.cfg.get("exchange_routing", {}) or {}
+        self.exchange_index    = ExchangeRoutes(get_exchange_index(routing_cfg), routing_cfg.get("symbols"))
+        self.balance_exchanges = routing_cfg.get("balance_exchanges") or [self.OVRS_EXCG_CD]
+
         # TR ID 및 API URL 설정
         self.BALANCE_TR_ID = "VTTS3012R" if self.use_mock else "TTTS3012R"
         balance_path = "/uapi/overseas-stock/v1/trading/inquire-balance"
@@ -49,7 +56,7 @@ class AccountManager(BaseManager):
                 }
             )
         except ValidationError as ve:
-            self.logger.error(f"[AccountManager] RequestHeader 검증 실패: {ve.json()}")
+            self.logger.error("[AccountManager] RequestHeader 검증 실패: %s", ve.json())
             return None
 
         return header_model.model_dump(by_alias=True, exclude_none=True)
@@ -86,8 +93,8 @@ class AccountManager(BaseManager):
         }
 
         try:
-            resp = requests.get(self.balance_api_url, headers=headers, params=params)
-            data = resp.json()
+            data = self.transport.get(self.balance_api_url, headers=headers, params=params, client=self.client_id,
+                                      reauth=self._reauth)
         except Exception:
             self.logger.exception("[AccountManager] 잔고 조회 중 HTTP 요청 에러 발생")
             return None
@@ -95,28 +102,58 @@ class AccountManager(BaseManager):
         try:
             parsed = BalanceInquiryResponse.parse_obj(data)
         except ValidationError as ve:
-            self.logger.error(f"[AccountManager] 잔고 조회 응답 파싱 실패: {ve.json()}")
+            self.logger.error("[AccountManager] 잔고 조회 응답 파싱 실패: %s", ve.json())
             return None
 
         if parsed.rt_cd != "0":
-            self.logger.error(f"[AccountManager] 잔고 조회 실패 (rt_cd={parsed.rt_cd}, msg1={parsed.msg1})")
+            self.logger.error("[AccountManager] 잔고 조회 실패 (rt_cd=%s, msg1=%s)", parsed.rt_cd, parsed.msg1)
             return None
 
         return parsed
 
+    def get_merged_balance(self, exchanges: Iterable[str] = None) -> Optional[BalanceInquiryResponse]:
+        """
+        여러 거래소의 잔고를 동시에 조회하여 하나의 응답으로 합친다.
+        output1 은 (종목, 거래소) 기준으로 중복 제거, output2 는 첫 성공 응답을 사용.
+        조회된 종목의 거래소는 exchange_index 에 기록된다.
+        """
+        exchanges = list(dict.fromkeys(exchanges or self.balance_exchanges))
+        if len(exchanges) == 1:
+            responses = [self.get_balance(OVRS_EXCG_CD=exchanges[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(exchanges)) as pool:
+                fetch = tracing.propagate(lambda ex: self.get_balance(OVRS_EXCG_CD=ex))
+                responses = list(pool.map(fetch, exchanges))
+
+        valid = [r for r in responses if r is not None]
+        if not valid:
+            return None
+        if len(valid) < len(responses):
+            self.logger.warning("[AccountManager] 일부 거래소 잔고 조회 실패, 성공한 거래소만 병합")
+
+        items = {}
+        for resp in valid:
+            for item in resp.output1:
+                items.setdefault((item.ovrs_pdno, item.ovrs_excg_cd), item)
+        merged = valid[0].model_copy(update={"output1": list(items.values())})
+        self.exchange_index.update_from_balance(merged)
+        return merged
+
     def get_cash_balance(
         self,
         CANO: str = None,
         ACNT_PRDT_CD: str = None,
         OVRS_EXCG_CD: str = None,
-        TR_CRCY_CD: str = None
+        TR_CRCY_CD: str = None,
+        balance: Optional[BalanceInquiryResponse] = None
     ) -> float:
         """
         예수금(현금) 조회. 잔고 조회 결과에서
         output1의 ovrs_stck_evlu_amt(평가금액) 합계와 output2.frcr_buy_amt_smtl1(총매입원금)을
         사용해 추정 계산을 수행.
+        balance 에 이미 조회한 잔고 응답을 넘기면 API 를 다시 호출하지 않는다.
         """
-        resp = self.get_balance(CANO, ACNT_PRDT_CD, OVRS_EXCG_CD, TR_CRCY_CD)
+        resp = balance if balance is not None else self.get_balance(CANO, ACNT_PRDT_CD, OVRS_EXCG_CD, TR_CRCY_CD)
         if resp is None:
             self.logger.error("[AccountManager] 잔고 조회 실패로 인한 예수금 반환 불가, 0.0 반환")
             return 0.0
@@ -1,6 +1,22 @@
 import os
 import yaml
 
+from src.transport import get_transport
+
+
+BASE_DIR    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(BASE_DIR, "..", "config", "config.yaml")
+
+
+def load_config(config_path: str = CONFIG_PATH) -> dict:
+    """
+    config.yaml 을 읽어 딕셔너리로 반환. 파일이 없으면 FileNotFoundError.
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {config_path}")
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
 
 class BaseManager:
     """
@@ -8,12 +24,17 @@ class BaseManager:
     모든 매니저는 이 클래스를 상속하여 config.yaml을 한 번만 읽도록 합니다.
     """
 
-    def __init__(self):
+    def __init__(self, cfg: dict = None):
+        """
+        cfg : 이미 로드한 설정 딕셔너리 (멀티 계좌 실행 시 계좌별 설정).
+              None 이면 config.yaml 을 읽는다.
+        """
         # 1) 환경변수에서 API 자격증명 읽기
         self._load_env_vars()
 
         # 2) config.yaml 로드
-        self.cfg = self._load_config()
+        self.cfg = cfg if cfg is not None else self._load_config()
+        self._load_account_credentials()
 
         # 3) trading 설정 읽기 (use_mock 등)
         self.use_mock = self._load_trading_config()
@@ -21,6 +42,35 @@ class BaseManager:
         # 4) path 설정 (domain, api path 등)
         self.DOMAIN_REAL, self.DOMAIN_MOCK, self.PATH_CFG = self._load_path_config()
 
+        # 5) appkey 단위 공유 HTTP 연결 (keep-alive) 및 초당 요청 한도
+        self._bind_transport()
+
+        # 요청 한도를 계좌 단위로 공평하게 나누기 위한 식별자
+        account_cfg = self.cfg.get("account", {})
+        self.client_id = f"{account_cfg.get('CANO')}-{account_cfg.get('ACNT_PRDT_CD')}"
+
+
+    def _bind_transport(self):
+        """
+        현재 appkey 의 공유 Transport 연결 (같은 appkey 면 기존 연결/요청 한도를 그대로 쓴다).
+        """
+        rate_cfg = self.cfg.get("rate_limit", {})
+        rate = rate_cfg.get("mock_per_sec", 2) if self.use_mock else rate_cfg.get("real_per_sec", 18)
+        self.transport = get_transport(self.api_key, rate)
+
+    def _reauth(self, stale: str):
+        """
+        서버가 만료로 거부한 토큰(stale)을 버리고 공유 TokenManager 에서 새 토큰을 받는다.
+        Transport 의 reauth 콜백. TokenManager 가 없으면 None (재요청하지 않음).
+        """
+        token_manager = getattr(self, "token_manager", None)
+        if token_manager is None:
+            return None
+        token_manager.invalidate(stale)
+        token = token_manager.get_token()
+        if token:
+            self.token = token
+        return token
 
     def _load_env_vars(self):
         """
@@ -34,22 +84,30 @@ class BaseManager:
             print(f"[BaseManager] 환경변수 로드 실패: {e}")
             exit(1)
 
+    def _load_account_credentials(self):
+        """
+        account 섹션에 appkey_env / appsecret_env / token_env 가 있으면
+        해당 환경변수에서 계좌별 자격증명을 읽는다 (멀티 계좌용).
+        """
+        account_cfg = self.cfg.get("account", {})
+        if account_cfg.get("appkey_env"):
+            self.api_key = os.getenv(account_cfg["appkey_env"])
+        if account_cfg.get("appsecret_env"):
+            self.app_secret = os.getenv(account_cfg["appsecret_env"])
+        if account_cfg.get("token_env"):
+            self.token = os.getenv(account_cfg["token_env"])
+
     def _load_config(self) -> dict:
         """
         프로젝트 루트의 config/config.yaml 파일을 읽어와 파싱한 딕셔너리를 반환.
         """
-        base_dir    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        config_path = os.path.join(base_dir, "config", "config.yaml")
-
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {config_path}")
-
-        with open(config_path, "r", encoding="utf-8") as f:
-            try:
-                return yaml.safe_load(f)
-            except Exception as e:
-                print(f"[BaseManager] config.yaml 파싱 실패: {e}")
-                exit(1)
+        try:
+            return load_config()
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            print(f"[BaseManager] config.yaml 파싱 실패: {e}")
+            exit(1)
 
     def _load_trading_config(self) -> bool:
         """
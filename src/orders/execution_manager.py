@@ -3,17 +3,18 @@
 import logging
 import os
 import yaml
-import requests
 
 from typing import Optional
 from pydantic import ValidationError
 
-from src.db.db import create_hold_from_order, create_trade_from_hold_and_delete, SessionLocal
-from src.db.models import OrderList, HoldList
+from src.db.db import create_hold_from_order, create_trade_from_hold_and_delete, find_order, SessionLocal
+from src.db.models import HoldList
 from src.order_execution_models import ExecutionInquiryResponse
 
 # Header 검증을 위해 RequestHeader 모델 재사용
 from src.orders.order_models import RequestHeader  
+from src.transport import get_transport
+from src import profiling, tracing
 
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -57,24 +58,39 @@ EXEC_TR_ID_MOCK = "VTTS3035R"
 
 
 class ExecutionManager:
-    def __init__(self, api_key: str, app_secret: str, token: str, use_mock: bool = None):
+    def __init__(self, api_key: str, app_secret: str, token: str, use_mock: bool = None, token_manager=None):
         """
-        api_key    : KIS appkey
-        app_secret : KIS appsecret
-        token      : OAuth 토큰 (Bearer <token>)
-        use_mock   : None 이면 config.yaml 읽은 값 사용, 아니면 인자로 받은 값
+        api_key       : KIS appkey
+        app_secret    : KIS appsecret
+        token         : OAuth 토큰 (Bearer <token>)
+        use_mock      : None 이면 config.yaml 읽은 값 사용, 아니면 인자로 받은 값
+        token_manager : 공유 TokenManager. 주면 토큰 만료(EGW00123) 응답 시 재발급 후 한 번 재요청
         """
         self.api_key    = api_key
         self.app_secret = app_secret
         self.token      = token
+        self.token_manager = token_manager
         self.use_mock   = use_mock_default if use_mock is None else use_mock
 
         base = DOMAIN_MOCK if self.use_mock else DOMAIN_REAL
         self.exec_url = f"{base}{EXEC_PATH}"
+        self.transport = get_transport(api_key)
 
         self.session = SessionLocal()
         self.logger  = logging.getLogger(__name__)
 
+    def _reauth(self, stale: str) -> Optional[str]:
+        """
+        만료로 거부된 토큰을 버리고 새 토큰을 받는다 (Transport reauth 콜백).
+        """
+        if self.token_manager is None:
+            return None
+        self.token_manager.invalidate(stale)
+        token = self.token_manager.get_token()
+        if token:
+            self.token = token
+        return token
+
     def _build_header(self, tr_id: str) -> Optional[dict]:
         """
         RequestHeader 모델로 헤더를 생성 및 검증
@@ -91,7 +107,7 @@ class ExecutionManager:
                 }
             )
         except ValidationError as ve:
-            self.logger.error(f"RequestHeader 검증 실패: {ve.json()}")
+            self.logger.error("RequestHeader 검증 실패: %s", ve.json())
             return None
 
         return header_model.dict(by_alias=True, exclude_none=True)
@@ -148,8 +164,7 @@ class ExecutionManager:
         }
 
         try:
-            resp = requests.get(self.exec_url, headers=headers, params=params)
-            data = resp.json()
+            data = self.transport.get(self.exec_url, headers=headers, params=params, reauth=self._reauth)
         except Exception as e:
             self.logger.exception("주문체결내역 조회 중 HTTP 요청 에러 발생")
             return None
@@ -157,11 +172,11 @@ class ExecutionManager:
         try:
             parsed = ExecutionInquiryResponse.parse_obj(data)
         except ValidationError as ve:
-            self.logger.error(f"주문체결내역 응답 파싱 실패: {ve.json()}")
+            self.logger.error("주문체결내역 응답 파싱 실패: %s", ve.json())
             return None
 
         if parsed.rt_cd != "0":
-            self.logger.error(f"주문체결내역 조회 실패 (rt_cd={parsed.rt_cd}, msg1={parsed.msg1})")
+            self.logger.error("주문체결내역 조회 실패 (rt_cd=%s, msg1=%s)", parsed.rt_cd, parsed.msg1)
             return None
 
         return parsed
@@ -172,47 +187,49 @@ class ExecutionManager:
         각 output 레코드마다 다음을 수행:
 
         - sll_buy_dvsn_cd == "02" (매수 체결):
-            1) OrderList에서 해당 주문번호(orgn_odno)로 주문을 조회
+            1) OrderList에서 해당 주문일자(ord_dt)의 주문번호(orgn_odno)로 주문을 조회
             2) create_hold_from_order(order) 호출 → hold_list 생성 + order.status="체결"
         - sll_buy_dvsn_cd == "01" (매도 체결):
             1) HoldList에서 pdno(종목코드)로 보유 조회
             2) create_trade_from_hold_and_delete(hold, sell_price) 호출 → trade_history 생성 + hold_list 삭제 + order.status="매도완료"
         """
-        for item in execution_response.output:
-            # 1) 매수 체결
-            if item.sll_buy_dvsn_cd == "02":
-                session = SessionLocal()
-                try:
-                    order = session.query(OrderList).filter(OrderList.order_id == item.orgn_odno).first()
-                    if order:
-                        create_hold_from_order(order)
-                    else:
-                        self.logger.warning(f"매수 체결: OrderList에서 주문번호 {item.orgn_odno}를 찾을 수 없음")
-                except Exception:
-                    session.rollback()
-                    self.logger.exception("매수 체결 처리 중 DB 에러 발생")
-                finally:
-                    session.close()
-
-            # 2) 매도 체결
-            elif item.sll_buy_dvsn_cd == "01":
-                session = SessionLocal()
-                try:
-                    hold = session.query(HoldList).filter(HoldList.code == item.pdno).first()
-                    if hold:
-                        sell_price = int(item.ft_ccld_unpr3)
-                        create_trade_from_hold_and_delete(hold, sell_price)
-                    else:
-                        self.logger.warning(f"매도 체결: HoldList에서 종목 {item.pdno}를 찾을 수 없음")
-                except Exception:
-                    session.rollback()
-                    self.logger.exception("매도 체결 처리 중 DB 에러 발생")
-                finally:
-                    session.close()
-
-            else:
-                # 기타(예: SLL_BUY_DVSN="00" 전체 조회 시도)
-                continue
+        with profiling.profile("execution_sync"), \
+                tracing.trace("process_executions", fills=len(execution_response.output)):
+            for item in execution_response.output:
+                # 1) 매수 체결
+                if item.sll_buy_dvsn_cd == "02":
+                    session = SessionLocal()
+                    try:
+                        order = find_order(session, item.orgn_odno, item.ord_dt)
+                        if order:
+                            create_hold_from_order(order)
+                        else:
+                            self.logger.warning("매수 체결: OrderList에서 주문번호 %s를 찾을 수 없음", item.orgn_odno)
+                    except Exception:
+                        session.rollback()
+                        self.logger.exception("매수 체결 처리 중 DB 에러 발생")
+                    finally:
+                        session.close()
+
+                # 2) 매도 체결
+                elif item.sll_buy_dvsn_cd == "01":
+                    session = SessionLocal()
+                    try:
+                        hold = session.query(HoldList).filter(HoldList.code == item.pdno).first()
+                        if hold:
+                            sell_price = int(item.ft_ccld_unpr3)
+                            create_trade_from_hold_and_delete(hold, sell_price)
+                        else:
+                            self.logger.warning("매도 체결: HoldList에서 종목 %s를 찾을 수 없음", item.pdno)
+                    except Exception:
+                        session.rollback()
+                        self.logger.exception("매도 체결 처리 중 DB 에러 발생")
+                    finally:
+                        session.close()
+
+                else:
+                    # 기타(예: SLL_BUY_DVSN="00" 전체 조회 시도)
+                    continue
 
     def close(self):
         self.session.close()
@@ -1,5 +1,4 @@
 import logging
-import requests
 from typing import Optional
 
 from pydantic import ValidationError
@@ -14,8 +13,8 @@ class MarginManager(BaseManager):
     해외증거금 통화별조회 (v1_해외주식-035) 기능.
     """
 
-    def __init__(self):
-        super().__init__()  # BaseManager 초기화
+    def __init__(self, cfg: dict = None):
+        super().__init__(cfg)  # BaseManager 초기화
 
         # TR ID 및 API URL 설정 (모의투자 미지원)
         self.MARGIN_TR_ID    = "TTTC2101R"
@@ -40,7 +39,7 @@ class MarginManager(BaseManager):
                 }
             )
         except ValidationError as ve:
-            self.logger.error(f"[MarginManager] RequestHeader 검증 실패: {ve.json()}")
+            self.logger.error("[MarginManager] RequestHeader 검증 실패: %s", ve.json())
             return None
 
         return header_model.dict(by_alias=True, exclude_none=True)
@@ -67,8 +66,8 @@ class MarginManager(BaseManager):
         }
 
         try:
-            resp = requests.get(self.margin_api_url, headers=headers, params=params)
-            data = resp.json()
+            data = self.transport.get(self.margin_api_url, headers=headers, params=params, client=self.client_id,
+                                      reauth=self._reauth)
         except Exception:
             self.logger.exception("[MarginManager] 증거금 조회 중 HTTP 요청 에러 발생")
             return None
@@ -76,31 +75,49 @@ class MarginManager(BaseManager):
         try:
             parsed = MarginResponse.parse_obj(data)
         except ValidationError as ve:
-            self.logger.error(f"[MarginManager] 증거금 조회 응답 파싱 실패: {ve.json()}")
+            self.logger.error("[MarginManager] 증거금 조회 응답 파싱 실패: %s", ve.json())
             return None
 
         if parsed.rt_cd != "0":
-            self.logger.error(f"[MarginManager] 증거금 조회 실패 (rt_cd={parsed.rt_cd}, msg1={parsed.msg1})")
+            self.logger.error("[MarginManager] 증거금 조회 실패 (rt_cd=%s, msg1=%s)", parsed.rt_cd, parsed.msg1)
             return None
 
         return parsed
 
-    def get_usd_available_cash(self, CANO: str = None, ACNT_PRDT_CD: str = None) -> float:
+    def get_available_cash(
+        self,
+        currency: str = "USD",
+        CANO: str = None,
+        ACNT_PRDT_CD: str = None,
+        margin: Optional[MarginResponse] = None
+    ) -> float:
         """
-        USD 외화일반주문가능금액 반환.
+        통화별 외화일반주문가능금액 반환.
+        margin 에 이미 조회한 증거금 응답을 넘기면 API 를 다시 호출하지 않는다.
         """
-        resp = self.get_foreign_margin(CANO, ACNT_PRDT_CD)
+        resp = margin if margin is not None else self.get_foreign_margin(CANO, ACNT_PRDT_CD)
         if resp is None:
-            self.logger.error("[MarginManager] foreign-margin 응답 없거나 파싱 실패로 USD 주문가능금액 반환 불가, 0.0 반환")
+            self.logger.error("[MarginManager] foreign-margin 응답 없거나 파싱 실패로 %s 주문가능금액 반환 불가, 0.0 반환", currency)
             return 0.0
 
         for item in resp.output:
-            if item.crcy_cd.upper() == "USD":
+            if item.crcy_cd.upper() == currency.upper():
                 try:
                     return float(item.frcr_gnrl_ord_psbl_amt)
                 except Exception:
-                    self.logger.error(f"[MarginManager] USD 주문가능금액 파싱 오류: {item.frcr_gnrl_ord_psbl_amt}")
+                    self.logger.error("[MarginManager] %s 주문가능금액 파싱 오류: %s", currency, item.frcr_gnrl_ord_psbl_amt)
                     return 0.0
 
-        self.logger.warning("[MarginManager] USD 통화 정보가 응답에 없습니다. 0.0 반환")
+        self.logger.warning("[MarginManager] %s 통화 정보가 응답에 없습니다. 0.0 반환", currency)
         return 0.0
+
+    def get_usd_available_cash(
+        self,
+        CANO: str = None,
+        ACNT_PRDT_CD: str = None,
+        margin: Optional[MarginResponse] = None
+    ) -> float:
+        """
+        USD 외화일반주문가능금액 반환.
+        """
+        return self.get_available_cash("USD", CANO, ACNT_PRDT_CD, margin=margin)
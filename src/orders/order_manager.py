@@ -1,15 +1,15 @@
 import logging
 import uuid
 from datetime import datetime
-import requests
 from typing import Optional
 
 from pydantic import ValidationError
 
-from src.db.db import SessionLocal
+from src.db.db import SessionLocal, find_order
 from src.db.models import OrderList
 from src.orders.order_models import RequestHeader, RequestBody, ResponseBody as OrderResponseBody
 from src.orders.base_manager import BaseManager
+from src.symbol_master import get_symbol_master
 
 
 class OrderManager(BaseManager):
@@ -17,8 +17,8 @@ class OrderManager(BaseManager):
     해외주식 주문 생성/정정/취소 기능(v1_해외주식-001).
     """
 
-    def __init__(self):
-        super().__init__()  # BaseManager 초기화
+    def __init__(self, cfg: dict = None):
+        super().__init__(cfg)  # BaseManager 초기화
 
         # 주문 API 경로(config.yaml의 path.api) 사용
         order_path = self.PATH_CFG.get("api", "/uapi/overseas-stock/v1/trading/order")
@@ -26,6 +26,7 @@ class OrderManager(BaseManager):
         self.api_url = f"{base}{order_path}"
 
         self.session = SessionLocal()
+        self.symbol_master = get_symbol_master(self.cfg.get("symbol_master"))
         self.logger  = logging.getLogger(__name__)
 
     def _build_tr_id(self, is_buy: bool) -> str:
@@ -49,7 +50,7 @@ class OrderManager(BaseManager):
         ORD_QTY: int,
         OVRS_ORD_UNPR: int,
         order_type: str,
-        name: str,
+        name: Optional[str],
         qty: int,
         price: int,
         CTAC_TLNO: str = None,
@@ -66,9 +67,12 @@ class OrderManager(BaseManager):
         gt_uid: str = None,
     ) -> Optional[str]:
         """
-        해외주식 주문 API 호출 → DB에 저장 → order_id 반환
+        해외주식 주문 API 호출 → DB에 저장 → KIS 주문번호(ODNO) 반환.
+        체결내역 조회의 odno/orgn_odno 와 같은 값이라 체결 반영 시 이 번호로 주문을 찾는다.
+        주문번호는 매일 다시 매겨지므로 DB 에는 대리키(uuid)와 (주문일자, ODNO)로 저장하며,
+        주문은 이미 접수되었으므로 DB 저장이 실패해도 ODNO 를 반환한다.
+        name 이 None 이면 종목 마스터의 회사명(없으면 종목코드)을 기록한다.
         """
-        order_id = str(uuid.uuid4())
         order_time = datetime.now()
 
         tr_id = self._build_tr_id(is_buy)
@@ -85,7 +89,7 @@ class OrderManager(BaseManager):
                 }
             )
         except ValidationError as ve:
-            self.logger.error(f"[OrderManager] RequestHeader 검증 실패: {ve.json()}")
+            self.logger.error("[OrderManager] RequestHeader 검증 실패: %s", ve.json())
             return None
 
         # Body 검증용 Pydantic
@@ -107,17 +111,18 @@ class OrderManager(BaseManager):
                 ALGO_ORD_TMD_DVSN_CD=ALGO_ORD_TMD_DVSN_CD,
             )
         except ValidationError as ve:
-            self.logger.error(f"[OrderManager] RequestBody 검증 실패: {ve.json()}")
+            self.logger.error("[OrderManager] RequestBody 검증 실패: %s", ve.json())
             return None
 
         # HTTP 요청
         try:
-            resp = requests.post(
+            data = self.transport.post(
                 self.api_url,
                 headers=header_model.dict(by_alias=True, exclude_none=True),
-                json=body_model.dict(by_alias=True, exclude_none=True)
+                json=body_model.dict(by_alias=True, exclude_none=True),
+                client=self.client_id,
+                reauth=self._reauth,
             )
-            data = resp.json()
         except Exception:
             self.logger.exception("[OrderManager] 주문 생성 중 HTTP 요청 에러 발생")
             return None
@@ -126,15 +131,18 @@ class OrderManager(BaseManager):
         try:
             resp_model = OrderResponseBody.parse_obj(data)
         except ValidationError as ve:
-            self.logger.error(f"[OrderManager] 응답 파싱 실패: {ve.json()}")
+            self.logger.error("[OrderManager] 응답 파싱 실패: %s", ve.json())
             return None
 
         if resp_model.rt_cd == "0":
             # DB 저장
+            odno = resp_model.output.ODNO
             new_order = OrderList(
-                order_id   = order_id,
+                order_id   = str(uuid.uuid4()),
+                odno       = odno,
+                order_date = order_time.strftime("%Y%m%d"),
                 code       = PDNO,
-                name       = name,
+                name       = name or self.symbol_master.name(PDNO, PDNO),
                 order_type = order_type,
                 qty        = qty,
                 remain_qty = qty,
@@ -145,34 +153,37 @@ class OrderManager(BaseManager):
             try:
                 self.session.add(new_order)
                 self.session.commit()
-                self.logger.info(f"[OrderManager] Order created successfully: {order_id}")
-                return order_id
+                self.logger.info("[OrderManager] Order created successfully: %s", odno)
             except Exception:
-                self.logger.exception("[OrderManager] DB 저장 중 에러 발생")
-                return None
+                self.session.rollback()
+                self.logger.exception("[OrderManager] DB 저장 중 에러 발생 (주문은 접수됨: %s)", odno)
+            return odno
         else:
-            self.logger.error(f"[OrderManager] Order API Error (rt_cd={resp_model.rt_cd}, msg1={resp_model.msg1})")
+            self.logger.error("[OrderManager] Order API Error (rt_cd=%s, msg1=%s)", resp_model.rt_cd, resp_model.msg1)
             return None
 
     def modify_order(self, order_id: str, new_qty: int, new_price: int) -> bool:
-        order = self.session.query(OrderList).filter(OrderList.order_id == order_id).first()
+        """
+        order_id 는 create_order 가 반환한 KIS 주문번호(ODNO) (같은 번호가 여러 날 있으면 최근 주문).
+        """
+        order = find_order(self.session, order_id)
         if order:
             order.qty = new_qty
             order.cum_price = new_price * new_qty
             self.session.commit()
             return True
         else:
-            self.logger.error(f"[OrderManager] Order {order_id} not found")
+            self.logger.error("[OrderManager] Order %s not found", order_id)
             return False
 
     def cancel_order(self, order_id: str) -> bool:
-        order = self.session.query(OrderList).filter(OrderList.order_id == order_id).first()
+        order = find_order(self.session, order_id)
         if order:
             order.status = "취소"
             self.session.commit()
             return True
         else:
-            self.logger.error(f"[OrderManager] Order {order_id} not found")
+            self.logger.error("[OrderManager] Order %s not found", order_id)
             return False
 
     def close(self):
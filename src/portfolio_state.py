@@ -0,0 +1,195 @@
+# src/portfolio_state.py
+
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class PortfolioState:
+    """
+    메모리 상의 포트폴리오 상태.
+
+    - seed()        : 잔고/증거금 조회 결과로 전체 초기화 (전체 재동기화)
+    - apply_quote() : 현재가 갱신
+    - apply_fill()  : 체결(또는 체결 가정) 반영 → 수량/예수금 갱신
+    - assume_fill() / reconcile_fill() : 주문 직후 전량 체결을 가정하고,
+                      체결내역 조회(inquire-ccnl)의 실제 체결수량/체결가로 바로잡는다
+    평가금액, 비중 조회는 누적 합계를 유지하므로 O(1)이며 API 호출이 없다.
+    resync_interval 초가 지나거나 mark_stale() 이 호출되면 needs_resync() 가 True.
+    """
+
+    def __init__(self, resync_interval: float = 0.0):
+        self.resync_interval = float(resync_interval)
+        self.codes = []
+        self.index: Dict[str, int] = {}
+        self._qty = np.zeros(16)
+        self._prices = np.zeros(16)
+        self.cash = 0.0
+        self.stock_value = 0.0
+        self.last_sync: Optional[float] = None
+        self._stale = True
+        # 체결 확인 전 주문: {주문번호: [종목, 매수여부, 주문가, 반영한 체결수량, 체결가, 반영한 미체결수량]}
+        self.pending: Dict[str, list] = {}
+
+    # ── 내부 ─────────────────────────────────────────────────────────────
+    def _slot(self, code: str) -> int:
+        i = self.index.get(code)
+        if i is not None:
+            return i
+        i = len(self.codes)
+        if i >= self._qty.size:
+            self._qty = np.concatenate([self._qty, np.zeros(self._qty.size)])
+            self._prices = np.concatenate([self._prices, np.zeros(self._prices.size)])
+        self.codes.append(code)
+        self.index[code] = i
+        return i
+
+    # ── 동기화 ───────────────────────────────────────────────────────────
+    def seed(
+        self,
+        positions: Dict[str, Tuple[float, float]],
+        cash: float,
+        universe: Iterable[str] = (),
+    ):
+        """
+        positions : {종목코드: (수량, 현재가)}
+        cash      : 주문가능 예수금
+        universe  : 보유하지 않았더라도 미리 등록할 종목 (목표 종목 등)
+        """
+        universe = list(universe)
+        self.codes = []
+        self.index = {}
+        size = max(16, len(positions) + len(universe))
+        self._qty = np.zeros(size)
+        self._prices = np.zeros(size)
+        for code in universe:
+            self._slot(code)
+        for code, (qty, price) in positions.items():
+            i = self._slot(code)
+            self._qty[i] = qty
+            self._prices[i] = price
+
+        n = len(self.codes)
+        self.cash = float(cash)
+        self.stock_value = float((self._qty[:n] * self._prices[:n]).sum())
+        self.last_sync = time.monotonic()
+        self._stale = False
+        self.pending = {}
+
+    def mark_stale(self):
+        self._stale = True
+
+    def needs_resync(self, now: Optional[float] = None) -> bool:
+        if self._stale or self.last_sync is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self.last_sync >= self.resync_interval
+
+    # ── 증분 갱신 ────────────────────────────────────────────────────────
+    def apply_quote(self, code: str, price: Optional[float]):
+        """
+        현재가 갱신. 등록되지 않은 종목은 가격만 기록한다.
+        """
+        if price is None:
+            return
+        i = self._slot(code)
+        self.stock_value += self._qty[i] * (price - self._prices[i])
+        self._prices[i] = price
+
+    def apply_fill(self, code: str, is_buy: bool, qty: float, price: float):
+        """
+        체결 반영: 수량과 예수금을 갱신하고 현재가를 체결가로 맞춘다.
+        """
+        self.apply_quote(code, price)
+        i = self.index[code]
+        signed = qty if is_buy else -qty
+        self._qty[i] += signed
+        self.stock_value += signed * price
+        self.cash -= signed * price
+
+    def assume_fill(self, order_id: Optional[str], code: str, is_buy: bool, qty: float, price: float):
+        """
+        주문 전송 직후 주문가 전량 체결을 가정해 반영하고, 주문번호를 체결 확인 대기로 기록한다.
+        """
+        self.apply_fill(code, is_buy, qty, price)
+        if order_id:
+            self.pending[order_id] = [code, is_buy, price, 0.0, 0.0, float(qty)]
+
+    def reconcile_fill(self, order_id: str, filled_qty: float, fill_price: float, open_qty: float) -> bool:
+        """
+        체결내역 조회 결과로 가정 체결을 바로잡는다.
+        filled_qty / fill_price : 누적 체결수량 / 체결단가, open_qty : 아직 열린 미체결수량
+        (취소/거부로 닫힌 주문은 0). 체결분은 체결가로, 미체결분은 주문가 가정 그대로 두고
+        앞서 반영한 양과의 차이만 수량/예수금에 더한다. 주문이 닫히면 대기 목록에서 뺀다.
+        대기 중인 주문이 아니면 False.
+        """
+        entry = self.pending.get(order_id)
+        if entry is None:
+            return False
+        code, is_buy, order_price, filled, avg, unfilled = entry
+        sign = 1.0 if is_buy else -1.0
+        i = self.index[code]
+        delta_qty = (filled_qty + open_qty) - (filled + unfilled)
+        delta_cash = (filled_qty * fill_price + open_qty * order_price) - (filled * avg + unfilled * order_price)
+        self._qty[i] += sign * delta_qty
+        self.stock_value += sign * delta_qty * self._prices[i]
+        self.cash -= sign * delta_cash
+        if filled_qty > 0:
+            self.apply_quote(code, fill_price)
+
+        if open_qty > 0:
+            entry[3:] = [float(filled_qty), float(fill_price), float(open_qty)]
+        else:
+            del self.pending[order_id]
+        return True
+
+    # ── 조회 (O(1)) ──────────────────────────────────────────────────────
+    @property
+    def total_value(self) -> float:
+        return self.stock_value + self.cash
+
+    def qty(self, code: str) -> float:
+        i = self.index.get(code)
+        return float(self._qty[i]) if i is not None else 0.0
+
+    def price(self, code: str) -> float:
+        i = self.index.get(code)
+        return float(self._prices[i]) if i is not None else 0.0
+
+    def value(self, code: str) -> float:
+        i = self.index.get(code)
+        return float(self._qty[i] * self._prices[i]) if i is not None else 0.0
+
+    def weight(self, code: str) -> float:
+        total = self.total_value
+        return self.value(code) / total if total > 0 else 0.0
+
+    # ── 배열 조회 ────────────────────────────────────────────────────────
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._qty[:len(self.codes)]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:len(self.codes)]
+
+    def weights(self) -> np.ndarray:
+        """
+        self.codes 순서의 현재 비중 배열
+        """
+        total = self.total_value
+        if total <= 0:
+            return np.zeros(len(self.codes))
+        return self.quantities * self.prices / total
+
+    def arrays(self, codes: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        주어진 종목 순서대로 (현재가, 수량) 배열 반환. 미등록 종목은 0.
+        """
+        idx = np.array([self.index.get(c, -1) for c in codes], dtype=np.int64)
+        known = idx >= 0
+        safe = np.where(known, idx, 0)
+        prices = np.where(known, self._prices[safe], 0.0)
+        qty = np.where(known, self._qty[safe], 0.0)
+        return prices, qty
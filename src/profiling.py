@@ -0,0 +1,250 @@
+# src/profiling.py
+"""
+운영 중 켤 수 있는 프로파일링 모드 (코드 수정 없이 환경변수로 제어).
+
+    KIS_PROFILE=cpu,alloc,wall     # 또는 all. 비어 있으면 비활성
+    KIS_PROFILE_DIR=data/profiles  # 결과 저장 위치 (기본값)
+    KIS_PROFILE_INTERVAL_MS=5      # wall 샘플링 간격
+
+프로파일 대상: 리밸런싱(rebalance), 체결내역 동기화(execution_sync), 토큰 재발급(token).
+구간마다 <시각>-<이름>.* 파일을 남긴다.
+    cpu   : .pstats (cProfile, 호출한 스레드만) + .txt 상위 함수 요약
+    alloc : .tracemalloc (Snapshot.dump) + .alloc.txt 할당 위치 상위 목록
+    wall  : .collapsed (전체 스레드 스택 샘플링, I/O 대기 포함) → flamegraph.pl / speedscope
+
+한 번에 하나의 구간만 프로파일한다 (동시/중첩 구간은 그대로 실행).
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES    = ("cpu", "alloc", "wall")
+TOP_N    = 20
+
+
+class _Config:
+    modes: frozenset = frozenset()
+    output_dir: str = os.path.join(ROOT_DIR, "data", "profiles")
+    interval: float = 0.005
+
+
+def configure(modes: Iterable[str] = (), output_dir: Optional[str] = None, interval_ms: Optional[float] = None):
+    modes = {m.strip().lower() for m in modes if m and m.strip()}
+    if "all" in modes:
+        modes = set(MODES)
+    unknown = modes - set(MODES)
+    if unknown:
+        logging.getLogger(__name__).warning("[Profiler] 알 수 없는 프로파일 모드 무시: %s", sorted(unknown))
+    _Config.modes = frozenset(modes & set(MODES))
+    if output_dir:
+        _Config.output_dir = output_dir if os.path.isabs(output_dir) else os.path.join(ROOT_DIR, output_dir)
+    if interval_ms:
+        _Config.interval = float(interval_ms) / 1000.0
+
+
+def configure_from_env():
+    configure(
+        os.getenv("KIS_PROFILE", "").split(","),
+        os.getenv("KIS_PROFILE_DIR"),
+        os.getenv("KIS_PROFILE_INTERVAL_MS"),
+    )
+
+
+def enabled() -> bool:
+    return bool(_Config.modes)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) wall-clock 스택 샘플러
+# ─────────────────────────────────────────────────────────────────────────
+class StackSampler:
+    """
+    interval 마다 모든 스레드의 현재 스택을 기록해 collapsed stack 으로 집계.
+    CPU 를 쓰지 않는 대기(HTTP 응답, 요청 한도, 락)도 샘플에 잡힌다.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                self.counts[f"{names.get(ident, ident)};{self._collapse(frame)}"] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 프로파일 구간
+# ─────────────────────────────────────────────────────────────────────────
+_active_lock = threading.Lock()
+
+
+class _Session:
+    def __init__(self, name: str, modes: frozenset):
+        self.name = name
+        self.modes = modes
+        self.owner = False
+        self.cpu: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+        self.started_tracemalloc = False
+        self.start = 0.0
+        self.files: Dict[str, str] = {}
+
+    def __enter__(self):
+        self.owner = _active_lock.acquire(blocking=False)
+        if not self.owner:
+            return self
+        try:
+            if "alloc" in self.modes and not tracemalloc.is_tracing():
+                tracemalloc.start(25)
+                self.started_tracemalloc = True
+            if "wall" in self.modes:
+                self.sampler = StackSampler(_Config.interval)
+                self.sampler.start()
+            if "cpu" in self.modes:
+                self.cpu = cProfile.Profile()
+                self.cpu.enable()
+        except Exception:
+            # 시작 실패 (예: 다른 프로파일러가 이미 동작 중) → 시작한 것만 되돌리고 측정 없이 진행
+            logging.getLogger(__name__).exception("[Profiler] %s 프로파일 시작 실패, 측정 없이 진행", self.name)
+            self._abort()
+            return self
+        self.start = time.perf_counter()
+        return self
+
+    def _abort(self):
+        try:
+            if self.sampler is not None:
+                self.sampler.stop()
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+        finally:
+            self.cpu = None
+            self.sampler = None
+            self.started_tracemalloc = False
+            self.owner = False
+            _active_lock.release()
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.owner:
+            return False
+        try:
+            elapsed = time.perf_counter() - self.start
+            if self.cpu is not None:
+                self.cpu.disable()
+            if self.sampler is not None:
+                self.sampler.stop()
+            snapshot = tracemalloc.take_snapshot() if "alloc" in self.modes and tracemalloc.is_tracing() else None
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+            self._write(elapsed, snapshot)
+        except Exception:
+            logging.getLogger(__name__).exception("[Profiler] 프로파일 결과 저장 실패")
+        finally:
+            _active_lock.release()
+        return False
+
+    def _write(self, elapsed: float, snapshot):
+        logger = logging.getLogger(__name__)
+        os.makedirs(_Config.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        prefix = os.path.join(_Config.output_dir, f"{stamp}-{self.name}")
+
+        if self.cpu is not None:
+            self.files["pstats"] = f"{prefix}.pstats"
+            self.cpu.dump_stats(self.files["pstats"])
+            summary = io.StringIO()
+            pstats.Stats(self.cpu, stream=summary).sort_stats("tottime").print_stats(TOP_N)
+            self.files["summary"] = f"{prefix}.txt"
+            with open(self.files["summary"], "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+            stats = pstats.Stats(self.cpu).stats
+            hot = sorted(stats.items(), key=lambda kv: kv[1][2], reverse=True)[:5]
+            for (filename, line, func), (_, ncalls, tottime, cumtime, _) in hot:
+                logger.info(
+                    "[Profiler] %s hot: %s:%s(%s) tottime=%.4fs cumtime=%.4fs calls=%s",
+                    self.name, os.path.basename(filename), line, func, tottime, cumtime, ncalls
+                )
+
+        if snapshot is not None:
+            self.files["tracemalloc"] = f"{prefix}.tracemalloc"
+            snapshot.dump(self.files["tracemalloc"])
+            self.files["alloc"] = f"{prefix}.alloc.txt"
+            with open(self.files["alloc"], "w", encoding="utf-8") as f:
+                for stat in snapshot.statistics("lineno")[:TOP_N]:
+                    f.write(f"{stat}\n")
+
+        if self.sampler is not None:
+            self.files["collapsed"] = f"{prefix}.collapsed"
+            self.sampler.write(self.files["collapsed"])
+
+        logger.info("[Profiler] %s %.3fs 프로파일 저장: %s", self.name, elapsed, ', '.join(self.files.values()))
+
+
+class _NoopSession:
+    __slots__ = ()
+    files: Dict[str, str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSession()
+
+
+def profile(name: str):
+    """
+    with profiling.profile("rebalance"): ...  (KIS_PROFILE 이 비어 있으면 no-op)
+    """
+    if not _Config.modes:
+        return _NOOP
+    return _Session(name, _Config.modes)
+
+
+configure_from_env()
@@ -0,0 +1,62 @@
+# src/rate_limiter.py
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable
+
+
+class RateLimiter:
+    """
+    appkey 단위 초당 요청 제한 (토큰 버킷).
+
+    여러 계좌(client)가 같은 appkey 를 공유할 때, 대기 중인 계좌들에게
+    라운드로빈으로 한 슬롯씩 배정하여 한 계좌가 한도를 독점하지 못하게 한다.
+    rate <= 0 이면 제한하지 않는다.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(self.rate, 1.0))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting: Dict[Hashable, Deque[object]] = {}
+        self._order: Deque[Hashable] = deque()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, client: Hashable = "default") -> float:
+        """
+        슬롯 하나를 얻을 때까지 대기. 반환값은 대기한 시간(초).
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        start = time.monotonic()
+        ticket = object()
+        with self._cond:
+            queue = self._waiting.setdefault(client, deque())
+            if not queue:
+                self._order.append(client)
+            queue.append(ticket)
+
+            while True:
+                self._refill()
+                my_turn = self._order[0] == client and queue[0] is ticket
+                if my_turn and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    queue.popleft()
+                    self._order.popleft()
+                    if queue:
+                        self._order.append(client)
+                    else:
+                        del self._waiting[client]
+                    self._cond.notify_all()
+                    return time.monotonic() - start
+
+                timeout = None if not my_turn else (1.0 - self._tokens) / self.rate
+                self._cond.wait(timeout)
@@ -0,0 +1,180 @@
+# src/rebalance_engine.py
+
+from dataclasses import dataclass
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 리밸런싱 계획 (RebalancePlan)
+# ─────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class RebalancePlan:
+    """
+    한 번의 리밸런싱 계산 결과.
+    모든 배열은 codes와 같은 순서(종목 인덱스)를 따른다.
+    """
+    codes: Tuple[str, ...]
+    prices: np.ndarray          # 현재가
+    current_qty: np.ndarray     # 현재 보유 수량
+    target_values: np.ndarray   # 목표 평가금액
+    diffs: np.ndarray           # 목표 - 현재 평가금액
+    sell_qty: np.ndarray        # 매도 수량 (정수)
+    buy_qty: np.ndarray         # 매수 수량 (정수, 현금 제약 반영)
+    cash_before: float          # 리밸런싱 전 예수금
+    cash_after: float           # 모든 주문 체결 가정 시 예상 예수금
+    total_value: float          # 주식 평가금액(목표 외 보유 종목 포함) + 예수금
+
+    def sells(self) -> Iterator[Tuple[str, int, float]]:
+        """
+        (종목코드, 매도수량, 현재가) 순회
+        """
+        for i in np.flatnonzero(self.sell_qty):
+            yield self.codes[i], int(self.sell_qty[i]), float(self.prices[i])
+
+    def buys(self) -> Iterator[Tuple[str, int, float]]:
+        """
+        (종목코드, 매수수량, 현재가) 순회
+        """
+        for i in np.flatnonzero(self.buy_qty):
+            yield self.codes[i], int(self.buy_qty[i]), float(self.prices[i])
+
+    @property
+    def order_count(self) -> int:
+        return int(np.count_nonzero(self.sell_qty) + np.count_nonzero(self.buy_qty))
+
+    @property
+    def turnover(self) -> float:
+        """
+        매도 + 매수 거래대금 합계
+        """
+        return float(((self.sell_qty + self.buy_qty) * self.prices).sum())
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 벡터화 계산 함수
+#    모든 함수는 마지막 축을 종목 축으로 사용하므로
+#    (N,) 단일 계획과 (K, N) 후보 계획 묶음을 동일하게 처리한다.
+# ─────────────────────────────────────────────────────────────────────────
+def fit_buys_to_cash(buy_want: np.ndarray, prices: np.ndarray, cash) -> np.ndarray:
+    """
+    원하는 매수 수량(buy_want)의 총 비용이 가용 현금을 넘으면
+    1) 전체 수량을 같은 비율로 줄인 뒤 내림(floor)하고
+    2) 남은 현금으로 부족분이 큰 종목부터 1주씩 추가 배정한다.
+    """
+    cash = np.maximum(np.asarray(cash, dtype=float), 0.0)
+    cost = (buy_want * prices).sum(axis=-1)
+    over = cost > cash
+    scale = np.where(over, cash / np.where(cost > 0, cost, 1.0), 1.0)
+    buy = np.floor(buy_want * scale[..., None])
+
+    left = cash - (buy * prices).sum(axis=-1)
+    short = buy < buy_want
+    order = np.argsort(-(buy_want - buy) * prices, axis=-1, kind="stable")
+    step_price = np.take_along_axis(np.where(short, prices, np.inf), order, axis=-1)
+    extra_sorted = np.cumsum(step_price, axis=-1) <= left[..., None]
+
+    extra = np.zeros_like(buy)
+    np.put_along_axis(extra, order, extra_sorted.astype(buy.dtype), axis=-1)
+    return buy + extra
+
+
+def size_orders(prices: np.ndarray, qty: np.ndarray, weights: np.ndarray, cash, other_value=0.0):
+    """
+    목표 가치, 차이, 정수 매도/매수 수량을 한 번에 계산한다.
+    현재가가 0 이하인 종목은 거래 대상에서 제외된다.
+    other_value 는 배열에 없는 보유 종목(목표 외 종목)의 평가금액으로, 총 평가금액에만 더해진다
+    (목표가치 = (주식 전체 + 예수금) × 비중).
+
+    반환: (target_values, diffs, sell_qty, buy_qty, total_value, cash_after)
+    """
+    prices  = np.asarray(prices, dtype=float)
+    qty     = np.asarray(qty, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    cash    = np.asarray(cash, dtype=float)
+
+    valid = prices > 0
+    safe_prices = np.where(valid, prices, 1.0)
+
+    market_value = qty * prices
+    total_value = market_value.sum(axis=-1) + cash + np.asarray(other_value, dtype=float)
+    target_values = total_value[..., None] * weights
+    diffs = target_values - market_value
+
+    sell_qty = np.where(valid & (diffs < 0), np.floor(-diffs / safe_prices), 0.0)
+    sell_qty = np.minimum(sell_qty, qty)
+    buy_want = np.where(valid & (diffs > 0), np.floor(diffs / safe_prices), 0.0)
+
+    cash_avail = cash + (sell_qty * prices).sum(axis=-1)
+    buy_qty = fit_buys_to_cash(buy_want, prices, cash_avail)
+    cash_after = cash_avail - (buy_qty * prices).sum(axis=-1)
+
+    return target_values, diffs, sell_qty, buy_qty, total_value, cash_after
+
+
+def compute_plan(
+    codes: Sequence[str],
+    prices: Sequence[float],
+    qty: Sequence[float],
+    weights: Sequence[float],
+    cash: float,
+    other_value: float = 0.0,
+) -> RebalancePlan:
+    """
+    단일 포트폴리오에 대한 리밸런싱 계획을 계산한다.
+    other_value : codes 에 없는 보유 종목의 평가금액 (총 평가금액 기준에 포함)
+    """
+    prices = np.asarray(prices, dtype=float)
+    qty    = np.asarray(qty, dtype=float)
+    target_values, diffs, sell_qty, buy_qty, total_value, cash_after = size_orders(
+        prices, qty, weights, cash, other_value
+    )
+    return RebalancePlan(
+        codes=tuple(codes),
+        prices=prices,
+        current_qty=qty,
+        target_values=target_values,
+        diffs=diffs,
+        sell_qty=sell_qty.astype(np.int64),
+        buy_qty=buy_qty.astype(np.int64),
+        cash_before=float(cash),
+        cash_after=float(cash_after),
+        total_value=float(total_value),
+    )
+
+
+def evaluate_candidates(
+    prices: Sequence[float],
+    qty: Sequence[float],
+    weights_matrix: np.ndarray,
+    cash: float,
+    other_value: float = 0.0,
+):
+    """
+    여러 후보 목표비중(K, N)을 한 번에 평가한다.
+    other_value : 배열에 없는 보유 종목의 평가금액 (총 평가금액 기준에 포함, compute_plan 과 같음)
+
+    반환: dict (sell_qty, buy_qty: (K, N) / cash_after, order_count, turnover,
+               tracking_error: (K,))
+    tracking_error는 주문 체결 후 비중과 목표 비중 차이의 L1 합이다.
+    """
+    prices = np.asarray(prices, dtype=float)
+    qty    = np.asarray(qty, dtype=float)
+    weights_matrix = np.atleast_2d(np.asarray(weights_matrix, dtype=float))
+
+    _, _, sell_qty, buy_qty, total_value, cash_after = size_orders(
+        prices, qty, weights_matrix, cash, other_value
+    )
+    new_qty = qty - sell_qty + buy_qty
+    denom = np.where(total_value > 0, total_value, 1.0)
+    new_weights = new_qty * prices / denom[..., None]
+
+    return {
+        "sell_qty": sell_qty.astype(np.int64),
+        "buy_qty": buy_qty.astype(np.int64),
+        "cash_after": cash_after,
+        "order_count": np.count_nonzero(sell_qty, axis=-1) + np.count_nonzero(buy_qty, axis=-1),
+        "turnover": ((sell_qty + buy_qty) * prices).sum(axis=-1),
+        "tracking_error": np.abs(new_weights - weights_matrix).sum(axis=-1),
+    }
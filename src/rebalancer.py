@@ -1,14 +1,25 @@
 import math
+import time
 import logging
-import requests
+from datetime import datetime, timedelta
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
 from pydantic import BaseModel, Field, ValidationError
 
 from orders.account_manager import AccountManager
 from orders.order_manager   import OrderManager
 from orders.margin_manager  import MarginManager
 from src.orders.order_models import RequestHeader
+from src.orders.execution_manager import EXEC_PATH, ExecutionManager
+from src.api_client import get_token_manager
+from src.rebalance_engine import compute_plan
+from src.allocation_optimizer import optimize_plan
+from src.market_calendar import MarketScheduler, calendar_key
+from src.portfolio_state import PortfolioState
+from src.account_snapshot import AccountSnapshot
+from src.exchange_index import get_exchange_index, price_exchange_code
+from src.strategies import load_allocation, netting_report, resolve_strategies, target_weights
+from src import metrics, profiling, tracing
 
 # ─────────────────────────────────────────────────────────────────────────
 # 1) Price API용 Pydantic 모델 (v1_해외주식-009)
@@ -37,15 +48,17 @@ class PriceResponse(BaseModel):
 # 2) Rebalancer 클래스 (AccountManager, OrderManager, MarginManager 상속)
 # ─────────────────────────────────────────────────────────────────────────
 class Rebalancer(AccountManager, OrderManager, MarginManager):
-    def __init__(self):
+    def __init__(self, cfg: dict = None):
+        """
+        cfg : 계좌별 설정 딕셔너리 (None 이면 config.yaml 사용)
+        """
         # 부모 초기화 순서대로 호출
-        AccountManager.__init__(self)
-        OrderManager.__init__(self)
-        MarginManager.__init__(self)
+        AccountManager.__init__(self, cfg)
+        OrderManager.__init__(self, cfg)
+        MarginManager.__init__(self, cfg)
 
-        # config.yaml에서 strategy 섹션 읽기 (weights만)
-        strategy_cfg = self.cfg.get("strategy", {})
-        self.weights = strategy_cfg.get("weights", {})
+        # 목표비중 / 수량 산정 방식 (strategy 섹션, 설정 재적재 시 reconfigure 로 다시 읽음)
+        self._load_strategy()
 
         # Price API 엔드포인트 로드 (path 섹션 사용)
         path_cfg        = self.PATH_CFG
@@ -53,15 +66,170 @@ class Rebalancer(AccountManager, OrderManager, MarginManager):
         self.DOMAIN_MOCK = path_cfg.get("mock", "https://openapivts.koreainvestment.com:29443")
         self.PRICE_PATH  = "/uapi/overseas-price/v1/quotations/price"
 
+        # 토큰 캐시 (.env 의 KIS_OAUTH_TOKEN 이 있으면 재사용)
+        base = self.DOMAIN_MOCK if self.use_mock else self.DOMAIN_REAL
+        self.token_manager = get_token_manager(
+            self.api_key, self.app_secret, token_url=f"{base}/oauth2/tokenP", token=self.token
+        )
+
+        # 체결내역 조회 (체결 가정으로 반영한 주문을 실제 체결로 보정)
+        self._bind_executions()
+
+        # 메모리 포트폴리오 상태 (기본: 매 리밸런싱마다 전체 재동기화)
+        portfolio_cfg  = self.cfg.get("portfolio", {})
+        self.portfolio = PortfolioState(portfolio_cfg.get("resync_interval_sec", 0))
+
+        # 장 운영시간 판단 (모든 대상 거래소가 장외면 API 요청/주문을 보내지 않음)
+        self._market_keys = None
+        self._update_scheduler()
+
+        # 현재 리밸런싱 주기의 계좌 스냅샷 / 계획 / 주문 결과
+        self.snapshot: Optional[AccountSnapshot] = None
+        self.last_plan = None
+        self.orders_sent = 0
+        self.orders_failed = 0
+
+        # 현재가 캐시: {종목코드: (가격, 조회시각)}. TTL 0 이면 캐시하지 않음
+        self.price_cache_ttl = 0.0
+        self.price_workers = int((self.cfg.get("exchange_routing", {}) or {}).get("max_parallel", 8))
+        self._price_cache: Dict[str, tuple] = {}
+
         self.logger = logging.getLogger(__name__)
 
+    def _load_strategy(self):
+        """
+        목표비중: target_allocation.yaml 전략 합산 (없으면 config.yaml strategy.weights)
+        """
+        for name, value in self._read_strategy(self.cfg).items():
+            setattr(self, name, value)
+        self._apply_routes()
+
+    def _read_strategy(self, cfg: dict) -> dict:
+        """
+        strategy 섹션으로 목표비중/수량 산정 방식 속성을 계산만 해서 {속성명: 값} 으로 반환 (self 는 그대로).
+        """
+        strategy_cfg = cfg.get("strategy", {})
+        allocation = load_allocation(cfg, self.symbol_master)
+        strategies = resolve_strategies(cfg, compiled=allocation)
+        return {
+            "allocation": allocation,
+            "strategies": strategies,
+            "weights":    target_weights(cfg, strategies),
+            # 수량 산정 방식: proportional(기본, 종목별 내림) / optimizer(추적오차 최소화)
+            "sizing_mode":        strategy_cfg.get("mode", "proportional"),
+            "no_trade_band":      float(strategy_cfg.get("no_trade_band", 0.0)),
+            "min_order_notional": float(strategy_cfg.get("min_order_notional", 0.0)),
+        }
+
+    def _apply_routes(self):
+        """
+        이 계좌의 라우팅 뷰 수동 지정을 다시 만든다: exchange_routing.symbols > 배분 파일의 "거래소:종목".
+        공유 ExchangeIndex 는 건드리지 않으며, 설정에서 빠진 지정은 바로 사라진다.
+        """
+        exchanges = self.allocation.exchanges if self.allocation is not None else {}
+        routing_cfg = self.cfg.get("exchange_routing", {}) or {}
+        self.exchange_index.overrides = {**exchanges, **(routing_cfg.get("symbols") or {})}
+
+    def _rebind_credentials(self):
+        """
+        account 섹션의 appkey_env / appsecret_env / token_env 를 다시 읽고, appkey 가 바뀌었으면
+        그 appkey 의 공유 토큰/연결로 갈아탄다 (같은 appkey 면 기존 토큰/연결 유지).
+        """
+        previous = (self.api_key, self.app_secret)
+        self._load_env_vars()
+        self._load_account_credentials()
+        if (self.api_key, self.app_secret) == previous:
+            return
+        self._bind_transport()
+        base = self.DOMAIN_MOCK if self.use_mock else self.DOMAIN_REAL
+        self.token_manager = get_token_manager(
+            self.api_key, self.app_secret, token_url=f"{base}/oauth2/tokenP", token=self.token
+        )
+        self.executions.close()
+        self._bind_executions()
+        self.logger.info("[Rebalancer] 계좌 자격증명 변경 → 토큰/연결 재연결")
+
+    def _bind_executions(self):
+        """
+        현재 자격증명/공유 TokenManager 로 체결내역 조회용 ExecutionManager 생성.
+        """
+        base = self.DOMAIN_MOCK if self.use_mock else self.DOMAIN_REAL
+        self.executions = ExecutionManager(
+            self.api_key, self.app_secret, self.token, use_mock=self.use_mock, token_manager=self.token_manager
+        )
+        self.executions.exec_url = f"{base}{self.PATH_CFG.get('execution_api', EXEC_PATH)}"
+
+    def reconfigure(self, cfg: dict, sections: Set[str]):
+        """
+        검증된 새 설정 중 바뀐 섹션만 반영 (ConfigWatcher 구독자).
+        새 상태를 모두 지역 변수로 먼저 만든 뒤 한꺼번에 교체하므로, 도중에 예외가 나면
+        기존 설정이 그대로 남는다. 토큰/연결/현재가 캐시는 유지하고, 잔고는 다음 주기에 다시 맞춘다.
+        """
+        state = {"cfg": cfg}
+        if "strategy" in sections:
+            state.update(self._read_strategy(cfg))
+        account_cfg = cfg.get("account", {}) or {}
+        exchange = account_cfg.get("OVRS_EXCG_CD") if "account" in sections else self.OVRS_EXCG_CD
+        if "account" in sections:
+            state.update(
+                CANO=account_cfg.get("CANO"),
+                ACNT_PRDT_CD=account_cfg.get("ACNT_PRDT_CD"),
+                OVRS_EXCG_CD=exchange,
+                TR_CRCY_CD=account_cfg.get("TR_CRCY_CD"),
+                client_id=f"{account_cfg.get('CANO')}-{account_cfg.get('ACNT_PRDT_CD')}",
+            )
+        index = None
+        if sections & {"account", "exchange_routing"}:
+            routing_cfg = cfg.get("exchange_routing", {}) or {}
+            state["balance_exchanges"] = routing_cfg.get("balance_exchanges") or [exchange]
+            state["price_workers"] = int(routing_cfg.get("max_parallel", 8))
+            index = get_exchange_index(routing_cfg)
+
+        # ─── 교체 (여기부터는 계산된 값 대입과 연결 재사용/재생성만) ───
+        for name, value in state.items():
+            setattr(self, name, value)
+        if index is not None:
+            self.exchange_index.index = index
+        if sections & {"strategy", "account", "exchange_routing"}:
+            self._apply_routes()
+        # 대상 거래소는 교체된 라우팅/목표비중 기준 (없는 거래소/휴장일 오류는 MarketScheduler 가 경고 후 건너뜀)
+        self._update_scheduler(force="market_hours" in sections)
+        if "strategy" in sections:
+            self.logger.info("[Rebalancer] 목표비중 재적재: 종목 %d개, 전략 %d개", len(self.weights), len(self.strategies))
+        if "account" in sections:
+            self._rebind_credentials()
+            self.logger.info("[Rebalancer] 계좌 설정 재적재: %s", self.client_id)
+        self.portfolio.mark_stale()
+
+    def _update_scheduler(self, force: bool = False):
+        """
+        장 운영시간 판단 대상: 계좌 기본 거래소 + 목표/보유 종목의 거래소 (라우팅 지정, 캐시).
+        대상 거래소가 바뀌었을 때(또는 force)만 MarketScheduler 를 다시 만든다.
+        """
+        codes = set(self.weights) | set(self.portfolio.codes)
+        exchanges = {self.OVRS_EXCG_CD} | {self.exchange_index.get(code) for code in codes}
+        exchanges.discard(None)
+        keys = frozenset(calendar_key(ex) for ex in exchanges)
+        if not force and keys == self._market_keys:
+            return
+        self._market_keys = keys
+        self.market_scheduler = MarketScheduler(sorted(exchanges), self.cfg.get("market_hours", {}))
+
+    def _market_open(self, code: str) -> bool:
+        """
+        종목의 거래소 장이 열려 있는지. 닫혀 있으면 이번 주기 주문을 보류한다 (다음 주기에 다시 계획).
+        """
+        exchange = self.exchange_index.get(code) or self.OVRS_EXCG_CD
+        if self.market_scheduler.is_open_for(exchange):
+            return True
+        self.logger.info("[Rebalancer] %s(%s) 장 운영시간이 아니므로 주문 보류", code, exchange)
+        return False
+
     def _get_token(self) -> str:
         """
-        OAuth 토큰 발급 로직.
-        실제로는 APIClient.get_oauth_token() 등을 호출하여 반환해야 합니다.
+        OAuth 토큰 반환. TokenManager 가 만료 전까지 캐시된 토큰을 재사용한다.
         """
-        # TODO: APIClient.get_oauth_token() 호출 후 토큰 반환
-        return "YOUR_BEARER_TOKEN"
+        return self.token_manager.get_token()
 
     def _build_price_header(self, tr_id: str) -> Optional[dict]:
         """
@@ -78,32 +246,29 @@ class Rebalancer(AccountManager, OrderManager, MarginManager):
                 }
             )
         except ValidationError as ve:
-            self.logger.error(f"[Rebalancer] Price Header 검증 실패: {ve.json()}")
+            self.logger.error("[Rebalancer] Price Header 검증 실패: %s", ve.json())
             return None
 
         return header_model.dict(by_alias=True, exclude_none=True)
 
-    def _get_price(self, symbol: str) -> Optional[float]:
+    def _get_price(self, symbol: str, exchange: str = None) -> Optional[float]:
         """
         v1_해외주식-009 (현재체결가) API 호출하여 해당 종목의 현재가를 반환.
+        exchange 를 생략하면 exchange_index 의 종목별 거래소(없으면 계좌 기본 거래소)를 사용.
+        price_cache_ttl 이내에 조회한 가격이 있으면 API 호출 없이 반환.
         """
+        if exchange is None and self.price_cache_ttl > 0:
+            cached = self._price_cache.get(symbol)
+            if cached and time.monotonic() - cached[1] < self.price_cache_ttl:
+                return cached[0]
+
         tr_id = "HHDFS00000300"
         headers = self._build_price_header(tr_id)
         if headers is None:
             return None
 
-        exch_map = {
-            "NASD": "NAS",
-            "NYSE": "NYS",
-            "AMEX": "AMS",
-            "TKSE": "TSE",
-            "SEHK": "HKS",
-            "SHAA": "SHS",
-            "SZAA": "SZS",
-            "HASE": "HNX",
-            "VNSE": "HSX",
-        }
-        EXCD = exch_map.get(self.OVRS_EXCG_CD, self.OVRS_EXCG_CD)
+        exchange = exchange or self.exchange_index.get(symbol) or self.OVRS_EXCG_CD
+        EXCD = price_exchange_code(exchange)
 
         params = {
             "AUTH": "",
@@ -114,208 +279,261 @@ class Rebalancer(AccountManager, OrderManager, MarginManager):
         base = self.DOMAIN_MOCK if self.use_mock else self.DOMAIN_REAL
         url = f"{base}{self.PRICE_PATH}"
         try:
-            resp = requests.get(url, headers=headers, params=params)
-            data = resp.json()
+            data = self.transport.get(url, headers=headers, params=params, client=self.client_id,
+                                      reauth=self._reauth)
         except Exception:
-            self.logger.exception(f"[Rebalancer] {symbol} 현재가 조회 중 HTTP 에러 발생")
+            self.logger.exception("[Rebalancer] %s 현재가 조회 중 HTTP 에러 발생", symbol)
             return None
 
         try:
             parsed = PriceResponse.parse_obj(data)
         except ValidationError as ve:
-            self.logger.error(f"[Rebalancer] {symbol} 현재가 응답 파싱 실패: {ve.json()}")
+            self.logger.error("[Rebalancer] %s 현재가 응답 파싱 실패: %s", symbol, ve.json())
             return None
 
         if parsed.rt_cd != "0":
-            self.logger.error(f"[Rebalancer] {symbol} 현재가 조회 실패 (rt_cd={parsed.rt_cd}, msg1={parsed.msg1})")
+            self.logger.error("[Rebalancer] %s 현재가 조회 실패 (rt_cd=%s, msg1=%s)", symbol, parsed.rt_cd, parsed.msg1)
             return None
 
         try:
-            return float(parsed.output.last)
+            price = float(parsed.output.last)
         except Exception:
-            self.logger.error(f"[Rebalancer] {symbol} 현재가 변환 오류: {parsed.output.last}")
+            self.logger.error("[Rebalancer] %s 현재가 변환 오류: %s", symbol, parsed.output.last)
             return None
 
-    def _get_current_holdings(self) -> Dict[str, dict]:
+        self._price_cache[symbol] = (price, time.monotonic())
+        return price
+
+    def _sync_portfolio(self, snapshot: Optional[AccountSnapshot] = None) -> bool:
         """
-        현재 보유 중인 종목과 수량, 가격, 평가금액을 반환.
-        또한, MarginManager.get_usd_available_cash()로 가져온 'USD 예수금'을 현금으로 포함.
+        잔고 → 보유/목표 종목 현재가 → USD 예수금을 하나의 AccountSnapshot 에서 읽어
+        self.portfolio 를 다시 초기화한다. 성공 시 True.
         """
+        snapshot = snapshot or AccountSnapshot(self)
+
         # 1) 잔고 조회 (AccountManager)
-        balance_resp = self.get_balance()
-        if not balance_resp:
+        with metrics.phase("balance"):
+            balance = snapshot.balance
+        if not balance:
             self.logger.error("[Rebalancer] 잔고 조회 실패, 리밸런싱 중단")
-            return {}
-
-        holdings: Dict[str, dict] = {}
-        stock_total = 0.0
-
-        for item in balance_resp.output1:
-            code = item.ovrs_pdno
-            qty = int(item.ovrs_cblc_qty)
-            if qty <= 0:
-                continue
-
-            current_price = self._get_price(code)
+            return False
+
+        # 2) 현재가: 보유 종목 + 목표 종목 (미보유 목표 종목도 매수할 수 있도록)
+        #    거래소를 모르는 종목은 (종목 × 후보 거래소)를 한 풀에서 동시에 조회해 거래소를 찾고,
+        #    찾을 때 받은 가격은 스냅샷에 그대로 기록해 다시 조회하지 않는다
+        held = snapshot.positions()
+        codes = list(held) + [c for c in self.weights if c not in held]
+        with metrics.phase("prices"):
+            unknown = [code for code in codes if not self.exchange_index.get(code)]
+            if unknown:
+                found = self.exchange_index.probe_many(unknown, self.OVRS_EXCG_CD, self._get_price,
+                                                       self.price_workers)
+                snapshot.seed_prices({code: price for code, (_, price) in found.items()})
+            self.exchange_index.save()
+
+            prices = snapshot.prices(codes)
+        positions: Dict[str, tuple] = {}
+        for code in codes:
+            current_price = prices[code]
             if current_price is None:
-                self.logger.warning(f"[Rebalancer] {code} 현재가 조회 실패, 해당 종목 제외")
+                self.logger.warning("[Rebalancer] %s 현재가 조회 실패, 해당 종목 제외", code)
                 continue
+            positions[code] = (held.get(code, 0), current_price)
 
-            market_value = current_price * qty
-            holdings[code] = {
-                "qty": qty,
-                "market_value": market_value,
-                "current_price": current_price
-            }
-            stock_total += market_value
+        # 3) USD 예수금 (MarginManager, 같은 스냅샷의 증거금 응답 사용)
+        with metrics.phase("margin"):
+            usd_cash = snapshot.cash("USD")
 
-        # 2) USD 예수금 조회 (MarginManager)
-        usd_cash = self.get_usd_available_cash()
+        self.portfolio.seed(positions, usd_cash, universe=self.weights.keys())
+        # 새로 알게 된 종목 거래소도 장 운영시간 판단에 넣는다
+        self._update_scheduler()
+        return True
 
-        holdings["__cash__"]       = usd_cash
-        holdings["__total_stock__"] = stock_total
-        holdings["__total_value__"] = stock_total + usd_cash
-        return holdings
-
-    def _compute_and_execute_trades(self, holdings: Dict[str, dict]):
+    def _reconcile_fills(self) -> bool:
         """
-        1) 목표 비율 대비 현재 가치 차이 계산
-        2) 매도 주문 실행 → 현금 증가 및 보유량 업데이트
-        3) 매수 주문 실행 → 현금 감소
+        체결 가정으로 반영한 주문을 체결내역 조회(v1_해외주식-007)의 실제 체결수량/체결가로 바로잡는다.
+        조회 기간은 어제~오늘 (현지 주문일자가 한국 날짜보다 하루 늦을 수 있음).
+        조회에 실패하면 전체 재동기화하도록 표시하고 False.
         """
-        total_stock = holdings["__total_stock__"]
-        cash        = holdings["__cash__"]
-        total_value = holdings["__total_value__"]
-
-        # 보유 종목 리스트
-        codes = list(self.weights.keys())
-        n = len(codes)
-
-        # 1) 목표 가치 계산 (equal weight 혹은 config.yaml의 weight 사용)
-        # 총 value 기준으로 각 목표값
-        target_values: Dict[str, float] = {}
-        for code, weight in self.weights.items():
-            target_values[code] = total_value * weight
-
-        # 2) 차이 계산: diff = target - current
-        diffs: Dict[str, float] = {}
-        for code in codes:
-            current = holdings.get(code, {"market_value": 0.0})
-            diffs[code] = target_values[code] - current["market_value"]
-
-        # 3) 매도 주문 생성 및 실행 (diff < 0)
-        for code, diff in diffs.items():
-            if diff >= 0:
-                continue
-            current_price = holdings[code]["current_price"]
-            sell_qty = math.floor(abs(diff) / current_price)
-            if sell_qty < 1:
-                continue
-
-            self.logger.info(f"[Rebalancer] 매도 주문 → 종목: {code}, 수량: {sell_qty}, 가격(시장가): {current_price}")
-            order_id = self.create_order(
-                is_buy=False,
-                CANO=self.CANO,
-                ACNT_PRDT_CD=self.ACNT_PRDT_CD,
-                OVRS_EXCG_CD=self.OVRS_EXCG_CD,
-                PDNO=code,
-                ORD_QTY=sell_qty,
-                OVRS_ORD_UNPR=int(current_price),
-                order_type="리밸런싱 매도",
-                name=code,
-                qty=sell_qty,
-                price=int(current_price)
-            )
-            if order_id:
-                self.logger.info(f"[Rebalancer] 매도 주문 전송 성공: {order_id}")
+        today = datetime.now()
+        self.executions.token = self.token
+        response = self.executions.inquire_executions(
+            CANO=self.CANO,
+            ACNT_PRDT_CD=self.ACNT_PRDT_CD,
+            PDNO="%",
+            ORD_STRT_DT=(today - timedelta(days=1)).strftime("%Y%m%d"),
+            ORD_END_DT=today.strftime("%Y%m%d"),
+            SLL_BUY_DVSN="00",
+            CCLD_NCCS_DVSN="00",
+            OVRS_EXCG_CD="%",
+            SORT_SQN="DS",
+        )
+        if response is None:
+            self.logger.warning("[Rebalancer] 체결내역 조회 실패, 전체 재동기화로 대체")
+            self.portfolio.mark_stale()
+            return False
+
+        matched = 0
+        for item in response.output:
+            # 거부된 주문은 더 체결되지 않으므로 미체결분을 닫는다
+            open_qty = 0.0 if item.rjct_rson else float(item.nccs_qty or 0)
+            if self.portfolio.reconcile_fill(item.odno, float(item.ft_ccld_qty or 0),
+                                             float(item.ft_ccld_unpr3 or 0), open_qty):
+                matched += 1
+        self.logger.info("[Rebalancer] 체결 반영: 주문 %d건, 체결 확인 대기 %d건", matched, len(self.portfolio.pending))
+        return True
+
+    def _compute_and_execute_trades(self):
+        """
+        1) 목표 비율 대비 현재 가치 차이 및 정수 수량을 벡터화 계산 (rebalance_engine)
+        2) 매도 주문 실행 → 체결 가정으로 portfolio 에 반영 (다음 주기에 실제 체결로 보정)
+        3) 매수 주문 실행 → 체결 가정으로 portfolio 에 반영
+        """
+        portfolio = self.portfolio
+
+        # 1) 목표 종목 배열 구성 (현재가 조회 실패 종목은 현재가 0 → 거래 제외)
+        with metrics.phase("plan"):
+            codes   = list(self.weights.keys())
+            prices, qtys = portfolio.arrays(codes)
+            weights = [self.weights[code] for code in codes]
+            # 목표 외 보유 종목도 총 평가금액 기준에 포함 (목표가치 = 계좌 전체 × 비중)
+            other_value = max(portfolio.stock_value - float((prices * qtys).sum()), 0.0)
+
+            if self.sizing_mode == "optimizer":
+                plan = optimize_plan(
+                    codes, prices, qtys, weights, portfolio.cash,
+                    no_trade_band=self.no_trade_band,
+                    min_order_notional=self.min_order_notional,
+                    other_value=other_value,
+                )
             else:
-                self.logger.error(f"[Rebalancer] 매도 주문 전송 실패: {code}")
-                continue
-
-            # 매도 완료 가정: 현금 증가, 보유량 감소
-            cash += sell_qty * current_price
-            holdings[code]["qty"] -= sell_qty
-            holdings[code]["market_value"] = holdings[code]["qty"] * current_price
-            self.logger.info(f"[Rebalancer] 매도 후 예수금: {cash}, {code} 잔여 수량: {holdings[code]['qty']}")
-
-        # 4) 매수 주문 생성 및 실행 (diff > 0)
-        for code, diff in diffs.items():
-            if diff <= 0:
-                continue
-            current_price = holdings.get(code, {"current_price": 0.0})["current_price"]
-            if current_price <= 0:
-                continue
-
-            buy_qty = math.floor(diff / current_price)
-            if buy_qty < 1:
-                continue
-
-            max_affordable = math.floor(cash / current_price)
-            buy_qty = min(buy_qty, max_affordable)
-            if buy_qty < 1:
-                continue
-
-            self.logger.info(f"[Rebalancer] 매수 주문 → 종목: {code}, 수량: {buy_qty}, 가격(시장가): {current_price}")
-            order_id = self.create_order(
-                is_buy=True,
-                CANO=self.CANO,
-                ACNT_PRDT_CD=self.ACNT_PRDT_CD,
-                OVRS_EXCG_CD=self.OVRS_EXCG_CD,
-                PDNO=code,
-                ORD_QTY=buy_qty,
-                OVRS_ORD_UNPR=int(current_price),
-                order_type="리밸런싱 매수",
-                name=code,
-                qty=buy_qty,
-                price=int(current_price)
+                plan = compute_plan(codes, prices, qtys, weights, portfolio.cash, other_value)
+            self.last_plan = plan
+            self.orders_sent = 0
+            self.orders_failed = 0
+            if len(self.strategies) > 1:
+                # 전략별 매수/매도는 위 계획에서 종목별로 이미 상계됨 (따로 리밸런싱했을 때와 비교)
+                report = netting_report(self.strategies, dict(zip(codes, prices)), dict(zip(codes, qtys)),
+                                        portfolio.cash, other_value)
+                self.logger.info(
+                    "[Rebalancer] 전략 %d개 합산: 전략별 실행 시 주문 %d건(반대 방향 종목 %d개) → 상계 후 %d건",
+                    len(self.strategies), report["separate_orders"], report["opposing_symbols"],
+                    report["combined_orders"]
+                )
+            self.logger.info(
+                "[Rebalancer] 리밸런싱 계획: 주문 %s건, 거래대금 %.2f, 예상 예수금 %.2f",
+                plan.order_count, plan.turnover, plan.cash_after
             )
-            if order_id:
-                self.logger.info(f"[Rebalancer] 매수 주문 전송 성공: {order_id}")
-            else:
-                self.logger.error(f"[Rebalancer] 매수 주문 전송 실패: {code}")
-                continue
 
-            # 매수 완료 가정: 현금 감소, 보유량 증가
-            cost = buy_qty * current_price
-            cash -= cost
-            if code in holdings:
-                holdings[code]["qty"] += buy_qty
-                holdings[code]["market_value"] = holdings[code]["qty"] * current_price
-            else:
-                holdings[code] = {
-                    "qty": buy_qty,
-                    "market_value": cost,
-                    "current_price": current_price
-                }
-            self.logger.info(f"[Rebalancer] 매수 후 예수금: {cash}, {code} 보유량: {holdings[code]['qty']}")
+        # 2) 매도 주문 실행
+        with metrics.phase("sells"):
+            for code, sell_qty, current_price in plan.sells():
+                if not self._market_open(code):
+                    continue
+                self.logger.info("[Rebalancer] 매도 주문 → 종목: %s(%s), 수량: %s, 가격(시장가): %s",
+                                 code, self.symbol_master.name(code, "-"), sell_qty, current_price)
+                order_id = self.create_order(
+                    is_buy=False,
+                    CANO=self.CANO,
+                    ACNT_PRDT_CD=self.ACNT_PRDT_CD,
+                    OVRS_EXCG_CD=self.exchange_index.get(code) or self.OVRS_EXCG_CD,
+                    PDNO=code,
+                    ORD_QTY=sell_qty,
+                    OVRS_ORD_UNPR=int(current_price),
+                    order_type="리밸런싱 매도",
+                    name=None,
+                    qty=sell_qty,
+                    price=int(current_price)
+                )
+                if order_id:
+                    self.orders_sent += 1
+                    self.logger.info("[Rebalancer] 매도 주문 전송 성공: %s", order_id)
+                else:
+                    self.orders_failed += 1
+                    self.logger.error("[Rebalancer] 매도 주문 전송 실패: %s", code)
+                    continue
+
+                # 매도 완료 가정: 현금 증가, 보유량 감소 (다음 주기에 체결내역으로 보정)
+                portfolio.assume_fill(order_id, code, False, sell_qty, current_price)
+                self.logger.info("[Rebalancer] 매도 후 예수금: %s, %s 잔여 수량: %s", portfolio.cash, code, portfolio.qty(code))
+
+        # 3) 매수 주문 실행 (매도 실패 시를 대비해 실제 예수금으로 한 번 더 제한)
+        with metrics.phase("buys"):
+            for code, buy_qty, current_price in plan.buys():
+                buy_qty = min(buy_qty, math.floor(portfolio.cash / current_price))
+                if buy_qty < 1 or not self._market_open(code):
+                    continue
+
+                self.logger.info("[Rebalancer] 매수 주문 → 종목: %s(%s), 수량: %s, 가격(시장가): %s",
+                                 code, self.symbol_master.name(code, "-"), buy_qty, current_price)
+                order_id = self.create_order(
+                    is_buy=True,
+                    CANO=self.CANO,
+                    ACNT_PRDT_CD=self.ACNT_PRDT_CD,
+                    OVRS_EXCG_CD=self.exchange_index.get(code) or self.OVRS_EXCG_CD,
+                    PDNO=code,
+                    ORD_QTY=buy_qty,
+                    OVRS_ORD_UNPR=int(current_price),
+                    order_type="리밸런싱 매수",
+                    name=None,
+                    qty=buy_qty,
+                    price=int(current_price)
+                )
+                if order_id:
+                    self.orders_sent += 1
+                    self.logger.info("[Rebalancer] 매수 주문 전송 성공: %s", order_id)
+                else:
+                    self.orders_failed += 1
+                    self.logger.error("[Rebalancer] 매수 주문 전송 실패: %s", code)
+                    continue
+
+                # 매수 완료 가정: 현금 감소, 보유량 증가
+                portfolio.assume_fill(order_id, code, True, buy_qty, current_price)
+                self.logger.info("[Rebalancer] 매수 후 예수금: %s, %s 보유량: %s", portfolio.cash, code, portfolio.qty(code))
 
         # 최종 예수금 및 포트폴리오 가치를 로그에 남김
-        final_stock_value = sum(v["market_value"] for k, v in holdings.items() if k not in ["__cash__", "__total_stock__", "__total_value__"])
-        self.logger.info(f"[Rebalancer] 최종 예수금: {cash}, 최종 주식 평가금액 합계: {final_stock_value}")
+        self.logger.info("[Rebalancer] 최종 예수금: %s, 최종 주식 평가금액 합계: %s", portfolio.cash, portfolio.stock_value)
 
     def rebalance(self):
         """
         1) 토큰 발급 후 self.token 설정
-        2) 현재 보유 조회 (주식 + USD 예수금)
+        2) 지난 주기 주문의 실제 체결 반영, 포트폴리오 상태가 오래됐으면 전체 재동기화 (주식 + USD 예수금)
         3) 매도 → 매수 순서로 주문 실행
+        장외 시간이면 아무 요청도 보내지 않고 종료한다.
         """
-        # 1) 토큰 발급
-        token = self._get_token()
-        self.token = token
-
-        # 2) 현재 보유 조회
-        holdings = self._get_current_holdings()
-        if not holdings:
+        if not self.market_scheduler.is_open():
+            wait_min = self.market_scheduler.seconds_until_open() / 60
+            self.logger.info("[Rebalancer] 장 운영시간이 아니므로 리밸런싱 생략 (개장까지 %.0f분)", wait_min)
             return
 
-        # 3) 매도·매수 실행
-        self._compute_and_execute_trades(holdings)
+        with profiling.profile("rebalance"), tracing.trace("rebalance", account=self.client_id), \
+                metrics.phase("cycle"):
+            # 1) 토큰 발급
+            with metrics.phase("token"):
+                token = self._get_token()
+            self.token = token
+
+            # 2) 포트폴리오 상태 확인 (이번 주기의 조회는 모두 하나의 스냅샷을 공유)
+            #    재동기화 전이면 지난 주기 주문의 실제 체결을 먼저 반영
+            self.snapshot = AccountSnapshot(self)
+            if self.portfolio.pending and not self.portfolio.needs_resync():
+                with metrics.phase("fills"):
+                    self._reconcile_fills()
+            if self.portfolio.needs_resync():
+                with metrics.phase("sync"):
+                    synced = self._sync_portfolio(self.snapshot)
+                if not synced:
+                    return
+
+            # 3) 매도·매수 실행
+            self._compute_and_execute_trades()
 
     def close(self):
         """
-        AccountManager, OrderManager, MarginManager 정리
+        AccountManager, OrderManager, MarginManager, 체결내역 조회 세션 정리
         """
         self.session.close()  # AccountManager와 OrderManager가 SessionLocal 사용
+        self.executions.close()
         # MarginManager는 별도 세션 없음
 
 
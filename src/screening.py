@@ -0,0 +1,336 @@
+# src/screening.py
+"""
+조건식 기반 종목 스크리닝.
+
+YAML 조건식을 벡터 술어로 컴파일하고, 저장된 봉(BarStore)과 종목 마스터(SymbolMaster)로
+유니버스 전체를 한 번에 평가한다. 종목마다 자기 마지막 봉들을 모은 (T, N) 행렬에서 지표를
+종목 축으로 한꺼번에 계산하고 같은 지표는 한 번만 계산한다.
+
+    condition: momentum
+    freq: 1d
+    universe: []                    # 비우면 저장소의 freq 종목 전체
+    stock_codes: [SGOV]             # 조건과 무관하게 항상 포함 (filters 가 없으면 이 목록만)
+    filters:
+      - close > 10
+      - avg_volume(20) >= 1000000
+      - close > sma(200)
+      - return(60) > 0
+      - sector in [반도체 제조업, Technology]
+    sort: -return(60)               # 앞에 - 면 내림차순
+    limit: 20
+
+항: 숫자, 필드(open/high/low/close/volume), 지표 이름(인자), sector.
+지표: sma(n), ema(n), rsi(n), atr(n), volatility(n) (src.indicators), avg_volume(n), return(n), high(n), low(n).
+EMA/RSI/ATR 는 최근 5n 봉으로 계산한다 (indicators.warmup_bars).
+
+    python -m src.screening config/conditions.yaml
+"""
+
+import argparse
+import logging
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from src import indicators
+from src.marketdata.bar_store import BarStore
+from src.symbol_master import SymbolMaster, get_symbol_master
+
+
+FIELDS = ("open", "high", "low", "close", "volume")
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+_FILTER_RE = re.compile(r"^\s*(.+?)(?:\s+(not\s+in|in)\s+|\s*(>=|<=|==|!=|>|<)\s*)(.+?)\s*$")
+_TERM_RE = re.compile(r"^([a-z_]\w*)\s*(?:\(\s*([^)]*)\s*\))?$")
+
+
+class ConditionError(ValueError):
+    """
+    조건식 문법/구성 오류
+    """
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 지표 (panel: {field: (T, N)} → (N,) 마지막 봉 기준 값)
+# ─────────────────────────────────────────────────────────────────────────
+def _window(x: np.ndarray, n: int) -> np.ndarray:
+    # 이력이 n 봉보다 짧으면 NaN 행을 붙여 결과가 NaN (조건 불충족) 이 되게 한다
+    if len(x) >= n:
+        return x[-n:]
+    return np.vstack([np.full((n - len(x), x.shape[1]), np.nan), x])
+
+
+def _avg_volume(panel, n):
+    return _window(panel["volume"], n).mean(axis=0)
+
+
+def _return(panel, n):
+    window = _window(panel["close"], n + 1)
+    return window[-1] / window[0] - 1.0
+
+
+def _high(panel, n):
+    return _window(panel["high"], n).max(axis=0)
+
+
+def _low(panel, n):
+    return _window(panel["low"], n).min(axis=0)
+
+
+def _streaming(name: str) -> Callable:
+    # src.indicators 배치 모드로 읽어 온 구간 전체를 흘리고 마지막 봉 값을 쓴다
+    def compute(panel, n):
+        indicator = indicators.create(f"{name}({n})")
+        return indicator.run(*(panel[f] for f in indicator.inputs))[-1]
+    return compute
+
+
+# 이름 → (함수, 필요한 필드, 필요한 봉 수(인자 n 기준))
+INDICATORS: Dict[str, tuple] = {
+    **{
+        name: (_streaming(name), cls.inputs, lambda n, name=name: indicators.warmup_bars(f"{name}({n})"))
+        for name, cls in indicators.INDICATORS.items()
+    },
+    "avg_volume": (_avg_volume, ("volume",), lambda n: n),
+    "return": (_return, ("close",), lambda n: n + 1),
+    "high": (_high, ("high",), lambda n: n),
+    "low": (_low, ("low",), lambda n: n),
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 컴파일
+# ─────────────────────────────────────────────────────────────────────────
+class _Context:
+    """
+    평가 한 번의 입력과 항 캐시
+    """
+
+    def __init__(self, codes: List[str], panel: Dict[str, np.ndarray], master: Optional[SymbolMaster]):
+        self.codes = codes
+        self.panel = panel
+        self.master = master
+        self.cache: Dict[str, np.ndarray] = {}
+
+    def sectors(self) -> np.ndarray:
+        if "sector" not in self.cache:
+            if self.master is None:
+                self.master = get_symbol_master()
+            self.cache["sector"] = np.array([self.master.sector(c) for c in self.codes], dtype=object)
+        return self.cache["sector"]
+
+
+class _Term:
+    def __init__(self, text: str):
+        self.key = re.sub(r"\s+", "", text)
+        self.fields: set = set()
+        self.lookback = 1
+        try:
+            value = float(self.key)
+        except ValueError:
+            value = None
+        if value is not None:
+            self.evaluate = lambda ctx: value
+            return
+
+        match = _TERM_RE.match(self.key)
+        if not match:
+            raise ConditionError(f"해석할 수 없는 항: {text!r}")
+        name, arg = match.group(1), match.group(2)
+        if arg is None and name in FIELDS:
+            self.fields = {name}
+            self.evaluate = self._cached(lambda ctx: ctx.panel[name][-1] if len(ctx.panel[name]) else
+                                         np.full(len(ctx.codes), np.nan))
+        elif arg is not None and name in INDICATORS:
+            fn, fields, bars = INDICATORS[name]
+            try:
+                n = int(arg)
+            except ValueError:
+                raise ConditionError(f"{name}() 인자는 정수여야 합니다: {text!r}")
+            if n < 1:
+                raise ConditionError(f"{name}() 인자는 1 이상이어야 합니다: {text!r}")
+            self.fields = set(fields)
+            self.lookback = bars(n)
+            self.evaluate = self._cached(lambda ctx: fn(ctx.panel, n))
+        else:
+            raise ConditionError(f"알 수 없는 필드/지표: {text!r}")
+
+    def _cached(self, compute: Callable) -> Callable:
+        key = self.key
+
+        def evaluate(ctx: _Context):
+            if key not in ctx.cache:
+                ctx.cache[key] = compute(ctx)
+            return ctx.cache[key]
+        return evaluate
+
+
+class _Filter:
+    def __init__(self, text: str):
+        match = _FILTER_RE.match(str(text))
+        if not match:
+            raise ConditionError(f"조건식 형식 오류: {text!r} (예: close > sma(200))")
+        left, word_op, op, right = match.groups()
+        op = " ".join(word_op.split()) if word_op else op
+        self.text = text
+        self.fields: set = set()
+        self.lookback = 1
+
+        if op in ("in", "not in"):
+            if left.strip() != "sector":
+                raise ConditionError(f"in 조건은 sector 에만 쓸 수 있습니다: {text!r}")
+            values = yaml.safe_load(right)
+            values = [str(v) for v in (values if isinstance(values, list) else [values])]
+            negate = op == "not in"
+            self.evaluate = lambda ctx: np.isin(ctx.sectors(), values) != negate
+            return
+        if left.strip() == "sector":
+            if op not in ("==", "!="):
+                raise ConditionError(f"sector 는 ==, !=, in 만 지원합니다: {text!r}")
+            value = str(yaml.safe_load(right))
+            self.evaluate = lambda ctx: (ctx.sectors() == value) != (op == "!=")
+            return
+
+        lhs, rhs, compare = _Term(left), _Term(right), OPERATORS[op]
+        self.fields = lhs.fields | rhs.fields
+        self.lookback = max(lhs.lookback, rhs.lookback)
+        # NaN 비교는 False → 이력이 부족한 종목은 걸러진다
+        self.evaluate = lambda ctx: np.asarray(compare(lhs.evaluate(ctx), rhs.evaluate(ctx)), dtype=bool)
+
+
+class Screen:
+    """
+    컴파일된 조건식. run() 으로 종목코드 목록을 얻는다.
+    """
+
+    def __init__(self, conditions: dict):
+        if not isinstance(conditions, dict):
+            raise ConditionError("조건식은 매핑이어야 합니다")
+        self.name = conditions.get("condition", "")
+        self.freq = str(conditions.get("freq", "1d"))
+        self.universe = [str(c) for c in conditions.get("universe") or []]
+        self.static_codes = [str(c) for c in conditions.get("stock_codes") or []]
+        self.filters = [_Filter(f) for f in conditions.get("filters") or []]
+        self.limit = conditions.get("limit")
+
+        sort = conditions.get("sort")
+        self.sort_desc = bool(sort) and str(sort).startswith("-")
+        self.sort = _Term(str(sort).lstrip("-")) if sort else None
+
+        terms = self.filters + ([self.sort] if self.sort else [])
+        self.fields = sorted(set().union(*(t.fields for t in terms))) if terms else []
+        self.lookback = max([t.lookback for t in terms] + [1])
+
+    def _load(self, store: BarStore, codes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        종목마다 자기 마지막 lookback 봉을 아래쪽에 맞춘 (lookback, N) 행렬. 이력이 짧으면 위쪽이 NaN.
+        시각 합집합으로 정렬하지 않으므로 휴장일이 다르거나 갱신이 늦은 종목도 자기 최근 봉으로 평가된다.
+        """
+        if not self.fields:
+            return {}
+        n = self.lookback
+        out = {f: np.full((n, len(codes)), np.nan) for f in self.fields}
+        for j, code in enumerate(codes):
+            # 메모리 매핑 뷰라 전체 구간을 읽어도 꼬리만 복사된다
+            bars = store.load(self.freq, code, columns=self.fields)
+            k = min(len(bars), n)
+            if k:
+                for f in self.fields:
+                    out[f][n - k:, j] = bars[f][-k:]
+        return out
+
+    def _evaluate(self, store: Optional[BarStore], master: Optional[SymbolMaster]):
+        if self.fields and store is None:
+            raise ConditionError("가격/지표 조건에는 봉 저장소가 필요합니다")
+        codes = self.universe_codes(store)
+        ctx = _Context(codes, self._load(store, codes) if store is not None else {}, master)
+        mask = np.ones(len(codes), dtype=bool)
+        for f in self.filters:
+            mask &= f.evaluate(ctx)
+        return ctx, mask
+
+    def evaluate(self, store: Optional[BarStore], master: Optional[SymbolMaster] = None) -> np.ndarray:
+        """
+        유니버스 순서의 (N,) 불리언 마스크
+        """
+        return self._evaluate(store, master)[1]
+
+    def universe_codes(self, store: Optional[BarStore]) -> List[str]:
+        if self.universe:
+            return list(self.universe)
+        return store.symbols(self.freq) if store is not None else []
+
+    def run(self, store: Optional[BarStore] = None, master: Optional[SymbolMaster] = None) -> List[str]:
+        """
+        조건을 만족하는 종목코드 (+ stock_codes). sort/limit 은 조건 통과 종목에만 적용.
+        """
+        matched: List[str] = []
+        if self.filters or self.sort:
+            started = time.perf_counter()
+            ctx, mask = self._evaluate(store, master)
+            idx = np.flatnonzero(mask)
+            if self.sort is not None:
+                key = np.broadcast_to(self.sort.evaluate(ctx), mask.shape)[idx]
+                key = np.where(np.isnan(key), -np.inf if self.sort_desc else np.inf, key)
+                order = np.argsort(-key if self.sort_desc else key, kind="stable")
+                idx = idx[order]
+            if self.limit:
+                idx = idx[: int(self.limit)]
+            matched = [ctx.codes[i] for i in idx]
+            logging.getLogger(__name__).debug(
+                "[Screen] %s: %d / %d 종목 (%.1f ms)",
+                self.name, len(matched), len(ctx.codes), (time.perf_counter() - started) * 1000
+            )
+        return list(dict.fromkeys(self.static_codes + matched))
+
+
+def compile_conditions(conditions: dict) -> Screen:
+    return Screen(conditions)
+
+
+def load_conditions(file_path: str) -> dict:
+    """
+    YAML 조건식 파일 로드 (컴파일해서 형식 오류를 먼저 확인한다).
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        conditions = yaml.safe_load(f) or {}
+    compile_conditions(conditions)
+    return conditions
+
+
+def get_stock_codes(
+    conditions: dict,
+    store: Optional[BarStore] = None,
+    master: Optional[SymbolMaster] = None,
+) -> List[str]:
+    """
+    조건식에 해당하는 종목코드 목록.
+    """
+    return compile_conditions(conditions).run(store, master)
+
+
+if __name__ == "__main__":
+    from src.logging_setup import setup_logging
+    from src.marketdata import bar_store
+    from src.orders.base_manager import load_config
+
+    parser = argparse.ArgumentParser(description="조건식 종목 스크리닝")
+    parser.add_argument("conditions", help="조건식 YAML 경로")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    setup_logging(cfg.get("logging"))
+    master = get_symbol_master(cfg.get("symbol_master"))
+    codes = get_stock_codes(load_conditions(args.conditions), bar_store.from_config(cfg.get("marketdata")), master)
+    for code in codes:
+        print(f"{code}\t{master.name(code, '')}")
@@ -0,0 +1,665 @@
+# src/simulator.py
+"""
+로컬 KIS OpenAPI 시뮬레이터.
+
+실제 도메인 대신 이 서버를 config.yaml path.real / path.mock 에 지정하면
+토큰 발급, 현재가, 기간별시세(일봉), 분봉, 잔고, 해외증거금, 주문, 주문체결내역 TR 을
+네트워크/자격증명 없이 재현할 수 있다. 응답은 src/orders/*_models.py, src/order_execution_models.py 의
+pydantic 모델과 같은 필드를 가진다.
+
+    python -m src.simulator --port 8000 --latency-ms 30 --error-rate 0.01 --rate-limit 20
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) 설정 / 상태
+# ─────────────────────────────────────────────────────────────────────────
+OK_MSG_CD  = "MCA00000"
+OK_MSG     = "정상처리 되었습니다."
+RATE_LIMIT_MSG_CD = "EGW00201"
+RATE_LIMIT_MSG    = "초당 거래건수를 초과하였습니다."
+
+# 시세 거래소코드(EXCD) → 주문 거래소코드
+PRICE_TO_ORDER_EXCHANGE = {
+    "NAS": "NASD", "NYS": "NYSE", "AMS": "AMEX", "TSE": "TKSE", "HKS": "SEHK",
+    "SHS": "SHAA", "SZS": "SZAA", "HNX": "HASE", "HSX": "VNSE",
+}
+US_EXCHANGES = ("NASD", "NYSE", "AMEX")
+
+KST = timezone(timedelta(hours=9))
+US_TZ = ZoneInfo("America/New_York")
+
+BUY_TR_IDS  = ("TTTT1002U", "VTTT1002U")
+SELL_TR_IDS = ("TTTT1006U", "VTTT1001U")
+
+# 주문번호(ODNO): 계좌/시뮬레이터 인스턴스와 무관하게 프로세스 전체에서 유일
+# (ExecutionManager 가 체결내역의 orgn_odno 로 OrderList 주문을 찾으므로 겹치면 안 된다)
+_order_numbers = itertools.count(1)
+
+
+@dataclass
+class SimulatorConfig:
+    latency_ms: float = 0.0           # 평균 응답 지연
+    latency_jitter_ms: float = 0.0    # 지연 표준편차
+    error_rate: float = 0.0           # HTTP 500 오류 주입 확률
+    rate_limit_per_sec: float = 0.0   # appkey 당 초당 요청 한도 (0: 무제한)
+    volatility: float = 0.0002        # 초당 가격 변동성 (로그수익률 표준편차)
+    spread_bps: float = 2.0           # 호가 스프레드 (bp)
+    default_cash: float = 100000.0    # 처음 보는 계좌의 USD 예수금
+    history_days: int = 750           # 일봉 이력 (영업일 수)
+    minute_days: int = 2              # 분봉 이력 (영업일 수, 정규장 09:30~16:00 ET)
+    seed: int = 42
+
+
+@dataclass
+class SimSymbol:
+    code: str
+    exchange: str
+    price: float
+    name: str = ""
+    updated: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class SimOrder:
+    odno: str
+    cano: str
+    code: str
+    exchange: str
+    is_buy: bool
+    qty: int
+    limit: float
+    filled_qty: int = 0
+    fill_price: float = 0.0
+    ord_dt: str = ""
+    ord_tmd: str = ""
+
+
+@dataclass
+class SimAccount:
+    cano: str
+    cash: float
+    positions: Dict[str, List[float]] = field(default_factory=dict)   # code → [수량, 평균단가]
+    reserved: float = 0.0                                              # 미체결 매수 증거금
+    orders: List[SimOrder] = field(default_factory=list)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 시뮬레이터 본체 (HTTP 와 무관한 순수 로직)
+# ─────────────────────────────────────────────────────────────────────────
+class KISSimulator:
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        symbols: Optional[Dict[str, Tuple[float, str]]] = None,
+        accounts: Optional[Dict[str, dict]] = None,
+    ):
+        """
+        symbols  : {종목코드: (초기가격, 주문거래소코드)}
+        accounts : {CANO: {"cash": float, "positions": {종목코드: 수량}}}
+        """
+        self.config = config or SimulatorConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.RLock()
+        self.symbols: Dict[str, SimSymbol] = {}
+        self.accounts: Dict[str, SimAccount] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.rejected = {"rate_limit": 0, "error": 0}
+        self._buckets: Dict[str, List[float]] = {}
+        # 차트 이력의 마지막 날짜 (테스트에서 과거로 돌려 '다음 날' 갱신을 재현)
+        self.history_end: date = datetime.now(US_TZ).date()
+        self._daily: Dict[str, list] = {}
+        self._minute: Dict[str, list] = {}
+
+        for code, (price, exchange) in (symbols or {}).items():
+            self.add_symbol(code, price, exchange)
+        for cano, acct in (accounts or {}).items():
+            account = self._account(cano, acct.get("cash"))
+            for code, qty in acct.get("positions", {}).items():
+                account.positions[code] = [float(qty), self.symbols[code].price]
+
+    # ── 상태 관리 ────────────────────────────────────────────────────────
+    def add_symbol(self, code: str, price: float, exchange: str = "NASD", name: str = ""):
+        with self.lock:
+            self.symbols[code] = SimSymbol(code, exchange, float(price), name or code)
+
+    def _account(self, cano: str, cash: Optional[float] = None) -> SimAccount:
+        account = self.accounts.get(cano)
+        if account is None:
+            account = SimAccount(cano, self.config.default_cash if cash is None else float(cash))
+            self.accounts[cano] = account
+        return account
+
+    def _tick(self, sym: SimSymbol) -> float:
+        """
+        마지막 조회 이후 경과 시간만큼 로그정규 랜덤워크로 가격을 움직인다.
+        """
+        now = time.monotonic()
+        dt = now - sym.updated
+        if dt > 0 and self.config.volatility > 0:
+            sym.price *= math.exp(self.rng.gauss(0.0, self.config.volatility * math.sqrt(dt)))
+            sym.price = max(round(sym.price, 4), 0.0001)
+        sym.updated = now
+        return sym.price
+
+    # ── 게이트: 지연 / 요청 한도 / 오류 주입 ────────────────────────────
+    def admit(self, tr_id: str, appkey: str) -> Optional[Tuple[int, dict]]:
+        """
+        요청을 처리해도 되면 None, 거절이면 (HTTP 상태, 응답 본문).
+        """
+        cfg = self.config
+        with self.lock:
+            self.request_counts[tr_id] = self.request_counts.get(tr_id, 0) + 1
+            delay = max(self.rng.gauss(cfg.latency_ms, cfg.latency_jitter_ms), 0.0) / 1000.0
+            inject = self.rng.random() < cfg.error_rate
+
+            if cfg.rate_limit_per_sec > 0:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(appkey, [cfg.rate_limit_per_sec, now])
+                tokens = min(cfg.rate_limit_per_sec, tokens + (now - last) * cfg.rate_limit_per_sec)
+                if tokens < 1.0:
+                    self._buckets[appkey] = [tokens, now]
+                    self.rejected["rate_limit"] += 1
+                    return 500, {"rt_cd": "1", "msg_cd": RATE_LIMIT_MSG_CD, "msg1": RATE_LIMIT_MSG}
+                self._buckets[appkey] = [tokens - 1.0, now]
+
+        if delay:
+            time.sleep(delay)
+        if inject:
+            with self.lock:
+                self.rejected["error"] += 1
+            return 500, {"rt_cd": "1", "msg_cd": "EGW00500", "msg1": "시뮬레이터 오류 주입"}
+        return None
+
+    # ── TR 처리 ─────────────────────────────────────────────────────────
+    def token(self, body: dict) -> dict:
+        expires = datetime.fromtimestamp(time.time() + 86400).strftime("%Y-%m-%d %H:%M:%S")
+        return {
+            "access_token": f"sim-{uuid.uuid4().hex}",
+            "token_type": "Bearer",
+            "expires_in": 86400,
+            "access_token_token_expired": expires,
+        }
+
+    def price(self, params: dict) -> dict:
+        excd = params.get("EXCD", "")
+        code = params.get("SYMB", "")
+        with self.lock:
+            sym = self.symbols.get(code)
+            # 종목이 없거나 거래소가 다르면 실서버처럼 빈 현재가를 돌려준다
+            if sym is None or PRICE_TO_ORDER_EXCHANGE.get(excd, excd) != sym.exchange:
+                last = ""
+            else:
+                last = f"{self._tick(sym):.4f}"
+                self._match_open_orders(code)
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "output": {"rsym": f"D{excd}{code}", "zdiv": "4", "base": last, "pvol": "0",
+                       "last": last, "sign": "3", "diff": "0", "rate": "0.00",
+                       "tvol": "0", "tamt": "0", "ordy": "매도불가" if not last else "매수가능"},
+        }
+
+    def balance(self, params: dict) -> dict:
+        cano = params.get("CANO", "")
+        acnt = params.get("ACNT_PRDT_CD", "")
+        exchange = params.get("OVRS_EXCG_CD", "")
+        with self.lock:
+            account = self._account(cano)
+            output1, total_cost, total_eval = [], 0.0, 0.0
+            for code, (qty, avg) in account.positions.items():
+                sym = self.symbols.get(code)
+                if qty <= 0 or sym is None or (exchange and sym.exchange != exchange):
+                    continue
+                price = self._tick(sym)
+                cost, value = qty * avg, qty * price
+                total_cost += cost
+                total_eval += value
+                output1.append({
+                    "cano": cano, "acnt_prdt_cd": acnt, "prdt_type_cd": "512",
+                    "ovrs_pdno": code, "ovrs_item_name": sym.name,
+                    "frcr_evlu_pfls_amt": f"{value - cost:.2f}",
+                    "evlu_pfls_rt": f"{(value / cost - 1) * 100 if cost else 0:.2f}",
+                    "pchs_avg_pric": f"{avg:.4f}", "ovrs_cblc_qty": str(int(qty)),
+                    "ord_psbl_qty": str(int(qty)), "frcr_pchs_amt1": f"{cost:.2f}",
+                    "ovrs_stck_evlu_amt": f"{value:.2f}", "now_pric2": f"{price:.4f}",
+                    "tr_crcy_cd": "USD", "ovrs_excg_cd": sym.exchange,
+                    "loan_type_cd": "10", "loan_dt": "", "expd_dt": "",
+                })
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "ctx_area_fk200": "", "ctx_area_nk200": "",
+            "output1": output1,
+            "output2": {
+                "frcr_pchs_amt1": f"{total_cost:.2f}", "ovrs_rlzt_pfls_amt": "0.00",
+                "ovrs_tot_pfls": f"{total_eval - total_cost:.2f}", "rlzt_erng_rt": "0.00",
+                "tot_evlu_pfls_amt": f"{total_eval - total_cost:.2f}",
+                "tot_pftrt": f"{(total_eval / total_cost - 1) * 100 if total_cost else 0:.2f}",
+                "frcr_buy_amt_smtl1": f"{total_cost:.2f}", "ovrs_rlzt_pfls_amt2": "0.00",
+                "frcr_buy_amt_smtl2": f"{total_cost:.2f}",
+            },
+        }
+
+    def foreign_margin(self, params: dict) -> dict:
+        with self.lock:
+            account = self._account(params.get("CANO", ""))
+            available = account.cash - account.reserved
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "output": [{
+                "natn_name": "미국", "crcy_cd": "USD",
+                "frcr_dncl_amt1": f"{account.cash:.2f}", "ustl_buy_amt": f"{account.reserved:.2f}",
+                "ustl_sll_amt": "0.00", "frcr_rcvb_amt": "0.00", "frcr_mgn_amt": f"{account.reserved:.2f}",
+                "frcr_gnrl_ord_psbl_amt": f"{available:.2f}", "frcr_ord_psbl_amt1": f"{available:.2f}",
+                "itgr_ord_psbl_amt": f"{available:.2f}", "bass_exrt": "1380.00",
+            }],
+        }
+
+    def order(self, tr_id: str, body: dict) -> dict:
+        is_buy = tr_id in BUY_TR_IDS
+        if not is_buy and tr_id not in SELL_TR_IDS:
+            return self._fail("APBK0919", f"지원하지 않는 주문 TR: {tr_id}")
+        try:
+            qty = int(body["ORD_QTY"])
+            limit = float(body["OVRS_ORD_UNPR"])
+            code = body["PDNO"]
+            cano = body["CANO"]
+        except (KeyError, ValueError):
+            return self._fail("OPSQ0002", "주문 입력값 오류")
+
+        with self.lock:
+            sym = self.symbols.get(code)
+            if sym is None or sym.exchange != body.get("OVRS_EXCG_CD"):
+                return self._fail("APBK1234", "해당 거래소에 존재하지 않는 종목입니다.")
+            if qty <= 0:
+                return self._fail("APBK0506", "주문수량을 확인하세요.")
+
+            account = self._account(cano)
+            if is_buy:
+                if qty * limit > account.cash - account.reserved:
+                    return self._fail("APBK0952", "주문가능금액을 초과 했습니다.")
+                account.reserved += qty * limit
+            else:
+                open_sell = sum(o.qty - o.filled_qty for o in account.orders
+                                if o.code == code and not o.is_buy)
+                if qty + open_sell > account.positions.get(code, [0, 0])[0]:
+                    return self._fail("APBK0986", "주문가능수량을 초과 했습니다.")
+
+            now = datetime.now()
+            order = SimOrder(
+                odno=f"{next(_order_numbers):010d}", cano=cano, code=code,
+                exchange=sym.exchange, is_buy=is_buy, qty=qty, limit=limit,
+                ord_dt=now.strftime("%Y%m%d"), ord_tmd=now.strftime("%H%M%S"),
+            )
+            account.orders.append(order)
+            self._match(account, order, self._tick(sym))
+
+        return {
+            "rt_cd": "0", "msg_cd": "APBK0013", "msg1": "주문 전송 완료 되었습니다.",
+            "output": {"KRX_FWDG_ORD_ORGNO": "01790", "ODNO": order.odno, "ORD_TMD": order.ord_tmd},
+        }
+
+    def executions(self, params: dict) -> dict:
+        code = params.get("PDNO", "")
+        side = params.get("SLL_BUY_DVSN", "00")
+        status = params.get("CCLD_NCCS_DVSN", "00")
+        with self.lock:
+            account = self._account(params.get("CANO", ""))
+            output = []
+            for o in account.orders:
+                if code and code != "%" and o.code != code:
+                    continue
+                if side == "01" and o.is_buy or side == "02" and not o.is_buy:
+                    continue
+                if status == "01" and o.filled_qty == 0 or status == "02" and o.filled_qty == o.qty:
+                    continue
+                output.append(self._execution_row(o))
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "ctx_area_fk200": "", "ctx_area_nk200": "", "output": output,
+        }
+
+    # ── 차트 (기간별시세 / 분봉) ─────────────────────────────────────────
+    def _business_days(self, count: int) -> List[date]:
+        days, day = [], datetime.now(US_TZ).date()
+        while len(days) < count:
+            if day.weekday() < 5:
+                days.append(day)
+            day -= timedelta(days=1)
+        return days[::-1]
+
+    def _daily_bars(self, sym: SimSymbol) -> list:
+        """
+        오늘 가격에서 거꾸로 걷는 결정적 랜덤워크 일봉 [(yyyymmdd, o, h, l, c, v), ...] (오름차순).
+        """
+        bars = self._daily.get(sym.code)
+        if bars is None:
+            rng = random.Random(f"{self.config.seed}:daily:{sym.code}")
+            days = self._business_days(self.config.history_days)
+            close, bars = sym.price, []
+            for day in reversed(days):
+                open_ = close * math.exp(rng.gauss(0.0, 0.01))
+                high = max(open_, close) * (1 + abs(rng.gauss(0.0, 0.005)))
+                low = min(open_, close) * (1 - abs(rng.gauss(0.0, 0.005)))
+                bars.append((day.strftime("%Y%m%d"), open_, high, low, close, rng.randint(10000, 5000000)))
+                close = open_ * math.exp(rng.gauss(0.0, 0.005))
+            bars.reverse()
+            self._daily[sym.code] = bars
+        return bars
+
+    def _minute_bars(self, sym: SimSymbol) -> list:
+        """
+        최근 minute_days 영업일 정규장 1분봉 [(epoch초, o, h, l, c, v), ...] (오름차순).
+        """
+        bars = self._minute.get(sym.code)
+        if bars is None:
+            rng = random.Random(f"{self.config.seed}:minute:{sym.code}")
+            price, bars = sym.price, []
+            for day in self._business_days(self.config.minute_days):
+                start = datetime.combine(day, dtime(9, 30), US_TZ).timestamp()
+                for i in range(390):
+                    open_ = price
+                    price = max(price * math.exp(rng.gauss(0.0, 0.001)), 0.0001)
+                    spread = abs(rng.gauss(0.0, 0.0005))
+                    bars.append((int(start) + 60 * i, open_, max(open_, price) * (1 + spread),
+                                 min(open_, price) * (1 - spread), price, rng.randint(100, 50000)))
+            self._minute[sym.code] = bars
+        return bars
+
+    def _chart_symbol(self, params: dict) -> Optional[SimSymbol]:
+        excd = params.get("EXCD", "")
+        sym = self.symbols.get(params.get("SYMB", ""))
+        if sym is None or PRICE_TO_ORDER_EXCHANGE.get(excd, excd) != sym.exchange:
+            return None
+        return sym
+
+    def daily_price(self, params: dict) -> dict:
+        """
+        기간별시세 (HHDFS76240000). BYMD(기준일, 비우면 마지막 날) 이전 일봉을 최신순으로 최대 100건.
+        """
+        end = params.get("BYMD") or self.history_end.strftime("%Y%m%d")
+        end = min(end, self.history_end.strftime("%Y%m%d"))
+        with self.lock:
+            sym = self._chart_symbol(params)
+            bars = self._daily_bars(sym) if sym is not None else []
+        keys = [b[0] for b in bars]
+        hi = bisect.bisect_right(keys, end)
+        rows = []
+        for i in range(hi - 1, max(hi - 100, 0) - 1, -1):
+            ymd, o, h, l, c, v = bars[i]
+            prev = bars[i - 1][4] if i > 0 else o
+            rows.append({
+                "xymd": ymd, "clos": f"{c:.4f}", "sign": "2" if c >= prev else "5",
+                "diff": f"{abs(c - prev):.4f}", "rate": f"{(c / prev - 1) * 100:.2f}",
+                "open": f"{o:.4f}", "high": f"{h:.4f}", "low": f"{l:.4f}",
+                "tvol": str(v), "tamt": f"{v * c:.0f}",
+                "pbid": f"{c:.4f}", "vbid": "0", "pask": f"{c:.4f}", "vask": "0",
+            })
+        code = params.get("SYMB", "")
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "output1": {"rsym": f"D{params.get('EXCD', '')}{code}", "zdiv": "4", "nrec": str(len(rows))},
+            "output2": rows,
+        }
+
+    def minute_chart(self, params: dict) -> dict:
+        """
+        분봉 (HHDFS76950200). NMIN 분 단위로 묶은 봉을 최신순으로 최대 NREC(≤120)건.
+        NEXT=1 이면 KEYB(현지 YYYYMMDDHHMMSS) 보다 이전 봉부터 이어서 조회한다.
+        """
+        nmin = max(int(params.get("NMIN") or 1), 1)
+        nrec = min(max(int(params.get("NREC") or 120), 1), 120)
+        keyb = params.get("KEYB", "") if params.get("NEXT") == "1" else ""
+        with self.lock:
+            sym = self._chart_symbol(params)
+            bars = self._minute_bars(sym) if sym is not None else []
+        cutoff = datetime.combine(self.history_end + timedelta(days=1), dtime(0, 0), US_TZ).timestamp()
+        if keyb:
+            cutoff = min(cutoff, datetime.strptime(keyb, "%Y%m%d%H%M%S").replace(tzinfo=US_TZ).timestamp())
+
+        # 같은 세션 안에서 nmin 개씩 묶는다 (세션 시작 기준)
+        grouped = []
+        for ts, o, h, l, c, v in bars:
+            if ts >= cutoff:
+                break
+            local = datetime.fromtimestamp(ts, US_TZ)
+            slot = ts - ((local.hour * 60 + local.minute - 570) % nmin) * 60
+            if grouped and grouped[-1][0] == slot:
+                g = grouped[-1]
+                grouped[-1] = (slot, g[1], max(g[2], h), min(g[3], l), c, g[5] + v)
+            else:
+                grouped.append((slot, o, h, l, c, v))
+
+        rows = []
+        for ts, o, h, l, c, v in reversed(grouped[-nrec:]):
+            local, korea = datetime.fromtimestamp(ts, US_TZ), datetime.fromtimestamp(ts, KST)
+            rows.append({
+                "tymd": local.strftime("%Y%m%d"), "xymd": local.strftime("%Y%m%d"), "xhms": local.strftime("%H%M%S"),
+                "kymd": korea.strftime("%Y%m%d"), "khms": korea.strftime("%H%M%S"),
+                "open": f"{o:.4f}", "high": f"{h:.4f}", "low": f"{l:.4f}", "last": f"{c:.4f}",
+                "evol": str(v), "eamt": f"{v * c:.0f}",
+            })
+        more = "1" if len(grouped) > nrec else "0"
+        code = params.get("SYMB", "")
+        return {
+            "rt_cd": "0", "msg_cd": OK_MSG_CD, "msg1": OK_MSG,
+            "output1": {"rsym": f"D{params.get('EXCD', '')}{code}", "zdiv": "4", "stim": "093000", "etim": "160000",
+                        "sktm": "223000", "ektm": "050000", "next": more, "more": more, "nrec": str(len(rows))},
+            "output2": rows,
+        }
+
+    # ── 매칭 엔진 ────────────────────────────────────────────────────────
+    def _match(self, account: SimAccount, order: SimOrder, last: float):
+        """
+        지정가 주문: 매수는 한도가 ≥ 매도호가, 매도는 한도가 ≤ 매수호가이면 전량 체결.
+        체결가는 호가(스프레드 반영), 매수 증거금 차액은 즉시 환급.
+        """
+        if order.filled_qty >= order.qty:
+            return
+        half_spread = last * self.config.spread_bps / 20000.0
+        ask, bid = last + half_spread, last - half_spread
+        if order.is_buy and order.limit < ask or not order.is_buy and order.limit > bid:
+            return
+
+        price = round(ask if order.is_buy else bid, 4)
+        qty = order.qty - order.filled_qty
+        pos = account.positions.setdefault(order.code, [0.0, 0.0])
+        if order.is_buy:
+            account.reserved -= qty * order.limit
+            account.cash -= qty * price
+            pos[1] = (pos[0] * pos[1] + qty * price) / (pos[0] + qty)
+            pos[0] += qty
+        else:
+            account.cash += qty * price
+            pos[0] -= qty
+        order.filled_qty = order.qty
+        order.fill_price = price
+
+    def _match_open_orders(self, code: str):
+        sym = self.symbols[code]
+        for account in self.accounts.values():
+            for order in account.orders:
+                if order.code == code and order.filled_qty < order.qty:
+                    self._match(account, order, sym.price)
+
+    def _execution_row(self, o: SimOrder) -> dict:
+        sym = self.symbols[o.code]
+        filled = o.filled_qty
+        return {
+            "ord_dt": o.ord_dt, "ord_gno_brno": "01790", "odno": o.odno, "orgn_odno": o.odno,
+            "sll_buy_dvsn_cd": "02" if o.is_buy else "01",
+            "sll_buy_dvsn_cd_name": "매수" if o.is_buy else "매도",
+            "rvse_cncl_dvsn": "00", "rvse_cncl_dvsn_name": "",
+            "pdno": o.code, "prdt_name": sym.name,
+            "ft_ord_qty": str(o.qty), "ft_ord_unpr3": f"{o.limit:.4f}",
+            "ft_ccld_qty": str(filled), "ft_ccld_unpr3": f"{o.fill_price:.4f}" if filled else "0",
+            "ft_ccld_amt3": f"{filled * o.fill_price:.2f}", "nccs_qty": str(o.qty - filled),
+            "prcs_stat_name": "완료" if filled == o.qty else "접수",
+            "rjct_rson": "", "ord_tmd": o.ord_tmd, "tr_mket_name": o.exchange,
+            "tr_natn": "840", "tr_natn_name": "미국", "ovrs_excg_cd": o.exchange,
+            "tr_crcy_cd": "USD", "dmst_ord_dt": o.ord_dt, "thco_ord_tmd": o.ord_tmd,
+            "loan_type_cd": "10", "loan_dt": "", "mdia_dvsn_name": "OpenAPI",
+            "usa_amk_exts_rqst_yn": "N", "splt_buy_attr_name": "",
+        }
+
+    @staticmethod
+    def _fail(msg_cd: str, msg: str) -> dict:
+        return {"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg}
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) HTTP 서버
+# ─────────────────────────────────────────────────────────────────────────
+ROUTES = {
+    ("POST", "/oauth2/tokenP"): "token",
+    ("GET", "/uapi/overseas-price/v1/quotations/price"): "price",
+    ("GET", "/uapi/overseas-price/v1/quotations/dailyprice"): "daily_price",
+    ("GET", "/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice"): "minute_chart",
+    ("GET", "/uapi/overseas-stock/v1/trading/inquire-balance"): "balance",
+    ("GET", "/uapi/overseas-stock/v1/trading/foreign-margin"): "foreign_margin",
+    ("POST", "/uapi/overseas-stock/v1/trading/order"): "order",
+    ("GET", "/uapi/overseas-stock/v1/trading/inquire-ccnl"): "executions",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "KISSimulator/1.0"
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 로 인한 40ms 대기 방지
+
+    def log_message(self, fmt, *args):
+        logging.getLogger(__name__).debug(fmt, *args)
+
+    def _reply(self, status: int, body: dict, tr_id: str = ""):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json; charset=UTF-8")
+        self.send_header("content-length", str(len(payload)))
+        if tr_id:
+            self.send_header("tr_id", tr_id)
+            self.send_header("tr_cont", "")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method: str):
+        sim: KISSimulator = self.server.simulator
+        url = urlparse(self.path)
+        route = ROUTES.get((method, url.path))
+        length = int(self.headers.get("content-length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if route is None:
+            self._reply(404, {"rt_cd": "1", "msg_cd": "EGW00404", "msg1": f"unknown path {url.path}"})
+            return
+
+        tr_id = self.headers.get("tr_id", "tokenP" if route == "token" else "")
+        rejected = sim.admit(tr_id, self.headers.get("appkey", ""))
+        if rejected is not None:
+            self._reply(*rejected, tr_id=tr_id)
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            self._reply(400, KISSimulator._fail("EGW00400", "JSON 파싱 실패"), tr_id)
+            return
+
+        if route == "token":
+            self._reply(200, sim.token(body))
+        elif route == "order":
+            self._reply(200, sim.order(tr_id, body), tr_id)
+        else:
+            self._reply(200, getattr(sim, route)(params), tr_id)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class SimulatorServer:
+    """
+    백그라운드 스레드에서 KISSimulator 를 HTTP 로 제공한다 (port=0 이면 임의 포트).
+    """
+
+    def __init__(self, simulator: Optional[KISSimulator] = None, host: str = "127.0.0.1", port: int = 0):
+        self.simulator = simulator or KISSimulator()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.simulator = self.simulator
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SimulatorServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="kis-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def make_universe(n: int, seed: int = 0) -> Dict[str, Tuple[float, str]]:
+    """
+    테스트/벤치마크용 가상 종목 n개 (SYM0000 ...) 를 US 거래소에 고르게 배정.
+    """
+    rng = random.Random(seed)
+    return {
+        f"SYM{i:04d}": (round(rng.uniform(5, 500), 2), US_EXCHANGES[i % len(US_EXCHANGES)])
+        for i in range(n)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 KIS OpenAPI 시뮬레이터")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--symbols", type=int, default=100, help="가상 종목 수 (SYM0000 ...)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="appkey 당 초당 요청 한도")
+    parser.add_argument("--cash", type=float, default=100000.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    sim_cfg = SimulatorConfig(
+        latency_ms=args.latency_ms, latency_jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_per_sec=args.rate_limit, default_cash=args.cash,
+    )
+    server = SimulatorServer(KISSimulator(sim_cfg, make_universe(args.symbols)), args.host, args.port)
+    logging.getLogger("simulator").info("KIS 시뮬레이터 시작: %s", server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
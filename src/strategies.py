@@ -0,0 +1,159 @@
+# src/strategies.py
+"""
+다중 전략 목표비중 합산.
+
+config/target_allocation.yaml 에 이름 붙은 전략을 여러 개 두고, 전략별 자본 배분 비율로
+가중합한 하나의 계좌 목표비중으로 리밸런싱한다. 계좌 단위로 한 번만 수량을 계산하므로
+같은 종목을 한 전략은 사고 다른 전략은 파는 주문이 종목별로 상계되어 한 건만 나간다.
+
+    strategies:
+      growth:
+        allocation: 0.6              # 계좌 평가금액 대비 배분 비율 (합계 ≤ 1, 나머지는 현금)
+        weights: {TQQQ: 0.5, SOXL: 0.3, SGOV: 0.2}
+      income:
+        allocation: 0.4
+        weights: {SGOV: 0.5, FEPI: 0.5}
+
+전략이 하나도 없으면 config.yaml strategy.weights 를 그대로 쓴다.
+allocation_file 은 디렉터리여도 되며, 파일 읽기/검증/종목 해석은 src/allocation_library.py 가
+컴파일해 캐시한다.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from src.rebalance_engine import size_orders
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+ALLOCATION_PATH = os.path.join(ROOT_DIR, "config", "target_allocation.yaml")
+TOLERANCE = 1e-6
+
+
+@dataclass
+class Strategy:
+    name: str
+    allocation: float
+    weights: Dict[str, float] = field(default_factory=dict)
+
+
+def parse_strategies(raw: Optional[dict]) -> List[Strategy]:
+    """
+    {이름: {allocation, weights}} → Strategy 목록 (검증 포함). 형식 오류는 ValueError.
+    """
+    strategies = []
+    for name, entry in (raw or {}).items():
+        entry = entry or {}
+        allocation = float(entry.get("allocation", 0.0))
+        weights = {str(k): float(v) for k, v in (entry.get("weights") or {}).items()}
+        if allocation < 0:
+            raise ValueError(f"strategies.{name}.allocation 은 0 이상이어야 합니다: {allocation}")
+        if any(w < 0 for w in weights.values()):
+            raise ValueError(f"strategies.{name}.weights 에 음수 비중이 있습니다")
+        if sum(weights.values()) > 1 + TOLERANCE:
+            raise ValueError(f"strategies.{name}.weights 합계가 1 을 넘습니다: {sum(weights.values()):.4f}")
+        strategies.append(Strategy(str(name), allocation, weights))
+
+    total = sum(s.allocation for s in strategies)
+    if total > 1 + TOLERANCE:
+        raise ValueError(f"전략 allocation 합계가 1 을 넘습니다: {total:.4f}")
+    return strategies
+
+
+def load_strategies(path: Optional[str] = ALLOCATION_PATH, master=None, cache_dir: Optional[str] = None) -> List[Strategy]:
+    """
+    배분 파일(또는 디렉터리)의 strategies (상대 경로는 프로젝트 루트 기준). 없거나 비어 있으면 빈 목록.
+    """
+    if not path:
+        return []
+    from src.allocation_library import compile_allocation
+    return compile_allocation(path, master, cache_dir).strategies()
+
+
+def load_allocation(cfg: dict, master=None):
+    """
+    strategy.allocation_file 컴파일 결과 (CompiledAllocation). 인라인 strategies 가 있거나
+    allocation_file 이 null 이면 None. 캐시 위치는 strategy.allocation_cache.
+    """
+    from src.allocation_library import CACHE_DIR, compile_allocation
+    strategy_cfg = cfg.get("strategy", {}) or {}
+    path = strategy_cfg.get("allocation_file", ALLOCATION_PATH)
+    if strategy_cfg.get("strategies") or not path:
+        return None
+    cache_dir = strategy_cfg.get("allocation_cache", CACHE_DIR)
+    if cache_dir and not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(ROOT_DIR, cache_dir)
+    return compile_allocation(path, master, cache_dir)
+
+
+def strategy_matrix(strategies: Sequence[Strategy]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    (종목 목록, 전략별 비중 (S, N), 배분 비율 (S,))
+    """
+    codes = list(dict.fromkeys(c for s in strategies for c in s.weights))
+    matrix = np.array([[s.weights.get(c, 0.0) for c in codes] for s in strategies], dtype=float)
+    allocation = np.array([s.allocation for s in strategies], dtype=float)
+    return codes, matrix.reshape(len(strategies), len(codes)), allocation
+
+
+def aggregate_weights(strategies: Sequence[Strategy]) -> Dict[str, float]:
+    """
+    계좌 목표비중 = Σ 배분 비율 × 전략 비중 (종목별). 합산 비중이 0 인 종목도 남겨
+    strategy.weights 와 같이 "전량 매도" 목표로 쓴다.
+    """
+    codes, matrix, allocation = strategy_matrix(strategies)
+    combined = allocation @ matrix
+    return {code: float(w) for code, w in zip(codes, combined)}
+
+
+def resolve_strategies(cfg: dict, master=None, compiled=None) -> List[Strategy]:
+    """
+    설정의 전략 목록. strategy.strategies(인라인) 가 있으면 그것을, 없으면
+    strategy.allocation_file(기본 target_allocation.yaml, null 이면 사용 안 함)의 컴파일 결과를 쓴다.
+    """
+    strategies = parse_strategies((cfg.get("strategy", {}) or {}).get("strategies"))
+    if not strategies:
+        compiled = compiled if compiled is not None else load_allocation(cfg, master)
+        strategies = compiled.strategies() if compiled is not None else []
+    return strategies
+
+
+def target_weights(cfg: dict, strategies: Optional[Sequence[Strategy]] = None) -> Dict[str, float]:
+    """
+    계좌 목표비중: 전략이 있으면 합산, 없으면 strategy.weights
+    """
+    strategies = resolve_strategies(cfg) if strategies is None else strategies
+    if strategies:
+        return aggregate_weights(strategies)
+    return dict((cfg.get("strategy", {}) or {}).get("weights", {}) or {})
+
+
+def netting_report(
+    strategies: Sequence[Strategy],
+    prices: Dict[str, float],
+    qty: Dict[str, float],
+    cash: float,
+    other_value: float = 0.0,
+) -> Dict[str, int]:
+    """
+    전략별로 따로 리밸런싱했을 때(각 전략이 보유/현금을 배분 비율만큼 나눠 가진다고 가정)와
+    합산 후 한 번에 리밸런싱했을 때의 주문 수 비교. other_value 는 목표 외 보유 종목 평가금액.
+    """
+    codes, matrix, allocation = strategy_matrix(strategies)
+    p = np.array([prices.get(c) or 0.0 for c in codes], dtype=float)
+    q = np.array([qty.get(c, 0) for c in codes], dtype=float)
+
+    _, _, sells, buys, _, _ = size_orders(p, allocation[:, None] * q, matrix, allocation * cash,
+                                          allocation * other_value)
+    separate = int(np.count_nonzero(sells) + np.count_nonzero(buys))
+    net = (buys - sells).sum(axis=0)
+    _, _, sell, buy, _, _ = size_orders(p, q, allocation @ matrix, cash, other_value)
+    return {
+        "separate_orders": separate,
+        "netted_orders": int(np.count_nonzero(net)),
+        "combined_orders": int(np.count_nonzero(sell) + np.count_nonzero(buy)),
+        "opposing_symbols": int(np.count_nonzero((sells > 0).any(axis=0) & (buys > 0).any(axis=0))),
+    }
@@ -0,0 +1,280 @@
+# src/symbol_master.py
+"""
+종목 마스터 (allStockCode 테이블 메모리 색인).
+
+테이블을 한 번 읽어 조회용 색인을 만든다.
+    - 종목코드 → SymbolRecord
+    - 회사명 접두어 검색 (정렬된 이름 목록 + bisect)
+    - 업종 → 종목코드 목록
+
+주문/매도 기록/로그 경로의 이름·업종 조회는 모두 메모리에서 끝나고 행마다 DB 를 조회하지 않는다.
+refresh() 는 먼저 집계 한 줄(행 수, 최대 index, 색인 컬럼 글자 수 합계)로 변화 여부를 보고,
+달라졌을 때(또는 verify_sec 마다)만 색인 컬럼을 튜플로 읽어 행 checksum(crc32) 을 비교한다.
+행 수/최대 index 가 같은 제자리 수정(UPDATE)도 글자 수 합계 또는 주기적 checksum 으로 잡는다.
+앞부분 행이 그대로이고 뒤에 행이 추가된 경우는 새 행만 합치고, 그 밖의 변화는 전체를 다시
+만든다. 색인은 새로 만든 뒤 통째로 교체하므로 조회 쪽에는 잠금이 없고, 최초 적재 이후의
+자동 갱신은 백그라운드 스레드에서 돌아 조회(주문/매도 기록 경로)를 막지 않는다.
+"""
+
+import bisect
+import logging
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+
+from src.db.models import AllStockCode
+
+
+# 색인에 쓰는 컬럼 (index 는 정렬/추가 판단용)
+_COLUMNS = (
+    AllStockCode.index, AllStockCode.종목코드, AllStockCode.회사명, AllStockCode.업종,
+    AllStockCode.주요제품, AllStockCode.상장일, AllStockCode.type,
+)
+
+# 변화 확인용 집계 (행 수, 최대 index, 색인 컬럼 글자 수 합계)
+_MARKER = (
+    func.count(AllStockCode.index), func.max(AllStockCode.index),
+    func.sum(sum(func.length(func.coalesce(col, "")) for col in _COLUMNS[1:])),
+)
+
+
+class SymbolRecord(NamedTuple):
+    code: str
+    name: Optional[str]
+    sector: Optional[str]
+    products: Optional[str]
+    listed: Optional[str]
+    market: Optional[str]        # allStockCode.type
+
+
+def normalize_code(code) -> str:
+    """
+    숫자 종목코드는 앞자리 0 이 빠진 채 저장된 경우가 있어 6자리로 맞춘다 (5930 → 005930).
+    """
+    code = str(code).strip().upper()
+    return code.zfill(6) if code.isdigit() and len(code) < 6 else code
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+class _Snapshot(NamedTuple):
+    by_code: Dict[str, SymbolRecord]
+    names: List[Tuple[str, str]]              # (정규화 이름, 종목코드) 정렬
+    sectors: Dict[str, Tuple[str, ...]]
+    count: int
+    max_index: int
+    checksum: int
+    marker: Optional[tuple]
+
+
+def _checksum(rows, crc: int = 0) -> int:
+    for row in rows:
+        crc = zlib.crc32(repr(tuple(row)).encode(), crc)
+    return crc
+
+
+def _build(
+    records: Dict[str, SymbolRecord], count: int, max_index: int, checksum: int, marker: Optional[tuple] = None
+) -> _Snapshot:
+    names = sorted((_name_key(r.name), r.code) for r in records.values() if r.name)
+    sectors: Dict[str, List[str]] = {}
+    for r in records.values():
+        if r.sector:
+            sectors.setdefault(r.sector, []).append(r.code)
+    return _Snapshot(records, names, {s: tuple(sorted(c)) for s, c in sectors.items()},
+                     count, max_index, checksum, marker)
+
+
+EMPTY = _build({}, 0, -1, 0)
+
+
+class SymbolMaster:
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        refresh_sec: float = 300.0,
+        verify_sec: float = 3600.0,
+    ):
+        """
+        session_factory : SQLAlchemy 세션 생성자 (기본: src.db.db.SessionLocal)
+        refresh_sec     : 조회 시 자동 refresh() 간격 (0 이하면 자동 갱신 없음)
+        verify_sec      : 집계가 같아도 행 checksum 까지 확인하는 간격 (0 이하면 매번)
+        """
+        if session_factory is None:
+            from src.db.db import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.refresh_sec = refresh_sec
+        self.verify_sec = verify_sec
+        self._snap = EMPTY
+        self._loaded_at: Optional[float] = None
+        self._verified_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    # ─── 적재 ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _record(row) -> SymbolRecord:
+        return SymbolRecord(normalize_code(row.종목코드), row.회사명, row.업종, row.주요제품, row.상장일, row.type)
+
+    def refresh(self, full: bool = False) -> bool:
+        """
+        테이블이 바뀌었으면 색인을 다시 만든다. 바뀐 게 있으면 True.
+        """
+        with self._lock:
+            snap = self._snap
+            session = self.session_factory()
+            try:
+                marker = tuple(session.query(*_MARKER).filter(AllStockCode.종목코드.isnot(None)).one())
+                verified_at = self._verified_at
+                verify = (full or verified_at is None or self.verify_sec <= 0
+                          or time.monotonic() - verified_at >= self.verify_sec)
+                if marker == snap.marker and not verify:
+                    self._loaded_at = time.monotonic()
+                    return False
+                rows = (session.query(*_COLUMNS).filter(AllStockCode.종목코드.isnot(None))
+                        .order_by(AllStockCode.index).all())
+            finally:
+                session.close()
+            self._loaded_at = self._verified_at = time.monotonic()
+
+            count = len(rows)
+            max_index = rows[-1][0] if rows else -1
+            # 이전 적재분만큼의 앞부분 checksum 을 이어서 계산 (뒤에 추가만 된 경우 판별)
+            prefix = _checksum(rows[:snap.count]) if 0 < snap.count <= count else None
+            checksum = _checksum(rows[snap.count:], prefix) if prefix is not None else _checksum(rows)
+            if not full and (count, checksum) == (snap.count, snap.checksum):
+                self._snap = snap._replace(marker=marker)
+                return False
+
+            appended = not full and prefix == snap.checksum
+            if appended:
+                records = dict(snap.by_code)
+                rows = rows[snap.count:]
+            else:
+                records = {}
+            records.update((r.code, r) for r in map(self._record, rows))
+            self._snap = _build(records, count, max_index, checksum, marker)
+        self.logger.info("[SymbolMaster] %s: 종목 %d개 (반영한 행 %d)",
+                         "증분 갱신" if appended else "전체 적재", len(records), len(rows))
+        return True
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:
+            # DB 장애 시 이전 색인으로 계속 조회 (refresh_sec 뒤에 다시 시도)
+            self._loaded_at = time.monotonic()
+            self.logger.exception("[SymbolMaster] 종목 마스터 갱신 실패")
+
+    def _refresh_in_background(self):
+        """
+        갱신 스레드가 돌고 있지 않으면 하나 띄운다 (조회는 기존 색인으로 바로 반환).
+        """
+        with self._refresher_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_quietly, name="symbol-master-refresh", daemon=True)
+            self._refresher.start()
+
+    def _current(self) -> _Snapshot:
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            # 최초 적재는 조회 결과가 필요하므로 호출한 스레드에서
+            self._refresh_quietly()
+        elif self.refresh_sec > 0 and time.monotonic() - loaded_at >= self.refresh_sec:
+            self._refresh_in_background()
+        return self._snap
+
+    # ─── 조회 ──────────────────────────────────────────────────────────────
+    @property
+    def version(self) -> Tuple[int, int, int]:
+        """
+        적재한 테이블 상태 (행 수, 최대 index, 행 checksum). 해석 결과 캐시 키에 쓴다.
+        """
+        snap = self._current()
+        return snap.count, snap.max_index, snap.checksum
+
+    def __len__(self) -> int:
+        return len(self._current().by_code)
+
+    def __contains__(self, code) -> bool:
+        return normalize_code(code) in self._current().by_code
+
+    def get(self, code) -> Optional[SymbolRecord]:
+        return self._current().by_code.get(normalize_code(code))
+
+    def name(self, code, default: Optional[str] = None) -> Optional[str]:
+        record = self.get(code)
+        return record.name if record is not None and record.name else default
+
+    def sector(self, code) -> Optional[str]:
+        record = self.get(code)
+        return record.sector if record is not None else None
+
+    def codes_in_sector(self, sector: str) -> Tuple[str, ...]:
+        return self._current().sectors.get(sector, ())
+
+    def sectors(self) -> List[str]:
+        return sorted(self._current().sectors)
+
+    def by_name(self, name: str) -> Optional[SymbolRecord]:
+        """
+        회사명 정확히 일치 (대소문자 무시). 같은 이름이 여럿이면 종목코드 순 첫 번째.
+        """
+        snap = self._current()
+        key = _name_key(name)
+        i = bisect.bisect_left(snap.names, (key, ""))
+        if i < len(snap.names) and snap.names[i][0] == key:
+            return snap.by_code[snap.names[i][1]]
+        return None
+
+    def search(self, prefix: str, limit: int = 20) -> List[SymbolRecord]:
+        """
+        회사명 접두어 검색 (대소문자 무시, 이름순).
+        """
+        snap = self._current()
+        key = _name_key(prefix)
+        start = bisect.bisect_left(snap.names, (key, ""))
+        out = []
+        for i in range(start, min(start + limit, len(snap.names))):
+            name, code = snap.names[i]
+            if not name.startswith(key):
+                break
+            out.append(snap.by_code[code])
+        return out
+
+    def names(self, codes: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        여러 종목의 회사명 {종목코드: 회사명} (없으면 None).
+        """
+        by_code = self._current().by_code
+        out = {}
+        for code in codes:
+            record = by_code.get(normalize_code(code))
+            out[code] = record.name if record is not None else None
+        return out
+
+
+_master: Optional[SymbolMaster] = None
+_master_lock = threading.Lock()
+
+
+def get_symbol_master(cfg: Optional[dict] = None) -> SymbolMaster:
+    """
+    프로세스 공유 SymbolMaster (처음 조회할 때 적재). cfg 는 config.yaml symbol_master 섹션.
+    """
+    global _master
+    with _master_lock:
+        if _master is None:
+            cfg = cfg or {}
+            _master = SymbolMaster(refresh_sec=float(cfg.get("refresh_sec", 300)),
+                                   verify_sec=float(cfg.get("verify_sec", 3600)))
+        return _master
@@ -0,0 +1,226 @@
+# src/tracing.py
+"""
+리밸런싱 주기 추적 (경량 span).
+
+    tracing:
+      enabled: true
+      output_dir: data/traces   # 주기마다 <시각>-<계좌>.json 저장 (비우면 메모리에만 보관)
+      format: chrome            # chrome (chrome://tracing, Perfetto) / json (중첩 트리)
+
+    with tracing.trace("rebalance", account="12345678-01"):
+        with tracing.span("price", symbol="AAPL") as span:
+            ...
+            span.set("rt_cd", "0")
+
+현재 span 은 contextvars 로 전달되므로 스레드 풀 작업은 tracing.propagate(fn) 로 감싸야
+부모 span 아래에 붙는다. 비활성 상태에서는 span() 이 공유 no-op 객체를 돌려준다.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_current: contextvars.ContextVar = contextvars.ContextVar("kis_trace_span", default=None)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 1) Span
+# ─────────────────────────────────────────────────────────────────────────
+class Span:
+    __slots__ = ("name", "attrs", "start_ns", "end_ns", "thread_id", "children", "_token", "_lock")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.end_ns = 0
+        self.thread_id = 0
+        self.children: List["Span"] = []
+        self._token = None
+        self._lock = threading.Lock()
+
+    def set(self, key: str, value: Any):
+        self.attrs[key] = value
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self._token = _current.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        parent = _current.get()
+        if parent is not None:
+            with parent._lock:
+                parent.children.append(self)
+        return False
+
+    def to_dict(self, origin_ns: Optional[int] = None) -> dict:
+        origin_ns = self.start_ns if origin_ns is None else origin_ns
+        return {
+            "name": self.name,
+            "start_ms": (self.start_ns - origin_ns) / 1e6,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "thread": self.thread_id,
+            "attrs": self.attrs,
+            "children": [c.to_dict(origin_ns) for c in sorted(self.children, key=lambda c: c.start_ns)],
+        }
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Trace(Span):
+    """
+    최상위 span. 끝나면 최근 추적 목록에 보관하고 설정에 따라 파일로 내보낸다.
+    """
+    __slots__ = ()
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        _State.finish(self)
+        return False
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 2) 공개 API
+# ─────────────────────────────────────────────────────────────────────────
+class _State:
+    enabled = False
+    output_dir: Optional[str] = None
+    fmt = "chrome"
+    recent: Deque[Span] = deque(maxlen=20)
+
+    @classmethod
+    def finish(cls, root: Span):
+        cls.recent.append(root)
+        if not cls.output_dir:
+            return
+        label = root.attrs.get("account", "")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = f"{stamp}-{root.name}{'-' + str(label) if label else ''}.json"
+        try:
+            write(os.path.join(cls.output_dir, name), root, cls.fmt)
+        except Exception:
+            logging.getLogger(__name__).exception("[Tracing] 추적 파일 저장 실패")
+
+
+def setup(tracing_cfg: Optional[dict] = None) -> bool:
+    tracing_cfg = tracing_cfg or {}
+    _State.enabled = bool(tracing_cfg.get("enabled", False))
+    output_dir = tracing_cfg.get("output_dir") or None
+    if output_dir and not os.path.isabs(output_dir):
+        output_dir = os.path.join(ROOT_DIR, output_dir)
+    _State.output_dir = output_dir
+    _State.fmt = tracing_cfg.get("format", "chrome")
+    return _State.enabled
+
+
+def enabled() -> bool:
+    return _State.enabled
+
+
+def span(name: str, **attrs):
+    """
+    현재 span 의 자식 span. 비활성이면 no-op.
+    """
+    if not _State.enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def trace(name: str, **attrs):
+    """
+    최상위 span (리밸런싱 1주기 등). 이미 추적 중이면 일반 자식 span 으로 동작한다.
+    """
+    if not _State.enabled:
+        return _NOOP
+    if _current.get() is not None:
+        return Span(name, attrs)
+    return _Trace(name, attrs)
+
+
+def current():
+    return _current.get() or _NOOP
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    호출 시점의 추적 컨텍스트에서 fn 을 실행하는 함수 (ThreadPoolExecutor 작업용).
+    """
+    if not _State.enabled:
+        return fn
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def recent_traces() -> List[Span]:
+    return list(_State.recent)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 3) 내보내기
+# ─────────────────────────────────────────────────────────────────────────
+def to_chrome(root: Span) -> dict:
+    """
+    Chrome trace event 형식 (chrome://tracing, https://ui.perfetto.dev 에서 열기).
+    """
+    pid = os.getpid()
+    events = []
+    for s in root.walk():
+        events.append({
+            "name": s.name,
+            "ph": "X",
+            "ts": (s.start_ns - root.start_ns) / 1e3,
+            "dur": (s.end_ns - s.start_ns) / 1e3,
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in s.attrs.items()},
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write(path: str, root: Span, fmt: str = "chrome"):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = to_chrome(root) if fmt == "chrome" else root.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, default=str)
@@ -0,0 +1,216 @@
+# src/transport.py
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import tracing
+from src.rate_limiter import RateLimiter
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# 공유 HTTP 전송 계층
+#   매 호출마다 requests.get/post 를 쓰면 TLS 연결을 새로 맺는다.
+#   appkey 단위로 requests.Session 과 RateLimiter 를 공유해
+#   keep-alive 연결을 재사용하고 초당 요청 한도를 계좌 간에 나눠 쓴다.
+# ─────────────────────────────────────────────────────────────────────────
+RATE_LIMIT_MSG_CD = "EGW00201"   # 초당 거래건수를 초과하였습니다.
+EXPIRED_TOKEN_MSG_CD = "EGW00123"  # 기간이 만료된 token 입니다.
+
+
+@dataclass
+class RequestEvent:
+    """
+    HTTP 요청 1회(재시도 포함 시 시도마다 1건)의 결과. 리스너에 전달된다.
+    """
+    method: str
+    url: str
+    tr_id: str
+    client: Hashable
+    attempt: int                 # 0부터 시작하는 재시도 번호
+    waited: float                # 요청 한도 슬롯 대기 시간(초)
+    elapsed: float               # HTTP 왕복 + JSON 파싱 시간(초)
+    status: Optional[int] = None
+    rt_cd: Optional[str] = None
+    msg_cd: Optional[str] = None
+    bytes_received: int = 0
+    error: Optional[str] = None
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.msg_cd == RATE_LIMIT_MSG_CD
+
+
+# 모든 Transport 가 공유하는 요청 리스너 (부하 테스트 / 메트릭 수집용)
+_listeners: Tuple[Callable[[RequestEvent], None], ...] = ()
+_listeners_lock = threading.Lock()
+
+
+def add_listener(listener: Callable[[RequestEvent], None]):
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener: Callable[[RequestEvent], None]):
+    global _listeners
+    with _listeners_lock:
+        _listeners = tuple(l for l in _listeners if l != listener)
+
+
+def _emit(event: RequestEvent):
+    for listener in _listeners:
+        try:
+            listener(event)
+        except Exception:
+            logging.getLogger(__name__).exception("[Transport] 요청 리스너 실행 중 예외 발생")
+
+
+def _span_attrs(tr_id: str, params: Optional[dict], body: Optional[dict], attempt: int, waited: float) -> dict:
+    """
+    추적 span 속성: TR, 종목, 거래소, 재시도 번호, 요청 한도 대기 시간.
+    """
+    fields = params or body or {}
+    attrs = {"tr_id": tr_id, "attempt": attempt, "limiter_wait_ms": round(waited * 1000, 3)}
+    symbol = fields.get("SYMB") or fields.get("PDNO")
+    exchange = fields.get("EXCD") or fields.get("OVRS_EXCG_CD")
+    if symbol:
+        attrs["symbol"] = symbol
+    if exchange:
+        attrs["exchange"] = exchange
+    return attrs
+
+
+class Transport:
+    def __init__(
+        self,
+        pool_size: int = 32,
+        timeout: float = 10.0,
+        rate_per_sec: float = 0.0,
+        max_retries: int = 3,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(rate_per_sec)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.logger = logging.getLogger(__name__)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        client: Hashable = "default",
+        reauth: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> dict:
+        """
+        요청 한도 슬롯을 얻은 뒤 요청하고 JSON 응답을 dict 로 반환.
+        초당 거래건수 초과(EGW00201) 응답은 max_retries 회까지 재시도한다.
+        토큰 만료(EGW00123) 응답이면 reauth(거부된 토큰) 로 새 토큰을 받아 한 번만 다시 요청한다.
+        HTTP/파싱 예외는 호출자에게 전달된다.
+        """
+        tr_id = (headers or {}).get("tr_id", "")
+        attempt, retries, reauthed = 0, 0, False
+        while True:
+            waited = self.limiter.acquire(client)
+            with tracing.span(tr_id or "http", **(_span_attrs(tr_id, params, json, attempt, waited)
+                                                  if tracing.enabled() else {})) as span:
+                start = time.perf_counter()
+                resp = None
+                try:
+                    resp = self.session.request(
+                        method, url, headers=headers, params=params, json=json, timeout=self.timeout
+                    )
+                    data = resp.json()
+                except Exception as e:
+                    if _listeners:
+                        _emit(RequestEvent(
+                            method, url, tr_id, client, attempt, waited, time.perf_counter() - start,
+                            status=resp.status_code if resp is not None else None, error=type(e).__name__,
+                        ))
+                    raise
+                span.set("rt_cd", data.get("rt_cd"))
+                span.set("msg_cd", data.get("msg_cd"))
+                if _listeners:
+                    _emit(RequestEvent(
+                        method, url, tr_id, client, attempt, waited, time.perf_counter() - start,
+                        status=resp.status_code, rt_cd=data.get("rt_cd"), msg_cd=data.get("msg_cd"),
+                        bytes_received=len(resp.content),
+                    ))
+            attempt += 1
+
+            msg_cd = data.get("msg_cd")
+            if msg_cd == EXPIRED_TOKEN_MSG_CD and reauth is not None and not reauthed:
+                reauthed = True
+                stale = (headers or {}).get("authorization", "").replace("Bearer ", "", 1)
+                token = reauth(stale)
+                if not token:
+                    return data
+                self.logger.warning("[Transport] 토큰 만료 응답, 재발급 후 재요청 (tr_id=%s)", tr_id)
+                headers = {**headers, "authorization": f"Bearer {token}"}
+                continue
+            if msg_cd != RATE_LIMIT_MSG_CD or retries == self.max_retries:
+                return data
+            retries += 1
+            self.logger.warning("[Transport] 초당 거래건수 초과, 재시도 %s/%s", retries, self.max_retries)
+            time.sleep(0.1 * (2 ** (retries - 1)))
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        client: Hashable = "default",
+        reauth: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> dict:
+        return self.request("GET", url, headers=headers, params=params, client=client, reauth=reauth)
+
+    def post(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        json: Optional[dict] = None,
+        client: Hashable = "default",
+        reauth: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> dict:
+        return self.request("POST", url, headers=headers, json=json, client=client, reauth=reauth)
+
+    def close(self):
+        self.session.close()
+
+
+_transports: Dict[str, Transport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(api_key: Optional[str], rate_per_sec: float = 0.0) -> Transport:
+    """
+    appkey 별 공유 Transport 반환 (없으면 rate_per_sec 한도로 생성).
+    """
+    key = api_key or ""
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = Transport(rate_per_sec=rate_per_sec)
+            _transports[key] = transport
+        return transport
+
+
+def close_transports():
+    """
+    프로세스 종료 시 모든 공유 연결을 정리한다.
+    """
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
@@ -0,0 +1,57 @@
+import unittest
+from types import SimpleNamespace
+
+from src.account_snapshot import AccountSnapshot
+
+
+class FakeManager:
+    def __init__(self):
+        self.calls = {"balance": 0, "margin": 0, "price": 0}
+
+    def get_merged_balance(self):
+        self.calls["balance"] += 1
+        item = SimpleNamespace(ovrs_pdno="AAPL", ovrs_cblc_qty="3")
+        empty = SimpleNamespace(ovrs_pdno="MSFT", ovrs_cblc_qty="0")
+        return SimpleNamespace(output1=[item, empty])
+
+    def get_foreign_margin(self):
+        self.calls["margin"] += 1
+        return SimpleNamespace(output=[])
+
+    def get_available_cash(self, currency, margin=None):
+        if margin is None:
+            margin = self.get_foreign_margin()
+        return 100.0 if margin is not None and currency == "USD" else 0.0
+
+    def _get_price(self, code):
+        self.calls["price"] += 1
+        return 10.0
+
+
+class FailingMarginManager(FakeManager):
+    def get_foreign_margin(self):
+        self.calls["margin"] += 1
+        return None
+
+
+class TestAccountSnapshot(unittest.TestCase):
+    def test_each_source_is_fetched_once(self):
+        manager = FakeManager()
+        snapshot = AccountSnapshot(manager)
+        self.assertEqual(snapshot.positions(), {"AAPL": 3})
+        self.assertEqual(snapshot.positions(), {"AAPL": 3})
+        self.assertEqual(snapshot.cash("USD"), 100.0)
+        self.assertEqual(snapshot.cash("USD"), 100.0)
+        snapshot.prices(["AAPL", "AAPL", "TSLA"])
+        self.assertEqual(manager.calls, {"balance": 1, "margin": 1, "price": 2})
+
+    def test_failed_margin_is_not_refetched(self):
+        manager = FailingMarginManager()
+        snapshot = AccountSnapshot(manager)
+        self.assertEqual(snapshot.cash("USD"), 0.0)
+        self.assertEqual(snapshot.cash("USD"), 0.0)
+        self.assertEqual(manager.calls["margin"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import allocation_library
+from src.allocation_library import compile_allocation
+from src.db.models import AllStockCode, Base
+from src.symbol_master import SymbolMaster
+
+
+GROWTH = """
+strategies:
+  growth:
+    allocation: 0.5
+    weights: {"NASD:AAPL": 2, "Microsoft Corp": 1, AAPL: 1}
+"""
+
+INCOME = """
+normalize: false
+strategies:
+  income:
+    weights: {SGOV: 0.4, FEPI: 0.4}
+  cash:
+    weights: {TQQQ: 0}
+"""
+
+
+class TestAllocationLibrary(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[AllStockCode.__table__])
+        Session = sessionmaker(bind=engine)
+        session = Session()
+        session.add_all(AllStockCode(회사명=n, 종목코드=c, 업종="ETF") for n, c in
+                        [("Apple Inc", "AAPL"), ("Microsoft Corp", "MSFT"), ("SGOV ETF", "SGOV")])
+        session.commit()
+        session.close()
+        self.master = SymbolMaster(Session, refresh_sec=0)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.books = os.path.join(self.tmp.name, "books")
+        self.cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(self.books)
+        self._write("a_growth.yaml", GROWTH)
+        self._write("b_income.yml", INCOME)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        with open(os.path.join(self.books, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_directory_compiles_and_resolves(self):
+        compiled = compile_allocation(self.books, self.master, self.cache)
+        strategies = {s.name: s for s in compiled.strategies()}
+
+        self.assertEqual(list(strategies), ["growth", "income", "cash"])
+        self.assertEqual(strategies["growth"].weights, {"AAPL": 0.75, "MSFT": 0.25})
+        self.assertEqual(strategies["income"].weights, {"SGOV": 0.4, "FEPI": 0.4})
+        self.assertAlmostEqual(strategies["income"].allocation, 0.25)
+        self.assertAlmostEqual(strategies["cash"].allocation, 0.25)
+        self.assertEqual(compiled.exchanges, {"AAPL": "NASD"})
+        self.assertEqual(compiled.unresolved, ["FEPI", "TQQQ"])
+
+        weights = compiled.weights()
+        self.assertAlmostEqual(weights["AAPL"], 0.375)
+        self.assertAlmostEqual(weights["SGOV"], 0.1)
+        self.assertEqual(weights["TQQQ"], 0.0)     # 0 은 전량 매도 목표로 남는다
+
+    def test_cache_hit_skips_parsing(self):
+        first = compile_allocation(self.books, self.master, self.cache)
+        with mock.patch.object(allocation_library, "_compile", side_effect=AssertionError("recompiled")):
+            second = compile_allocation(self.books, self.master, self.cache)
+        self.assertEqual(second.key, first.key)
+        self.assertEqual(second.strategies(), first.strategies())
+        self.assertEqual(second.exchanges, first.exchanges)
+
+        self._write("b_income.yml", INCOME.replace("0.4}", "0.5}"))
+        third = compile_allocation(self.books, self.master, self.cache)
+        self.assertNotEqual(third.key, first.key)
+        self.assertEqual(third.strategies()[1].weights["FEPI"], 0.5)
+
+    def test_validation(self):
+        for name, text in (("c.yaml", "strategies:\n  growth:\n    weights: {X: 1}\n"),
+                           ("c.yaml", "strategies:\n  x:\n    weights: {Y: -1}\n"),
+                           ("c.yaml", "strategies:\n  x:\n    allocation: 0.6\n    weights: {Y: 1}\n"),
+                           ("c.yaml", "normalize: false\nstrategies:\n  x:\n    weights: {Y: 0.7, Z: 0.4}\n"),
+                           ("c.yaml", "strategies:\n  x:\n    weights: {\"XXXX:Y\": 1}\n")):
+            self._write(name, text)
+            with self.assertRaises(ValueError):
+                compile_allocation(self.books, self.master, None)
+
+    def test_missing_path_is_empty(self):
+        compiled = compile_allocation(os.path.join(self.tmp.name, "none.yaml"), self.master, self.cache)
+        self.assertEqual(compiled.strategies(), [])
+        self.assertEqual(compiled.weights(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
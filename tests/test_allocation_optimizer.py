@@ -0,0 +1,42 @@
+import unittest
+
+from src.allocation_optimizer import optimize_plan
+from src.rebalance_engine import compute_plan
+
+
+class TestAllocationOptimizer(unittest.TestCase):
+    def test_uses_idle_cash_better_than_proportional(self):
+        codes = ["A", "B", "C"]
+        prices = [300.0, 70.0, 45.0]
+        weights = [0.4, 0.3, 0.3]
+        proportional = compute_plan(codes, prices, [0, 0, 0], weights, 1000.0)
+        optimized = optimize_plan(codes, prices, [0, 0, 0], weights, 1000.0)
+        self.assertGreaterEqual(optimized.cash_after, 0.0)
+        self.assertLessEqual(optimized.cash_after, proportional.cash_after)
+
+    def test_other_holdings_count_toward_total(self):
+        plan = optimize_plan(["A"], [100.0], [0], [0.5], 1000.0, other_value=1000.0)
+        self.assertEqual(plan.total_value, 2000.0)
+        self.assertEqual(plan.buy_qty.tolist(), [10])
+        self.assertEqual(plan.cash_after, 0.0)
+
+    def test_no_trade_band_keeps_position(self):
+        # A 비중 0.505 (목표 0.5) → 밴드 0.01 안쪽이므로 거래 없음
+        plan = optimize_plan(["A", "B"], [101.0, 99.0], [10, 10], [0.5, 0.5], 0.0, no_trade_band=0.01)
+        self.assertEqual(plan.order_count, 0)
+
+    def test_min_order_notional_drops_small_orders(self):
+        plan = optimize_plan(["A", "B"], [10.0, 10.0], [50, 48], [0.5, 0.5], 20.0, min_order_notional=50.0)
+        for code, qty, price in list(plan.sells()) + list(plan.buys()):
+            self.assertGreaterEqual(qty * price, 50.0)
+
+    def test_cash_never_negative(self):
+        plan = optimize_plan(
+            ["A", "B", "C"], [123.0, 57.0, 9.5], [3, 0, 40], [0.2, 0.5, 0.3], 17.0,
+            min_order_notional=30.0,
+        )
+        self.assertGreaterEqual(plan.cash_after, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
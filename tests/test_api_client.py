@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+from src.api_client import TokenManager
+from src.transport import EXPIRED_TOKEN_MSG_CD, Transport
+
+
+class _Response:
+    def __init__(self, data):
+        self.status_code = 200
+        self.content = b"{}"
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class TestExpiredToken(unittest.TestCase):
+    def setUp(self):
+        self.client = mock.Mock(expires_in=None)
+        self.client.get_oauth_token.side_effect = ["fresh-1", "fresh-2"]
+        self.manager = TokenManager(self.client, token="from-env")   # 발급 시각을 모르는 .env 토큰
+        self.transport = Transport()
+        self.sent = []
+
+    def tearDown(self):
+        self.transport.close()
+
+    def _reauth(self, stale):
+        self.manager.invalidate(stale)
+        return self.manager.get_token()
+
+    def _serve(self, *replies):
+        replies = iter(replies)
+
+        def request(method, url, headers=None, **kwargs):
+            self.sent.append(headers["authorization"])
+            return _Response(next(replies))
+        self.transport.session.request = request
+
+    def test_expired_token_is_reissued_and_retried_once(self):
+        expired = {"rt_cd": "1", "msg_cd": EXPIRED_TOKEN_MSG_CD}
+        self._serve(expired, {"rt_cd": "0", "msg_cd": "MCA00000"})
+        data = self.transport.get("http://kis", headers={"authorization": "Bearer from-env"},
+                                  reauth=self._reauth)
+        self.assertEqual(data["rt_cd"], "0")
+        self.assertEqual(self.sent, ["Bearer from-env", "Bearer fresh-1"])
+        self.assertEqual(self.manager.get_token(), "fresh-1")
+
+        # 재발급 토큰도 거부되면 더 재시도하지 않는다
+        self.sent.clear()
+        self._serve(expired, expired)
+        data = self.transport.get("http://kis", headers={"authorization": "Bearer fresh-1"},
+                                  reauth=self._reauth)
+        self.assertEqual(data["msg_cd"], EXPIRED_TOKEN_MSG_CD)
+        self.assertEqual(self.sent, ["Bearer fresh-1", "Bearer fresh-2"])
+
+    def test_invalidate_keeps_token_already_reissued(self):
+        self.manager.invalidate("from-env")
+        self.assertEqual(self.manager.get_token(), "fresh-1")
+        self.manager.invalidate("from-env")      # 다른 스레드가 이미 바꾼 토큰은 유지
+        self.assertEqual(self.manager.get_token(), "fresh-1")
+        self.assertEqual(self.client.get_oauth_token.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
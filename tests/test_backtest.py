@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from src.backtest.engine import BacktestConfig, run_backtest, simulate
+from src.rebalance_engine import compute_plan
+
+
+def _prices(T=120, N=3, seed=7):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0005, 0.02, size=(T, N))
+    return 50.0 * np.exp(np.cumsum(steps, axis=0)) * np.arange(1, N + 1)
+
+
+class TestBacktest(unittest.TestCase):
+    def test_matches_stepwise_plan_without_fees(self):
+        prices = _prices()
+        weights = np.array([0.5, 0.3, 0.2])
+        result = simulate(prices, weights, rebalance_every=1, config=BacktestConfig(fee_rate=0.0))
+
+        qty, cash = np.zeros(3), 100000.0
+        for p in prices:
+            plan = compute_plan(("A", "B", "C"), p, qty, weights, cash)
+            qty = qty - plan.sell_qty + plan.buy_qty
+            cash = plan.cash_after
+        np.testing.assert_array_equal(result.final_qty[0], qty)
+        self.assertAlmostEqual(result.final_cash[0], cash, places=6)
+
+    def test_fees_and_cash_constraint(self):
+        prices = _prices()
+        weights = np.array([0.4, 0.4, 0.2])
+        free = simulate(prices, weights, rebalance_every=5, config=BacktestConfig(fee_rate=0.0))
+        paid = simulate(prices, weights, rebalance_every=5,
+                        config=BacktestConfig(fee_rate=0.01, sell_tax_rate=0.001))
+        self.assertEqual(free.fees[0], 0.0)
+        self.assertGreater(paid.fees[0], 0.0)
+        self.assertLess(paid.final_value[0], free.final_value[0])
+        self.assertGreaterEqual(paid.final_cash[0], -1e-9)
+        self.assertTrue(np.all(paid.final_qty == np.floor(paid.final_qty)))
+
+    def test_missing_bar_does_not_shrink_total(self):
+        prices = np.full((6, 2), 100.0)
+        prices[3, 1] = np.nan                                   # B 만 하루 휴장
+        result = simulate(prices, np.array([0.5, 0.5]), rebalance_every=1, config=BacktestConfig(fee_rate=0.0))
+        self.assertEqual(result.orders[0], 2)                   # 최초 매수 2건 이후 거래 없음
+        np.testing.assert_array_equal(result.final_qty[0], [500, 500])
+
+    def test_parameter_sets_are_independent(self):
+        prices = _prices()
+        prices[:30, 2] = np.nan                                 # 상장 전 구간
+        weights = np.array([[0.5, 0.3, 0.2], [0.2, 0.2, 0.6], [1.0, 0.0, 0.0]])
+        every = [0, 10, 21]
+        sym_thr = [0.02, np.inf, 0.1]
+        batch = run_backtest(prices, weights, every, sym_thr, config=BacktestConfig())
+        for k in range(3):
+            single = simulate(prices, weights[k], every[k], sym_thr[k], config=BacktestConfig())
+            np.testing.assert_allclose(batch.equity[:, k], single.equity[:, 0])
+            self.assertEqual(batch.rebalances[k], single.rebalances[0])
+        self.assertGreater(batch.final_qty[1, 2], 0)
+
+        parallel = run_backtest(prices, weights, every, sym_thr, config=BacktestConfig(), processes=2)
+        np.testing.assert_allclose(parallel.equity, batch.equity)
+        for a, b in zip(parallel.to_rows(), batch.to_rows()):
+            for name in a:
+                self.assertAlmostEqual(a[name], b[name], places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from src.marketdata.bar_store import BarStore
+from src.marketdata.chart_manager import ChartManager
+from src.marketdata.downloader import BarDownloader
+from src.simulator import KISSimulator, SimulatorConfig, SimulatorServer
+
+
+class TestBarDownloader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sim = KISSimulator(
+            SimulatorConfig(history_days=300, minute_days=1),
+            symbols={"AAPL": (100.0, "NASD"), "KO": (50.0, "NYSE")},
+        )
+        self.server = SimulatorServer(self.sim).start()
+        cfg = {
+            "path": {"real": self.server.url, "mock": self.server.url},
+            "account": {"CANO": "12345678", "ACNT_PRDT_CD": "01", "OVRS_EXCG_CD": "NASD"},
+            "rate_limit": {"real_per_sec": 0},
+            "exchange_routing": {"cache_path": os.path.join(self.tmp.name, "exchange_index.json")},
+        }
+        self.store = BarStore(os.path.join(self.tmp.name, "bars"))
+        self.downloader = BarDownloader(ChartManager(cfg), self.store, workers=2)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_daily_resumes_from_last_stored_bar(self):
+        today = self.sim.history_end
+        self.sim.history_end = today - timedelta(days=14)
+        first = self.downloader.run(["AAPL", "KO"], "1d")
+        self.assertGreater(first["AAPL"], 200)                        # 100건 단위로 여러 페이지
+        self.assertEqual(self.downloader.chart.exchange_index.get("KO"), "NYSE")
+
+        self.sim.history_end = today
+        self.sim.request_counts.clear()
+        second = self.downloader.run(["AAPL", "KO"], "1d")
+        self.assertTrue(5 <= second["AAPL"] <= 11)
+        self.assertEqual(self.sim.request_counts["HHDFS76240000"], 2)  # 종목당 1페이지만
+
+        stored = self.store.load("1d", "AAPL")
+        expected = self.sim._daily_bars(self.sim.symbols["AAPL"])
+        self.assertEqual(len(stored), first["AAPL"] + second["AAPL"])
+        self.assertTrue(np.all(np.diff(stored["ts"]) > 0))
+        np.testing.assert_allclose(stored["close"], [b[4] for b in expected[-len(stored):]], rtol=1e-6)
+
+    def test_daily_rewrites_history_when_adjustment_changes(self):
+        today = self.sim.history_end
+        self.sim.history_end = today - timedelta(days=14)
+        self.downloader.run(["AAPL"], "1d")
+
+        # 2:1 분할 → 수정주가 기준으로 과거 봉 전체가 바뀐다
+        bars = self.sim._daily_bars(self.sim.symbols["AAPL"])
+        self.sim._daily["AAPL"] = [(d, o / 2, h / 2, l / 2, c / 2, v * 2) for d, o, h, l, c, v in bars]
+        self.sim.history_end = today
+        self.downloader.run(["AAPL"], "1d")
+
+        stored = self.store.load("1d", "AAPL")
+        expected = self.sim._daily_bars(self.sim.symbols["AAPL"])
+        self.assertTrue(np.all(np.diff(stored["ts"]) > 0))
+        np.testing.assert_allclose(stored["close"], [b[4] for b in expected[-len(stored):]], rtol=1e-5)
+
+    def test_adjusted_setting_change_rebases_history(self):
+        self.downloader.run(["KO"], "1d")
+        self.assertEqual(self.store.meta("1d"), {"adjusted": True})
+
+        self.downloader.adjusted = False
+        self.sim.request_counts.clear()
+        self.downloader.run(["KO"], "1d")
+        self.assertGreater(self.sim.request_counts["HHDFS76240000"], 1)  # 전체 이력 재다운로드
+        self.assertEqual(self.store.meta("1d"), {"adjusted": False})
+
+    def test_last_stored_bar_is_rewritten(self):
+        self.downloader.run(["KO"], "1d")
+        last = self.store.load("1d", "KO").close[-1]
+        bars = self.sim._daily_bars(self.sim.symbols["KO"])
+        d, o, h, l, c, v = bars[-1]
+        bars[-1] = (d, o, h, l, c + 1.0, v)                          # 장중 미완성 봉이 마감된 경우
+        self.assertEqual(self.downloader.run(["KO"], "1d"), {"KO": 0})
+        self.assertAlmostEqual(float(self.store.load("1d", "KO").close[-1]), last + 1.0, places=4)
+
+    def test_minute_pages_with_continuation_key(self):
+        counts = self.downloader.run(["AAPL"], "1m")
+        self.assertEqual(counts["AAPL"], 390)                         # 120건씩 4페이지
+        stored = self.store.load("1m", "AAPL")
+        self.assertTrue(np.all(np.diff(stored["ts"]) == 60))
+
+        self.sim.request_counts.clear()
+        self.assertEqual(self.downloader.run(["AAPL"], "1m"), {"AAPL": 0})
+        self.assertEqual(self.sim.request_counts["HHDFS76950200"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.marketdata.bar_store import BAR_DTYPE, BarStore
+from src.marketdata.candles import CandleAggregator
+
+
+DAY = 86400
+
+
+def _bars(ts, close):
+    out = np.zeros(len(ts), dtype=BAR_DTYPE)
+    out["ts"] = ts
+    out["close"] = close
+    return out
+
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BarStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_only_and_range_slicing(self):
+        ts = np.arange(10) * DAY
+        self.assertEqual(self.store.append("1d", "AAPL", _bars(ts[:6], ts[:6] / DAY)), 6)
+        # 겹치는 봉은 건너뛰고 새 봉만 추가
+        self.assertEqual(self.store.append("1d", "AAPL", _bars(ts[4:], ts[4:] / DAY)), 4)
+        self.assertEqual(self.store.last_timestamp("1d", "AAPL"), 9 * DAY)
+
+        bars = self.store.load("1d", "AAPL", start=2 * DAY, end=5 * DAY)
+        np.testing.assert_array_equal(bars.close, [2.0, 3.0, 4.0])
+        self.assertFalse(bars.close.flags.writeable)
+        self.assertEqual(len(self.store.load("1d", "AAPL", start="19700111")), 0)
+        self.assertEqual(len(self.store.load("1d", "MISSING")), 0)
+
+    def test_uncommitted_tail_is_invisible_and_overwritten(self):
+        self.store.append("1d", "AAPL", _bars([0, DAY], [1.0, 2.0]))
+        # 색인 갱신 전에 중단된 쓰기를 흉내 낸다
+        with open(os.path.join(self.tmp.name, "1d", "AAPL", "close.f8"), "ab") as f:
+            f.write(np.array([99.0]).tobytes())
+
+        reopened = BarStore(self.tmp.name)
+        np.testing.assert_array_equal(reopened.load("1d", "AAPL").close, [1.0, 2.0])
+        reopened.append("1d", "AAPL", _bars([2 * DAY], [3.0]))
+        np.testing.assert_array_equal(BarStore(self.tmp.name).load("1d", "AAPL").close, [1.0, 2.0, 3.0])
+
+    def test_panel_aligns_on_timestamp_union(self):
+        self.store.append("1d", "A", _bars([0, DAY, 2 * DAY], [1.0, 2.0, 3.0]))
+        self.store.append("1d", "B", _bars([DAY, 3 * DAY], [20.0, 40.0]))
+        panel = self.store.panel("1d", ["A", "B", "C"], fields=("close",))
+        np.testing.assert_array_equal(panel.ts, [0, DAY, 2 * DAY, 3 * DAY])
+        np.testing.assert_array_equal(
+            panel["close"],
+            [[1.0, np.nan, np.nan], [2.0, 20.0, np.nan], [3.0, np.nan, np.nan], [np.nan, 40.0, np.nan]],
+        )
+
+    def test_replace_from_rewrites_tail(self):
+        self.store.append("1d", "AAPL", _bars(np.arange(5) * DAY, [1.0, 2.0, 3.0, 4.0, 5.0]))
+        added = self.store.append("1d", "AAPL", _bars(np.arange(3, 7) * DAY, [40.0, 50.0, 60.0, 70.0]),
+                                  replace_from=3 * DAY)
+        self.assertEqual(added, 2)
+        np.testing.assert_array_equal(BarStore(self.tmp.name).load("1d", "AAPL").close,
+                                      [1.0, 2.0, 3.0, 40.0, 50.0, 60.0, 70.0])
+        self.assertEqual(self.store.span("1d", "AAPL"), (0, 6 * DAY))
+
+    def test_panel_keeps_open_maps_bounded(self):
+        store = BarStore(self.tmp.name, max_open_maps=8)
+        symbols = [f"S{i:03d}" for i in range(40)]
+        for i, symbol in enumerate(symbols):
+            store.append("1d", symbol, _bars(np.arange(5) * DAY, np.full(5, float(i))))
+
+        fd_dir = "/proc/self/fd"
+        before = len(os.listdir(fd_dir)) if os.path.isdir(fd_dir) else None
+        panel = store.panel("1d", symbols, fields=("close", "volume"))
+        np.testing.assert_array_equal(panel["close"][-1], np.arange(40, dtype=float))
+        self.assertLessEqual(len(store._maps), 8)
+        if before is not None:
+            self.assertLessEqual(len(os.listdir(fd_dir)) - before, 8)
+
+    def test_candle_aggregator_closes_buckets_into_store(self):
+        candles = CandleAggregator(self.store, freq="poll_1m", interval_sec=60)
+        for ts, price in [(0, 10.0), (20, 12.0), (50, 9.0), (61, 11.0), (30, 100.0)]:
+            candles.on_tick("AAPL", price, volume=1, ts=ts)
+        self.assertEqual(candles.flush(), 1)
+        self.assertEqual(candles.flush(now=120), 1)
+
+        rec = self.store.load("poll_1m", "AAPL").to_records()
+        self.assertEqual(rec.tolist(), [(0, 10.0, 12.0, 9.0, 9.0, 3.0), (60, 11.0, 11.0, 11.0, 11.0, 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,17 @@
+import unittest
+
+from benchmarks.compare import compare
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_flags_only_regressions_over_threshold(self):
+        base = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}, "gone": {"median": 1.0}}}
+        head = {"results": {"a": {"median": 1.05}, "b": {"median": 1.5}, "new": {"median": 1.0}}}
+        rows, regressions = compare(base, head, threshold=0.10)
+        self.assertEqual(regressions, ["b"])
+        self.assertEqual([r[0] for r in rows], ["a", "b", "gone", "new"])
+        self.assertIsNone(dict((r[0], r[3]) for r in rows)["new"])
+
+
+if __name__ == '__main__':
+    unittest.main()
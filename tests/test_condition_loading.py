@@ -1,22 +1,81 @@
+import os
+import tempfile
 import unittest
-import yaml
 
-def load_conditions(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+import numpy as np
+
+from src.marketdata.bar_store import BAR_DTYPE, BarStore
+from src.screening import ConditionError, compile_conditions, get_stock_codes, load_conditions
+
+
+DAY = 86400
+
+
+class _Master:
+    SECTORS = {"AAA": "Tech", "BBB": "Tech", "CCC": "Energy", "DDD": "Energy"}
+
+    def sector(self, code):
+        return self.SECTORS.get(code)
 
-def get_stock_codes(conditions):
-    # Dummy implementation: ǽĿ شϴ ֽڵ带 ȯ ()
-    return conditions.get('stock_codes', [])
 
 class TestConditionLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BarStore(self.tmp.name)
+        ts = np.arange(60) * DAY
+        # AAA: 상승 / BBB: 하락 / CCC: 상승·거래량 적음 / DDD: 이력 10봉뿐
+        for symbol, slope, volume, n in [("AAA", 1.0, 1e6, 60), ("BBB", -0.5, 1e6, 60),
+                                         ("CCC", 0.5, 1e3, 60), ("DDD", 2.0, 1e6, 10)]:
+            bars = np.zeros(n, dtype=BAR_DTYPE)
+            bars["ts"] = ts[-n:]
+            bars["close"] = 100 + slope * np.arange(n)
+            bars["high"] = bars["close"] + 1
+            bars["low"] = bars["close"] - 1
+            bars["volume"] = volume
+            self.store.append("1d", symbol, bars)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
     def test_load_conditions_and_get_stock_codes(self):
-        #  ǽ 
+        path = os.path.join(self.tmp.name, "conditions.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("condition: example_condition\nstock_codes: [AAPL, MSFT, GOOG]\n")
+        conditions = load_conditions(path)
+        self.assertEqual(get_stock_codes(conditions), ['AAPL', 'MSFT', 'GOOG'])
+
+    def test_vectorized_filters_sort_and_limit(self):
         conditions = {
-            'condition': 'example_condition',
-            'stock_codes': ['AAPL', 'MSFT', 'GOOG']
+            "filters": ["close > sma(20)", "avg_volume(5) >= 10000", "return(20) > 0"],
+            "stock_codes": ["SGOV"],
         }
-        self.assertEqual(get_stock_codes(conditions), ['AAPL', 'MSFT', 'GOOG'])
+        self.assertEqual(get_stock_codes(conditions, self.store), ["SGOV", "AAA"])
+
+        conditions = {"filters": ["close > 0", "sector in [Tech, Energy]"], "sort": "-return(5)", "limit": 3}
+        self.assertEqual(get_stock_codes(conditions, self.store, _Master()), ["DDD", "AAA", "CCC"])
+        conditions = {"filters": ["sector not in [Tech]", "high(10) - 1 > 0"]}
+        with self.assertRaises(ConditionError):
+            compile_conditions(conditions)
+
+        screen = compile_conditions({"universe": ["CCC", "AAA"], "filters": ["sector == Energy"]})
+        np.testing.assert_array_equal(screen.evaluate(self.store, _Master()), [True, False])
+        self.assertEqual(compile_conditions({"filters": ["low(10) > 100"]}).lookback, 10)
+
+    def test_symbols_are_evaluated_on_their_own_latest_bars(self):
+        # BBB 만 하루 더 갱신됨 → 나머지 종목이 최신 합집합 시각에 봉이 없어도 걸러지면 안 된다
+        extra = np.zeros(1, dtype=BAR_DTYPE)
+        extra["ts"], extra["close"], extra["volume"] = 60 * DAY, 80.0, 1e6
+        self.store.append("1d", "BBB", extra)
+
+        self.assertEqual(get_stock_codes({"filters": ["close > 0"]}, self.store), ["AAA", "BBB", "CCC", "DDD"])
+        self.assertEqual(get_stock_codes({"filters": ["return(20) > 0", "avg_volume(5) > 1e5"]}, self.store),
+                         ["AAA"])
+
+    def test_invalid_conditions(self):
+        for bad in ["close >", "volume ~ 3", "foo(3) > 1", "sma(x) > 1", "close in [1]"]:
+            with self.assertRaises(ConditionError):
+                compile_conditions({"filters": [bad]})
+
 
 if __name__ == '__main__':
     unittest.main()
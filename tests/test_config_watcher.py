@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from src.config_watcher import ConfigWatcher, validate_config
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp.name, "config.yaml")
+        self.allocation_path = os.path.join(self.tmp.name, "allocation.yaml")
+        self.cfg = {
+            "account": {"CANO": "1"},
+            "strategy": {"weights": {"AAPL": 0.5}, "allocation_file": self.allocation_path,
+                         "allocation_cache": None},
+            "daemon": {"poll_interval_sec": 60},
+        }
+        self._write_config(self.cfg)
+        self._write_allocation("strategies: {}\n")
+        self.watcher = ConfigWatcher(self.config_path, interval_sec=0)
+        self.calls = []
+        self.watcher.subscribe(lambda cfg, sections: self.calls.append(("strategy", sections)), "strategy")
+        self.watcher.subscribe(lambda cfg, sections: self.calls.append(("daemon", sections)), "daemon")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _bump(self, path):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def _write_config(self, cfg):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(cfg, f)
+        if hasattr(self, "watcher"):
+            self._bump(self.config_path)
+
+    def _write_allocation(self, text):
+        with open(self.allocation_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if hasattr(self, "watcher"):
+            self._bump(self.allocation_path)
+
+    def test_unchanged_files_do_not_reload(self):
+        self.assertEqual(self.watcher.poll(), set())
+        self.assertEqual(self.watcher.reloads, 0)
+        self.assertEqual(self.calls, [])
+
+    def test_only_changed_sections_are_notified(self):
+        old = self.watcher.cfg
+        self.cfg["daemon"]["poll_interval_sec"] = 30
+        self._write_config(self.cfg)
+
+        self.assertEqual(self.watcher.poll(), {"daemon"})
+        self.assertEqual(self.calls, [("daemon", {"daemon"})])
+        self.assertIsNot(self.watcher.cfg, old)
+        self.assertEqual(self.watcher.cfg["daemon"]["poll_interval_sec"], 30)
+
+    def test_allocation_file_change_counts_as_strategy(self):
+        self._write_allocation("strategies:\n  solo:\n    allocation: 1.0\n    weights: {MSFT: 1}\n")
+        self.assertEqual(self.watcher.poll(), {"strategy"})
+        self.assertEqual(self.calls, [("strategy", {"strategy"})])
+
+    def test_invalid_config_keeps_previous(self):
+        old = self.watcher.cfg
+        self.cfg["strategy"]["weights"] = {"AAPL": 0.8, "MSFT": 0.4}
+        self._write_config(self.cfg)
+
+        self.assertEqual(self.watcher.poll(), set())
+        self.assertIs(self.watcher.cfg, old)
+        self.assertEqual(self.watcher.failures, 1)
+        # 같은 파일 상태로는 다시 시도하지 않는다
+        self.assertEqual(self.watcher.poll(), set())
+        self.assertEqual(self.watcher.failures, 1)
+
+        self.cfg["strategy"]["weights"] = {"AAPL": 0.8}
+        self._write_config(self.cfg)
+        self.assertEqual(self.watcher.poll(), {"strategy"})
+        self.assertEqual(self.watcher.cfg["strategy"]["weights"], {"AAPL": 0.8})
+
+    def test_validate_config(self):
+        self.assertEqual(validate_config(self.cfg), {"AAPL": 0.5})
+        for bad in ([], {"strategy": {"weights": {"AAPL": -0.1}, "allocation_file": None}},
+                    {"daemon": {"cooldown_sec": "soon"}, "strategy": {"allocation_file": None}},
+                    {"daemon": {"rebalance_threshold": True}, "strategy": {"allocation_file": None}}):
+            with self.assertRaises(ValueError):
+                validate_config(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
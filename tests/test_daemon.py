@@ -0,0 +1,150 @@
+import unittest
+
+from src.daemon import DriftMonitor, RebalanceDaemon
+from src.portfolio_state import PortfolioState
+
+
+class TestDriftMonitor(unittest.TestCase):
+    def setUp(self):
+        self.monitor = DriftMonitor({"A": 0.5, "B": 0.5})
+        holdings = {
+            "A": {"qty": 10, "current_price": 50.0},
+            "B": {"qty": 10, "current_price": 50.0},
+            "C": {"qty": 1, "current_price": 0.0},
+        }
+        self.monitor.seed(holdings, cash=0.0)
+
+    def test_balanced_portfolio_has_no_drift(self):
+        per_symbol, aggregate = self.monitor.drift()
+        self.assertAlmostEqual(float(per_symbol.max()), 0.0)
+        self.assertAlmostEqual(aggregate, 0.0)
+        self.assertFalse(self.monitor.breached(0.05, 0.1))
+
+    def test_price_update_is_incremental(self):
+        self.monitor.update_price("A", 100.0)
+        self.assertAlmostEqual(self.monitor.total_value, 1500.0)
+        per_symbol, _ = self.monitor.drift()
+        self.assertAlmostEqual(float(per_symbol[0]), 2 / 3 - 0.5)
+        self.assertTrue(self.monitor.breached(0.05, 1.0))
+
+    def test_unknown_symbol_is_ignored(self):
+        self.monitor.update_price("ZZZ", 10.0)
+        self.assertAlmostEqual(self.monitor.total_value, 1000.0)
+
+    def test_set_weights_realigns_targets(self):
+        self.monitor.set_weights({"A": 1.0})
+        per_symbol, aggregate = self.monitor.drift()
+        self.assertEqual(per_symbol.size, 1)
+        self.assertAlmostEqual(aggregate, 0.5)
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.open = True
+
+    def is_open(self, ts=None):
+        return self.open
+
+    def seconds_until_open(self, ts=None):
+        return 0.0 if self.open else 3600.0
+
+
+class FakeRebalancer:
+    """
+    API 대신 호출 기록만 남기는 Rebalancer (잔고 재동기화 / 현재가 / 리밸런싱).
+    """
+
+    price_workers = 1
+
+    def __init__(self):
+        self.cfg = {}
+        self.weights = {"A": 0.5, "B": 0.5}
+        self.portfolio = PortfolioState()
+        self.market_scheduler = FakeScheduler()
+        self.price_cache_ttl = 0.0
+        self.positions = {"A": (10, 50.0), "B": (10, 50.0)}
+        self.quotes = {"A": 50.0, "B": 50.0}
+        self.calls = []
+
+    def _get_token(self):
+        return "token"
+
+    def _sync_portfolio(self, snapshot=None):
+        self.calls.append("sync")
+        self.portfolio.seed(self.positions, 0.0, universe=self.weights)
+        return True
+
+    def _get_price(self, code, exchange=None):
+        self.calls.append(("price", code))
+        return self.quotes[code]
+
+    def rebalance(self):
+        self.calls.append("rebalance")
+
+    def reconfigure(self, cfg, sections):
+        self.weights = dict(cfg["strategy"]["weights"])
+
+
+class TestRebalanceDaemon(unittest.TestCase):
+    def setUp(self):
+        self.rebalancer = FakeRebalancer()
+        self.daemon = RebalanceDaemon(self.rebalancer, {
+            "poll_interval_sec": 60,
+            "symbol_drift_threshold": 0.05,
+            "aggregate_drift_threshold": 0.10,
+            "cooldown_sec": 3600,
+            "resync_interval_sec": 1800,
+        })
+
+    def test_closed_market_sends_no_requests(self):
+        self.rebalancer.market_scheduler.open = False
+        self.assertFalse(self.daemon.run_once())
+        self.assertEqual(self.rebalancer.calls, [])
+
+    def test_resync_then_price_refresh(self):
+        self.assertFalse(self.daemon.run_once())                 # 첫 주기: 전체 재동기화
+        self.assertEqual(self.rebalancer.calls, ["sync"])
+
+        self.rebalancer.calls.clear()
+        self.assertFalse(self.daemon.run_once())                 # resync_interval 이내: 현재가만
+        self.assertEqual(self.rebalancer.calls, [("price", "A"), ("price", "B")])
+
+        self.rebalancer.portfolio.mark_stale()
+        self.rebalancer.calls.clear()
+        self.daemon.run_once()
+        self.assertEqual(self.rebalancer.calls, ["sync"])
+
+    def test_threshold_breach_and_cooldown(self):
+        self.daemon.run_once()
+        self.rebalancer.quotes["A"] = 100.0                      # A 비중 2/3 → 임계값 초과
+        self.assertTrue(self.daemon.run_once())
+        self.assertEqual(self.rebalancer.calls[-1], "rebalance")
+        self.assertTrue(self.rebalancer.portfolio.needs_resync())  # 주문 뒤 실제 잔고로 다시 맞춤
+
+        # 재동기화 후에도 드리프트가 남아 있지만 쿨다운 중이라 리밸런싱하지 않는다
+        self.rebalancer.positions = {"A": (10, 100.0), "B": (10, 50.0)}
+        self.rebalancer.calls.clear()
+        self.assertFalse(self.daemon.run_once())
+        self.assertEqual(self.rebalancer.calls, ["sync"])
+
+        self.daemon.last_rebalance -= 3600
+        self.assertTrue(self.daemon.run_once())
+
+    def test_config_change_updates_thresholds_and_targets(self):
+        self.daemon.run_once()
+        cfg = {"daemon": {"poll_interval_sec": 30, "symbol_drift_threshold": 0.6,
+                          "aggregate_drift_threshold": 0.6},
+               "strategy": {"weights": {"A": 1.0}}}
+        self.rebalancer.reconfigure(cfg, {"strategy"})           # 구독 순서: Rebalancer 먼저
+        self.daemon._on_config_change(cfg, {"daemon", "strategy"})
+
+        self.assertEqual(self.rebalancer.price_cache_ttl, 30.0)
+        self.assertEqual(self.daemon.symbol_threshold, 0.6)
+        per_symbol, aggregate = self.daemon.monitor.drift()
+        self.assertEqual(per_symbol.size, 1)                     # 목표 종목이 A 하나로 바뀜
+        self.assertAlmostEqual(aggregate, 0.5)
+        self.assertFalse(self.daemon.run_once())                 # 완화된 임계값으로는 리밸런싱 안 함
+
+
+if __name__ == '__main__':
+    unittest.main()
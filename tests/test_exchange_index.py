@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from src.exchange_index import ROOT_DIR, ExchangeIndex, ExchangeRoutes, get_exchange_index, price_exchange_code
+
+
+class TestExchangeIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_override_and_balance(self):
+        index = ExchangeIndex(self.path)
+        routes = ExchangeRoutes(index, {"SGOV": "AMEX"})
+        balance = SimpleNamespace(output1=[
+            SimpleNamespace(ovrs_pdno="IBM", ovrs_excg_cd="NYSE"),
+            SimpleNamespace(ovrs_pdno="SGOV", ovrs_excg_cd="NASD"),
+        ])
+        routes.update_from_balance(balance)
+        self.assertEqual(routes.get("IBM"), "NYSE")
+        self.assertEqual(routes.get("SGOV"), "AMEX")
+        self.assertEqual(index.get("SGOV"), "NASD")              # 공유 캐시에는 잔고 응답 그대로
+        self.assertEqual(routes.group(["IBM", "AAPL"], "NASD"), {"NYSE": ["IBM"], "NASD": ["AAPL"]})
+
+    def test_resolve_probes_and_persists(self):
+        index = ExchangeIndex(cache_path=self.path)
+        probe = lambda symbol, exchange: 10.0 if exchange == "NYSE" else None
+        self.assertEqual(index.resolve("KO", "NASD", probe), "NYSE")
+        index.save()
+        self.assertEqual(ExchangeIndex(cache_path=self.path).get("KO"), "NYSE")
+        self.assertEqual(price_exchange_code("NYSE"), "NYS")
+
+    def test_cache_path_is_project_relative(self):
+        index = get_exchange_index({"cache_path": "data/exchange_index_test.json"})
+        self.assertEqual(index.cache_path, os.path.join(ROOT_DIR, "data", "exchange_index_test.json"))
+
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            bare = ExchangeIndex("index.json")                   # 디렉터리 없는 파일명도 저장 가능
+            bare.set("KO", "NYSE")
+            bare.save()
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(os.listdir(self.tmp.name), ["index.json"])
+
+    def test_probe_many_single_pool(self):
+        index = ExchangeIndex(cache_path=self.path)
+        calls = []
+        listing = {"KO": "NYSE", "SPY": "AMEX", "AAPL": "NASD"}
+
+        def probe(symbol, exchange):
+            calls.append((symbol, exchange))
+            return 5.0 if listing.get(symbol) == exchange else None
+
+        found = index.probe_many(["KO", "SPY", "AAPL", "ZZZZ"], "NASD", probe)
+        self.assertEqual(found, {"KO": ("NYSE", 5.0), "SPY": ("AMEX", 5.0), "AAPL": ("NASD", 5.0)})
+        self.assertEqual(len(calls), 12)                 # 종목 × 후보 거래소 한 번씩
+        self.assertEqual(index.get("SPY"), "AMEX")
+        self.assertIsNone(index.get("ZZZZ"))
+
+    def test_routes_keep_overrides_per_owner(self):
+        index = get_exchange_index({"cache_path": self.path, "symbols": {"SGOV": "AMEX"}})
+        a = ExchangeRoutes(index, {"TQQQ": "NASD"})
+        b = ExchangeRoutes(index, {"TQQQ": "AMEX"})
+        self.assertEqual((a.get("TQQQ"), b.get("TQQQ")), ("NASD", "AMEX"))
+        self.assertIsNone(a.get("SGOV"))                 # 설정의 수동 지정은 공유 인덱스에 들어가지 않음
+        self.assertIsNone(index.get("TQQQ"))
+
+        probe = lambda symbol, exchange: 10.0 if exchange == "NYSE" else None
+        self.assertEqual(a.resolve("KO", "NASD", probe), "NYSE")
+        self.assertEqual(b.get("KO"), "NYSE")            # 조회 결과는 공유 캐시에 기록
+        self.assertEqual(b.group(["KO", "TQQQ"], "NASD"), {"NYSE": ["KO"], "AMEX": ["TQQQ"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from src import indicators
+from src.indicators import IndicatorBank
+from src.marketdata.bar_store import BAR_DTYPE, BarStore
+from src.marketdata.candles import CandleAggregator
+
+
+def _ohlc(T=400, N=6, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (T, N)), axis=0))
+    close[:50, 2] = np.nan                              # 늦게 상장한 종목
+    close[200:203, 4] = np.nan                          # 중간에 봉이 빠진 종목
+    return close * 1.01, close * 0.99, close
+
+
+class TestIndicators(unittest.TestCase):
+    def test_batch_matches_reference(self):
+        high, low, close = _ohlc()
+        col = close[:, 0]
+        np.testing.assert_allclose(indicators.sma(close, 20)[19:, 0],
+                                   np.convolve(col, np.ones(20) / 20, mode="valid"), rtol=1e-12)
+        self.assertTrue(np.isnan(indicators.sma(close, 20)[:19]).all())
+
+        returns = col[1:] / col[:-1] - 1
+        expected = [returns[i - 20:i].std(ddof=1) for i in range(20, len(col))]
+        np.testing.assert_allclose(indicators.volatility(close, 20)[20:, 0], expected, rtol=1e-9)
+
+        ema = col[:10].mean()
+        for x in col[10:]:
+            ema += 2 / 11 * (x - ema)
+        self.assertAlmostEqual(indicators.ema(col, 10)[-1], ema, places=10)
+
+        rsi = indicators.rsi(close, 14)
+        self.assertTrue(np.all((rsi[~np.isnan(rsi)] >= 0) & (rsi[~np.isnan(rsi)] <= 100)))
+        self.assertEqual(indicators.rsi(np.arange(1.0, 30.0), 14)[-1], 100.0)
+        self.assertAlmostEqual(indicators.atr(np.full(30, 11.0), np.full(30, 9.0), np.full(30, 10.0), 14)[-1], 2.0)
+
+    def test_streaming_matches_batch(self):
+        high, low, close = _ohlc()
+        series = {"open": close, "high": high, "low": low, "close": close}
+        for spec in ("sma(20)", "ema(12)", "rsi(14)", "atr(14)", "volatility(20)"):
+            batch_ind = indicators.create(spec)
+            batch = batch_ind.run(*(series[f] for f in batch_ind.inputs))
+
+            stream = indicators.create(spec, size=close.shape[1])
+            out = np.full_like(batch, np.nan)
+            for t in range(len(close)):
+                for j in np.flatnonzero(~np.isnan(close[t])):
+                    out[t, j] = stream.update(j, *(series[f][t, j] for f in stream.inputs))[0]
+            np.testing.assert_allclose(out, batch, rtol=1e-10, err_msg=spec)
+
+    def test_streaming_continues_after_batch(self):
+        high, low, close = _ohlc()
+        series = {"open": close, "high": high, "low": low, "close": close}
+        for spec in ("sma(20)", "ema(12)", "rsi(14)", "atr(14)", "volatility(20)"):
+            whole = indicators.create(spec)
+            expected = whole.run(*(series[f] for f in whole.inputs))
+
+            ind = indicators.create(spec)
+            ind.run(*(series[f][:300] for f in ind.inputs))          # 배치로 워밍업
+            tail = ind.run(*(series[f][300:] for f in ind.inputs))   # 상태가 있는 열은 이어서 update
+            np.testing.assert_allclose(tail, expected[300:], rtol=1e-10, err_msg=spec)
+
+    def test_bank_warm_up_and_candle_updates(self):
+        high, low, close = (a[:, :1] for a in _ohlc(T=120))
+        with tempfile.TemporaryDirectory() as root:
+            store = BarStore(root)
+            bars = np.zeros(100, dtype=BAR_DTYPE)
+            bars["ts"] = np.arange(100) * 60
+            bars["open"], bars["high"], bars["low"], bars["close"] = close[:100, 0], high[:100, 0], low[:100, 0], close[:100, 0]
+            store.append("1m", "AAPL", bars)
+
+            bank = IndicatorBank(["sma(10)", "rsi(14)", "atr(14)"])
+            self.assertEqual(bank.warm_up(store, "1m", ["AAPL", "NONE"]), 100)
+            candles = CandleAggregator(store, freq="1m", interval_sec=60, indicators=bank)
+            for t in range(100, 120):
+                candles.on_tick("AAPL", close[t, 0], ts=t * 60)
+            candles.flush(now=120 * 60)
+
+        expected = indicators.sma(close[:, 0], 10)[-1]
+        self.assertAlmostEqual(bank.values("AAPL")["sma(10)"], expected, places=10)
+        self.assertTrue(np.isnan(bank.values("MSFT")["rsi(14)"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import queue
+import tempfile
+import unittest
+
+from src import logging_setup
+
+
+class _Exploding:
+    def __str__(self):
+        raise AssertionError("호출 스레드에서 포맷됨")
+
+
+class TestLoggingSetup(unittest.TestCase):
+    def tearDown(self):
+        logging_setup.shutdown_logging()
+        logging.getLogger("test.noisy").setLevel(logging.NOTSET)
+
+    def _setup(self, **cfg):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = os.path.join(self.tmp.name, "app.log")
+        return logging_setup.setup_logging({"file": path, **cfg}), path
+
+    def _lines(self, path):
+        logging_setup.shutdown_logging()
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_message_is_formatted_off_the_caller_thread(self):
+        handler = logging_setup.DroppingQueueHandler(queue.Queue())
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "value=%s", (_Exploding(),), None)
+        handler.emit(record)
+        queued = handler.queue.get_nowait()
+        self.assertEqual(queued.msg, "value=%s")
+        self.assertIsInstance(queued.args[0], _Exploding)
+
+    def test_json_output_with_extra_and_exception(self):
+        _, path = self._setup(format="json")
+        logger = logging.getLogger("test.json")
+        logger.info("주문 %s", "AAPL", extra={"tr_id": "TTTT1002U"})
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            logger.exception("실패")
+
+        first, second = (json.loads(line) for line in self._lines(path))
+        self.assertEqual((first["msg"], first["tr_id"], first["logger"]), ("주문 AAPL", "TTTT1002U", "test.json"))
+        self.assertEqual(second["level"], "ERROR")
+        self.assertIn("ValueError: bad", second["exc"])
+
+    def test_levels_and_sampling(self):
+        _, path = self._setup(levels={"test.noisy": "WARNING"}, sampling={"test.sampled": 0.0})
+        logging.getLogger("test.noisy").info("숨김")
+        logging.getLogger("test.sampled.child").info("샘플링됨")
+        logging.getLogger("test.sampled.child").warning("경고는 항상 기록")
+        logging.getLogger("test.other").info("기록")
+
+        lines = self._lines(path)
+        self.assertEqual(len(lines), 2)
+        self.assertIn("경고는 항상 기록", lines[0])
+        self.assertIn("test.other: 기록", lines[1])
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = logging_setup.DroppingQueueHandler(queue.Queue(maxsize=2))
+        for i in range(5):
+            handler.emit(logging.LogRecord("test", logging.INFO, __file__, 1, "n=%s", (i,), None))
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
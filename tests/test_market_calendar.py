@@ -0,0 +1,81 @@
+import unittest
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from src.market_calendar import MarketCalendar, MarketScheduler, us_holidays
+
+NY = ZoneInfo("America/New_York")
+
+
+def ts(*args, tz=NY):
+    return datetime(*args, tzinfo=tz).timestamp()
+
+
+class TestMarketCalendar(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.us = MarketCalendar("NASD", start_year=2025, end_year=2026)
+
+    def test_us_holidays(self):
+        holidays = us_holidays(2025)
+        self.assertIn(date(2025, 4, 18), holidays)   # Good Friday
+        self.assertIn(date(2025, 11, 27), holidays)  # Thanksgiving
+        self.assertIn(date(2026, 7, 3), us_holidays(2026))  # 7/4 토요일 → 금요일 대체
+
+    def test_regular_and_extended_sessions(self):
+        self.assertTrue(self.us.is_open(ts(2025, 6, 2, 10, 0)))
+        self.assertFalse(self.us.is_open(ts(2025, 6, 2, 8, 0)))
+        self.assertEqual(self.us.session(ts(2025, 6, 2, 8, 0)), "pre")
+        self.assertEqual(self.us.session(ts(2025, 6, 2, 17, 0)), "after")
+        self.assertFalse(self.us.is_open(ts(2025, 6, 7, 10, 0)))  # 토요일
+
+    def test_early_close(self):
+        self.assertFalse(self.us.is_open(ts(2025, 11, 28, 14, 0)))
+        self.assertTrue(self.us.is_open(ts(2025, 11, 28, 12, 0)))
+
+    def test_next_open_skips_weekend_and_holiday(self):
+        # 2025-04-17(목) 장 마감 후 → 금요일(Good Friday) 휴장 → 4/21(월) 09:30
+        self.assertEqual(self.us.next_open(ts(2025, 4, 17, 16, 30)), ts(2025, 4, 21, 9, 30))
+        now = ts(2025, 6, 2, 10, 0)
+        self.assertEqual(self.us.next_open(now), now)
+
+    def test_next_open_extends_past_table_end(self):
+        # 테이블(2025년) 마지막 장 마감 후 → 1/1 휴장 → 2026-01-02 09:30
+        calendar = MarketCalendar("NASD", start_year=2025, end_year=2025)
+        self.assertEqual(calendar.next_open(ts(2025, 12, 31, 16, 30)), ts(2026, 1, 2, 9, 30))
+        self.assertEqual(calendar.end_year, 2026)
+
+    def test_lunch_break(self):
+        tokyo = MarketCalendar("TKSE", start_year=2025, end_year=2025)
+        tz = ZoneInfo("Asia/Tokyo")
+        self.assertFalse(tokyo.is_open(ts(2025, 6, 2, 12, 0, tz=tz)))
+        self.assertEqual(tokyo.next_open(ts(2025, 6, 2, 12, 0, tz=tz)), ts(2025, 6, 2, 12, 30, tz=tz))
+
+    def test_scheduler_disabled_is_always_open(self):
+        scheduler = MarketScheduler(["NASD"], {"enabled": False})
+        self.assertTrue(scheduler.is_open(ts(2025, 6, 7, 10, 0)))
+
+    def test_scheduler_per_exchange(self):
+        scheduler = MarketScheduler(["NASD", "TKSE"], {})
+        now = ts(2025, 6, 2, 10, 0)                              # 뉴욕 장중, 도쿄는 밤
+        self.assertTrue(scheduler.is_open(now))
+        self.assertTrue(scheduler.is_open_for("NYSE", now))
+        self.assertFalse(scheduler.is_open_for("TKSE", now))
+        self.assertTrue(scheduler.is_open_for("XXXX", now))      # 캘린더 없는 거래소는 열린 것으로 간주
+
+    def test_scheduler_skips_unknown_exchange(self):
+        disabled = MarketScheduler(["XXXX"], {"enabled": False})
+        self.assertEqual(disabled.calendars, {})
+
+        with self.assertLogs("src.market_calendar", "WARNING"):
+            unknown = MarketScheduler(["XXXX", None], {})
+        self.assertTrue(unknown.is_open(ts(2025, 6, 7, 10, 0)))
+        self.assertEqual(unknown.seconds_until_open(ts(2025, 6, 7, 10, 0)), 0.0)
+
+        with self.assertLogs("src.market_calendar", "WARNING"):
+            mixed = MarketScheduler(["XXXX", "NASD"], {})
+        self.assertFalse(mixed.is_open(ts(2025, 6, 7, 10, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import metrics
+from src.metrics import Registry
+from src.transport import RequestEvent
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = Registry()
+        hist = registry.histogram("t_seconds", "test", ("tr_id",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            hist.observe(value, 'A"1')
+        text = registry.render()
+        self.assertIn('t_seconds_bucket{tr_id="A\\"1",le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{tr_id="A\\"1",le="1"} 2', text)
+        self.assertIn('t_seconds_bucket{tr_id="A\\"1",le="+Inf"} 3', text)
+        self.assertIn('t_seconds_count{tr_id="A\\"1"} 3', text)
+
+    def test_request_events_and_db_commits_are_recorded(self):
+        metrics.REGISTRY.clear()
+        metrics.observe_request(RequestEvent("GET", "u", "TTTS3012R", "c", 0, 0.0, 0.02,
+                                             status=200, rt_cd="0", msg_cd="MCA00000", bytes_received=100))
+        metrics.observe_request(RequestEvent("GET", "u", "TTTS3012R", "c", 1, 0.3, 0.02,
+                                             status=500, rt_cd="1", msg_cd="EGW00201", bytes_received=50))
+        self.assertEqual(metrics.REQUESTS.get("TTTS3012R", "1", "EGW00201"), 1)
+        self.assertEqual(metrics.REQUEST_RETRIES.get("TTTS3012R"), 1)
+        self.assertEqual(metrics.RESPONSE_BYTES.get("TTTS3012R"), 150)
+        self.assertEqual(metrics.REQUEST_DURATION.count("TTTS3012R"), 2)
+
+        factory = sessionmaker(bind=create_engine("sqlite://"))
+        metrics.instrument_sessions(factory)
+        session = factory()
+        session.commit()
+        session.close()
+        self.assertEqual(metrics.DB_COMMIT_DURATION.count(), 1)
+
+        with metrics.phase("sync"):
+            pass
+        self.assertEqual(metrics.PHASE_DURATION.count("sync"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
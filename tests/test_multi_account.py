@@ -0,0 +1,78 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.multi_account import MultiAccountRebalancer
+from src.rate_limiter import RateLimiter
+
+
+class FakeRebalancer:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.last_plan = SimpleNamespace(order_count=len(cfg["strategy"]["weights"]))
+        self.orders_sent = 0
+        self.orders_failed = 0
+
+    def rebalance(self):
+        if self.cfg["account"]["CANO"] == "BAD":
+            raise RuntimeError("boom")
+        time.sleep(0.2)
+        self.orders_sent = self.last_plan.order_count
+
+    def close(self):
+        pass
+
+
+class TestMultiAccount(unittest.TestCase):
+    def setUp(self):
+        self.cfg = {
+            "account": {"CANO": "00000000", "ACNT_PRDT_CD": "01", "OVRS_EXCG_CD": "NASD"},
+            "strategy": {"weights": {"A": 1.0}},
+            "accounts": [
+                {"name": "a1", "CANO": "11111111", "weights": {"A": 0.5, "B": 0.5}},
+                {"name": "a2", "CANO": "22222222"},
+                {"name": "bad", "CANO": "BAD"},
+            ],
+        }
+
+    def test_account_config_overrides(self):
+        runner = MultiAccountRebalancer(FakeRebalancer, self.cfg)
+        cfg = runner.account_config(self.cfg["accounts"][0])
+        self.assertEqual(cfg["account"]["CANO"], "11111111")
+        self.assertEqual(cfg["account"]["OVRS_EXCG_CD"], "NASD")
+        self.assertEqual(cfg["strategy"]["weights"], {"A": 0.5, "B": 0.5})
+        self.assertNotIn("accounts", cfg)
+
+    def test_accounts_run_concurrently(self):
+        report = MultiAccountRebalancer(FakeRebalancer, self.cfg).run()
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(report.orders_sent, 3)
+        self.assertLess(report.wall_time, 0.35)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_slots_are_shared_round_robin(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        grants = []
+        lock = threading.Lock()
+
+        def worker(client, n):
+            for _ in range(n):
+                limiter.acquire(client)
+                with lock:
+                    grants.append(client)
+
+        threads = [threading.Thread(target=worker, args=(c, 6)) for c in ("x", "y")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 두 계좌가 모두 대기 중인 동안에는 번갈아 가며 슬롯을 받는다
+        first_half = grants[:8]
+        self.assertLessEqual(abs(first_half.count("x") - first_half.count("y")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from src.portfolio_state import PortfolioState
+
+
+class TestPortfolioState(unittest.TestCase):
+    def setUp(self):
+        self.state = PortfolioState(resync_interval=60)
+        self.state.seed({"A": (10, 100.0), "B": (5, 20.0)}, cash=900.0, universe=["A", "C"])
+
+    def test_seed_totals(self):
+        self.assertEqual(self.state.stock_value, 1100.0)
+        self.assertEqual(self.state.total_value, 2000.0)
+        self.assertAlmostEqual(self.state.weight("A"), 0.5)
+        self.assertEqual(self.state.qty("C"), 0.0)
+
+    def test_quote_and_fill_are_incremental(self):
+        self.state.apply_quote("A", 110.0)
+        self.assertEqual(self.state.total_value, 2100.0)
+        self.state.apply_fill("C", True, 3, 50.0)
+        self.assertEqual(self.state.cash, 750.0)
+        self.assertEqual(self.state.total_value, 2100.0)
+        self.state.apply_fill("A", False, 10, 110.0)
+        self.assertEqual(self.state.qty("A"), 0.0)
+        self.assertEqual(self.state.cash, 1850.0)
+
+    def test_real_fills_replace_assumed_fills(self):
+        self.state.assume_fill("0001", "C", True, 4, 50.0)
+        self.state.assume_fill("0002", "B", False, 5, 20.0)
+        self.assertEqual(self.state.cash, 800.0)
+
+        # 매수 일부 체결(체결가 49) → 체결분은 체결가, 미체결분은 주문가 가정 유지
+        self.assertTrue(self.state.reconcile_fill("0001", 3, 49.0, 1))
+        self.assertEqual(self.state.qty("C"), 4.0)
+        self.assertEqual(self.state.cash, 900.0 - 147.0 - 50.0 + 100.0)
+        self.assertIn("0001", self.state.pending)
+
+        # 나머지 미체결분 취소, 매도는 체결가 21 로 전량 체결
+        self.state.reconcile_fill("0001", 3, 49.0, 0)
+        self.state.reconcile_fill("0002", 5, 21.0, 0)
+        self.assertEqual(self.state.qty("C"), 3.0)
+        self.assertEqual(self.state.qty("B"), 0.0)
+        self.assertEqual(self.state.cash, 900.0 - 147.0 + 105.0)
+        self.assertEqual(self.state.stock_value, 1000.0 + 147.0)
+        self.assertEqual(self.state.pending, {})
+        self.assertFalse(self.state.reconcile_fill("0002", 5, 21.0, 0))
+
+    def test_arrays_follow_requested_order(self):
+        prices, qty = self.state.arrays(["B", "ZZZ", "A"])
+        self.assertEqual(prices.tolist(), [20.0, 0.0, 100.0])
+        self.assertEqual(qty.tolist(), [5.0, 0.0, 10.0])
+
+    def test_resync_flags(self):
+        now = self.state.last_sync
+        self.assertFalse(self.state.needs_resync(now + 10))
+        self.assertTrue(self.state.needs_resync(now + 61))
+        self.state.mark_stale()
+        self.assertTrue(self.state.needs_resync(now))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src import profiling
+
+
+def _busy_wait():
+    end = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    time.sleep(0.03)
+    return total
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.configure(())
+
+    def test_disabled_by_default(self):
+        profiling.configure(())
+        with profiling.profile("rebalance") as session:
+            pass
+        self.assertEqual(session.files, {})
+
+    def test_all_modes_write_standard_outputs(self):
+        with tempfile.TemporaryDirectory() as out:
+            profiling.configure(["all"], output_dir=out, interval_ms=1)
+            with profiling.profile("rebalance") as session:
+                _busy_wait()
+                with profiling.profile("token") as nested:   # 중첩 구간은 건너뜀
+                    pass
+
+            self.assertEqual(nested.files, {})
+            self.assertEqual(set(session.files), {"pstats", "summary", "tracemalloc", "alloc", "collapsed"})
+            for path in session.files.values():
+                self.assertTrue(os.path.getsize(path) > 0, path)
+            with open(session.files["collapsed"], encoding="utf-8") as f:
+                self.assertIn("_busy_wait", f.read())
+
+
+    def test_failed_start_releases_lock(self):
+        with tempfile.TemporaryDirectory() as out:
+            profiling.configure(["cpu", "wall"], output_dir=out, interval_ms=1)
+            broken = mock.Mock()
+            broken.return_value.enable.side_effect = ValueError("Another profiling tool is already active")
+            with mock.patch.object(profiling.cProfile, "Profile", broken), self.assertLogs("src.profiling", "ERROR"):
+                with profiling.profile("rebalance") as failed:
+                    pass
+            self.assertEqual(failed.files, {})
+            self.assertIsNone(failed.sampler)
+
+            with profiling.profile("rebalance") as session:   # 잠금이 풀려 다음 구간은 측정된다
+                _busy_wait()
+            self.assertIn("pstats", session.files)
+
+
+if __name__ == '__main__':
+    unittest.main()
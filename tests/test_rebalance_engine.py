@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from src.rebalance_engine import compute_plan, evaluate_candidates, fit_buys_to_cash
+
+
+class TestRebalanceEngine(unittest.TestCase):
+    def test_sell_then_buy_sizes(self):
+        # 총 평가금액 2000 → A 목표 1000 (보유 1500), B 목표 1000 (보유 0 + 현금 500)
+        plan = compute_plan(["A", "B"], [100.0, 50.0], [15, 0], [0.5, 0.5], 500.0)
+        self.assertEqual(plan.total_value, 2000.0)
+        self.assertEqual(plan.sell_qty.tolist(), [5, 0])
+        self.assertEqual(plan.buy_qty.tolist(), [0, 20])
+        self.assertEqual(plan.cash_after, 0.0)
+        self.assertEqual(list(plan.sells()), [("A", 5, 100.0)])
+        self.assertEqual(list(plan.buys()), [("B", 20, 50.0)])
+
+    def test_other_holdings_count_toward_total(self):
+        # 목표 외 보유 1000 포함 총 2000 → A 목표 1000 = 10주 (목표 종목만 기준이면 5주)
+        plan = compute_plan(["A"], [100.0], [0], [0.5], 1000.0, other_value=1000.0)
+        self.assertEqual(plan.total_value, 2000.0)
+        self.assertEqual(plan.buy_qty.tolist(), [10])
+        self.assertEqual(plan.cash_after, 0.0)
+
+    def test_missing_price_is_skipped(self):
+        plan = compute_plan(["A", "B"], [100.0, 0.0], [0, 0], [0.5, 0.5], 1000.0)
+        self.assertEqual(plan.buy_qty.tolist(), [5, 0])
+        self.assertEqual(plan.order_count, 1)
+
+    def test_buys_limited_by_cash(self):
+        buy = fit_buys_to_cash(np.array([10.0, 10.0]), np.array([10.0, 10.0]), 150.0)
+        self.assertLessEqual(float((buy * 10.0).sum()), 150.0)
+        self.assertEqual(int(buy.sum()), 15)
+
+    def test_evaluate_candidates_matches_single_plan(self):
+        prices = [100.0, 50.0, 20.0]
+        qty = [10, 10, 10]
+        candidates = np.array([[0.5, 0.3, 0.2], [0.2, 0.3, 0.5]])
+        for other in (0.0, 1000.0):                      # 목표 외 보유 종목 평가금액 포함 여부
+            result = evaluate_candidates(prices, qty, candidates, 300.0, other)
+            for k in range(2):
+                plan = compute_plan(["A", "B", "C"], prices, qty, candidates[k], 300.0, other)
+                self.assertEqual(result["buy_qty"][k].tolist(), plan.buy_qty.tolist())
+                self.assertEqual(result["sell_qty"][k].tolist(), plan.sell_qty.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+import requests
+
+from src.order_execution_models import ExecutionInquiryResponse
+from src.orders.account_models import BalanceInquiryResponse
+from src.orders.margin_models import MarginResponse
+from src.orders.order_models import ResponseBody
+from src.simulator import KISSimulator, SimulatorConfig, SimulatorServer
+from src.transport import Transport, add_listener, remove_listener
+
+
+HEADERS = {"appkey": "sim-key", "appsecret": "sim-secret"}
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        sim = KISSimulator(
+            SimulatorConfig(volatility=0.0, spread_bps=0.0),
+            symbols={"AAPL": (100.0, "NASD"), "KO": (50.0, "NYSE")},
+            accounts={"12345678": {"cash": 1000.0, "positions": {"KO": 4}}},
+        )
+        self.server = SimulatorServer(sim).start()
+        self.url = self.server.url
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _get(self, path, tr_id, params):
+        return requests.get(f"{self.url}{path}", headers={**HEADERS, "tr_id": tr_id}, params=params).json()
+
+    def _order(self, tr_id, code, exchange, qty, price):
+        body = {"CANO": "12345678", "ACNT_PRDT_CD": "01", "OVRS_EXCG_CD": exchange, "PDNO": code,
+                "ORD_QTY": str(qty), "OVRS_ORD_UNPR": f"{price:.2f}", "ORD_SVR_DVSN_CD": "0", "ORD_DVSN": "00"}
+        return requests.post(f"{self.url}/uapi/overseas-stock/v1/trading/order",
+                             headers={**HEADERS, "tr_id": tr_id}, json=body).json()
+
+    def test_payloads_match_models_and_orders_fill(self):
+        token = requests.post(f"{self.url}/oauth2/tokenP", json={}).json()
+        self.assertTrue(token["access_token"])
+
+        price = self._get("/uapi/overseas-price/v1/quotations/price", "HHDFS00000300",
+                          {"AUTH": "", "EXCD": "NAS", "SYMB": "AAPL"})
+        self.assertEqual(float(price["output"]["last"]), 100.0)
+        wrong = self._get("/uapi/overseas-price/v1/quotations/price", "HHDFS00000300",
+                          {"AUTH": "", "EXCD": "NYS", "SYMB": "AAPL"})
+        self.assertEqual(wrong["output"]["last"], "")
+
+        filled = ResponseBody(**self._order("TTTT1002U", "AAPL", "NASD", 5, 101.0))
+        self.assertEqual(filled.rt_cd, "0")
+        resting = ResponseBody(**self._order("TTTT1006U", "KO", "NYSE", 2, 60.0))
+        self.assertEqual(resting.rt_cd, "0")
+        rejected = self._order("TTTT1002U", "AAPL", "NASD", 100, 100.0)
+        self.assertEqual(rejected["rt_cd"], "1")
+
+        balance = BalanceInquiryResponse(**self._get(
+            "/uapi/overseas-stock/v1/trading/inquire-balance", "TTTS3012R",
+            {"CANO": "12345678", "ACNT_PRDT_CD": "01", "OVRS_EXCG_CD": "NASD", "TR_CRCY_CD": "USD"}))
+        self.assertEqual([(i.ovrs_pdno, i.ovrs_cblc_qty) for i in balance.output1], [("AAPL", "5")])
+
+        margin = MarginResponse(**self._get(
+            "/uapi/overseas-stock/v1/trading/foreign-margin", "TTTC2101R",
+            {"CANO": "12345678", "ACNT_PRDT_CD": "01"}))
+        self.assertAlmostEqual(float(margin.output[0].frcr_gnrl_ord_psbl_amt), 500.0)
+
+        execs = ExecutionInquiryResponse(**self._get(
+            "/uapi/overseas-stock/v1/trading/inquire-ccnl", "TTTS3035R",
+            {"CANO": "12345678", "ACNT_PRDT_CD": "01", "PDNO": "", "SLL_BUY_DVSN": "00",
+             "CCLD_NCCS_DVSN": "02"}))
+        self.assertEqual([(e.pdno, e.nccs_qty) for e in execs.output], [("KO", "2")])
+
+    def test_order_numbers_are_unique_across_accounts_and_simulators(self):
+        other = KISSimulator(SimulatorConfig(volatility=0.0), symbols={"AAPL": (100.0, "NASD")})
+        numbers = []
+        for sim in (self.server.simulator, other):
+            for cano in ("12345678", "87654321"):
+                body = {"CANO": cano, "OVRS_EXCG_CD": "NASD", "PDNO": "AAPL", "ORD_QTY": "1",
+                        "OVRS_ORD_UNPR": "100.00"}
+                numbers.append(sim.order("TTTT1002U", body)["output"]["ODNO"])
+        self.assertEqual(len(set(numbers)), 4)
+
+    def test_rate_limit_rejects_with_egw00201(self):
+        self.server.simulator.config.rate_limit_per_sec = 2
+        codes = [self._get("/uapi/overseas-price/v1/quotations/price", "HHDFS00000300",
+                           {"EXCD": "NAS", "SYMB": "AAPL"}).get("msg_cd") for _ in range(5)]
+        self.assertIn("EGW00201", codes)
+        self.assertGreater(self.server.simulator.rejected["rate_limit"], 0)
+
+    def test_transport_listener_sees_each_attempt(self):
+        self.server.simulator.config.rate_limit_per_sec = 1
+        events = []
+        add_listener(events.append)
+        transport = Transport(max_retries=1)
+        try:
+            url = f"{self.url}/uapi/overseas-price/v1/quotations/price"
+            for _ in range(2):
+                transport.get(url, headers={**HEADERS, "tr_id": "HHDFS00000300"},
+                              params={"EXCD": "NAS", "SYMB": "AAPL"})
+        finally:
+            remove_listener(events.append)
+            transport.close()
+        self.assertEqual({e.tr_id for e in events}, {"HHDFS00000300"})
+        self.assertTrue(any(e.rate_limited and e.attempt == 0 for e in events))
+        self.assertTrue(all(e.elapsed > 0 and e.bytes_received > 0 for e in events))
+
+
+if __name__ == '__main__':
+    unittest.main()
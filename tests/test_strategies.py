@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from src.multi_account import MultiAccountRebalancer
+from src.strategies import (aggregate_weights, load_strategies, netting_report, parse_strategies,
+                            target_weights)
+
+
+RAW = {
+    "growth": {"allocation": 0.6, "weights": {"TQQQ": 0.5, "SGOV": 0.5}},
+    "income": {"allocation": 0.4, "weights": {"SGOV": 0.25, "FEPI": 0.75}},
+}
+
+
+class TestStrategies(unittest.TestCase):
+    def test_aggregate_weights(self):
+        weights = aggregate_weights(parse_strategies(RAW))
+        self.assertEqual(set(weights), {"TQQQ", "SGOV", "FEPI"})
+        self.assertAlmostEqual(weights["TQQQ"], 0.3)
+        self.assertAlmostEqual(weights["SGOV"], 0.4)
+        self.assertAlmostEqual(weights["FEPI"], 0.3)
+
+    def test_zero_weight_is_kept_as_liquidation_target(self):
+        raw = {"a": {"allocation": 0.5, "weights": {"TQQQ": 1.0, "SOXL": 0.0}}}
+        self.assertEqual(aggregate_weights(parse_strategies(raw)), {"TQQQ": 0.5, "SOXL": 0.0})
+
+    def test_validation(self):
+        for raw in ({"a": {"allocation": 0.7, "weights": {"X": 1}}, "b": {"allocation": 0.4, "weights": {"Y": 1}}},
+                    {"a": {"allocation": 0.5, "weights": {"X": 0.8, "Y": 0.3}}},
+                    {"a": {"allocation": -0.1, "weights": {"X": 1}}}):
+            with self.assertRaises(ValueError):
+                parse_strategies(raw)
+
+    def test_target_weights_precedence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "target_allocation.yaml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("strategies:\n  solo:\n    allocation: 1.0\n    weights: {AAPL: 1.0}\n")
+            self.assertEqual(len(load_strategies(path)), 1)
+
+            base = {"weights": {"MSFT": 1.0}, "allocation_file": path}
+            self.assertEqual(target_weights({"strategy": base}), {"AAPL": 1.0})
+            self.assertAlmostEqual(target_weights({"strategy": dict(base, strategies=RAW)})["SGOV"], 0.4)
+            self.assertEqual(target_weights({"strategy": dict(base, allocation_file=None)}), {"MSFT": 1.0})
+            self.assertEqual(target_weights({"strategy": dict(base, allocation_file=os.path.join(tmp, "x.yaml"))}),
+                             {"MSFT": 1.0})
+
+            multi = MultiAccountRebalancer(lambda cfg: None, cfg={"strategy": base, "accounts": []})
+            cfg = multi.account_config({"CANO": "1", "weights": {"KO": 1.0}})
+            self.assertEqual(target_weights(cfg), {"KO": 1.0})
+            cfg = multi.account_config({"CANO": "1", "strategies": RAW})
+            self.assertAlmostEqual(target_weights(cfg)["FEPI"], 0.3)
+
+    def test_netting_reduces_orders(self):
+        # 두 전략이 TQQQ 를 반대 방향으로 원한다: 따로 돌리면 매수/매도가 모두 나가지만 합산하면 상계
+        strategies = parse_strategies({
+            "a": {"allocation": 0.5, "weights": {"TQQQ": 0.8, "SGOV": 0.2}},
+            "b": {"allocation": 0.5, "weights": {"TQQQ": 0.2, "SGOV": 0.8}},
+        })
+        report = netting_report(strategies, {"TQQQ": 50.0, "SGOV": 100.0}, {"TQQQ": 100, "SGOV": 50}, 0.0)
+        self.assertEqual(report["opposing_symbols"], 2)
+        self.assertEqual(report["separate_orders"], 4)
+        self.assertEqual(report["combined_orders"], 0)
+        self.assertLessEqual(report["netted_orders"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
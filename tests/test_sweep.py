@@ -0,0 +1,84 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.backtest.engine import simulate
+from src.backtest.sweep import SweepRunner, expand_grid
+
+
+GRID = {
+    "weights": {
+        "balanced": {"A": 0.5, "B": 0.5},
+        "tilted": {"A": 0.8, "B": 0.2},
+    },
+    "rebalance_every": [0, 5, 21],
+    "symbol_threshold": [0.05, math.inf],
+}
+
+
+def _prices(T=200, seed=3):
+    rng = np.random.default_rng(seed)
+    return 40.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, size=(T, 2)), axis=0))
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, "sweep")
+        self.prices = _prices()
+        self.symbols, self.jobs = expand_grid(GRID)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_expand_grid(self):
+        self.assertEqual(self.symbols, ["A", "B"])
+        self.assertEqual(len(self.jobs), 2 * 3 * 2)
+        self.assertEqual(len({j["job"] for j in self.jobs}), len(self.jobs))
+        self.assertEqual(expand_grid(GRID)[1], self.jobs)                  # job id 는 결정적
+        with self.assertRaises(ValueError):
+            expand_grid({"symbols": ["A"], "weights": {"x": {"A": 0.5, "C": 0.5}}})
+
+    def test_resume_skips_completed_and_partial_line(self):
+        runner = SweepRunner(self.out, workers=1, batch_size=4)
+        self.assertEqual(runner.run(self.prices, self.jobs[:5], self.symbols), 5)
+        with open(runner.results_path, "a", encoding="utf-8") as f:
+            f.write('{"job": "trunc')                                      # 기록 중 중단
+
+        self.assertEqual(runner.run(self.prices, self.jobs, self.symbols), len(self.jobs) - 5)
+        self.assertEqual(runner.run(self.prices, self.jobs, self.symbols), 0)
+        rows = runner.results()
+        self.assertEqual(sorted(r["job"] for r in rows), sorted(j["job"] for j in self.jobs))
+
+        job = next(j for j in self.jobs if j["symbol_threshold"] == math.inf)
+        row = next(r for r in rows if r["job"] == job["job"])
+        self.assertIsNone(row["symbol_threshold"])
+        single = simulate(self.prices, job["w"], job["rebalance_every"], job["symbol_threshold"])
+        self.assertAlmostEqual(row["final_value"], single.final_value[0], places=6)
+
+        with self.assertRaises(ValueError):
+            runner.run(self.prices * 2, self.jobs, self.symbols)            # 다른 가격으로 재개 불가
+
+    def test_process_pool_matches_inline(self):
+        inline = SweepRunner(os.path.join(self.tmp.name, "inline"), workers=1, batch_size=5)
+        pooled = SweepRunner(self.out, workers=2, batch_size=5)
+        inline.run(self.prices, self.jobs, self.symbols)
+        self.assertEqual(pooled.run(self.prices, self.jobs, self.symbols), len(self.jobs))
+
+        expected = {r["job"]: r for r in inline.results()}
+        for row in pooled.results():
+            for key, value in row.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(value, expected[row["job"]][key], places=6)
+                else:
+                    self.assertEqual(value, expected[row["job"]][key])
+        with open(os.path.join(self.out, "sweep.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["shape"], [200, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import time
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import AllStockCode, Base
+from src.symbol_master import SymbolMaster
+
+
+ROWS = [
+    ("삼성전자", "5930", "반도체 제조업"),
+    ("삼성SDI", "006400", "전자부품 제조업"),
+    ("SK하이닉스", "000660", "반도체 제조업"),
+    ("Apple Inc", "AAPL", "Technology"),
+]
+
+
+class TestSymbolMaster(unittest.TestCase):
+    def setUp(self):
+        # 백그라운드 갱신 스레드도 같은 메모리 DB 를 보도록 연결 하나를 공유
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine, tables=[AllStockCode.__table__])
+        self.Session = sessionmaker(bind=self.engine)
+        self._insert(ROWS)
+        self.queries = 0
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        self.master = SymbolMaster(self.Session, refresh_sec=0)
+
+    def _count(self, conn, cursor, statement, *args):
+        self.queries += 1
+        self.statements.append(statement)
+
+    def _insert(self, rows):
+        session = self.Session()
+        session.add_all(AllStockCode(회사명=n, 종목코드=c, 업종=s) for n, c, s in rows)
+        session.commit()
+        session.close()
+
+    def test_lookups_are_in_memory(self):
+        self.assertEqual(self.master.name("005930"), "삼성전자")
+        self.assertEqual(self.master.name(5930), "삼성전자")
+        self.assertEqual(self.master.name("aapl"), "Apple Inc")
+        self.assertEqual(self.master.name("MSFT", "MSFT"), "MSFT")
+        loaded = self.queries
+
+        self.assertEqual(self.master.sector("000660"), "반도체 제조업")
+        self.assertEqual(self.master.codes_in_sector("반도체 제조업"), ("000660", "005930"))
+        self.assertEqual([r.code for r in self.master.search("삼성")], ["006400", "005930"])
+        self.assertEqual([r.code for r in self.master.search("apple")], ["AAPL"])
+        self.assertEqual(self.master.search("삼성", limit=1)[0].code, "006400")
+        self.assertEqual(self.master.names(["AAPL", "X"]), {"AAPL": "Apple Inc", "X": None})
+        self.assertEqual(self.queries, loaded)                   # 적재 후에는 DB 조회 없음
+
+    def test_incremental_refresh(self):
+        self.assertEqual(len(self.master), 4)
+        queries = self.queries
+        self.assertFalse(self.master.refresh())                  # 변화 없음: 집계 조회 1회, 색인 유지
+        self.assertEqual(self.queries, queries + 1)
+        self.assertIn("count(", self.statements[-1].lower())
+
+        self._insert([("Microsoft", "MSFT", "Technology")])
+        self.assertTrue(self.master.refresh())
+        self.assertEqual(self.master.codes_in_sector("Technology"), ("AAPL", "MSFT"))
+
+        session = self.Session()
+        session.query(AllStockCode).filter(AllStockCode.종목코드 == "AAPL").delete()
+        session.commit()
+        session.close()
+        self.assertTrue(self.master.refresh())                   # 삭제 → 전체 재적재
+        self.assertNotIn("AAPL", self.master)
+        self.assertEqual(len(self.master), 4)
+
+    def test_in_place_update_is_detected(self):
+        version = self.master.version
+        session = self.Session()
+        session.query(AllStockCode).filter(AllStockCode.종목코드 == "AAPL").update({"회사명": "Apple Corp"})
+        session.commit()
+        session.close()
+
+        self.assertTrue(self.master.refresh())                   # 행 수/최대 index 는 그대로
+        self.assertEqual(self.master.name("AAPL"), "Apple Corp")
+        self.assertIsNone(self.master.by_name("Apple Inc"))
+        self.assertNotEqual(self.master.version, version)
+
+    def test_same_size_update_is_caught_by_verify(self):
+        self.master.verify_sec = 0                                # 집계가 같아도 매번 checksum 확인
+        session = self.Session()
+        session.query(AllStockCode).filter(AllStockCode.종목코드 == "AAPL").update({"회사명": "Apple Co."})
+        session.commit()
+        session.close()
+        self.assertTrue(self.master.refresh())
+        self.assertEqual(self.master.name("AAPL"), "Apple Co.")
+
+    def test_auto_refresh_runs_off_the_lookup_path(self):
+        master = SymbolMaster(self.Session, refresh_sec=0.01)
+        self.assertEqual(master.name("AAPL"), "Apple Inc")       # 최초 적재는 동기
+        self._insert([("Microsoft", "MSFT", "Technology")])
+        time.sleep(0.02)
+        self.assertIsNone(master.name("MSFT"))                   # 갱신 전 색인으로 바로 반환
+        master._refresher.join(5)
+        self.assertEqual(master.name("MSFT"), "Microsoft")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.setup({})
+
+    def test_disabled_is_noop(self):
+        tracing.setup({})
+        before = len(tracing.recent_traces())
+        with tracing.trace("rebalance") as root, tracing.span("price", symbol="AAPL") as span:
+            span.set("rt_cd", "0")
+        self.assertIs(root, span)
+        self.assertEqual(len(tracing.recent_traces()), before)
+
+    def test_spans_nest_across_propagated_threads(self):
+        tracing.setup({"enabled": True})
+
+        def fetch(symbol):
+            with tracing.span("HHDFS00000300", symbol=symbol) as span:
+                span.set("rt_cd", "0")
+
+        with tracing.trace("rebalance", account="1-01"):
+            with tracing.span("prices"):
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    list(pool.map(tracing.propagate(fetch), ["AAPL", "MSFT"]))
+
+        root = tracing.recent_traces()[-1]
+        tree = root.to_dict()
+        self.assertEqual(tree["name"], "rebalance")
+        prices = tree["children"][0]
+        self.assertEqual(sorted(c["attrs"]["symbol"] for c in prices["children"]), ["AAPL", "MSFT"])
+
+        events = tracing.to_chrome(root)["traceEvents"]
+        self.assertEqual([e["name"] for e in events][:2], ["rebalance", "prices"])
+        self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+
+
+if __name__ == '__main__':
+    unittest.main()